@@ -0,0 +1,104 @@
+import argparse
+import threading
+import time
+
+import lbclient
+import utils
+import histogram
+
+# Tamaños del tráfico grande de fondo: las tres clases de tamaño mayores
+LARGE_SIZES = [512 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+
+
+def large_writer(client, generator, stop, counters, lock):
+    """Escribe valores grandes de LARGE_SIZES sin pausa hasta que se activa stop."""
+    while not stop.is_set():
+        with lock:
+            key = generator.key()
+            value = generator.value(generator.rng.choice(LARGE_SIZES))
+        status, _ = client.set(key, value)
+        with lock:
+            counters["ops"] += 1
+            counters["bytes"] += len(value)
+            counters["failures"] += 0 if status else 1
+
+
+def measure_config(address, pool_size, large_channels, num_reads, large_threads, seed):
+    """
+    Mide la latencia de lecturas de 512B mientras large_threads hilos escriben valores
+    grandes por el mismo cliente, con la configuración de canales indicada.
+
+    Returns:
+        dict: 'histogram' de las lecturas pequeñas y throughput del tráfico grande.
+    """
+    generator = utils.ValueGenerator(seed)
+    client = lbclient.KeyValueClient(address, pool_size=pool_size, large_channels=large_channels)
+    try:
+        small_keys = [generator.key() for _ in range(100)]
+        client.set_many([(key, generator.value(512)) for key in small_keys])
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        counters = {"ops": 0, "bytes": 0, "failures": 0}
+        writers = [threading.Thread(target=large_writer, args=(client, utils.ValueGenerator(seed + i + 1), stop, counters, lock))
+                   for i in range(large_threads)]
+        for writer in writers:
+            writer.start()
+        time.sleep(0.5) # Que el tráfico grande esté en vuelo antes de medir
+
+        hist = histogram.LatencyHistogram()
+        failures = 0
+        start = time.perf_counter()
+        for _ in range(num_reads):
+            key = generator.rng.choice(small_keys)
+            start_time = time.perf_counter_ns()
+            status, _ = client.get(key)
+            hist.record(time.perf_counter_ns() - start_time)
+            failures += 0 if status else 1
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        for writer in writers:
+            writer.join()
+    finally:
+        client.close()
+    return {"histogram": hist, "read_failures": failures,
+            "large_mb_per_sec": counters["bytes"] / elapsed / (1024 * 1024) if elapsed > 0 else 0,
+            "large_failures": counters["failures"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latencia de peticiones pequeñas con tráfico de valores grandes en vuelo, con un canal y con un pool de canales")
+    parser.add_argument('--server', default='localhost:5050', help='Dirección del servidor (por defecto: localhost:5050)')
+    parser.add_argument('--pool_size', type=int, default=4, help='Canales para peticiones pequeñas en las configuraciones con pool (por defecto: 4)')
+    parser.add_argument('--large_channels', type=int, default=2, help='Canales dedicados a valores grandes en la última configuración (por defecto: 2)')
+    parser.add_argument('--large_threads', type=int, default=4, help='Hilos que escriben valores de 512KB-4MB en paralelo (por defecto: 4)')
+    parser.add_argument('--num_reads', type=int, default=2000, help='Lecturas de 512B medidas por configuración (por defecto: 2000)')
+    parser.add_argument('--seed', type=int, default=1, help='Semilla de claves y valores (por defecto: 1)')
+    parser.add_argument('--latency_report', help='Archivo donde exportar los histogramas de latencia (.json o .csv)')
+    args = parser.parse_args(argv)
+
+    configs = {
+        "1 canal": (1, 0),
+        f"pool de {args.pool_size}": (args.pool_size, 0),
+        f"pool de {args.pool_size} + {args.large_channels} dedicados": (args.pool_size, args.large_channels),
+    }
+    results = {}
+    for name, (pool_size, large_channels) in configs.items():
+        print(f"Midiendo '{name}'...")
+        results[name] = measure_config(args.server, pool_size, large_channels, args.num_reads, args.large_threads, args.seed)
+
+    print(f"\n{'Canales':<28} {'p50':>9} {'p99':>9} {'p99.9':>9} {'max':>9} {'Grandes MB/s':>13} {'Fallos':>7}")
+    for name, result in results.items():
+        summary = result["histogram"].summary()
+        print(f"{name:<28} {summary['p50_latency_ms']:>7.2f}ms {summary['p99_latency_ms']:>7.2f}ms "
+              f"{summary['p99.9_latency_ms']:>7.2f}ms {summary['max_latency_ms']:>7.2f}ms "
+              f"{result['large_mb_per_sec']:>13.1f} {result['read_failures'] + result['large_failures']:>7}")
+
+    if args.latency_report:
+        histogram.export(args.latency_report, {name: result["histogram"] for name, result in results.items()})
+        print(f"Histogramas de latencia exportados a: {args.latency_report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import contextlib
+import io
+import os
+import shlex
+import sys
+import tempfile
+import time
+
+import keycodec
+import lbclient
+import utils
+from bench_suite import DEFAULT_GO_SERVER, disk_bytes, server_command, start_server, stop_server
+
+# Tamaños de valor por defecto: cada sobrescritura cambia la clave de clase con frecuencia
+DEFAULT_SIZES = [512, 4 * 1024, 512 * 1024, 1024 * 1024]
+
+# Crecimiento máximo tolerado de values.db entre el final de las rondas de asentamiento y
+# el final de la carga
+DEFAULT_MAX_GROWTH = 1.25
+
+
+def run_round(client, keys, sizes, generator, current):
+    """
+    Sobrescribe cada clave una vez con un valor de un tamaño elegido al azar de sizes y
+    actualiza current (clave -> tamaño de bloque vigente).
+
+    Returns:
+        tuple: (fallos, bytes escritos, segundos)
+    """
+    failures = 0
+    written = 0
+    start = time.perf_counter()
+    for key in keys:
+        size = generator.rng.choice(sizes)
+        status, _ = client.set(key, generator.value(size))
+        if status:
+            current[key] = keycodec.class_for_length(size)
+            written += size
+        else:
+            failures += 1
+    return failures, written, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga larga de sobrescrituras con cambios de clase de tamaño: mide si values.db se mantiene acotado")
+    parser.add_argument('--server', choices=['go', 'python'], default='go', help='Servidor a medir (por defecto: go)')
+    parser.add_argument('--server_bin', default=DEFAULT_GO_SERVER, help='Ejecutable del servidor Go (por defecto: server.exe en la raíz del repositorio)')
+    parser.add_argument('--server_args', default='', help='Argumentos adicionales del servidor, p. ej. "-durabilidad batch"')
+    parser.add_argument('--port', type=int, default=5070, help='Puerto del servidor (por defecto: 5070)')
+    parser.add_argument('--keys', type=int, default=100, help='Claves que se sobrescriben en cada ronda (por defecto: 100)')
+    parser.add_argument('--rounds', type=int, default=20, help='Rondas de sobrescritura (por defecto: 20)')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES), help='Tamaños de valor en bytes separados por comas (por defecto: 512B, 4KB, 512KB y 1MB)')
+    parser.add_argument('--settle', type=int, default=3, help='Rondas tras las que se toma el tamaño de referencia de values.db (por defecto: 3)')
+    parser.add_argument('--max_growth', type=float, default=DEFAULT_MAX_GROWTH, help='Crecimiento máximo tolerado de values.db desde la referencia; si se supera el código de salida es 1 (por defecto: 1.25)')
+    parser.add_argument('--restart_round', type=int, default=None, help='Reiniciar el servidor tras esta ronda, para medir la reutilización de huecos tras un reinicio (por defecto: la mitad de las rondas; 0 = no reiniciar)')
+    parser.add_argument('--seed', type=int, default=1, help='Semilla de claves y valores (por defecto: 1)')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar la salida del cliente')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    restart_round = args.rounds // 2 if args.restart_round is None else args.restart_round
+    if args.server == 'go' and not os.path.exists(args.server_bin):
+        parser.error(f"no existe el ejecutable del servidor Go {args.server_bin} (compílelo con make o use --server python)")
+
+    generator = utils.ValueGenerator(args.seed)
+    keys = [generator.key() for _ in range(args.keys)]
+    current = {}
+    quiet = contextlib.redirect_stdout(sys.stdout if args.verbose else io.StringIO())
+    command = server_command(args.server, args.port, args.server_bin, shlex.split(args.server_args))
+    reference = None
+    peak = 0
+
+    print(f"{'Ronda':>5} {'ops/s':>9} {'MB/s':>8} {'values.db':>11} {'Vigente':>10} {'Ampl.':>6} {'Disco':>10} {'Fallos':>7}")
+    with tempfile.TemporaryDirectory(prefix='bench_overwrite_') as work_dir:
+        values_path = os.path.join(work_dir, 'db', 'values.db')
+        process = start_server(command, work_dir, args.port)
+        with quiet:
+            client = lbclient.KeyValueClient(f'localhost:{args.port}')
+        try:
+            for round_number in range(1, args.rounds + 1):
+                with quiet:
+                    failures, written, elapsed = run_round(client, keys, sizes, generator, current)
+                values_size = os.path.getsize(values_path) if os.path.exists(values_path) else 0
+                live = sum(current.values())
+                peak = max(peak, values_size)
+                if round_number == args.settle:
+                    reference = values_size
+                print(f"{round_number:>5} {(args.keys - failures) / elapsed:>9.1f} "
+                      f"{written / elapsed / (1024 * 1024):>8.1f} "
+                      f"{values_size / (1024 * 1024):>9.1f}MB {live / (1024 * 1024):>8.1f}MB "
+                      f"{values_size / live if live else 0:>6.2f} {disk_bytes(os.path.join(work_dir, 'db')) / (1024 * 1024):>8.1f}MB {failures:>7}")
+
+                if round_number == restart_round and round_number < args.rounds:
+                    with quiet:
+                        client.close()
+                    stop_server(process)
+                    print("  (servidor reiniciado)")
+                    process = start_server(command, work_dir, args.port)
+                    with quiet:
+                        client = lbclient.KeyValueClient(f'localhost:{args.port}')
+        finally:
+            with quiet:
+                client.close()
+            stop_server(process)
+
+    if reference is None:
+        print("\nNo hay suficientes rondas para comparar con la referencia (--settle).")
+        return 0
+    growth = peak / reference if reference else 0
+    print(f"\nvalues.db: {reference / (1024 * 1024):.1f}MB tras la ronda {args.settle}, "
+          f"máximo {peak / (1024 * 1024):.1f}MB (crecimiento x{growth:.2f}, tolerado x{args.max_growth:.2f})")
+    if growth > args.max_growth:
+        print("values.db no se mantiene acotado: el espacio de los valores sobrescritos no se reutiliza.")
+        return 1
+    print("values.db se mantiene acotado.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import grpc
+import lbclient
+import utils
+import histogram
+
+# Modos del servidor de referencia que se comparan: nombre -> argumentos de pyserver.py
+MODES = {
+    "offsets+pread": [],
+    "offsets+mmap": ['--mmap'],
+    "valores en memoria": ['--values_in_memory'],
+}
+
+
+def read_rss_bytes(pid):
+    """
+    Devuelve la memoria residente (RSS) del proceso pid en bytes, leída de /proc (Linux),
+    o None si no está disponible. En el modo mmap incluye las páginas de values.db
+    mapeadas, que son caché de archivo que el sistema puede liberar.
+    """
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def start_server(port, db_dir, extra_args=(), timeout=30):
+    """Lanza pyserver.py en un subproceso y espera a que acepte conexiones."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pyserver.py')
+    process = subprocess.Popen([sys.executable, script, '--port', str(port), '--db', db_dir, *extra_args],
+                               stdout=subprocess.DEVNULL)
+    with grpc.insecure_channel(f'localhost:{port}') as channel:
+        grpc.channel_ready_future(channel).result(timeout=timeout)
+    return process
+
+
+def stop_server(process):
+    process.terminate()
+    process.wait()
+
+
+def populate(port, db_dir, num_keys, value_size, seed):
+    """Escribe num_keys valores de value_size bytes con un servidor temporal. Devuelve las claves."""
+    generator = utils.ValueGenerator(seed=seed)
+    keys = [generator.key(8) for _ in range(num_keys)]
+    process = start_server(port, db_dir)
+    client = lbclient.KeyValueClient(f'localhost:{port}')
+    try:
+        for start in range(0, num_keys, 64):
+            client.set_many([(key, generator.value(value_size)) for key in keys[start:start + 64]])
+    finally:
+        client.close()
+        stop_server(process)
+    return keys
+
+
+def measure_mode(port, db_dir, extra_args, keys, num_reads, seed):
+    """
+    Arranca el servidor en un modo, mide su RSS tras la carga y la latencia de num_reads
+    lecturas aleatorias, y lo detiene.
+    """
+    load_start = time.perf_counter()
+    process = start_server(port, db_dir, extra_args)
+    load_seconds = time.perf_counter() - load_start
+    rss_loaded = read_rss_bytes(process.pid)
+
+    rng = random.Random(seed)
+    hist = histogram.LatencyHistogram()
+    client = lbclient.KeyValueClient(f'localhost:{port}')
+    try:
+        for _ in range(num_reads):
+            key = rng.choice(keys)
+            start = time.perf_counter_ns()
+            status, _ = client.get(key)
+            hist.record(time.perf_counter_ns() - start)
+            if not status:
+                print(f"Advertencia: lectura fallida de la clave {key}")
+        rss_after = read_rss_bytes(process.pid)
+    finally:
+        client.close()
+        stop_server(process)
+    return {"load_seconds": load_seconds, "rss_loaded": rss_loaded, "rss_after_reads": rss_after, "histogram": hist}
+
+
+def format_rss(value):
+    return "N/D" if value is None else f"{value / (1024 * 1024):.1f}MB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara RSS y latencia del servidor Python con índice de offsets frente a valores en memoria")
+    parser.add_argument('--num_keys', type=int, default=2000, help='Claves a cargar (por defecto: 2000)')
+    parser.add_argument('--value_size', type=int, default=512 * 1024, help='Tamaño de cada valor en bytes (por defecto: 512KB)')
+    parser.add_argument('--num_reads', type=int, default=2000, help='Lecturas aleatorias por modo (por defecto: 2000)')
+    parser.add_argument('--port', type=int, default=5070, help='Puerto para los servidores del benchmark (por defecto: 5070)')
+    parser.add_argument('--db', help='Directorio de datos; si no se indica se usa uno temporal')
+    parser.add_argument('--seed', type=int, default=1, help='Semilla de claves, valores y lecturas (por defecto: 1)')
+    parser.add_argument('--latency_report', help='Archivo donde exportar los histogramas de latencia (.json o .csv)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_dir = args.db or os.path.join(temp_dir, 'db')
+        print(f"Cargando {args.num_keys} valores de {args.value_size} bytes en {db_dir}...")
+        keys = populate(args.port, db_dir, args.num_keys, args.value_size, args.seed)
+
+        results = {}
+        for name, extra_args in MODES.items():
+            print(f"Midiendo el modo '{name}'...")
+            results[name] = measure_mode(args.port, db_dir, extra_args, keys, args.num_reads, args.seed)
+
+    print(f"\n{'Modo':<20} {'Carga':>8} {'RSS cargado':>12} {'RSS final':>10} {'p50':>9} {'p99':>9} {'avg':>9}")
+    for name, result in results.items():
+        summary = result["histogram"].summary()
+        print(f"{name:<20} {result['load_seconds']:>7.2f}s {format_rss(result['rss_loaded']):>12} "
+              f"{format_rss(result['rss_after_reads']):>10} {summary['p50_latency_ms']:>7.3f}ms "
+              f"{summary['p99_latency_ms']:>7.3f}ms {summary['avg_latency_ms']:>7.3f}ms")
+
+    if args.latency_report:
+        histogram.export(args.latency_report, {name: result["histogram"] for name, result in results.items()})
+        print(f"Histogramas de latencia exportados a: {args.latency_report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,364 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+
+import grpc
+import keycodec
+import lbclient
+import utils
+import histogram
+import run_client
+from bench_pyserver import read_rss_bytes
+
+PHASES = ('write', 'read', 'mixed', 'prefix')
+
+# Tolerancia por defecto frente a la línea base: caída de throughput o subida del p99
+DEFAULT_TOLERANCE = 0.10
+
+# Caracteres de prefijo en la fase prefix: con claves hexadecimales, ~1/256 de las claves por consulta
+PREFIX_LENGTH = 2
+
+CLIENT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Ejecutable del servidor Go que genera el makefile en la raíz del repositorio
+DEFAULT_GO_SERVER = os.path.join(os.path.dirname(CLIENT_DIR), 'server.exe')
+
+
+def server_command(kind, port, binary=None, extra_args=()):
+    """
+    Devuelve el comando que arranca un servidor del tipo kind ('go' o 'python') en port.
+    Ambos usan ./db relativo al directorio de trabajo, que la suite crea vacío para cada fase.
+    """
+    if kind == 'python':
+        return [sys.executable, os.path.join(CLIENT_DIR, 'pyserver.py'), '--port', str(port), '--db', './db', *extra_args]
+    return [os.path.abspath(binary or DEFAULT_GO_SERVER), '-port', str(port), *extra_args]
+
+
+def start_server(command, work_dir, port, timeout=60):
+    """
+    Lanza el servidor con work_dir como directorio de trabajo (su salida va a server.log) y
+    espera a que acepte conexiones.
+
+    Raises:
+        RuntimeError: Si el servidor termina o no acepta conexiones dentro de timeout.
+    """
+    log = open(os.path.join(work_dir, 'server.log'), 'wb')
+    process = subprocess.Popen(command, cwd=work_dir, stdout=log, stderr=subprocess.STDOUT)
+    log.close()
+    try:
+        with grpc.insecure_channel(f'localhost:{port}') as channel:
+            grpc.channel_ready_future(channel).result(timeout=timeout)
+    except grpc.FutureTimeoutError:
+        stop_server(process)
+        raise RuntimeError(f"el servidor no aceptó conexiones en {timeout}s (ver {os.path.join(work_dir, 'server.log')})")
+    if process.poll() is not None:
+        raise RuntimeError(f"el servidor terminó con código {process.returncode}")
+    return process
+
+
+def compression_args(kind, algorithm, threshold):
+    """Devuelve los argumentos con que un servidor del tipo kind comprime las respuestas grandes."""
+    if algorithm == 'none':
+        return []
+    if kind == 'python':
+        return ['--compression', algorithm, '--compression_threshold', str(threshold)]
+    return ['-compresion', algorithm, '-compresionUmbral', str(threshold)]
+
+
+def loopback_bytes():
+    """
+    Devuelve los bytes enviados hasta ahora por la interfaz de loopback (lo), leídos de
+    /proc/net/dev (Linux), o None si no está disponible. Como el servidor de la suite es
+    local, la diferencia entre dos lecturas son los bytes que la fase puso en la red, con
+    las cabeceras de TCP y HTTP/2 incluidas (y el tráfico de otros procesos por loopback).
+    """
+    try:
+        with open('/proc/net/dev', encoding='ascii') as f:
+            for line in f:
+                name, _, counters = line.partition(':')
+                if name.strip() == 'lo':
+                    return int(counters.split()[8])
+    except (OSError, IndexError, ValueError):
+        return None
+    return None
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def disk_bytes(db_dir):
+    """Devuelve los bytes que ocupan los archivos de db_dir (keys.db, values.db, WAL...)."""
+    total = 0
+    for root, _, files in os.walk(db_dir):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def operations_for_size(num_operations, value_size, max_mb):
+    """Limita las operaciones de una fase para que escriba como mucho max_mb MB."""
+    return max(1, min(num_operations, int(max_mb * 1024 * 1024 // value_size)))
+
+
+def run_prefix_queries(client, keys, num_queries, generator):
+    """
+    Ejecuta num_queries recorridos con iter_prefix (claves y valores) usando prefijos de
+    PREFIX_LENGTH caracteres de claves existentes, o de PREFIX_LENGTH bytes si son claves
+    binarias (keycodec.Key), que se recorren con un prefijo binario.
+
+    Returns:
+        tuple: (success_count, failure_count, latency_histogram)
+    """
+    latency_histogram = histogram.LatencyHistogram()
+    success = failure = 0
+    for _ in range(num_queries):
+        key = generator.rng.choice(keys)
+        prefix = key.raw[:PREFIX_LENGTH] if isinstance(key, keycodec.Key) else key[:PREFIX_LENGTH]
+        start_time = time.perf_counter_ns()
+        try:
+            for _ in client.iter_prefix(prefix):
+                pass
+            success += 1
+        except grpc.RpcError:
+            failure += 1
+        latency_histogram.record(time.perf_counter_ns() - start_time)
+    return success, failure, latency_histogram
+
+
+def run_phase(client, phase, num_operations, value_size, warmup, seed, value_kind='random'):
+    """
+    Ejecuta una fase sobre un servidor recién arrancado: carga los datos que necesita y
+    un calentamiento sin medir, y después la parte medida. value_kind es el tipo de valor
+    de utils.ValueGenerator.
+
+    Returns:
+        tuple: (success_count, failure_count, elapsed_seconds, latency_histogram, wire_bytes);
+               wire_bytes es None si no se pueden medir (ver loopback_bytes).
+    """
+    generator = utils.ValueGenerator(seed, kind=value_kind)
+    keys = []
+    if phase == 'write':
+        run_client.perform_bulk_write(client, warmup, value_size, generator)
+    else:
+        _, _, _, _, keys, _ = run_client.perform_bulk_write(client, num_operations, value_size, generator, batch_size=16)
+        run_client.perform_bulk_read(client, keys[:warmup])
+
+    wire_start = loopback_bytes()
+    start_time = time.perf_counter()
+    if phase == 'write':
+        success, failure, _, _, _, metrics = run_client.perform_bulk_write(client, num_operations, value_size, generator)
+        latency_histogram = metrics["histogram"]
+    elif phase == 'read':
+        success, failure, _, metrics = run_client.perform_bulk_read(client, keys)
+        latency_histogram = metrics["histogram"]
+    elif phase == 'mixed':
+        success, failure, _, metrics = run_client.perform_mixed_workload(client, num_operations, value_size, list(keys), generator)
+        latency_histogram = metrics["histogram"]
+    else:
+        success, failure, latency_histogram = run_prefix_queries(client, keys, max(1, num_operations // 10), generator)
+    elapsed = time.perf_counter() - start_time
+    wire_end = loopback_bytes()
+    wire_bytes = wire_end - wire_start if wire_start is not None and wire_end is not None else None
+    return success, failure, elapsed, latency_histogram, wire_bytes
+
+
+def measure_cell(args, phase, value_size, compression='none'):
+    """
+    Mide una fase con un tamaño de valor: arranca un servidor sobre un ./db vacío en un
+    directorio temporal, ejecuta la fase, lee RSS y bytes en disco, y lo detiene. Con
+    compression, cliente y servidor comprimen los mensajes desde args.compression_threshold.
+    """
+    num_operations = operations_for_size(args.num_operations, value_size, args.max_mb)
+    with tempfile.TemporaryDirectory(prefix='bench_suite_') as work_dir:
+        extra_args = shlex.split(args.server_args) + compression_args(args.server, compression, args.compression_threshold)
+        command = server_command(args.server, args.port, args.server_bin, extra_args)
+        process = start_server(command, work_dir, args.port)
+        # La salida de las fases (progreso, fallos) solo se muestra con --verbose
+        quiet = contextlib.redirect_stdout(sys.stdout if args.verbose else io.StringIO())
+        with quiet:
+            client = lbclient.KeyValueClient(f'localhost:{args.port}', compression=compression,
+                                             compression_threshold=args.compression_threshold)
+        try:
+            with quiet:
+                success, failure, elapsed, latency_histogram, wire_bytes = run_phase(client, phase, num_operations, value_size, min(args.warmup, num_operations), args.seed, args.values)
+            rss = read_rss_bytes(process.pid)
+            on_disk = disk_bytes(os.path.join(work_dir, 'db'))
+        finally:
+            with quiet:
+                client.close()
+            stop_server(process)
+
+    # Bytes de valores que la fase movió (prefix no tiene un tamaño de respuesta fijo)
+    payload_bytes = success * value_size if phase != 'prefix' else None
+    return {
+        "phase": phase,
+        "value_size": value_size,
+        "compression": compression,
+        "operations": success + failure,
+        "success": success,
+        "failure": failure,
+        "elapsed_seconds": elapsed,
+        "ops_per_sec": (success + failure) / elapsed if elapsed > 0 else 0,
+        "mb_per_sec": (success + failure) * value_size / elapsed / (1024 * 1024) if elapsed > 0 and phase != 'prefix' else None,
+        **latency_histogram.summary(),
+        "server_rss_bytes": rss,
+        "disk_bytes": on_disk,
+        "wire_bytes": wire_bytes,
+        "wire_ratio": payload_bytes / wire_bytes if payload_bytes and wire_bytes else None,
+    }
+
+
+def result_key(result):
+    # Las celdas sin compresión conservan la clave de las líneas base anteriores
+    compression = result.get('compression', 'none')
+    return f"{result['phase']}_{result['value_size']}B" + ("" if compression == 'none' else f"_{compression}")
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Compara los resultados con los de una ejecución anterior. Una celda es una regresión
+    si su throughput cae más de tolerance o su p99 sube más de tolerance.
+
+    Returns:
+        list: (celda, métrica, valor base, valor actual) de cada regresión.
+    """
+    baseline_by_key = {result_key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        base = baseline_by_key.get(result_key(result))
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append((result_key(result), "ops_per_sec", base["ops_per_sec"], result["ops_per_sec"]))
+        if result["p99_latency_ms"] > base["p99_latency_ms"] * (1 + tolerance):
+            regressions.append((result_key(result), "p99_latency_ms", base["p99_latency_ms"], result["p99_latency_ms"]))
+    return regressions
+
+
+def format_mb(value):
+    return "N/D" if value is None else f"{value / (1024 * 1024):.1f}MB"
+
+
+def print_results(results):
+    print(f"\n{'Fase':<8} {'Tamaño':>8} {'Compr.':>7} {'Ops':>6} {'ops/s':>10} {'MB/s':>8} {'p50':>9} {'p99':>9} {'p99.9':>9} "
+          f"{'RSS':>9} {'Disco':>9} {'Red':>9} {'Ratio':>6} {'Fallos':>7}")
+    for r in results:
+        mb_per_sec = "-" if r["mb_per_sec"] is None else f"{r['mb_per_sec']:.1f}"
+        ratio = "-" if r.get("wire_ratio") is None else f"{r['wire_ratio']:.2f}"
+        print(f"{r['phase']:<8} {r['value_size']:>8} {r.get('compression', 'none'):>7} {r['operations']:>6} {r['ops_per_sec']:>10.2f} {mb_per_sec:>8} "
+              f"{r['p50_latency_ms']:>7.2f}ms {r['p99_latency_ms']:>7.2f}ms {r['p99.9_latency_ms']:>7.2f}ms "
+              f"{format_mb(r['server_rss_bytes']):>9} {format_mb(r['disk_bytes']):>9} {format_mb(r.get('wire_bytes')):>9} {ratio:>6} {r['failure']:>7}")
+
+
+def print_compression_tradeoff(results):
+    """
+    Compara cada celda comprimida con la misma celda sin compresión: bytes en la red,
+    throughput y p99. Solo hay comparación si la suite midió también 'none'.
+    """
+    uncompressed = {(r['phase'], r['value_size']): r for r in results if r['compression'] == 'none'}
+    rows = [(r, uncompressed.get((r['phase'], r['value_size']))) for r in results if r['compression'] != 'none']
+    rows = [(r, base) for r, base in rows if base is not None]
+    if not rows:
+        return
+    print(f"\n{'Fase':<8} {'Tamaño':>8} {'Compr.':>7} {'Red':>8} {'ops/s':>8} {'p99':>8}   (frente a sin compresión)")
+    for r, base in rows:
+        wire = "-" if not r['wire_bytes'] or not base['wire_bytes'] else f"x{base['wire_bytes'] / r['wire_bytes']:.2f}"
+        throughput = r['ops_per_sec'] / base['ops_per_sec'] - 1 if base['ops_per_sec'] else 0
+        p99 = r['p99_latency_ms'] / base['p99_latency_ms'] - 1 if base['p99_latency_ms'] else 0
+        print(f"{r['phase']:<8} {r['value_size']:>8} {r['compression']:>7} {wire:>8} {throughput:>+8.0%} {p99:>+8.0%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks: cada fase con cada clase de tamaño sobre un servidor recién arrancado")
+    parser.add_argument('--server', choices=['go', 'python'], default='go', help='Servidor a medir (por defecto: go)')
+    parser.add_argument('--server_bin', default=DEFAULT_GO_SERVER, help='Ejecutable del servidor Go (por defecto: server.exe en la raíz del repositorio)')
+    parser.add_argument('--server_args', default='', help='Argumentos adicionales del servidor, p. ej. "-durabilidad batch"')
+    parser.add_argument('--port', type=int, default=5060, help='Puerto de los servidores de la suite (por defecto: 5060)')
+    parser.add_argument('--phases', default=','.join(PHASES), help=f"Fases separadas por comas (por defecto: {','.join(PHASES)})")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in run_client.VALUE_SIZES), help='Tamaños de valor en bytes separados por comas (por defecto: las 5 clases de tamaño)')
+    parser.add_argument('--num_operations', type=int, default=1000, help='Operaciones medidas por fase (por defecto: 1000; la fase prefix hace la décima parte en recorridos)')
+    parser.add_argument('--max_mb', type=float, default=256, help='Máximo de MB escritos por fase; limita las operaciones de los tamaños grandes (por defecto: 256)')
+    parser.add_argument('--warmup', type=int, default=50, help='Operaciones de calentamiento sin medir por fase (por defecto: 50)')
+    parser.add_argument('--seed', type=int, default=1, help='Semilla de claves y valores (por defecto: 1)')
+    parser.add_argument('--values', choices=utils.VALUE_KINDS, default='random', help='Tipo de valor: caracteres aleatorios o nombres de clientes, más compresibles (por defecto: random)')
+    parser.add_argument('--compression', default='none', help=f"Compresión de los mensajes separada por comas, p. ej. none,gzip para comparar cada celda con y sin ella (opciones: none, {', '.join(lbclient.COMPRESSION_ALGORITHMS)}; por defecto: none)")
+    parser.add_argument('--compression_threshold', type=int, default=lbclient.DEFAULT_COMPRESSION_THRESHOLD, help='Bytes a partir de los cuales se comprime un mensaje (por defecto: 64KB)')
+    parser.add_argument('--output', default='bench_results.json', help='Archivo JSON de resultados (por defecto: bench_results.json)')
+    parser.add_argument('--baseline', help='Resultados de una ejecución anterior con los que comparar; con regresiones el código de salida es 1')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='Variación tolerada frente a la línea base (por defecto: 0.10)')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar la salida detallada de cada fase')
+    args = parser.parse_args(argv)
+
+    phases = [phase.strip() for phase in args.phases.split(',') if phase.strip()]
+    unknown = set(phases) - set(PHASES)
+    if unknown:
+        parser.error(f"fases desconocidas: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    compressions = [name.strip() for name in args.compression.split(',') if name.strip()]
+    unknown = set(compressions) - {'none', *lbclient.COMPRESSION_ALGORITHMS}
+    if unknown:
+        parser.error(f"algoritmos de compresión desconocidos: {', '.join(sorted(unknown))}")
+    if args.server == 'go' and not os.path.exists(args.server_bin):
+        parser.error(f"no existe el ejecutable del servidor Go {args.server_bin} (compílelo con make o use --server python)")
+
+    results = []
+    for value_size in sizes:
+        for phase in phases:
+            for compression in compressions:
+                print(f"Midiendo la fase '{phase}' con valores de {value_size} B (compresión: {compression})...")
+                results.append(measure_cell(args, phase, value_size, compression))
+
+    print_results(results)
+    print_compression_tradeoff(results)
+    report = {
+        "meta": {
+            "server": args.server,
+            "server_args": args.server_args,
+            "num_operations": args.num_operations,
+            "max_mb": args.max_mb,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "values": args.values,
+            "compression_threshold": args.compression_threshold,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados guardados en: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if not regressions:
+            print(f"Sin regresiones frente a {args.baseline} (tolerancia {args.tolerance:.0%}).")
+            return 0
+        print(f"Regresiones frente a {args.baseline} (tolerancia {args.tolerance:.0%}):")
+        for cell, metric, base, current in regressions:
+            print(f"  - {cell}: {metric} {base:.2f} -> {current:.2f}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
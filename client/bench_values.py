@@ -0,0 +1,104 @@
+import argparse
+import contextlib
+import io
+import os
+import shlex
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import lbclient
+import utils
+from bench_suite import DEFAULT_GO_SERVER, server_command, start_server, stop_server
+
+# Tamaño de valor por defecto: el de la clase más grande, donde más pesan las copias
+DEFAULT_VALUE_SIZE = 4 * 1024 * 1024
+
+
+def run_phase(client, operation, keys, generator, value_size, as_bytes):
+    """
+    Ejecuta una operación (set o get) sobre cada clave por el camino de cadenas o el de
+    bytes, midiendo el tiempo real, el tiempo de CPU del cliente y el pico de memoria
+    reservada por Python (tracemalloc) durante la fase.
+
+    Returns:
+        dict: Fallos, segundos, CPU por operación y pico de memoria en bytes.
+    """
+    failures = 0
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for key in keys:
+        if operation == 'set':
+            value = generator.value_bytes(value_size) if as_bytes else generator.value(value_size)
+            status, _ = client.set(key, value)
+        else:
+            status, value = client.get(key, as_bytes=as_bytes)
+            status = status and len(value) == value_size
+        if not status:
+            failures += 1
+        del value # El pico no debe incluir el valor de la operación anterior
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "failures": failures,
+        "seconds": elapsed,
+        "cpu_ms_per_op": cpu * 1000 / len(keys),
+        "peak_bytes": peak,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara el camino de cadenas (valor) y el de bytes (valor_binario) en set/get de valores grandes")
+    parser.add_argument('--server', choices=['go', 'python'], default='go', help='Servidor a medir (por defecto: go)')
+    parser.add_argument('--server_bin', default=DEFAULT_GO_SERVER, help='Ejecutable del servidor Go (por defecto: server.exe en la raíz del repositorio)')
+    parser.add_argument('--server_args', default='', help='Argumentos adicionales del servidor, p. ej. "-durabilidad batch"')
+    parser.add_argument('--port', type=int, default=5071, help='Puerto del servidor (por defecto: 5071)')
+    parser.add_argument('--operations', type=int, default=50, help='Operaciones por fase (por defecto: 50)')
+    parser.add_argument('--value_size', type=int, default=DEFAULT_VALUE_SIZE, help='Tamaño de los valores en bytes (por defecto: 4MB)')
+    parser.add_argument('--seed', type=int, default=1, help='Semilla de claves y valores (por defecto: 1)')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar la salida del cliente')
+    args = parser.parse_args(argv)
+
+    if args.server == 'go' and not os.path.exists(args.server_bin):
+        parser.error(f"no existe el ejecutable del servidor Go {args.server_bin} (compílelo con make o use --server python)")
+
+    generator = utils.ValueGenerator(args.seed)
+    generator.value_bytes(args.value_size) # Codifica el pool antes de medir
+    quiet = contextlib.redirect_stdout(sys.stdout if args.verbose else io.StringIO())
+    command = server_command(args.server, args.port, args.server_bin, shlex.split(args.server_args))
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix='bench_values_') as work_dir:
+        process = start_server(command, work_dir, args.port)
+        with quiet:
+            # Sin caché (por defecto), así que cada get pasa por el servidor
+            client = lbclient.KeyValueClient(f'localhost:{args.port}')
+        try:
+            for path, as_bytes in (('str', False), ('bytes', True)):
+                keys = [generator.key() for _ in range(args.operations)]
+                for operation in ('set', 'get'):
+                    with quiet:
+                        result = run_phase(client, operation, keys, generator, args.value_size, as_bytes)
+                    results.append((path, operation, result))
+        finally:
+            with quiet:
+                client.close()
+            stop_server(process)
+
+    mb = args.value_size / (1024 * 1024)
+    print(f"Valores de {mb:.2f}MB, {args.operations} operaciones por fase")
+    print(f"{'Camino':>7} {'Op.':>4} {'ops/s':>8} {'MB/s':>8} {'CPU ms/op':>10} {'Pico mem.':>10} {'Fallos':>7}")
+    for path, operation, result in results:
+        done = args.operations - result['failures']
+        print(f"{path:>7} {operation:>4} {done / result['seconds']:>8.1f} {done * mb / result['seconds']:>8.1f} "
+              f"{result['cpu_ms_per_op']:>10.2f} {result['peak_bytes'] / (1024 * 1024):>8.1f}MB {result['failures']:>7}")
+    return 1 if any(result['failures'] for _, _, result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,484 @@
+import base64
+import collections
+import csv
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+import keycodec
+
+# Formatos de import/export: CSV (clave,valor), JSON Lines y un directorio con un archivo por valor
+FORMATS = ('csv', 'jsonl', 'dir')
+EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'jsonl'}
+
+# Mayor valor que acepta el servidor
+MAX_VALUE_BYTES = 4 * 1024 * 1024
+
+# Escritores concurrentes y ventana de bytes en vuelo por defecto del import. La ventana
+# acota la memoria: como mucho caben en ella 16 valores de 4MB leídos y aún sin confirmar.
+DEFAULT_WRITERS = 8
+DEFAULT_WINDOW_BYTES = 64 * 1024 * 1024
+# Registros en vuelo por escritor: con valores pequeños el tope lo pone esta cuenta y no la
+# ventana de bytes
+RECORDS_PER_WRITER = 4
+
+# Intervalo entre guardados del checkpoint y entre líneas de progreso
+CHECKPOINT_INTERVAL_S = 2.0
+
+# Prefijo del nombre de archivo de una clave binaria en el formato dir, seguido de su
+# hexadecimal. quote() escapa '@', así que ningún nombre de una clave de texto empieza por él.
+BINARY_FILE_PREFIX = '@'
+
+# Encabezados de CSV que se reconocen y se saltan
+CSV_HEADERS = (['key', 'value'], ['clave', 'valor'])
+
+# Registro leído de la fuente del import. value es bytes, salvo en el formato dir, donde el
+# escritor lee el archivo path; error explica por qué el registro no se puede importar.
+Record = collections.namedtuple('Record', ['key', 'value', 'size', 'path', 'error'], defaults=(None, None, 0, None, None))
+
+
+def detect_format(path):
+    """
+    Devuelve el formato de path: 'dir' si es un directorio (o no tiene extensión) y si no
+    el de su extensión.
+
+    Raises:
+        ValueError: Si la extensión no es de un formato conocido.
+    """
+    if os.path.isdir(path):
+        return 'dir'
+    extension = os.path.splitext(path)[1].lower()
+    if not extension:
+        return 'dir'
+    if extension not in EXTENSIONS:
+        raise ValueError(f"no se reconoce el formato de {path} (use --format {'/'.join(FORMATS)})")
+    return EXTENSIONS[extension]
+
+
+def _record_key(text=None, hex_key=None):
+    """Devuelve la clave de un registro: una keycodec.Key si viene en hexadecimal."""
+    if hex_key is not None:
+        return keycodec.Key.from_hex(hex_key)
+    return text
+
+
+def _value_record(key, value):
+    if len(value) > MAX_VALUE_BYTES:
+        return Record(key, error=f"el valor de la clave {key} mide {len(value)} bytes (máximo 4MB)")
+    return Record(key, value, len(value))
+
+
+def read_csv(path):
+    """
+    Lee registros (clave, valor) de un CSV, en streaming. Una primera fila 'key,value' o
+    'clave,valor' se salta. Los valores se codifican a UTF-8 una sola vez y se envían como
+    bytes (ver KeyValueClient.set), así que se guardan tal cual.
+    """
+    csv.field_size_limit(max(csv.field_size_limit(), 2 * MAX_VALUE_BYTES))
+    with open(path, newline='', encoding='utf-8') as f:
+        for row_number, row in enumerate(csv.reader(f), start=1):
+            if row_number == 1 and [column.strip().lower() for column in row] in CSV_HEADERS:
+                continue
+            if len(row) != 2 or not row[0]:
+                yield Record(error=f"fila {row_number}: se esperaban 2 columnas (clave, valor) y hay {len(row)}")
+                continue
+            yield _value_record(row[0], row[1].encode('utf-8'))
+
+
+def read_jsonl(path):
+    """
+    Lee registros de un archivo JSON Lines, en streaming. Cada línea es un objeto con la
+    clave en "key" (o "key_hex" para una clave binaria) y el valor en "value" (o
+    "value_b64" para un valor binario en base64), como los escribe export_records.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                key = _record_key(item.get('key'), item.get('key_hex'))
+                value = base64.b64decode(item['value_b64']) if 'value_b64' in item else item['value'].encode('utf-8')
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                yield Record(error=f"línea {line_number}: registro inválido ({e})")
+                continue
+            if not key:
+                yield Record(error=f"línea {line_number}: falta la clave")
+                continue
+            yield _value_record(key, value)
+
+
+def read_directory(path):
+    """
+    Lee un registro por archivo de path, en orden de nombre. La clave es el nombre del
+    archivo sin el escape de export_records (urllib.parse.unquote), o la clave binaria de un
+    nombre que empieza por BINARY_FILE_PREFIX. El contenido no se lee aquí sino en el
+    escritor, después de reservar su lugar en la ventana.
+    """
+    entries = sorted((entry for entry in os.scandir(path) if entry.is_file()), key=lambda entry: entry.name)
+    for entry in entries:
+        try:
+            if entry.name.startswith(BINARY_FILE_PREFIX):
+                key = _record_key(hex_key=entry.name[len(BINARY_FILE_PREFIX):])
+            else:
+                key = urllib.parse.unquote(entry.name)
+        except ValueError as e:
+            yield Record(error=f"{entry.name}: clave binaria inválida ({e})")
+            continue
+        size = entry.stat().st_size
+        if size > MAX_VALUE_BYTES:
+            yield Record(key, error=f"{entry.name} mide {size} bytes (máximo 4MB)")
+            continue
+        yield Record(key, size=size, path=entry.path)
+
+
+def read_records(path, fmt):
+    """Devuelve el generador de registros de path según su formato."""
+    readers = {'csv': read_csv, 'jsonl': read_jsonl, 'dir': read_directory}
+    return readers[fmt](path)
+
+
+def default_checkpoint_path(path, action):
+    """Devuelve el checkpoint por defecto de un import o export de path: '<path>.<action>.ckpt'."""
+    return f"{os.path.normpath(path)}.{action}.ckpt"
+
+
+def load_checkpoint(checkpoint_path, source):
+    """
+    Devuelve el estado guardado en checkpoint_path si corresponde a source (la ruta
+    absoluta de la fuente o destino), o None si no hay checkpoint o es de otra fuente.
+    """
+    try:
+        with open(checkpoint_path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get('source') == source else None
+
+
+def save_checkpoint(checkpoint_path, state):
+    """Guarda state en checkpoint_path de forma atómica (archivo temporal y os.replace)."""
+    temp_path = checkpoint_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, checkpoint_path)
+
+
+def remove_checkpoint(checkpoint_path):
+    try:
+        os.remove(checkpoint_path)
+    except FileNotFoundError:
+        pass
+
+
+class ByteWindow:
+    """
+    Ventana de bytes y registros en vuelo: acquire bloquea al lector hasta que los
+    escritores confirman lo suficiente. Un registro mayor que toda la ventana entra solo,
+    cuando no queda nada en vuelo.
+    """
+    def __init__(self, max_bytes, max_records):
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.bytes = 0
+        self.records = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size):
+        with self._condition:
+            self._condition.wait_for(lambda: self.records == 0 or
+                                     (self.records < self.max_records and self.bytes + size <= self.max_bytes))
+            self.bytes += size
+            self.records += 1
+
+    def release(self, size):
+        with self._condition:
+            self.bytes -= size
+            self.records -= 1
+            self._condition.notify_all()
+
+
+class Watermark:
+    """
+    Posición hasta la que todos los registros están confirmados. Los escritores terminan
+    fuera de orden; la marca solo avanza sobre un tramo continuo de registros confirmados,
+    así que reanudar desde ella no se salta ninguno (los ya escritos después de la marca
+    se vuelven a escribir, y set es idempotente).
+    """
+    def __init__(self, position):
+        self.position = position
+        self._done = set()
+        self._lock = threading.Lock()
+
+    def done(self, index):
+        with self._lock:
+            self._done.add(index)
+            while self.position in self._done:
+                self._done.discard(self.position)
+                self.position += 1
+
+
+def _rate_line(records, size, elapsed):
+    mb = size / (1024 * 1024)
+    return (f"{records} registros, {mb:.2f} MB en {elapsed:.1f}s "
+            f"({mb / elapsed if elapsed > 0 else 0:.2f} MB/s, {records / elapsed if elapsed > 0 else 0:.1f} registros/s)")
+
+
+def import_records(client, path, fmt=None, writers=DEFAULT_WRITERS, window_bytes=DEFAULT_WINDOW_BYTES, checkpoint_path=None):
+    """
+    Importa los registros de path (CSV, JSON Lines o un directorio de archivos de valor) con
+    writers escritores concurrentes.
+
+    Los registros se leen en streaming y cada uno reserva su tamaño en una ventana de
+    window_bytes antes de leerse (formato dir) o enviarse, así que la memoria queda acotada
+    aunque los valores sean de 4MB. Cada CHECKPOINT_INTERVAL_S se guarda en checkpoint_path
+    hasta qué registro está todo confirmado. Si el import falla, volver a ejecutarlo reanuda
+    desde ahí; al terminar sin fallos el checkpoint se borra. Los registros inválidos (mal
+    formados o de más de 4MB) se saltan y se informan.
+
+    Args:
+        client: KeyValueClient o ShardedKeyValueClient.
+        path (str): Archivo o directorio de origen.
+        fmt (str, opcional): Formato de FORMATS; por defecto se deduce de path.
+        writers (int): Escrituras simultáneas.
+        window_bytes (int): Bytes de valores en vuelo como máximo.
+        checkpoint_path (str, opcional): Archivo de checkpoint (por defecto '<path>.import.ckpt').
+
+    Returns:
+        dict: Registros y bytes importados en esta ejecución, saltados, fallos, segundos,
+              posición reanudada y throughput (MB/s y registros/s).
+    """
+    fmt = fmt or detect_format(path)
+    checkpoint_path = checkpoint_path or default_checkpoint_path(path, 'import')
+    source = os.path.abspath(path)
+    state = load_checkpoint(checkpoint_path, source) or {"source": source, "format": fmt, "position": 0, "skipped": 0}
+    resumed_from = state["position"]
+    if resumed_from:
+        print(f"Reanudando el import desde el registro {resumed_from} (checkpoint {checkpoint_path})")
+
+    window = ByteWindow(window_bytes, writers * RECORDS_PER_WRITER)
+    watermark = Watermark(resumed_from)
+    stop = threading.Event()
+    failures = []
+    totals = {"records": 0, "bytes": 0}
+    totals_lock = threading.Lock()
+
+    def write(index, record):
+        try:
+            value = record.value
+            if record.path is not None:
+                with open(record.path, 'rb') as f:
+                    value = f.read()
+            status, message = client.set(record.key, value)
+        except OSError as e:
+            status, message = False, str(e)
+        finally:
+            window.release(record.size)
+        if not status:
+            failures.append(f"Registro {index} (clave {record.key}): {message}")
+            stop.set() # No se leen más registros: se reanuda desde la marca
+            return
+        with totals_lock:
+            totals["records"] += 1
+            totals["bytes"] += record.size
+        watermark.done(index)
+
+    def checkpoint():
+        state["position"] = watermark.position
+        save_checkpoint(checkpoint_path, state)
+
+    start = time.perf_counter()
+    last_report = start
+    with ThreadPoolExecutor(max_workers=writers) as executor:
+        try:
+            for index, record in enumerate(read_records(path, fmt)):
+                if index < resumed_from:
+                    continue
+                if stop.is_set():
+                    break
+                if record.error:
+                    print(f"Advertencia: se salta el registro {index}: {record.error}")
+                    state["skipped"] += 1
+                    watermark.done(index)
+                    continue
+                window.acquire(record.size)
+                executor.submit(write, index, record)
+
+                now = time.perf_counter()
+                if now - last_report >= CHECKPOINT_INTERVAL_S:
+                    last_report = now
+                    checkpoint()
+                    with totals_lock:
+                        print(f"  Importados: {_rate_line(totals['records'], totals['bytes'], now - start)}")
+        finally:
+            executor.shutdown(wait=True)
+            elapsed = time.perf_counter() - start
+            checkpoint()
+
+    if not failures:
+        remove_checkpoint(checkpoint_path)
+    return {
+        "records": totals["records"],
+        "bytes": totals["bytes"],
+        "skipped": state["skipped"],
+        "failures": failures,
+        "resumed_from": resumed_from,
+        "position": watermark.position,
+        "checkpoint": checkpoint_path,
+        "elapsed_seconds": elapsed,
+        "mb_per_sec": totals["bytes"] / (1024 * 1024) / elapsed if elapsed > 0 else 0,
+        "records_per_sec": totals["records"] / elapsed if elapsed > 0 else 0,
+    }
+
+
+def _raw_key(obj):
+    """Bytes de la clave de un objeto, en el orden en que el servidor recorre las claves."""
+    return keycodec.index_key(obj.clave, obj.clave_binaria)
+
+
+class _Writer:
+    """Escribe los objetos exportados en un archivo CSV o JSON Lines, o en un directorio."""
+    def __init__(self, path, fmt, resume_bytes=None):
+        self.path = path
+        self.fmt = fmt
+        self.file = None
+        if fmt == 'dir':
+            os.makedirs(path, exist_ok=True)
+            return
+        # Al reanudar se descarta lo escrito después del último checkpoint
+        self.file = open(path, 'r+' if resume_bytes is not None else 'w', newline='', encoding='utf-8')
+        if resume_bytes is not None:
+            self.file.truncate(resume_bytes)
+            self.file.seek(resume_bytes)
+        if fmt == 'csv':
+            self.csv = csv.writer(self.file)
+            if resume_bytes is None:
+                self.csv.writerow(CSV_HEADERS[0])
+
+    def write(self, obj):
+        """Escribe obj y devuelve los bytes de su valor, o None si el formato no lo admite."""
+        value = obj.valor_binario or obj.valor
+        if self.fmt == 'dir':
+            name = (BINARY_FILE_PREFIX + obj.clave_binaria.hex()) if obj.clave_binaria else urllib.parse.quote(obj.clave, safe='')
+            data = value if isinstance(value, bytes) else value.encode('utf-8')
+            with open(os.path.join(self.path, name), 'wb') as f:
+                f.write(data)
+            return len(data)
+        if self.fmt == 'csv':
+            if obj.clave_binaria or obj.valor_binario:
+                return None # CSV solo guarda texto: las claves y valores binarios requieren jsonl o dir
+            self.csv.writerow([obj.clave, obj.valor])
+            return len(obj.valor.encode('utf-8'))
+        item = {"key_hex": obj.clave_binaria.hex()} if obj.clave_binaria else {"key": obj.clave}
+        if obj.valor_binario:
+            item["value_b64"] = base64.b64encode(obj.valor_binario).decode('ascii')
+        else:
+            item["value"] = obj.valor
+        self.file.write(json.dumps(item, ensure_ascii=False) + '\n')
+        return len(value) if isinstance(value, bytes) else len(value.encode('utf-8'))
+
+    def sync(self):
+        """Lleva lo escrito al disco y devuelve el tamaño del archivo (None en el formato dir)."""
+        if self.file is None:
+            return None
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return os.fstat(self.file.fileno()).st_size
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+def export_records(client, path, fmt=None, prefix='', checkpoint_path=None):
+    """
+    Exporta las claves con el prefijo (todas, por defecto) a path con un recorrido por
+    prefijo en streaming (iter_prefix), en orden de clave y sin reunir el resultado en
+    memoria.
+
+    El formato de salida es el que lee import_records: CSV (solo claves y valores de
+    texto; los binarios se saltan), JSON Lines (key/key_hex y value/value_b64) o un
+    directorio con un archivo por clave. Cada CHECKPOINT_INTERVAL_S la salida se sincroniza
+    y se guarda la última clave escrita en checkpoint_path; si el recorrido se corta,
+    volver a ejecutar el export descarta lo escrito después y sigue desde esa clave.
+
+    Args:
+        client: KeyValueClient o ShardedKeyValueClient.
+        path (str): Archivo o directorio de destino.
+        fmt (str, opcional): Formato de FORMATS; por defecto se deduce de path.
+        prefix (str): Prefijo de las claves a exportar.
+        checkpoint_path (str, opcional): Archivo de checkpoint (por defecto '<path>.export.ckpt').
+
+    Returns:
+        dict: Registros y bytes exportados en esta ejecución, saltados, error (None si
+              terminó), segundos y throughput (MB/s y registros/s).
+    """
+    fmt = fmt or detect_format(path)
+    checkpoint_path = checkpoint_path or default_checkpoint_path(path, 'export')
+    source = os.path.abspath(path)
+    state = load_checkpoint(checkpoint_path, source)
+    if state is not None and state.get('prefix') != prefix:
+        state = None
+    if state is None:
+        state = {"source": source, "format": fmt, "prefix": prefix, "cursor": '', "last_key_hex": None, "output_bytes": None}
+    else:
+        print(f"Reanudando el export después de la clave {state['last_key_hex']} (checkpoint {checkpoint_path})")
+    # El servidor solo admite cursores de texto válidos: si la última clave es binaria se
+    # reanuda desde la última de texto y el resto hasta last_key se descarta aquí
+    last_key = bytes.fromhex(state["last_key_hex"]) if state["last_key_hex"] else None
+
+    writer = _Writer(path, fmt, state["output_bytes"])
+    records = size = skipped = 0
+    error = None
+
+    def checkpoint():
+        state["output_bytes"] = writer.sync()
+        save_checkpoint(checkpoint_path, state)
+
+    start = time.perf_counter()
+    last_report = start
+    try:
+        for obj in client.iter_prefix(prefix, cursor=state["cursor"], as_bytes=fmt == 'dir'):
+            raw_key = _raw_key(obj)
+            if last_key is not None and raw_key <= last_key:
+                continue
+            written = writer.write(obj)
+            if written is None:
+                skipped += 1
+            else:
+                records += 1
+                size += written
+            state["last_key_hex"] = raw_key.hex()
+            if not obj.clave_binaria:
+                state["cursor"] = obj.clave
+
+            now = time.perf_counter()
+            if now - last_report >= CHECKPOINT_INTERVAL_S:
+                last_report = now
+                checkpoint()
+                print(f"  Exportados: {_rate_line(records, size, now - start)}")
+    except grpc.RpcError as e:
+        error = f"{e.code().name}: {e.details()}"
+    finally:
+        elapsed = time.perf_counter() - start
+        checkpoint()
+        writer.close()
+
+    if error is None:
+        remove_checkpoint(checkpoint_path)
+    return {
+        "records": records,
+        "bytes": size,
+        "skipped": skipped,
+        "error": error,
+        "checkpoint": checkpoint_path,
+        "elapsed_seconds": elapsed,
+        "mb_per_sec": size / (1024 * 1024) / elapsed if elapsed > 0 else 0,
+        "records_per_sec": records / elapsed if elapsed > 0 else 0,
+    }
@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+
+
+class ReadCache:
+    """
+    Caché de lecturas del lado del cliente, acotada por bytes y no por número de entradas.
+
+    La expulsión es LRU: al superar max_bytes se descartan las entradas usadas hace más
+    tiempo. Un valor más grande que max_bytes nunca se guarda, así que unos pocos valores
+    de 4MB no pueden desbordar la memoria. Con ttl_seconds las entradas caducan, lo que
+    acota el tiempo que se puede servir un valor modificado por otro cliente.
+    """
+    def __init__(self, max_bytes, ttl_seconds=None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict() # clave -> (valor, tamaño, instante de expiración)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def get(self, key):
+        """
+        Devuelve el valor en caché para key, o None si no está o ha caducado.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, size, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._remove(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.bytes_saved += size
+        return value
+
+    def put(self, key, value):
+        """
+        Guarda value para key (write-through) y expulsa entradas LRU hasta respetar max_bytes.
+        """
+        self._remove(key)
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self.entries[key] = (value, size, expires_at)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            oldest_key = next(iter(self.entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        """Descarta la entrada de key, si existe."""
+        self._remove(key)
+
+    def clear(self):
+        """Descarta todas las entradas (p. ej. tras resetDb)."""
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        """
+        Devuelve los contadores de la caché.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+            "entries": len(self.entries),
+            "current_bytes": self.current_bytes,
+        }
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
@@ -0,0 +1,135 @@
+import itertools
+import threading
+import time
+
+import grpc
+import conexion_pb2_grpc as pb_grpc
+import rawvalues
+
+# Tamaño de carga a partir del cual una petición va a los canales dedicados a valores grandes
+LARGE_VALUE_THRESHOLD = 512 * 1024
+
+# Tiempo que un canal puede seguir en TRANSIENT_FAILURE antes de que el pool lo reemplace por
+# uno nuevo, que se conecta sin esperar el backoff acumulado del anterior
+RECONNECT_AFTER_S = 5.0
+
+# Estados en los que un canal no se elige mientras haya otro sano en su grupo
+UNHEALTHY_STATES = (grpc.ChannelConnectivity.TRANSIENT_FAILURE, grpc.ChannelConnectivity.SHUTDOWN)
+
+
+class ChannelPool:
+    """
+    Pool de canales gRPC hacia un servidor, cada uno con su propia conexión HTTP/2.
+
+    Con un único canal, unos pocos set de 4MB en vuelo ocupan la ventana de control de
+    flujo de la conexión y las peticiones pequeñas esperan detrás de ellos. El pool reparte
+    las peticiones pequeñas en round-robin entre size canales y, si large_channels > 0,
+    envía las de más de large_threshold bytes (y las respuestas potencialmente grandes:
+    multiGet y recorridos con valores) por canales propios.
+
+    Cada canal se vigila con subscribe(): mientras haya otro sano en su grupo, un canal
+    caído no se elige, y si sigue caído más de RECONNECT_AFTER_S se reemplaza.
+    """
+    def __init__(self, address, size=1, large_channels=0, large_threshold=LARGE_VALUE_THRESHOLD, options=()):
+        """
+        Args:
+            address (str): Dirección del servidor gRPC.
+            size (int): Canales para las peticiones pequeñas.
+            large_channels (int): Canales dedicados a las peticiones grandes (0 = no hay).
+            large_threshold (int): Bytes de carga a partir de los cuales una petición es grande.
+            options (list): Opciones de canal (tamaño de mensaje, ventanas, keepalive...).
+        """
+        self.address = address
+        self.large_threshold = large_threshold
+        # Con el pool de subcanales local cada canal abre su propia conexión; con el global,
+        # canales con las mismas opciones compartirían una
+        self.options = list(options) + [('grpc.use_local_subchannel_pool', 1)]
+        # RLock: reemplazar un canal con el bloqueo tomado lo suscribe de nuevo
+        self._lock = threading.RLock()
+        self._channels = []
+        self._stubs = []
+        self._raw_stubs = []
+        self._states = []
+        self._failing_since = []
+        for _ in range(max(1, size) + large_channels):
+            self._channels.append(None)
+            self._stubs.append(None)
+            self._raw_stubs.append(None)
+            self._states.append(grpc.ChannelConnectivity.IDLE)
+            self._failing_since.append(None)
+            self._connect(len(self._channels) - 1)
+        self.small = list(range(max(1, size)))
+        self.large = list(range(max(1, size), len(self._channels)))
+        self._next = {"small": itertools.count(), "large": itertools.count()}
+        self.reconnections = 0
+
+    def _connect(self, index):
+        channel = grpc.insecure_channel(self.address, options=self.options)
+        self._channels[index] = channel
+        self._stubs[index] = pb_grpc.BDStub(channel)
+        self._raw_stubs[index] = rawvalues.RawStub(channel)
+        self._states[index] = grpc.ChannelConnectivity.IDLE
+        self._failing_since[index] = None
+        channel.subscribe(lambda state, index=index, channel=channel: self._on_state(index, channel, state), try_to_connect=True)
+
+    def _on_state(self, index, channel, state):
+        with self._lock:
+            if self._channels[index] is not channel:
+                return # Notificación de un canal ya reemplazado
+            self._states[index] = state
+            if state in UNHEALTHY_STATES:
+                if self._failing_since[index] is None:
+                    self._failing_since[index] = time.monotonic()
+            else:
+                self._failing_since[index] = None
+
+    def _healthy(self, index):
+        return self._states[index] not in UNHEALTHY_STATES
+
+    def _reconnect_if_stale(self, index):
+        """Reemplaza el canal index si lleva más de RECONNECT_AFTER_S caído. Con self._lock tomado."""
+        since = self._failing_since[index]
+        if since is None or time.monotonic() - since < RECONNECT_AFTER_S:
+            return
+        old = self._channels[index]
+        self._connect(index)
+        self.reconnections += 1
+        old.close()
+
+    def stub(self, payload_bytes=0, large_response=False, raw=False):
+        """
+        Devuelve el stub del siguiente canal para una petición.
+
+        Args:
+            payload_bytes (int): Bytes de carga de la petición (el valor en un set).
+            large_response (bool): Si la respuesta puede ser grande aunque la petición no lo sea.
+            raw (bool): Devolver el rawvalues.RawStub del canal (set/get de valores binarios).
+
+        Returns:
+            BDStub: El stub del primer canal sano en round-robin dentro de su grupo, o del
+                    siguiente en turno si ninguno está sano (la llamada fallará y se podrá
+                    reintentar).
+        """
+        is_large = self.large and (payload_bytes >= self.large_threshold or large_response)
+        group = self.large if is_large else self.small
+        start = next(self._next["large" if is_large else "small"])
+        stubs = self._raw_stubs if raw else self._stubs
+        with self._lock:
+            for offset in range(len(group)):
+                index = group[(start + offset) % len(group)]
+                if self._healthy(index):
+                    return stubs[index]
+            index = group[start % len(group)]
+            self._reconnect_if_stale(index)
+            return stubs[index]
+
+    def health(self):
+        """Devuelve el estado de conectividad de cada canal: {'small': [...], 'large': [...]}."""
+        with self._lock:
+            return {"small": [self._states[i].name for i in self.small],
+                    "large": [self._states[i].name for i in self.large]}
+
+    def close(self):
+        with self._lock:
+            for channel in self._channels:
+                channel.close()
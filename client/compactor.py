@@ -0,0 +1,194 @@
+import argparse
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+import dbreader
+
+# Tamaño del buffer de escritura secuencial de los archivos nuevos
+WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Marca que indica que el directorio temporal está completo y sincronizado en disco
+COMPLETE_MARKER = 'COMPACTACION_COMPLETA'
+
+# Archivos de datos que reescribe la compactación; el resto del directorio se copia tal cual
+DATA_FILES = ('keys.db', 'values.db')
+
+# WAL del servidor Go (RUTA_WAL): si no está vacío tiene escrituras que aún no llegaron a
+# keys.db y referencias a posiciones de values.db que la compactación cambiaría
+WAL_FILE = 'wal.log'
+
+
+def _fsync_dir(path):
+    """Sincroniza la entrada de directorio de path (no disponible en Windows)."""
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _temp_paths(db_dir):
+    db_dir = os.path.normpath(db_dir)
+    return db_dir + '.compactando', db_dir + '.anterior'
+
+
+def recover(db_dir):
+    """
+    Termina o descarta una compactación interrumpida.
+
+    La compactación escribe los archivos nuevos en '<db>.compactando', y luego renombra
+    '<db>' a '<db>.anterior' y '<db>.compactando' a '<db>'. Si el proceso se cortó entre
+    los dos renombrados, se completa el cambio; si se cortó antes de terminar los
+    archivos nuevos, se descartan y la base de datos original queda intacta.
+
+    Returns:
+        str: Descripción de lo que se hizo, o None si no había nada que recuperar.
+    """
+    new_dir, old_dir = _temp_paths(db_dir)
+    action = None
+    if not os.path.exists(db_dir) and os.path.exists(os.path.join(new_dir, COMPLETE_MARKER)):
+        os.rename(new_dir, db_dir)
+        action = "se completó el cambio de directorios de una compactación interrumpida"
+    elif os.path.exists(new_dir):
+        shutil.rmtree(new_dir)
+        action = "se descartó una compactación incompleta"
+    if os.path.exists(db_dir) and os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+        action = action or "se eliminó la copia anterior de una compactación terminada"
+    if action:
+        _fsync_dir(os.path.dirname(os.path.abspath(db_dir)))
+    return action
+
+
+def compact(db_dir='./db'):
+    """
+    Compacta keys.db y values.db de db_dir, que no debe estar en uso por el servidor.
+
+    Se copian solo los registros vigentes (la última aparición de cada clave), agrupados
+    por tamaño de bloque y en orden de clave, a archivos nuevos escritos secuencialmente
+    con un buffer grande; cada valor se copia desde el mapeo de values.db sin cargar el
+    resto en memoria. Los registros que apuntan fuera de values.db o con un tamaño de
+    bloque inválido se descartan. Los demás archivos del directorio se copian sin cambios.
+    Los archivos nuevos se sincronizan en disco antes de reemplazar el directorio, así que
+    un corte en cualquier punto deja la base original o la compactada (ver recover).
+
+    Returns:
+        dict: Tamaños antes y después, bytes recuperados, registros descartados y throughput.
+
+    Raises:
+        RuntimeError: Si el WAL del servidor no está vacío: hay que arrancar y detener el
+                      servidor para que lo reproduzca antes de compactar.
+    """
+    recover(db_dir)
+    wal_path = os.path.join(db_dir, WAL_FILE)
+    if os.path.exists(wal_path) and os.path.getsize(wal_path) > 0:
+        raise RuntimeError(f"{wal_path} tiene escrituras sin aplicar: arranque y detenga el servidor para reproducirlo antes de compactar")
+    new_dir, old_dir = _temp_paths(db_dir)
+    os.makedirs(new_dir)
+
+    start = time.perf_counter()
+    keys_before = os.path.getsize(os.path.join(db_dir, 'keys.db'))
+    with dbreader.StoreReader(db_dir) as reader:
+        values_before = reader.values_size
+        indices = reader.live_indices()
+        # El campo tam puede llevar además el largo del valor: se copia tal cual y los
+        # bloques se miden con block_sizes
+        live, blocks = reader.records[indices], reader.block_sizes[indices]
+        valid = np.isin(blocks, dbreader.SIZE_CLASSES)
+        valid &= (live['dir'] >= 0) & (live['dir'] + blocks <= values_before)
+        dropped = int(np.count_nonzero(~valid))
+        live, blocks = live[valid], blocks[valid]
+
+        # Agrupar por tamaño de bloque y, dentro de cada grupo, ordenar por clave
+        order = np.lexsort((live['clave'], blocks))
+        live, blocks = live[order], blocks[order]
+        new_records = live.copy()
+        new_records['dir'] = np.concatenate(([0], np.cumsum(blocks.astype(np.int64))[:-1])) if len(live) else []
+
+        values_view = reader.values
+        with open(os.path.join(new_dir, 'values.db'), 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            for old_dir_pos, tam in zip(live['dir'].tolist(), blocks.tolist()):
+                f.write(values_view[old_dir_pos:old_dir_pos + tam])
+            f.flush()
+            os.fsync(f.fileno())
+        del values_view
+
+    with open(os.path.join(new_dir, 'keys.db'), 'wb') as f:
+        f.write(new_records.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    for name in os.listdir(db_dir):
+        if name in DATA_FILES:
+            continue
+        source = os.path.join(db_dir, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(new_dir, name))
+        else:
+            shutil.copy2(source, os.path.join(new_dir, name))
+            with open(os.path.join(new_dir, name), 'rb') as f:
+                os.fsync(f.fileno())
+    with open(os.path.join(new_dir, COMPLETE_MARKER), 'wb') as f:
+        os.fsync(f.fileno())
+    _fsync_dir(new_dir)
+
+    os.rename(db_dir, old_dir)
+    os.rename(new_dir, db_dir)
+    _fsync_dir(os.path.dirname(os.path.abspath(db_dir)))
+    os.remove(os.path.join(db_dir, COMPLETE_MARKER))
+    shutil.rmtree(old_dir)
+
+    elapsed = time.perf_counter() - start
+    values_after = os.path.getsize(os.path.join(db_dir, 'values.db'))
+    keys_after = os.path.getsize(os.path.join(db_dir, 'keys.db'))
+    return {
+        "live_keys": len(new_records),
+        "dropped_records": dropped,
+        "values_bytes_before": values_before,
+        "values_bytes_after": values_after,
+        "keys_bytes_before": keys_before,
+        "keys_bytes_after": keys_after,
+        "reclaimed_bytes": (values_before + keys_before) - (values_after + keys_after),
+        "elapsed_seconds": elapsed,
+        "throughput_mb_s": (values_after / (1024 * 1024)) / elapsed if elapsed > 0 else 0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compactación offline de keys.db / values.db (con el servidor detenido)")
+    parser.add_argument('--db', default='./db', help='Directorio con keys.db y values.db (por defecto: ./db)')
+    parser.add_argument('--dry_run', action='store_true', help='Solo mostrar cuánto espacio se recuperaría')
+    args = parser.parse_args(argv)
+
+    action = recover(args.db)
+    if action:
+        print(f"Recuperación: {action}")
+
+    if args.dry_run:
+        with dbreader.StoreReader(args.db) as reader:
+            stats = reader.stats()
+        print(f"Claves vigentes: {stats['live_keys']}, registros duplicados: {stats['duplicate_records']}")
+        print(f"Espacio muerto recuperable en values.db: {dbreader.format_bytes(stats['dead_bytes'])}")
+        return 0
+
+    try:
+        result = compact(args.db)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Claves vigentes copiadas: {result['live_keys']}")
+    print(f"Registros descartados (fuera de values.db o tamaño inválido): {result['dropped_records']}")
+    print(f"values.db: {dbreader.format_bytes(result['values_bytes_before'])} -> {dbreader.format_bytes(result['values_bytes_after'])}")
+    print(f"keys.db: {dbreader.format_bytes(result['keys_bytes_before'])} -> {dbreader.format_bytes(result['keys_bytes_after'])}")
+    print(f"Bytes recuperados: {dbreader.format_bytes(max(0, result['reclaimed_bytes']))}")
+    print(f"Tiempo: {result['elapsed_seconds']:.2f} s ({result['throughput_mb_s']:.2f} MB/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
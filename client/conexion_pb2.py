@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0e\x63onexion.proto\x12\x08\x63onexion\"\x10\n\x0eRequestResetDb\"1\n\x0eRespuestaReset\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\"X\n\x12RespuestaGetPrefix\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\x12!\n\x07objetos\x18\x03 \x03(\x0b\x32\x10.conexion.Objeto\"Q\n\x0cRespuestaGet\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\x12 \n\x06objeto\x18\x03 \x01(\x0b\x32\x10.conexion.Objeto\"&\n\x06Objeto\x12\r\n\x05\x63lave\x18\x01 \x01(\t\x12\r\n\x05valor\x18\x02 \x01(\t\"\x1a\n\tConsultar\x12\r\n\x05\x63lave\x18\x01 \x01(\t\"(\n\x08Insertar\x12\r\n\x05\x63lave\x18\x01 \x01(\t\x12\r\n\x05valor\x18\x02 \x01(\t\"/\n\x0cRespuestaSet\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t2\xea\x01\n\x02\x42\x44\x12\x31\n\x03set\x12\x12.conexion.Insertar\x1a\x16.conexion.RespuestaSet\x12\x32\n\x03get\x12\x13.conexion.Consultar\x1a\x16.conexion.RespuestaGet\x12>\n\tgetPrefix\x12\x13.conexion.Consultar\x1a\x1c.conexion.RespuestaGetPrefix\x12=\n\x07resetDb\x12\x18.conexion.RequestResetDb\x1a\x18.conexion.RespuestaResetB;Z9github.com/yormanbalanD/bd-clave-valor-distribuidos/protob\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0e\x63onexion.proto\x12\x08\x63onexion\"\x10\n\x0eRequestResetDb\"1\n\x0eRespuestaReset\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\"X\n\x12RespuestaGetPrefix\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\x12!\n\x07objetos\x18\x03 \x03(\x0b\x32\x10.conexion.Objeto\"Q\n\x0cRespuestaGet\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\x12 \n\x06objeto\x18\x03 \x01(\x0b\x32\x10.conexion.Objeto\"T\n\x06Objeto\x12\r\n\x05\x63lave\x18\x01 \x01(\t\x12\r\n\x05valor\x18\x02 \x01(\t\x12\x15\n\rclave_binaria\x18\x03 \x01(\x0c\x12\x15\n\rvalor_binario\x18\x04 \x01(\x0c\"C\n\tConsultar\x12\r\n\x05\x63lave\x18\x01 \x01(\t\x12\x15\n\rclave_binaria\x18\x02 \x01(\x0c\x12\x10\n\x08\x65n_bytes\x18\x03 \x01(\x08\"V\n\x08Insertar\x12\r\n\x05\x63lave\x18\x01 \x01(\t\x12\r\n\x05valor\x18\x02 \x01(\t\x12\x15\n\rclave_binaria\x18\x03 \x01(\x0c\x12\x15\n\rvalor_binario\x18\x04 \x01(\x0c\"/\n\x0cRespuestaSet\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\"5\n\x0cInsertarLote\x12%\n\telementos\x18\x01 \x03(\x0b\x32\x12.conexion.Insertar\"_\n\x10RespuestaLoteSet\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\x12*\n\nrespuestas\x18\x03 \x03(\x0b\x32\x16.conexion.RespuestaSet\"7\n\rConsultarLote\x12&\n\telementos\x18\x01 \x03(\x0b\x32\x13.conexion.Consultar\"_\n\x10RespuestaLoteGet\x12\x0e\n\x06\x65stado\x18\x01 \x01(\x08\x12\x0f\n\x07mensaje\x18\x02 \x01(\t\x12*\n\nrespuestas\x18\x03 \x03(\x0b\x32\x16.conexion.RespuestaGet\"\x9b\x01\n\x10\x43onsultarPrefijo\x12\x0f\n\x07prefijo\x18\x01 \x01(\t\x12\x13\n\x0bsolo_claves\x18\x02 \x01(\x08\x12\x0e\n\x06limite\x18\x03 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x04 \x01(\t\x12\x17\n\x0fprefijo_binario\x18\x05 \x01(\x0c\x12\x16\n\x0e\x63ursor_binario\x18\x06 \x01(\x0c\x12\x10\n\x08\x65n_bytes\x18\x07 \x01(\x08\"V\n\tFragmento\x12\r\n\x05\x63lave\x18\x01 \x01(\t\x12\x14\n\x0ctamano_total\x18\x02 \x01(\x03\x12\r\n\x05\x64\x61tos\x18\x03 \x01(\x0c\x12\x15\n\rclave_binaria\x18\x04 \x01(\x0c\x32\xa3\x04\n\x02\x42\x44\x12\x31\n\x03set\x12\x12.conexion.Insertar\x1a\x16.conexion.RespuestaSet\x12\x32\n\x03get\x12\x13.conexion.Consultar\x1a\x16.conexion.RespuestaGet\x12>\n\tgetPrefix\x12\x13.conexion.Consultar\x1a\x1c.conexion.RespuestaGetPrefix\x12=\n\x07resetDb\x12\x18.conexion.RequestResetDb\x1a\x18.conexion.RespuestaReset\x12>\n\x08multiSet\x12\x16.conexion.InsertarLote\x1a\x1a.conexion.RespuestaLoteSet\x12?\n\x08multiGet\x12\x17.conexion.ConsultarLote\x1a\x1a.conexion.RespuestaLoteGet\x12\x41\n\x0fgetPrefixStream\x12\x1a.conexion.ConsultarPrefijo\x1a\x10.conexion.Objeto0\x01\x12:\n\tsetStream\x12\x13.conexion.Fragmento\x1a\x16.conexion.RespuestaSet(\x01\x12\x37\n\tgetStream\x12\x13.conexion.Consultar\x1a\x13.conexion.Fragmento0\x01\x42;Z9github.com/yormanbalanD/bd-clave-valor-distribuidos/protob\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -41,13 +41,25 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_RESPUESTAGET']._serialized_start=187
   _globals['_RESPUESTAGET']._serialized_end=268
   _globals['_OBJETO']._serialized_start=270
-  _globals['_OBJETO']._serialized_end=308
-  _globals['_CONSULTAR']._serialized_start=310
-  _globals['_CONSULTAR']._serialized_end=336
-  _globals['_INSERTAR']._serialized_start=338
-  _globals['_INSERTAR']._serialized_end=378
-  _globals['_RESPUESTASET']._serialized_start=380
-  _globals['_RESPUESTASET']._serialized_end=427
-  _globals['_BD']._serialized_start=430
-  _globals['_BD']._serialized_end=664
+  _globals['_OBJETO']._serialized_end=354
+  _globals['_CONSULTAR']._serialized_start=356
+  _globals['_CONSULTAR']._serialized_end=423
+  _globals['_INSERTAR']._serialized_start=425
+  _globals['_INSERTAR']._serialized_end=511
+  _globals['_RESPUESTASET']._serialized_start=513
+  _globals['_RESPUESTASET']._serialized_end=560
+  _globals['_INSERTARLOTE']._serialized_start=562
+  _globals['_INSERTARLOTE']._serialized_end=615
+  _globals['_RESPUESTALOTESET']._serialized_start=617
+  _globals['_RESPUESTALOTESET']._serialized_end=712
+  _globals['_CONSULTARLOTE']._serialized_start=714
+  _globals['_CONSULTARLOTE']._serialized_end=769
+  _globals['_RESPUESTALOTEGET']._serialized_start=771
+  _globals['_RESPUESTALOTEGET']._serialized_end=866
+  _globals['_CONSULTARPREFIJO']._serialized_start=869
+  _globals['_CONSULTARPREFIJO']._serialized_end=1024
+  _globals['_FRAGMENTO']._serialized_start=1026
+  _globals['_FRAGMENTO']._serialized_end=1112
+  _globals['_BD']._serialized_start=1115
+  _globals['_BD']._serialized_end=1662
 # @@protoc_insertion_point(module_scope)
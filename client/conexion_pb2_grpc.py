@@ -54,6 +54,31 @@ class BDStub(object):
                 request_serializer=conexion__pb2.RequestResetDb.SerializeToString,
                 response_deserializer=conexion__pb2.RespuestaReset.FromString,
                 _registered_method=True)
+        self.multiSet = channel.unary_unary(
+                '/conexion.BD/multiSet',
+                request_serializer=conexion__pb2.InsertarLote.SerializeToString,
+                response_deserializer=conexion__pb2.RespuestaLoteSet.FromString,
+                _registered_method=True)
+        self.multiGet = channel.unary_unary(
+                '/conexion.BD/multiGet',
+                request_serializer=conexion__pb2.ConsultarLote.SerializeToString,
+                response_deserializer=conexion__pb2.RespuestaLoteGet.FromString,
+                _registered_method=True)
+        self.getPrefixStream = channel.unary_stream(
+                '/conexion.BD/getPrefixStream',
+                request_serializer=conexion__pb2.ConsultarPrefijo.SerializeToString,
+                response_deserializer=conexion__pb2.Objeto.FromString,
+                _registered_method=True)
+        self.setStream = channel.stream_unary(
+                '/conexion.BD/setStream',
+                request_serializer=conexion__pb2.Fragmento.SerializeToString,
+                response_deserializer=conexion__pb2.RespuestaSet.FromString,
+                _registered_method=True)
+        self.getStream = channel.unary_stream(
+                '/conexion.BD/getStream',
+                request_serializer=conexion__pb2.Consultar.SerializeToString,
+                response_deserializer=conexion__pb2.Fragmento.FromString,
+                _registered_method=True)
 
 
 class BDServicer(object):
@@ -83,6 +108,36 @@ class BDServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def multiSet(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def multiGet(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def getPrefixStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def setStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def getStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_BDServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -106,6 +161,31 @@ def add_BDServicer_to_server(servicer, server):
                     request_deserializer=conexion__pb2.RequestResetDb.FromString,
                     response_serializer=conexion__pb2.RespuestaReset.SerializeToString,
             ),
+            'multiSet': grpc.unary_unary_rpc_method_handler(
+                    servicer.multiSet,
+                    request_deserializer=conexion__pb2.InsertarLote.FromString,
+                    response_serializer=conexion__pb2.RespuestaLoteSet.SerializeToString,
+            ),
+            'multiGet': grpc.unary_unary_rpc_method_handler(
+                    servicer.multiGet,
+                    request_deserializer=conexion__pb2.ConsultarLote.FromString,
+                    response_serializer=conexion__pb2.RespuestaLoteGet.SerializeToString,
+            ),
+            'getPrefixStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.getPrefixStream,
+                    request_deserializer=conexion__pb2.ConsultarPrefijo.FromString,
+                    response_serializer=conexion__pb2.Objeto.SerializeToString,
+            ),
+            'setStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.setStream,
+                    request_deserializer=conexion__pb2.Fragmento.FromString,
+                    response_serializer=conexion__pb2.RespuestaSet.SerializeToString,
+            ),
+            'getStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.getStream,
+                    request_deserializer=conexion__pb2.Consultar.FromString,
+                    response_serializer=conexion__pb2.Fragmento.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'conexion.BD', rpc_method_handlers)
@@ -224,3 +304,138 @@ class BD(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def multiSet(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/conexion.BD/multiSet',
+            conexion__pb2.InsertarLote.SerializeToString,
+            conexion__pb2.RespuestaLoteSet.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def multiGet(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/conexion.BD/multiGet',
+            conexion__pb2.ConsultarLote.SerializeToString,
+            conexion__pb2.RespuestaLoteGet.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def getPrefixStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/conexion.BD/getPrefixStream',
+            conexion__pb2.ConsultarPrefijo.SerializeToString,
+            conexion__pb2.Objeto.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def setStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/conexion.BD/setStream',
+            conexion__pb2.Fragmento.SerializeToString,
+            conexion__pb2.RespuestaSet.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def getStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/conexion.BD/getStream',
+            conexion__pb2.Consultar.SerializeToString,
+            conexion__pb2.Fragmento.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,327 @@
+import argparse
+import mmap
+import os
+import sys
+
+import numpy as np
+
+# Registro InfClave del servidor: [16]byte Clave, int32 Tamaño, int64 Direccion (little-endian, 28 bytes)
+RECORD_DTYPE = np.dtype([('clave', 'S16'), ('tam', '<i4'), ('dir', '<i8')])
+
+# Tamaños de bloque con los que el servidor rellena los valores en values.db
+SIZE_CLASSES = (512, 4 * 1024, 512 * 1024, 1024 * 1024, 4 * 1024 * 1024)
+SIZE_CLASS_NAMES = {512: "512B", 4 * 1024: "4KB", 512 * 1024: "512KB", 1024 * 1024: "1MB", 4 * 1024 * 1024: "4MB"}
+
+# Un campo tam negativo lleva el largo exacto del valor en sus LENGTH_BITS bits bajos, el
+# log2 del tamaño de bloque en los BLOCK_BITS siguientes y la marca de clave binaria en el
+# bit siguiente, negados bit a bit (codificarTamaño y marcarClaveBinaria en el servidor
+# Go). Un tam positivo es solo el tamaño de bloque (registros anteriores) y el valor
+# termina en el último byte distinto de cero.
+LENGTH_BITS = 23
+BLOCK_BITS = 5
+BINARY_KEY_BIT = 1 << (LENGTH_BITS + BLOCK_BITS)
+UNKNOWN_LENGTH = -1
+
+
+def pack_size(block_size, length, binary_key=False):
+    """
+    Devuelve el campo tam de un registro con el tamaño de bloque y el largo del valor. Con
+    binary_key el registro es de una clave binaria: sus 16 bytes son la clave completa, NUL
+    finales incluidos, y no coincide con la clave de texto de los mismos bytes.
+    """
+    return ~(length | (block_size.bit_length() - 1) << LENGTH_BITS | (BINARY_KEY_BIT if binary_key else 0))
+
+
+def unpack_sizes(tam):
+    """
+    Decodifica un arreglo de campos tam.
+
+    Returns:
+        tuple: (tamaños de bloque, largos de los valores), dos arreglos int32; el largo es
+               UNKNOWN_LENGTH en los registros que solo tienen el tamaño de bloque.
+    """
+    tam = np.asarray(tam, dtype=np.int32)
+    explicit = tam < 0
+    packed = np.where(explicit, ~tam, 0)
+    blocks = np.where(explicit, np.left_shift(1, (packed >> LENGTH_BITS) & ((1 << BLOCK_BITS) - 1)), tam)
+    lengths = np.where(explicit, packed & ((1 << LENGTH_BITS) - 1), UNKNOWN_LENGTH)
+    return blocks.astype(np.int32), lengths.astype(np.int32)
+
+
+def binary_key_flags(tam):
+    """Devuelve un arreglo booleano que indica qué campos tam son de claves binarias."""
+    tam = np.asarray(tam, dtype=np.int32)
+    return (tam < 0) & ((~tam & BINARY_KEY_BIT) != 0)
+
+
+def _map_file(path):
+    """
+    Mapea path en memoria de solo lectura. Devuelve (mmap, tamaño); el mmap es None si el
+    archivo está vacío, ya que no se puede mapear un archivo de 0 bytes.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None, 0
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), size
+
+
+class StoreReader:
+    """
+    Lector offline de los archivos keys.db y values.db del servidor.
+
+    keys.db se mapea en memoria y se ve como un arreglo estructurado de NumPy (RECORD_DTYPE)
+    sin decodificar registro a registro, así que las estadísticas sobre millones de claves
+    son operaciones vectorizadas. Los valores se devuelven como memoryview sobre el mapeo
+    de values.db, sin copiarlos. Igual que la carga del servidor (getAllValuesToDict), si
+    una clave aparece varias veces gana el último registro; una clave binaria y una de texto
+    con los mismos bytes son claves distintas (binary_keys indica cuáles son binarias).
+
+    Debe usarse con el servidor detenido o aceptando que el resultado sea una instantánea
+    posiblemente inconsistente.
+    """
+    def __init__(self, db_dir='./db'):
+        self.db_dir = db_dir
+        self._keys_map, keys_size = _map_file(os.path.join(db_dir, 'keys.db'))
+        self._values_map, self.values_size = _map_file(os.path.join(db_dir, 'values.db'))
+
+        count = keys_size // RECORD_DTYPE.itemsize
+        self.trailing_bytes = keys_size - count * RECORD_DTYPE.itemsize # Registro final incompleto
+        if self._keys_map is None:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+        else:
+            self.records = np.frombuffer(self._keys_map, dtype=RECORD_DTYPE, count=count)
+        self.block_sizes, self.lengths = unpack_sizes(self.records['tam'])
+        self.binary_keys = binary_key_flags(self.records['tam'])
+        # Vista sin copia de values.db completo
+        self.values = memoryview(self._values_map) if self._values_map is not None else memoryview(b'')
+        self._live = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Libera los mapeos. Las vistas obtenidas con value() dejan de ser válidas."""
+        self.records = self.block_sizes = self.lengths = self.binary_keys = None
+        self._live = None
+        self.values.release()
+        for mapped in (self._keys_map, self._values_map):
+            if mapped is not None:
+                mapped.close()
+
+    def live_indices(self):
+        """
+        Devuelve los índices (ordenados) de los registros vigentes: la última aparición
+        de cada clave.
+        """
+        if self._live is None:
+            # Las claves binarias miden siempre 16 bytes, así que la clave sin los NUL finales
+            # y la marca de binaria identifican la clave
+            claves = np.empty(len(self.records), dtype=[('binaria', '?'), ('clave', 'S16')])
+            claves['binaria'] = self.binary_keys
+            claves['clave'] = self.records['clave']
+            _, first_in_reversed = np.unique(claves[::-1], return_index=True)
+            self._live = np.sort(len(claves) - 1 - first_in_reversed)
+        return self._live
+
+    def value(self, index, trim=True):
+        """
+        Devuelve el valor del registro index como memoryview sobre values.db (sin copia).
+
+        Args:
+            index (int): Posición del registro en keys.db.
+            trim (bool): Si es True, descarta el relleno de NULs del final, como el servidor.
+                         Solo se aplica a los registros sin largo del valor.
+
+        Returns:
+            memoryview: Los bytes del valor, o None si el bloque queda fuera de values.db.
+        """
+        start = int(self.records['dir'][index])
+        end = start + int(self.block_sizes[index])
+        if start < 0 or end > self.values_size:
+            return None
+        view = self.values[start:end]
+        length = int(self.lengths[index])
+        if length != UNKNOWN_LENGTH:
+            return view[:length]
+        if trim:
+            nonzero = np.flatnonzero(np.frombuffer(view, dtype=np.uint8))
+            view = view[:nonzero[-1] + 1] if len(nonzero) else view[:0]
+        return view
+
+    def find(self, key):
+        """
+        Devuelve el índice del registro vigente de la clave de texto key, o None si no
+        existe. Como el servidor guarda 16 bytes por clave, key se compara truncada a 16 bytes.
+        """
+        matches = np.flatnonzero((self.records['clave'] == key.encode('utf-8')[:16]) & ~self.binary_keys)
+        return int(matches[-1]) if len(matches) else None
+
+    def find_prefix(self, prefix):
+        """
+        Devuelve los índices de los registros vigentes cuya clave de texto empieza por
+        prefix, ordenados por clave. Como en el servidor, el prefijo vacío incluye las claves
+        binarias, después de todas las de texto.
+        """
+        live = self.live_indices()
+        if prefix:
+            live = live[~self.binary_keys[live]]
+        claves = self.records['clave'][live]
+        matches = live[np.char.startswith(claves, prefix.encode('utf-8')[:16])]
+        return matches[np.lexsort((self.records['clave'][matches], self.binary_keys[matches]))]
+
+    def _live_regions(self):
+        """Devuelve (inicio, fin) de los bloques vigentes ordenados por inicio."""
+        live = self.live_indices()
+        order = np.argsort(self.records['dir'][live], kind='stable')
+        starts = self.records['dir'][live][order].astype(np.int64)
+        ends = starts + self.block_sizes[live][order].astype(np.int64)
+        return starts, ends
+
+    def stats(self):
+        """
+        Devuelve un diccionario con las estadísticas del almacenamiento: claves y bytes por
+        tamaño de bloque, registros duplicados, espacio muerto y solapamientos.
+        """
+        live = self.live_indices()
+        blocks = self.block_sizes[live]
+        by_class = {}
+        for size in SIZE_CLASSES:
+            count = int(np.count_nonzero(blocks == size))
+            by_class[SIZE_CLASS_NAMES[size]] = {"keys": count, "bytes": count * size}
+
+        starts, ends = self._live_regions()
+        if len(starts):
+            # Fin máximo alcanzado por los bloques anteriores a cada uno
+            reach = np.concatenate(([starts[0]], np.maximum.accumulate(ends)[:-1]))
+            covered = int(np.clip(ends - np.maximum(starts, reach), 0, None).sum())
+            overlapping = int(np.count_nonzero(starts[1:] < reach[1:]))
+        else:
+            covered = overlapping = 0
+
+        return {
+            "records": len(self.records),
+            "live_keys": len(live),
+            "duplicate_records": len(self.records) - len(live),
+            "size_classes": by_class,
+            "values_file_bytes": self.values_size,
+            "live_bytes": covered,
+            "dead_bytes": max(0, self.values_size - covered),
+            "overlapping_regions": overlapping,
+        }
+
+    def check(self):
+        """
+        Verifica la integridad del almacenamiento.
+
+        Returns:
+            list: Mensajes con los problemas encontrados; vacía si todo está bien.
+        """
+        problems = []
+        if self.trailing_bytes:
+            problems.append(f"keys.db termina con un registro incompleto de {self.trailing_bytes} bytes")
+
+        live = self.live_indices()
+        tam = self.block_sizes[live]
+        direccion = self.records['dir'][live]
+
+        invalid_size = live[~np.isin(tam, SIZE_CLASSES)]
+        if len(invalid_size):
+            problems.append(f"{len(invalid_size)} registros con un tamaño de bloque inválido (primero: índice {invalid_size[0]})")
+
+        out_of_bounds = live[(direccion < 0) | (direccion + tam > self.values_size)]
+        if len(out_of_bounds):
+            problems.append(f"{len(out_of_bounds)} registros apuntan fuera de values.db (primero: índice {out_of_bounds[0]})")
+
+        empty_keys = live[self.records['clave'][live] == b'']
+        if len(empty_keys):
+            problems.append(f"{len(empty_keys)} registros con clave vacía")
+
+        overlapping = self.stats()["overlapping_regions"]
+        if overlapping:
+            problems.append(f"{overlapping} bloques de valores se solapan con el anterior")
+        return problems
+
+
+def format_bytes(size):
+    """Devuelve size en la unidad binaria más legible (B, KB, MB, GB)."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.2f}{unit}"
+        size /= 1024
+
+
+def print_stats(stats):
+    print(f"Registros en keys.db: {stats['records']}")
+    print(f"Claves vigentes: {stats['live_keys']}")
+    print(f"Registros duplicados: {stats['duplicate_records']}")
+    print("Claves por tamaño de bloque:")
+    for name, entry in stats["size_classes"].items():
+        print(f"  {name:>6}: {entry['keys']} claves, {format_bytes(entry['bytes'])}")
+    print(f"Tamaño de values.db: {format_bytes(stats['values_file_bytes'])}")
+    print(f"Bytes en uso: {format_bytes(stats['live_bytes'])}")
+    print(f"Espacio muerto: {format_bytes(stats['dead_bytes'])}")
+    print(f"Bloques solapados: {stats['overlapping_regions']}")
+
+
+def print_record(reader, index, show_value=True):
+    record = reader.records[index]
+    if reader.binary_keys[index]:
+        clave = record['clave'].ljust(16, b'\x00').hex()
+    else:
+        clave = record['clave'].decode('utf-8', errors='replace')
+    block_size = int(reader.block_sizes[index])
+    line = f"  - Clave: {clave}, Bloque: {SIZE_CLASS_NAMES.get(block_size, block_size)}, Dirección: {record['dir']}"
+    if show_value:
+        value = reader.value(index)
+        if value is None:
+            line += ", Valor: <fuera de values.db>"
+        else:
+            line += f", Largo: {len(value)}, Valor: {bytes(value[:50]).decode('utf-8', errors='replace')}..."
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lector offline de keys.db / values.db")
+    parser.add_argument('action', choices=['stats', 'check', 'get', 'prefix'], help='Acción a realizar')
+    parser.add_argument('--db', default='./db', help='Directorio con keys.db y values.db (por defecto: ./db)')
+    parser.add_argument('--key', help='Clave para la acción get')
+    parser.add_argument('--prefix', default='', help='Prefijo para la acción prefix')
+    parser.add_argument('--limit', type=int, default=20, help='Máximo de claves a mostrar en prefix (por defecto: 20, 0 = todas)')
+    parser.add_argument('--keys_only', action='store_true', help='En prefix, mostrar solo las claves')
+    args = parser.parse_args(argv)
+
+    with StoreReader(args.db) as reader:
+        if args.action == 'stats':
+            print_stats(reader.stats())
+
+        elif args.action == 'check':
+            problems = reader.check()
+            for problem in problems:
+                print(f"Error: {problem}")
+            print("Integridad: OK" if not problems else f"Integridad: {len(problems)} problemas")
+            return 1 if problems else 0
+
+        elif args.action == 'get':
+            if not args.key:
+                print("Error: La clave es requerida para la acción get")
+                return 1
+            index = reader.find(args.key)
+            if index is None:
+                print("Clave no encontrada")
+                return 1
+            print_record(reader, index)
+
+        elif args.action == 'prefix':
+            matches = reader.find_prefix(args.prefix)
+            print(f"Claves encontradas: {len(matches)}")
+            for index in (matches[:args.limit] if args.limit > 0 else matches):
+                print_record(reader, index, show_value=not args.keys_only)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
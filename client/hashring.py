@@ -0,0 +1,60 @@
+import bisect
+import hashlib
+
+# Nodos virtuales por servidor: suavizan el reparto de claves entre nodos
+DEFAULT_VIRTUAL_NODES = 160
+
+
+def _hash(value):
+    """
+    Devuelve un hash de 64 bits estable entre procesos (hash() de Python no lo es).
+    value es una cadena o algo convertible a bytes, como una keycodec.Key.
+    """
+    data = value.encode('utf-8') if isinstance(value, str) else bytes(value)
+    return int.from_bytes(hashlib.md5(data).digest()[:8], 'big')
+
+
+class ConsistentHashRing:
+    """
+    Anillo de hashing consistente con nodos virtuales.
+
+    Cada nodo ocupa virtual_nodes posiciones del anillo y una clave pertenece al primer
+    nodo virtual que encuentra en sentido horario. Al añadir o quitar un nodo solo
+    cambian de dueño las claves de sus tramos, aproximadamente 1/N del total.
+    """
+    def __init__(self, nodes=(), virtual_nodes=DEFAULT_VIRTUAL_NODES):
+        self.virtual_nodes = virtual_nodes
+        self.nodes = []
+        self._positions = [] # Posiciones ordenadas del anillo
+        self._owners = []    # Nodo dueño de cada posición
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node):
+        """Añade node (p. ej. 'localhost:5051') al anillo."""
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for replica in range(self.virtual_nodes):
+            position = _hash(f"{node}#{replica}")
+            index = bisect.bisect(self._positions, position)
+            self._positions.insert(index, position)
+            self._owners.insert(index, node)
+
+    def remove_node(self, node):
+        """Quita node del anillo; sus claves pasan a los nodos siguientes."""
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        kept = [(p, o) for p, o in zip(self._positions, self._owners) if o != node]
+        self._positions = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def get_node(self, key):
+        """Devuelve el nodo responsable de key."""
+        if not self._positions:
+            raise ValueError("El anillo no tiene nodos")
+        index = bisect.bisect(self._positions, _hash(key))
+        if index == len(self._positions):
+            index = 0
+        return self._owners[index]
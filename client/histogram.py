@@ -0,0 +1,141 @@
+import array
+import csv
+import json
+
+# Bits significativos de cada bucket: valores exactos hasta 2**7 y, por encima, 2**6
+# sub-buckets por potencia de dos, con un error relativo de como mucho 1/64 (~1.6%)
+PRECISION_BITS = 7
+# Mayor latencia representable (~18 minutos en ns); por encima se acumula en el último bucket
+MAX_TRACKABLE_NS = 2 ** 40
+
+PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+
+
+def _bucket_index(value_ns):
+    """
+    Devuelve el bucket log-lineal de un valor: exacto por debajo de 2**PRECISION_BITS
+    y con PRECISION_BITS bits significativos por encima.
+    """
+    exponent = max(0, value_ns.bit_length() - PRECISION_BITS)
+    return (exponent << (PRECISION_BITS - 1)) + (value_ns >> exponent)
+
+
+def _bucket_upper_bound(index):
+    """
+    Devuelve el mayor valor (ns) que cae en el bucket index.
+    """
+    if index < (1 << PRECISION_BITS):
+        return index
+    exponent = (index >> (PRECISION_BITS - 1)) - 1
+    mantissa = index - (exponent << (PRECISION_BITS - 1))
+    return ((mantissa + 1) << exponent) - 1
+
+
+BUCKET_COUNT = _bucket_index(MAX_TRACKABLE_NS - 1) + 1
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con buckets logarítmicos (estilo HDR).
+
+    Usa memoria constante (BUCKET_COUNT contadores) sin importar el número de muestras,
+    y dos histogramas se pueden combinar con merge(), por ejemplo los de varios
+    procesos cliente. Las muestras se registran en nanosegundos (time.perf_counter_ns)
+    y los reportes se dan en milisegundos.
+    """
+    def __init__(self):
+        self.counts = array.array('q', bytes(8 * BUCKET_COUNT))
+        self.total_count = 0
+        self.sum_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def record(self, value_ns):
+        """Registra una muestra de latencia en nanosegundos."""
+        value_ns = max(0, int(value_ns))
+        self.counts[_bucket_index(min(value_ns, MAX_TRACKABLE_NS - 1))] += 1
+        self.total_count += 1
+        self.sum_ns += value_ns
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def merge(self, other):
+        """Suma en este histograma las muestras de other. Devuelve self."""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        self.sum_ns += other.sum_ns
+        if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        return self
+
+    def percentile_ns(self, percentile):
+        """
+        Devuelve el valor (ns) por debajo del cual queda el percentil indicado (0-100).
+        """
+        if self.total_count == 0:
+            return 0
+        target = max(1, -(-self.total_count * percentile // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(_bucket_upper_bound(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self):
+        """
+        Devuelve un diccionario con el conteo, min/max/avg y los percentiles, en milisegundos.
+        """
+        metrics = {
+            "count": self.total_count,
+            "min_latency_ms": (self.min_ns or 0) / 1e6,
+            "max_latency_ms": self.max_ns / 1e6,
+            "avg_latency_ms": (self.sum_ns / self.total_count / 1e6) if self.total_count else 0,
+        }
+        for percentile in PERCENTILES:
+            metrics[f"p{percentile:g}_latency_ms"] = self.percentile_ns(percentile) / 1e6
+        return metrics
+
+
+def export_json(path, histograms):
+    """
+    Escribe en un archivo JSON el resumen de cada histograma.
+
+    Args:
+        path (str): Ruta del archivo de salida.
+        histograms (dict): {nombre: LatencyHistogram}, p. ej. {"write_512B": h}.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({name: h.summary() for name, h in histograms.items()}, f, indent=2)
+
+
+def export_csv(path, histograms):
+    """
+    Escribe en un archivo CSV una fila por histograma con su resumen.
+
+    Args:
+        path (str): Ruta del archivo de salida.
+        histograms (dict): {nombre: LatencyHistogram}.
+    """
+    fields = ["name", "count", "min_latency_ms", "avg_latency_ms"]
+    fields += [f"p{percentile:g}_latency_ms" for percentile in PERCENTILES] + ["max_latency_ms"]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for name, h in histograms.items():
+            writer.writerow({"name": name, **h.summary()})
+
+
+def export(path, histograms):
+    """
+    Exporta los histogramas en CSV si path termina en .csv, o en JSON en otro caso.
+    """
+    if path.lower().endswith('.csv'):
+        export_csv(path, histograms)
+    else:
+        export_json(path, histograms)
@@ -0,0 +1,133 @@
+import os
+
+# Largo de una clave de 128 bits
+KEY_BYTES = 16
+
+# Bit del primer byte de la clave que indica la clase de tamaño del valor (ver
+# PLANTEAMIENTO.txt). Los tres bits bajos deben ser cero.
+SIZE_CLASS_BITS = {
+    512: 0x80,
+    4 * 1024: 0x40,
+    512 * 1024: 0x20,
+    1024 * 1024: 0x10,
+    4 * 1024 * 1024: 0x08,
+}
+CLASS_BY_BITS = {bits: size for size, bits in SIZE_CLASS_BITS.items()}
+
+# Primer byte con el que el servidor distingue en su índice una clave binaria (seguido de
+# sus 16 bytes) de una de texto. Nunca aparece en UTF-8, así que una clave binaria no
+# coincide con ninguna de texto y en los recorridos todas quedan después de las de texto.
+BINARY_KEY_TAG = b'\xff'
+
+
+def class_for_length(length):
+    """Devuelve la menor clase de tamaño en la que cabe un valor de length bytes, o None si supera 4MB."""
+    for size in SIZE_CLASS_BITS:
+        if length <= size:
+            return size
+    return None
+
+
+def index_key(clave, clave_binaria):
+    """
+    Devuelve los bytes con los que el servidor ordena la clave de un Objeto: la marca y
+    los 16 bytes de clave_binaria si viene, o el UTF-8 de clave.
+    """
+    return BINARY_KEY_TAG + clave_binaria if clave_binaria else clave.encode('utf-8')
+
+
+class Key:
+    """
+    Clave binaria de 128 bits con la clase de tamaño del valor en su primer byte.
+
+    Se envía al servidor en el campo clave_binaria tal cual, sin pasar por una cadena
+    hexadecimal que el servidor truncaría a 16 bytes. Con la clase en la clave el servidor
+    elige el bloque del valor antes de recibirlo.
+
+    Las claves son inmutables, comparables y usables como clave de diccionario; el orden
+    es el de sus bytes, el mismo que usa el servidor en los recorridos por prefijo.
+    """
+    __slots__ = ('raw',)
+
+    def __init__(self, raw):
+        """
+        Args:
+            raw (bytes): Los 16 bytes de la clave.
+
+        Raises:
+            ValueError: Si raw no mide 16 bytes o su primer byte no es una clase de tamaño válida.
+        """
+        raw = bytes(raw)
+        if len(raw) != KEY_BYTES:
+            raise ValueError(f"una clave binaria mide {KEY_BYTES} bytes, no {len(raw)}")
+        if raw[0] not in CLASS_BY_BITS:
+            raise ValueError(f"primer byte de clave inválido: {raw[0]:08b} (debe tener un único bit de clase de tamaño)")
+        object.__setattr__(self, 'raw', raw)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Key es inmutable")
+
+    @classmethod
+    def from_parts(cls, size_class, body):
+        """
+        Arma una clave a partir de su clase de tamaño y los 15 bytes restantes.
+
+        Args:
+            size_class (int): Tamaño de bloque del valor (512, 4KB, 512KB, 1MB o 4MB).
+            body (bytes): Los 15 bytes que siguen al byte de clase.
+        """
+        if size_class not in SIZE_CLASS_BITS:
+            raise ValueError(f"clase de tamaño desconocida: {size_class}")
+        return cls(bytes([SIZE_CLASS_BITS[size_class]]) + bytes(body))
+
+    @classmethod
+    def random(cls, size_class, rng=None):
+        """Genera una clave aleatoria de la clase indicada (determinista si se pasa rng)."""
+        body = rng.randbytes(KEY_BYTES - 1) if rng is not None else os.urandom(KEY_BYTES - 1)
+        return cls.from_parts(size_class, body)
+
+    @classmethod
+    def for_value(cls, value, rng=None):
+        """Genera una clave aleatoria de la menor clase en la que cabe value (str o bytes)."""
+        length = len(value.encode('utf-8')) if isinstance(value, str) else len(value)
+        size_class = class_for_length(length)
+        if size_class is None:
+            raise ValueError("el tamaño del valor es mayor a 4 MB")
+        return cls.random(size_class, rng)
+
+    @classmethod
+    def from_hex(cls, text):
+        """Decodifica una clave escrita como 32 caracteres hexadecimales."""
+        return cls(bytes.fromhex(text))
+
+    @staticmethod
+    def class_prefix(size_class):
+        """Devuelve el prefijo binario que selecciona todas las claves de una clase de tamaño."""
+        return bytes([SIZE_CLASS_BITS[size_class]])
+
+    @property
+    def size_class(self):
+        """Tamaño de bloque en bytes codificado en el primer byte."""
+        return CLASS_BY_BITS[self.raw[0]]
+
+    def fits(self, length):
+        """Indica si un valor de length bytes cabe en la clase de la clave."""
+        return length <= self.size_class
+
+    def hex(self):
+        return self.raw.hex()
+
+    def __bytes__(self):
+        return self.raw
+
+    def __eq__(self, other):
+        return isinstance(other, Key) and self.raw == other.raw
+
+    def __lt__(self, other):
+        return self.raw < other.raw
+
+    def __hash__(self):
+        return hash(self.raw)
+
+    def __repr__(self):
+        return f"Key({self.raw.hex()})"
@@ -4,115 +4,818 @@ import grpc
 import conexion_pb2 as pb
 import conexion_pb2_grpc as pb_grpc
 import utils # Make sure 'utils' is relevant if you need it
+import cache
+import channelpool
+import hashring
+import keycodec
+import rawvalues
 import time
+import random
+import asyncio
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+# Límites de tamaño de los lotes de set_many/get_many. Se mantienen muy por debajo del
+# límite de mensaje del canal (1GB) para no retener lotes enormes en memoria.
+DEFAULT_BATCH_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_BATCH_MAX_KEYS = 64
+
+# Códigos de estado gRPC que indican un fallo transitorio: la escritura se puede reintentar
+# (set es idempotente). El resto, como INVALID_ARGUMENT, se devuelve sin reintentar.
+RETRYABLE_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.ABORTED, grpc.StatusCode.RESOURCE_EXHAUSTED)
+# Plazo total por defecto de una escritura, reintentos incluidos
+DEFAULT_DEADLINE_S = 10.0
+# Espera máxima entre dos reintentos
+MAX_RETRY_DELAY_MS = 1000
+
+# Ventana inicial de control de flujo por stream: un valor de 4MB cabe entero sin esperar
+# actualizaciones de ventana (el servidor Go usa la misma, ver VENTANA_STREAM)
+STREAM_WINDOW_BYTES = 8 * 1024 * 1024
+# Intervalo de los pings de keepalive; el servidor debe permitir pings a este ritmo
+KEEPALIVE_TIME_MS = 20000
+
+# Tamaño de los fragmentos con que set_from envía un valor (getStream usa el mismo)
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Algoritmos de compresión de mensajes que entienden el cliente y ambos servidores
+COMPRESSION_ALGORITHMS = {'gzip': grpc.Compression.Gzip, 'deflate': grpc.Compression.Deflate}
+# Bytes a partir de los cuales se comprime una petición: los valores de 512B no pagan la
+# CPU de comprimir, que apenas reduce lo que ocupan en la red
+DEFAULT_COMPRESSION_THRESHOLD = 64 * 1024
+
+# Opciones de canal compartidas por el cliente síncrono y el asíncrono
+CHANNEL_OPTIONS = [
+    ('grpc.max_send_message_length', 1024*1024*1024),
+    ('grpc.max_receive_message_length', 1024*1024*1024),
+    ('grpc.http2.lookahead_bytes', STREAM_WINDOW_BYTES),
+    # Keepalive: detecta una conexión muerta aunque no haya llamadas en curso
+    ('grpc.keepalive_time_ms', KEEPALIVE_TIME_MS),
+    ('grpc.keepalive_timeout_ms', 5000),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.max_pings_without_data', 0),
+    # Backoff de reconexión corto: un servidor reiniciado se vuelve a usar en segundos
+    ('grpc.initial_reconnect_backoff_ms', 200),
+    ('grpc.max_reconnect_backoff_ms', 2000),
+]
+
+def key_fields(key):
+    """
+    Devuelve el campo de clave de un mensaje: clave_binaria para una keycodec.Key (o bytes,
+    como un prefijo binario) y clave para una cadena.
+    """
+    if isinstance(key, (keycodec.Key, bytes, bytearray)):
+        return {'clave_binaria': bytes(key)}
+    return {'clave': key}
+
+
+def prefix_fields(prefix, cursor):
+    """
+    Devuelve los campos de prefijo y cursor de ConsultarPrefijo: los binarios si prefix es
+    bytes (o cursor una keycodec.Key o bytes), y los de texto si no.
+    """
+    if isinstance(prefix, (bytes, bytearray)) or isinstance(cursor, (bytes, bytearray, keycodec.Key)):
+        return {'prefijo_binario': bytes(prefix), 'cursor_binario': bytes(cursor) if cursor else b''}
+    return {'prefijo': prefix, 'cursor': cursor}
+
+
+# Tipos de valor que se envían en valor_binario, sin codificar
+BYTES_LIKE = (bytes, bytearray, memoryview)
+
+
+def value_fields(value):
+    """
+    Devuelve el campo de valor de un Insertar: valor_binario para bytes, bytearray o
+    memoryview y valor para una cadena.
+    """
+    if isinstance(value, BYTES_LIKE):
+        return {'valor_binario': bytes(value)}
+    return {'valor': value}
+
+
+def object_value(objeto, as_bytes=False):
+    """
+    Devuelve el valor de un Objeto de respuesta. El servidor lo envía en valor_binario si
+    se pidió en bytes (en_bytes) o si no es texto UTF-8; en ese caso el valor es bytes
+    aunque as_bytes sea False.
+    """
+    if as_bytes:
+        return objeto.valor_binario or objeto.valor.encode('utf-8')
+    return objeto.valor_binario or objeto.valor
+
+
+def _cached_as(value, as_bytes):
+    """Adapta un valor de la caché (str o bytes, según cómo se escribió) al tipo que pide get."""
+    if as_bytes:
+        return value.encode('utf-8') if isinstance(value, str) else value
+    if isinstance(value, str):
+        return value
+    try:
+        return bytes(value).decode('utf-8')
+    except UnicodeDecodeError:
+        return value
+
+
+def compression_algorithm(name):
+    """
+    Devuelve el grpc.Compression del algoritmo name ('gzip' o 'deflate'), o None si name
+    es None o 'none'.
+
+    Raises:
+        ValueError: Si el algoritmo no está en COMPRESSION_ALGORITHMS.
+    """
+    if name is None or name == 'none':
+        return None
+    if name not in COMPRESSION_ALGORITHMS:
+        raise ValueError(f"algoritmo de compresión desconocido: {name} (opciones: {', '.join(COMPRESSION_ALGORITHMS)})")
+    return COMPRESSION_ALGORITHMS[name]
+
+
+def call_compression(compression, threshold, payload_bytes):
+    """
+    Devuelve la compresión de una llamada que envía payload_bytes bytes: compression si
+    llega a threshold y NoCompression si no (o si compression es None).
+    """
+    if compression is None or payload_bytes < threshold:
+        return grpc.Compression.NoCompression
+    return compression
+
+
+class RpcFailure(str):
+    """
+    Mensaje de fallo de una llamada gRPC ('CÓDIGO: detalle') que además lleva el código de
+    estado en code, para clasificar los fallos sin interpretar el texto del mensaje.
+    """
+    def __new__(cls, error):
+        failure = super().__new__(cls, f"{error.code().name}: {error.details()}")
+        failure.code = error.code()
+        return failure
+
+
+def retry_delay(error, attempt, max_retries, base_delay_ms, deadline):
+    """
+    Decide si se reintenta una llamada que falló con error.
+
+    La espera es backoff exponencial con jitter completo: un valor aleatorio entre 0 y
+    base_delay_ms * 2**(attempt - 1) (como mucho MAX_RETRY_DELAY_MS), para que los clientes
+    que fallaron a la vez no reintenten a la vez.
+
+    Returns:
+        float: Segundos a esperar antes del siguiente intento, o None si no se debe
+        reintentar (código no reintentable, intentos agotados o plazo vencido).
+    """
+    if error.code() not in RETRYABLE_CODES or attempt >= max_retries:
+        return None
+    delay = random.uniform(0, min(MAX_RETRY_DELAY_MS, base_delay_ms * 2 ** (attempt - 1))) / 1000.0
+    if time.monotonic() + delay >= deadline:
+        return None
+    return delay
 
-max_retries = 3
 
 class KeyValueClient:
-    def __init__(self, server_address='localhost:5050'): # Ensure this matches your Go server's port (50051 based on your main.go)
+    def __init__(self, server_address='localhost:5050', cache_max_bytes=0, cache_ttl_seconds=None,
+                 pool_size=1, large_channels=0, large_threshold=channelpool.LARGE_VALUE_THRESHOLD,
+                 compression=None, compression_threshold=DEFAULT_COMPRESSION_THRESHOLD): # Ensure this matches your Go server's port (50051 based on your main.go)
+        """
+        Args:
+            server_address (str): Dirección del servidor gRPC.
+            cache_max_bytes (int): Tamaño máximo en bytes de la caché de lecturas; 0 la desactiva.
+            cache_ttl_seconds (float, opcional): Tiempo de vida de las entradas de la caché.
+            pool_size (int): Canales (conexiones HTTP/2) para las peticiones pequeñas, en round-robin.
+            large_channels (int): Canales dedicados a los valores de más de large_threshold bytes
+                                  (0 = todas las peticiones comparten los mismos canales).
+            large_threshold (int): Bytes a partir de los cuales una petición usa los canales dedicados.
+            compression (str, opcional): Algoritmo con que se comprimen las peticiones grandes
+                                         ('gzip' o 'deflate'); None no comprime. Las respuestas
+                                         las comprime el servidor según su propia configuración.
+            compression_threshold (int): Bytes a partir de los cuales se comprime una petición.
+        """
         
-        options = [
-            ('grpc.max_send_message_length', 1024*1024*1024),
-            ('grpc.max_receive_message_length', 1024*1024*1024),
-        ]
         print(f"Conectando al servidor en: {server_address}")
-        self.channel = grpc.insecure_channel(server_address, options=options)
-        # Use the correct service stub name: BDStub
-        self.stub = pb_grpc.BDStub(self.channel)
+        self.compression = compression_algorithm(compression)
+        self.compression_threshold = compression_threshold
+        self.pool = channelpool.ChannelPool(server_address, pool_size, large_channels, large_threshold, CHANNEL_OPTIONS)
+        # Caché de lecturas opcional. Solo ve las escrituras de este cliente: las de otros
+        # clientes se observan cuando la entrada caduca (cache_ttl_seconds) o es expulsada.
+        self.cache = cache.ReadCache(cache_max_bytes, cache_ttl_seconds) if cache_max_bytes > 0 else None
         print("Cliente gRPC inicializado.")
 
-    def set(self, key, value, max_retries=5, base_delay_ms=20):
+    def set(self, key, value, max_retries=5, base_delay_ms=20, deadline_s=DEFAULT_DEADLINE_S):
         """
-        Intenta establecer una clave-valor, con reintentos para errores de bloqueo.
+        Intenta establecer una clave-valor, con reintentos para errores transitorios.
+
+        Solo se reintentan los códigos de estado gRPC de RETRYABLE_CODES (p. ej. UNAVAILABLE),
+        con backoff exponencial con jitter y sin pasar del plazo total deadline_s.
 
         Args:
-            key (str): La clave a establecer.
-            value (str): El valor a asociar con la clave.
-            max_retries (int): Número máximo de reintentos en caso de errores de bloqueo.
+            key (str | keycodec.Key): La clave a establecer.
+            value (str | bytes | bytearray | memoryview): El valor a asociar con la clave.
+                Un valor binario se envía en valor_binario sin pasar por str (ver
+                rawvalues.encode_insertar) y se guarda con su largo exacto, NUL finales incluidos.
+            max_retries (int): Número máximo de intentos.
             base_delay_ms (int): Retraso base en milisegundos para el backoff exponencial.
+            deadline_s (float): Plazo total en segundos para todos los intentos.
 
         Returns:
             tuple: (estado_exitoso, mensaje_o_valor)
         """
         # print(f"Intentando establecer la clave: {key}") # Comentado para reducir la salida en bulkWrite
-        retries = 0
-        message = "" # Inicializar message para el caso de no entrar al bucle o fallar en el primer intento
-        while retries < max_retries:
-            request = pb.Insertar(clave=key, valor=value)
+        binary = isinstance(value, BYTES_LIKE)
+        request = rawvalues.encode_insertar(key, value) if binary else pb.Insertar(**key_fields(key), valor=value)
+        deadline = time.monotonic() + deadline_s
+        attempt = 0
+        while True:
             try:
-                response = self.stub.set(request) # Método Set (PascalCase)
-                if response.estado:
-                    # print(f"Respuesta del servidor para '{key}': Estado = {response.estado}, Mensaje = {response.mensaje}")
-                    return response.estado, response.mensaje
-                else:
-                    message = response.mensaje # Actualizar el mensaje de error
-                    # Si el estado es False, verificamos si es un error de "bloqueo"
-                    if "bloqueo en la posición" in response.mensaje:
-                        retries += 1
-                        delay = (base_delay_ms / 1000.0) * (2 ** (retries - 1)) # Backoff exponencial
-                        # print(f"Reintentando '{key}' ({retries}/{max_retries} intentos) debido a '{response.mensaje}'. Esperando {delay:.2f}s...")
-                        time.sleep(delay)
-                    else:
-                        # Si no es un error de bloqueo, devolver el error inmediatamente
-                        # print(f"Fallo al establecer la clave '{key}' (no es bloqueo): {response.mensaje}")
-                        return response.estado, response.mensaje
+                size = len(request) if binary else len(value)
+                response = self.pool.stub(size, raw=binary).set(request, timeout=max(0.0, deadline - time.monotonic()),
+                                                                compression=call_compression(self.compression, self.compression_threshold, size))
+                if response.estado and self.cache is not None:
+                    # Write-through: la caché queda con el valor recién escrito (una copia si
+                    # es un buffer que el llamador puede modificar)
+                    self.cache.put(key, value if isinstance(value, (str, bytes)) else bytes(value))
+                return response.estado, response.mensaje
             except grpc.RpcError as e:
-                # Errores de comunicación gRPC (e.g., servidor no disponible)
-                message = str(e) # Capturar el mensaje de error gRPC
-                # print(f"Error gRPC al establecer la clave '{key}': {e}")
-                return False, str(e)
+                # No se sabe si la escritura llegó a aplicarse: la entrada en caché deja de ser fiable
+                if self.cache is not None:
+                    self.cache.invalidate(key)
+                attempt += 1
+                delay = retry_delay(e, attempt, max_retries, base_delay_ms, deadline)
+                if delay is None:
+                    return False, RpcFailure(e)
+                time.sleep(delay)
             except Exception as e:
                 # Otros errores inesperados
-                message = str(e) # Capturar el mensaje de error
-                # print(f"Error inesperado al establecer la clave '{key}': {e}")
                 return False, str(e)
-        
-        # Si se agotan los reintentos
-        return False, f"Fallo al establecer la clave '{key}' después de {max_retries} reintentos. Último mensaje: {message}"
 
 
-    def get(self, key):
-        request = pb.Consultar(clave=key)
+    def get(self, key, as_bytes=False):
+        """
+        Obtiene el valor de una clave.
+
+        Args:
+            key (str | keycodec.Key): La clave a consultar.
+            as_bytes (bool): Pedir el valor en bytes (en_bytes). La respuesta se decodifica
+                             sin copiar el valor (ver rawvalues.decode_respuesta_get).
+
+        Returns:
+            tuple: (estado_exitoso, valor_o_mensaje). Con as_bytes el valor es un memoryview
+                   de solo lectura; si no, es str (o bytes si el valor guardado no es UTF-8).
+        """
+        if self.cache is not None:
+            cached_value = self.cache.get(key)
+            if cached_value is not None:
+                return True, _cached_as(cached_value, as_bytes)
+
+        request = pb.Consultar(**key_fields(key), en_bytes=as_bytes)
         try:
-            response = self.stub.get(request) # Método Get (PascalCase)
-            # print(f"Respuesta del servidor: Estado = {response.estado}, Mensaje = {response.mensaje}")
+            if as_bytes:
+                estado, mensaje, value = self.pool.stub(raw=True).get(request)
+            else:
+                response = self.pool.stub().get(request) # Método Get (PascalCase)
+                estado, mensaje, value = response.estado, response.mensaje, object_value(response.objeto)
+            # print(f"Respuesta del servidor: Estado = {estado}, Mensaje = {mensaje}")
+            if estado and self.cache is not None:
+                self.cache.put(key, value)
             # Si el estado es True, devolver el valor del objeto. Si es False, devolver el mensaje de error.
-            return response.estado, response.objeto.valor if response.estado else response.mensaje
+            return estado, value if estado else mensaje
         except grpc.RpcError as e:
             # print(f"Error gRPC al obtener la clave: {e}")
-            return False, str(e)
+            return False, RpcFailure(e)
         except Exception as e:
             # print(f"Error inesperado al obtener la clave: {e}")
             return False, str(e)
 
 
-    def get_prefix(self, prefix):
+    @staticmethod
+    def _fragments(key, chunks, size):
+        """Genera los mensajes Fragmento de un valor: el primero lleva la clave y el tamaño total."""
+        first = True
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if first:
+                yield pb.Fragmento(**key_fields(key), tamano_total=size, datos=chunk)
+                first = False
+            else:
+                yield pb.Fragmento(datos=chunk)
+        if first: # Valor vacío
+            yield pb.Fragmento(**key_fields(key), tamano_total=size)
+
+    @staticmethod
+    def _read_chunks(source, chunk_size):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def set_from(self, key, source, size=None, chunk_size=DEFAULT_CHUNK_SIZE, max_retries=5, base_delay_ms=20, deadline_s=DEFAULT_DEADLINE_S):
+        """
+        Establece el valor de una clave enviándolo en fragmentos con el RPC setStream.
+
+        Ni el cliente ni el servidor reúnen el valor completo en memoria: el cliente lee
+        source de a chunk_size bytes y el servidor escribe cada fragmento directamente en
+        values.db. El valor anterior de la clave sigue visible hasta que llega el último
+        fragmento.
+
+        Args:
+            key (str | keycodec.Key): La clave a establecer.
+            source: Archivo abierto en modo binario, o iterable de fragmentos bytes/str.
+            size (int, opcional): Tamaño total en bytes del valor. Con un archivo se calcula
+                                  desde la posición actual hasta el final; con un iterable es
+                                  obligatorio.
+            chunk_size (int): Bytes leídos del archivo por fragmento.
+            max_retries (int): Número máximo de intentos. Solo se reintenta si source es un
+                               archivo con seek (un iterable no se puede volver a recorrer).
+            base_delay_ms (int): Retraso base en milisegundos para el backoff exponencial.
+            deadline_s (float): Plazo total en segundos para todos los intentos.
+
+        Returns:
+            tuple: (estado_exitoso, mensaje)
+        """
+        is_file = hasattr(source, 'read')
+        start = None
+        if is_file and source.seekable():
+            start = source.tell()
+            if size is None:
+                size = source.seek(0, 2) - start
+                source.seek(start)
+        if size is None:
+            return False, "set_from necesita size si source no es un archivo con seek"
+        if start is None:
+            max_retries = 1
+
+        # Un valor escrito en fragmentos puede no ser texto: no se guarda en la caché
+        if self.cache is not None:
+            self.cache.invalidate(key)
+        deadline = time.monotonic() + deadline_s
+        attempt = 0
+        while True:
+            chunks = self._read_chunks(source, chunk_size) if is_file else source
+            try:
+                response = self.pool.stub(size).setStream(self._fragments(key, chunks, size), timeout=max(0.0, deadline - time.monotonic()),
+                                                          compression=call_compression(self.compression, self.compression_threshold, size))
+                return response.estado, response.mensaje
+            except grpc.RpcError as e:
+                attempt += 1
+                delay = retry_delay(e, attempt, max_retries, base_delay_ms, deadline)
+                if delay is None:
+                    return False, RpcFailure(e)
+                time.sleep(delay)
+                source.seek(start)
+            except Exception as e:
+                return False, str(e)
+
+    def get_into(self, key, writable):
+        """
+        Obtiene el valor de una clave con el RPC getStream y lo escribe en writable a medida
+        que llegan los fragmentos, sin reunirlo en memoria. A diferencia de get, sirve para
+        valores que no son texto UTF-8.
+
+        Args:
+            key (str | keycodec.Key): La clave a consultar.
+            writable: Objeto con write(bytes), p. ej. un archivo abierto en modo binario.
+
+        Returns:
+            tuple: (True, bytes_escritos) o (False, mensaje de error). Si el stream falla a
+                   mitad, writable puede haber recibido parte del valor.
+        """
+        request = pb.Consultar(**key_fields(key))
+        written = 0
+        try:
+            for fragmento in self.pool.stub(large_response=True).getStream(request):
+                writable.write(fragmento.datos)
+                written += len(fragmento.datos)
+            return True, written
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.NOT_FOUND:
+                return False, e.details()
+            return False, RpcFailure(e)
+
+    def set_many(self, items, max_batch_bytes=DEFAULT_BATCH_MAX_BYTES, max_retries=5, base_delay_ms=20, deadline_s=DEFAULT_DEADLINE_S):
+        """
+        Establece varias claves con el RPC multiSet, agrupándolas en lotes de como máximo
+        max_batch_bytes de carga útil (un elemento mayor que el límite viaja solo).
+        Los lotes que fallan con un código reintentable se reintentan como en set.
+
+        Args:
+            items (list): Lista de tuplas (clave, valor); los valores binarios (bytes,
+                          bytearray, memoryview) van en valor_binario.
+            max_batch_bytes (int): Tamaño máximo aproximado de cada lote (claves + valores).
+            max_retries (int): Número máximo de intentos por lote.
+            base_delay_ms (int): Retraso base en milisegundos para el backoff exponencial.
+            deadline_s (float): Plazo total en segundos para cada lote y sus reintentos.
+
+        Returns:
+            list: Un (estado_exitoso, mensaje) por elemento, en el mismo orden que items.
+        """
+        results = [None] * len(items)
+        for batch in self._chunk_by_bytes(range(len(items)), items, max_batch_bytes):
+            request = pb.InsertarLote(elementos=[pb.Insertar(**key_fields(items[i][0]), **value_fields(items[i][1])) for i in batch])
+            batch_bytes = sum(len(items[i][1]) for i in batch)
+            deadline = time.monotonic() + deadline_s
+            attempt = 0
+            while True:
+                try:
+                    response = self.pool.stub(batch_bytes).multiSet(request, timeout=max(0.0, deadline - time.monotonic()),
+                                                                    compression=call_compression(self.compression, self.compression_threshold, batch_bytes))
+                except grpc.RpcError as e:
+                    if self.cache is not None:
+                        for i in batch:
+                            self.cache.invalidate(items[i][0])
+                    attempt += 1
+                    delay = retry_delay(e, attempt, max_retries, base_delay_ms, deadline)
+                    if delay is None:
+                        for i in batch:
+                            results[i] = (False, RpcFailure(e))
+                        break
+                    time.sleep(delay)
+                    continue
+                for i, item_response in zip(batch, response.respuestas):
+                    results[i] = (item_response.estado, item_response.mensaje)
+                    if item_response.estado and self.cache is not None:
+                        value = items[i][1]
+                        self.cache.put(items[i][0], value if isinstance(value, (str, bytes)) else bytes(value))
+                break
+        return results
+
+    @staticmethod
+    def _chunk_by_bytes(indices, items, max_batch_bytes):
+        """
+        Agrupa los índices de items en lotes cuya carga (clave + valor) no supere max_batch_bytes.
+        """
+        batch = []
+        batch_bytes = 0
+        for i in indices:
+            item_bytes = len(items[i][0]) + len(items[i][1])
+            if batch and batch_bytes + item_bytes > max_batch_bytes:
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append(i)
+            batch_bytes += item_bytes
+        if batch:
+            yield batch
+
+    def get_many(self, keys, max_batch_keys=DEFAULT_BATCH_MAX_KEYS, as_bytes=False):
+        """
+        Obtiene varias claves con el RPC multiGet. El tamaño de los valores no se conoce de
+        antemano, así que los lotes se limitan por número de claves (64 valores de 4MB = 256MB).
+
+        Args:
+            keys (list): Claves a leer.
+            max_batch_keys (int): Número máximo de claves por lote.
+            as_bytes (bool): Pedir los valores en bytes (en_bytes).
+
+        Returns:
+            list: Un (estado, valor_o_mensaje) por clave, en el mismo orden que keys.
+        """
+        results = [None] * len(keys)
+        pending = []
+        for i, key in enumerate(keys):
+            cached_value = self.cache.get(key) if self.cache is not None else None
+            if cached_value is not None:
+                results[i] = (True, _cached_as(cached_value, as_bytes))
+            else:
+                pending.append(i)
+
+        for start in range(0, len(pending), max_batch_keys):
+            batch = pending[start:start + max_batch_keys]
+            request = pb.ConsultarLote(elementos=[pb.Consultar(**key_fields(keys[i]), en_bytes=as_bytes) for i in batch])
+            try:
+                response = self.pool.stub(large_response=True).multiGet(request)
+            except grpc.RpcError as e:
+                for i in batch:
+                    results[i] = (False, RpcFailure(e))
+                continue
+            for i, item_response in zip(batch, response.respuestas):
+                if item_response.estado:
+                    value = object_value(item_response.objeto, as_bytes)
+                    results[i] = (True, value)
+                    if self.cache is not None:
+                        self.cache.put(keys[i], value)
+                else:
+                    results[i] = (False, item_response.mensaje)
+        return results
+
+    def get_prefix(self, prefix, as_bytes=False):
         print(f"Intentando obtener valores con el prefijo: {prefix}")
         # Use the correct request message name: Consultar for GetPrefix (if that's what your proto means)
         # Your proto has: rpc getPrefix (Consultar)
-        request = pb.Consultar(clave=prefix) # Assuming 'clave' is used for prefix
+        # Un prefijo bytes busca claves binarias; con as_bytes los valores llegan en valor_binario
+        request = pb.Consultar(**key_fields(prefix), en_bytes=as_bytes)
         try:
             # Call the correct method name: GetPrefix
-            response = self.stub.getPrefix(request)
-            print(f"Respuesta del servidor: Estado = {response.estado}, Mensaje = {response.mensaje}, Objetos = {response.objetos}")
+            response = self.pool.stub(large_response=True).getPrefix(request)
+            print(f"Respuesta del servidor: Estado = {response.estado}, Mensaje = {response.mensaje}, Objetos = {len(response.objetos)}")
             return response.estado, response.objetos # Return state and list of objects
         except grpc.RpcError as e:
             print(f"Error gRPC al obtener el prefijo: {e}")
             return False, str(e)
 
+    def iter_prefix(self, prefix, keys_only=False, limit=0, cursor='', as_bytes=False):
+        """
+        Recorre los objetos cuya clave empieza por prefix usando el RPC en streaming.
+
+        A diferencia de get_prefix, el servidor envía los objetos de uno en uno y en orden
+        de clave, así que ni el servidor ni el cliente mantienen el resultado completo en
+        memoria. Si el recorrido se interrumpe, se puede reanudar pasando como cursor la
+        última clave recibida.
+
+        Args:
+            prefix (str | bytes): Prefijo de las claves buscadas; con bytes se recorren las
+                                  claves binarias comparando sus 16 bytes.
+            keys_only (bool): Si es True, el servidor solo envía las claves (valor vacío).
+            limit (int): Máximo de objetos a recibir (0 = sin límite).
+            cursor (str | keycodec.Key): Recibir solo las claves mayores que cursor.
+            as_bytes (bool): Pedir los valores en valor_binario (en_bytes).
+
+        Yields:
+            Objeto: Cada objeto (clave, valor) encontrado. Las claves binarias llegan en
+                    clave_binaria (sus 16 bytes) en lugar de clave, y los valores que no son
+                    texto UTF-8 en valor_binario (ver object_value).
+
+        Raises:
+            grpc.RpcError: Si la llamada o el stream fallan.
+        """
+        request = pb.ConsultarPrefijo(**prefix_fields(prefix, cursor), solo_claves=keys_only, limite=limit, en_bytes=as_bytes)
+        yield from self.pool.stub(large_response=not keys_only).getPrefixStream(request)
+
     def reset_db(self):
         print("Intentando resetear la base de datos")
         request = pb.RequestResetDb()
         try:
             # Call the correct method name: GetPrefix
-            response = self.stub.resetDb(request)
+            response = self.pool.stub().resetDb(request)
             print(f"Respuesta del servidor: Estado = {response.estado}, Mensaje = {response.mensaje}")
+            if self.cache is not None:
+                self.cache.clear()
             return response.estado, response.mensaje # Return state and list of objects
         except grpc.RpcError as e:
             print(f"Error gRPC al resetear la base de datos: {e}")
+            if self.cache is not None:
+                self.cache.clear()
             return False, str(e)
 
+    def cache_stats(self):
+        """
+        Devuelve los contadores de la caché de lecturas (hits, misses, evictions, bytes_saved...),
+        o None si la caché está desactivada.
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def channel_health(self):
+        """
+        Devuelve el estado de conectividad de cada canal del pool: {'small': [...], 'large': [...]}.
+        """
+        return self.pool.health()
+
+    def close(self):
+        print("Cerrando la conexión con el servidor.")
+        self.pool.close()
+        print("Conexión cerrada.")
+
+
+class ShardedKeyValueClient:
+    """
+    Cliente que reparte las claves entre varios servidores con hashing consistente.
+
+    Mantiene un KeyValueClient (un canal) por nodo y enruta cada set/get al nodo dueño
+    de la clave según un hashring.ConsistentHashRing con nodos virtuales. get_prefix
+    consulta todos los nodos en paralelo y une los resultados.
+
+    add_node/remove_node solo cambian el enrutamiento (≈1/N de las claves cambia de
+    nodo); no copian los datos ya escritos entre servidores.
+    """
+    def __init__(self, server_addresses, virtual_nodes=hashring.DEFAULT_VIRTUAL_NODES, **client_options):
+        """
+        Args:
+            server_addresses (list): Direcciones de los nodos, p. ej. ['localhost:5050', 'localhost:5051'].
+            virtual_nodes (int): Nodos virtuales por servidor en el anillo.
+            **client_options: Opciones adicionales para cada KeyValueClient (p. ej. cache_max_bytes).
+        """
+        self.client_options = client_options
+        self.ring = hashring.ConsistentHashRing(virtual_nodes=virtual_nodes)
+        self.clients = {}
+        self.shard_ops = {}
+        for address in server_addresses:
+            self.add_node(address)
+
+    def add_node(self, address):
+        """Abre un canal con address y lo añade al anillo."""
+        if address in self.clients:
+            return
+        self.clients[address] = KeyValueClient(address, **self.client_options)
+        self.shard_ops[address] = 0
+        self.ring.add_node(address)
+
+    def remove_node(self, address):
+        """Quita address del anillo y cierra su canal."""
+        if address not in self.clients:
+            return
+        self.ring.remove_node(address)
+        self.clients.pop(address).close()
+        self.shard_ops.pop(address)
+
+    def _client_for(self, key):
+        address = self.ring.get_node(key)
+        self.shard_ops[address] += 1
+        return self.clients[address]
+
+    def set(self, key, value, max_retries=5, base_delay_ms=20, deadline_s=DEFAULT_DEADLINE_S):
+        return self._client_for(key).set(key, value, max_retries, base_delay_ms, deadline_s)
+
+    def get(self, key, as_bytes=False):
+        return self._client_for(key).get(key, as_bytes)
+
+    def set_from(self, key, source, size=None, chunk_size=DEFAULT_CHUNK_SIZE, max_retries=5, base_delay_ms=20, deadline_s=DEFAULT_DEADLINE_S):
+        return self._client_for(key).set_from(key, source, size, chunk_size, max_retries, base_delay_ms, deadline_s)
+
+    def get_into(self, key, writable):
+        return self._client_for(key).get_into(key, writable)
+
+    def _group_by_node(self, keys):
+        """
+        Agrupa los índices de keys por el nodo dueño de cada clave.
+        """
+        groups = {}
+        for i, key in enumerate(keys):
+            address = self.ring.get_node(key)
+            self.shard_ops[address] += 1
+            groups.setdefault(address, []).append(i)
+        return groups
+
+    def set_many(self, items, max_batch_bytes=DEFAULT_BATCH_MAX_BYTES, max_retries=5, base_delay_ms=20, deadline_s=DEFAULT_DEADLINE_S):
+        results = [None] * len(items)
+        for address, indices in self._group_by_node([key for key, _ in items]).items():
+            node_results = self.clients[address].set_many([items[i] for i in indices], max_batch_bytes, max_retries, base_delay_ms, deadline_s)
+            for i, result in zip(indices, node_results):
+                results[i] = result
+        return results
+
+    def get_many(self, keys, max_batch_keys=DEFAULT_BATCH_MAX_KEYS, as_bytes=False):
+        results = [None] * len(keys)
+        for address, indices in self._group_by_node(keys).items():
+            node_results = self.clients[address].get_many([keys[i] for i in indices], max_batch_keys, as_bytes)
+            for i, result in zip(indices, node_results):
+                results[i] = result
+        return results
+
+    def _fan_out(self, method_name, *args):
+        """
+        Ejecuta el método indicado en todos los nodos en paralelo.
+
+        Returns:
+            dict: {dirección: resultado del método en ese nodo}
+        """
+        with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+            futures = {address: executor.submit(getattr(client, method_name), *args) for address, client in self.clients.items()}
+            return {address: future.result() for address, future in futures.items()}
+
+    def get_prefix(self, prefix, as_bytes=False):
+        objetos = []
+        for address, (estado, resultado) in self._fan_out('get_prefix', prefix, as_bytes).items():
+            if not estado:
+                return False, f"Error en el nodo {address}: {resultado}"
+            objetos.extend(resultado)
+        return True, objetos
+
+    def iter_prefix(self, prefix, keys_only=False, limit=0, cursor='', as_bytes=False):
+        """
+        Recorre en orden de clave los objetos con el prefijo de todos los nodos.
+
+        Cada nodo envía sus objetos ya ordenados, así que basta mezclar los streams con
+        heapq.merge: en memoria solo hay un objeto pendiente por nodo.
+        """
+        streams = [client.iter_prefix(prefix, keys_only, limit, cursor, as_bytes) for client in self.clients.values()]
+        # Las claves de texto se ordenan por su UTF-8 (el mismo orden que el de la cadena) y
+        # las binarias por sus bytes, después de todas las de texto (ver keycodec.index_key)
+        merged = heapq.merge(*streams, key=lambda objeto: keycodec.index_key(objeto.clave, objeto.clave_binaria))
+        if limit > 0:
+            merged = itertools.islice(merged, limit)
+        yield from merged
+
+    def reset_db(self):
+        errores = [f"{address}: {mensaje}" for address, (estado, mensaje) in self._fan_out('reset_db').items() if not estado]
+        if errores:
+            return False, "; ".join(errores)
+        return True, "OK"
+
+    def cache_stats(self):
+        """
+        Devuelve los contadores de caché sumados de todos los nodos, o None si la caché está desactivada.
+        """
+        per_node = [client.cache_stats() for client in self.clients.values()]
+        if not per_node or per_node[0] is None:
+            return None
+        stats = {name: sum(node[name] for node in per_node) for name in per_node[0] if name != "hit_ratio"}
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0
+        return stats
+
+    def shard_stats(self):
+        """
+        Devuelve cuántas operaciones de clave (set/get) se enrutaron a cada nodo y su fracción del total.
+        """
+        total = sum(self.shard_ops.values())
+        return {address: {"ops": ops, "share": ops / total if total else 0} for address, ops in self.shard_ops.items()}
+
     def close(self):
+        for client in self.clients.values():
+            client.close()
+
+
+class AsyncKeyValueClient:
+    """
+    Cliente asíncrono basado en grpc.aio.
+
+    Expone la misma interfaz que KeyValueClient (set/get/get_prefix/reset_db),
+    pero cada método es una corrutina, lo que permite mantener muchas peticiones
+    en vuelo sobre un mismo canal. El número de peticiones simultáneas se limita
+    con un semáforo (max_in_flight).
+    """
+    def __init__(self, server_address='localhost:5050', max_in_flight=64, compression=None,
+                 compression_threshold=DEFAULT_COMPRESSION_THRESHOLD):
+        print(f"Conectando (asyncio) al servidor en: {server_address}")
+        self.compression = compression_algorithm(compression)
+        self.compression_threshold = compression_threshold
+        self.channel = grpc.aio.insecure_channel(server_address, options=CHANNEL_OPTIONS)
+        self.stub = pb_grpc.BDStub(self.channel)
+        self.max_in_flight = max_in_flight
+        self._semaforo = asyncio.Semaphore(max_in_flight)
+        print(f"Cliente gRPC asíncrono inicializado (máximo {max_in_flight} peticiones en vuelo).")
+
+    async def set(self, key, value, max_retries=5, base_delay_ms=20, deadline_s=DEFAULT_DEADLINE_S):
+        """
+        Versión asíncrona de KeyValueClient.set, con los mismos reintentos para
+        códigos transitorios pero esperando con asyncio.sleep.
+
+        Returns:
+            tuple: (estado_exitoso, mensaje_o_valor)
+        """
+        request = pb.Insertar(**key_fields(key), **value_fields(value))
+        compression = call_compression(self.compression, self.compression_threshold, len(value))
+        deadline = time.monotonic() + deadline_s
+        attempt = 0
+        while True:
+            try:
+                async with self._semaforo:
+                    response = await self.stub.set(request, timeout=max(0.0, deadline - time.monotonic()), compression=compression)
+                return response.estado, response.mensaje
+            except grpc.RpcError as e:
+                attempt += 1
+                delay = retry_delay(e, attempt, max_retries, base_delay_ms, deadline)
+                if delay is None:
+                    return False, RpcFailure(e)
+                # El semáforo ya se liberó: la espera no ocupa un hueco de petición en vuelo
+                await asyncio.sleep(delay)
+            except Exception as e:
+                return False, str(e)
+
+    async def get(self, key, as_bytes=False):
+        request = pb.Consultar(**key_fields(key), en_bytes=as_bytes)
+        try:
+            async with self._semaforo:
+                response = await self.stub.get(request)
+            return response.estado, object_value(response.objeto, as_bytes) if response.estado else response.mensaje
+        except grpc.RpcError as e:
+            return False, RpcFailure(e)
+        except Exception as e:
+            return False, str(e)
+
+    async def get_prefix(self, prefix, as_bytes=False):
+        request = pb.Consultar(**key_fields(prefix), en_bytes=as_bytes)
+        try:
+            async with self._semaforo:
+                response = await self.stub.getPrefix(request)
+            return response.estado, response.objetos
+        except grpc.RpcError as e:
+            print(f"Error gRPC al obtener el prefijo: {e}")
+            return False, str(e)
+
+    async def iter_prefix(self, prefix, keys_only=False, limit=0, cursor='', as_bytes=False):
+        """
+        Versión asíncrona de KeyValueClient.iter_prefix: iterador asíncrono sobre los
+        objetos con el prefijo, recibidos en streaming y en orden de clave.
+        """
+        request = pb.ConsultarPrefijo(**prefix_fields(prefix, cursor), solo_claves=keys_only, limite=limit, en_bytes=as_bytes)
+        async with self._semaforo:
+            async for objeto in self.stub.getPrefixStream(request):
+                yield objeto
+
+    async def reset_db(self):
+        print("Intentando resetear la base de datos")
+        request = pb.RequestResetDb()
+        try:
+            async with self._semaforo:
+                response = await self.stub.resetDb(request)
+            print(f"Respuesta del servidor: Estado = {response.estado}, Mensaje = {response.mensaje}")
+            return response.estado, response.mensaje
+        except grpc.RpcError as e:
+            print(f"Error gRPC al resetear la base de datos: {e}")
+            return False, str(e)
+
+    async def close(self):
         print("Cerrando la conexión con el servidor.")
-        self.channel.close()
-        print("Conexión cerrada.")
\ No newline at end of file
+        await self.channel.close()
+        print("Conexión cerrada.")
@@ -0,0 +1,213 @@
+import asyncio
+import random
+import time
+
+import histogram
+
+# Distribuciones de llegada del generador en lazo abierto
+ARRIVALS = ('constant', 'poisson')
+
+# Peticiones en vuelo por defecto en lazo abierto. Las llegadas por encima del tope esperan
+# un hueco sin haber armado su petición (ver run_open_loop), así que la memoria queda
+# acotada aunque el servidor se sature; la espera sigue contando en la latencia.
+DEFAULT_MAX_IN_FLIGHT = 128
+
+# Un escalón está saturado si el throughput logrado queda por debajo de esta fracción del pedido
+SATURATION_RATIO = 0.9
+# El codo de la curva es el primer escalón cuyo p99 supera este múltiplo del p99 del primero
+KNEE_FACTOR = 2.0
+
+
+def arrival_offsets(rate, count, arrivals='constant', rng=None):
+    """
+    Genera los instantes de envío previstos, en ns desde el inicio, de count peticiones
+    a rate peticiones por segundo.
+
+    Args:
+        rate (float): Peticiones por segundo.
+        count (int): Número de peticiones.
+        arrivals (str): 'constant' (intervalo fijo de 1/rate) o 'poisson' (intervalos
+                        exponenciales de media 1/rate).
+        rng (random.Random, opcional): Generador para las llegadas de Poisson.
+
+    Returns:
+        generator: count desplazamientos en nanosegundos, crecientes.
+    """
+    if arrivals not in ARRIVALS:
+        raise ValueError(f"distribución de llegadas desconocida: {arrivals}")
+    rng = rng or random.Random()
+    offset = 0.0
+    for i in range(count):
+        if arrivals == 'constant':
+            offset = i / rate
+        else:
+            offset += rng.expovariate(rate)
+        yield int(offset * 1e9)
+
+
+async def run_open_loop(operation, rate, count, arrivals='constant', rng=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT, prepare=None):
+    """
+    Ejecuta count peticiones en lazo abierto: cada una se envía en su instante previsto,
+    sin esperar a que terminen las anteriores, así que una petición lenta no frena la carga.
+
+    La latencia se mide desde el instante previsto de envío y no desde el envío real
+    (corrección de la omisión coordinada): si el servidor o el propio cliente se atrasan,
+    la espera acumulada cuenta en la latencia, como la vería un usuario que llegó a su hora.
+    También se registra el tiempo de servicio, desde el envío real, para compararlos.
+
+    Cada llegada espera un hueco de max_in_flight antes de armar su petición con prepare,
+    así que con el servidor saturado las llegadas atrasadas solo ocupan una tarea sin datos
+    y la memoria no crece con la cola. prepare queda fuera del tiempo de servicio.
+
+    Args:
+        operation (callable): Corrutina operation(datos) que envía una petición y devuelve
+                              (estado, mensaje) como los métodos del cliente asíncrono.
+        rate (float): Peticiones por segundo.
+        count (int): Número de peticiones.
+        arrivals (str): Distribución de llegadas ('constant' o 'poisson').
+        rng (random.Random, opcional): Generador para las llegadas de Poisson.
+        max_in_flight (int): Peticiones armadas o en vuelo a la vez.
+        prepare (callable, opcional): prepare(i) arma los datos de la petición i que recibe
+                                      operation; por defecto operation recibe i.
+
+    Returns:
+        dict: rate, count, success, failure, failure_messages, elapsed (s, hasta la última
+              respuesta), ops_per_sec logrado, max_schedule_lag_ms (mayor atraso del propio
+              generador al enviar) y los histogramas 'histogram' (desde el instante previsto)
+              y 'service_histogram' (desde el envío real).
+    """
+    latency_histogram = histogram.LatencyHistogram()
+    service_histogram = histogram.LatencyHistogram()
+    result = {"rate": rate, "count": count, "success": 0, "failure": 0, "failure_messages": []}
+    last_completion = start = time.perf_counter_ns()
+    max_lag = 0
+
+    huecos = asyncio.Semaphore(max_in_flight)
+
+    async def enviar(i, intended):
+        nonlocal last_completion
+        async with huecos:
+            datos = prepare(i) if prepare is not None else i
+            sent = time.perf_counter_ns()
+            status, message = await operation(datos)
+            done = time.perf_counter_ns()
+        latency_histogram.record(done - intended)
+        service_histogram.record(done - sent)
+        last_completion = max(last_completion, done)
+        if status:
+            result["success"] += 1
+        else:
+            result["failure"] += 1
+            result["failure_messages"].append(f"Petición {i}: {message}")
+
+    pendientes = set()
+    for i, offset in enumerate(arrival_offsets(rate, count, arrivals, rng)):
+        intended = start + offset
+        delay = intended - time.perf_counter_ns()
+        if delay > 0:
+            await asyncio.sleep(delay / 1e9)
+        else:
+            max_lag = max(max_lag, -delay)
+        tarea = asyncio.create_task(enviar(i, intended))
+        pendientes.add(tarea)
+        tarea.add_done_callback(pendientes.discard)
+    if pendientes:
+        await asyncio.gather(*pendientes)
+
+    elapsed = (last_completion - start) / 1e9
+    result.update({
+        "elapsed": elapsed,
+        "ops_per_sec": count / elapsed if elapsed > 0 else 0,
+        "max_schedule_lag_ms": max_lag / 1e6,
+        "histogram": latency_histogram,
+        "service_histogram": service_histogram,
+    })
+    return result
+
+
+def is_saturated(step):
+    """Indica si un escalón no alcanzó el throughput pedido o tuvo fallos."""
+    return step["failure"] > 0 or step["ops_per_sec"] < SATURATION_RATIO * step["rate"]
+
+
+async def run_rate_ramp(operation, rates, step_seconds, arrivals='constant', rng=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT, prepare=None):
+    """
+    Ejecuta un escalón en lazo abierto por cada tasa de rates (de step_seconds segundos
+    cada uno) hasta el primero saturado, para encontrar el throughput de saturación y el
+    codo de la curva de latencia.
+
+    Args:
+        operation (callable): Corrutina operation(datos), como en run_open_loop.
+        rates (list): Tasas en peticiones por segundo, crecientes.
+        step_seconds (float): Duración prevista de cada escalón.
+        arrivals (str): Distribución de llegadas ('constant' o 'poisson').
+        rng (random.Random, opcional): Generador para las llegadas de Poisson.
+        max_in_flight (int): Peticiones armadas o en vuelo a la vez, como en run_open_loop.
+        prepare (callable, opcional): prepare(i), como en run_open_loop. i es global a toda
+                                      la rampa, no se reinicia en cada escalón.
+
+    Returns:
+        list: El resultado de run_open_loop de cada escalón ejecutado.
+    """
+    steps = []
+    first = 0
+    for rate in rates:
+        count = max(1, int(rate * step_seconds))
+        print(f"  >> Escalón de {rate:g} ops/s ({count} peticiones, llegadas {arrivals})...")
+        prepare_step = (lambda i, first=first: prepare(first + i)) if prepare is not None else (lambda i, first=first: first + i)
+        step = await run_open_loop(operation, rate, count, arrivals, rng, max_in_flight, prepare_step)
+        first += count
+        steps.append(step)
+        print_step(step)
+        if is_saturated(step):
+            print("     Saturado: se detiene la rampa.")
+            break
+    return steps
+
+
+def find_knee(steps):
+    """
+    Devuelve el índice del primer escalón cuyo p99 supera KNEE_FACTOR veces el p99 del
+    primero, o None si la latencia no se dispara en la rampa.
+    """
+    if not steps:
+        return None
+    base_p99 = steps[0]["histogram"].percentile_ns(99.0)
+    for index, step in enumerate(steps[1:], start=1):
+        if step["histogram"].percentile_ns(99.0) > KNEE_FACTOR * base_p99:
+            return index
+    return None
+
+
+def print_step(step):
+    """Imprime el resumen de un escalón en lazo abierto."""
+    latency = step["histogram"].summary()
+    service = step["service_histogram"].summary()
+    print(f"     Pedido: {step['rate']:.2f} ops/s, logrado: {step['ops_per_sec']:.2f} ops/s. "
+          f"Éxitos: {step['success']}, Fallos: {step['failure']}")
+    print(f"     Latencia (desde el envío previsto): p50={latency['p50_latency_ms']:.2f}ms, "
+          f"p99={latency['p99_latency_ms']:.2f}ms, max={latency['max_latency_ms']:.2f}ms")
+    print(f"     Tiempo de servicio (desde el envío real): p50={service['p50_latency_ms']:.2f}ms, "
+          f"p99={service['p99_latency_ms']:.2f}ms")
+    if step["max_schedule_lag_ms"] > 1:
+        print(f"     Advertencia: el generador llegó a enviar con {step['max_schedule_lag_ms']:.2f} ms de atraso")
+
+
+def print_ramp_report(steps):
+    """Imprime la tabla de la rampa con el throughput de saturación y el codo de la curva."""
+    print("\n--- Rampa de tasa en lazo abierto ---")
+    print(f"  {'Pedido':>10} {'Logrado':>10} {'p50':>9} {'p99':>9} {'p99 serv.':>10} {'Fallos':>7}")
+    for step in steps:
+        latency = step["histogram"].summary()
+        service = step["service_histogram"].summary()
+        print(f"  {step['rate']:>10.2f} {step['ops_per_sec']:>10.2f} {latency['p50_latency_ms']:>7.2f}ms "
+              f"{latency['p99_latency_ms']:>7.2f}ms {service['p99_latency_ms']:>8.2f}ms {step['failure']:>7}")
+    if not steps:
+        return
+    print(f"  Throughput de saturación: {max(step['ops_per_sec'] for step in steps):.2f} ops/s")
+    knee = find_knee(steps)
+    if knee is None:
+        print(f"  Codo de la curva: no encontrado (el p99 no superó {KNEE_FACTOR:g}x el del primer escalón)")
+    else:
+        print(f"  Codo de la curva: entre {steps[knee - 1]['rate']:g} y {steps[knee]['rate']:g} ops/s "
+              f"(p99 > {KNEE_FACTOR:g}x el del primer escalón)")
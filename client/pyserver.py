@@ -0,0 +1,570 @@
+import argparse
+import array
+import asyncio
+import contextlib
+import mmap
+import os
+import threading
+
+import grpc
+import conexion_pb2 as pb
+import conexion_pb2_grpc as pb_grpc
+import dbreader
+import keycodec
+import lbclient
+
+# Bytes de clave que guarda cada registro InfClave; las claves más largas se truncan
+KEY_BYTES = 16
+RECORD_SIZE = dbreader.RECORD_DTYPE.itemsize
+
+# Opciones del servidor: las del canal más permitir los pings de keepalive de los clientes
+# (cada lbclient.KEEPALIVE_TIME_MS), que con la configuración por defecto se rechazarían
+SERVER_OPTIONS = lbclient.CHANNEL_OPTIONS + [
+    ('grpc.http2.min_ping_interval_without_data_ms', lbclient.KEEPALIVE_TIME_MS // 2),
+    ('grpc.http2.max_ping_strikes', 0),
+]
+
+# Metadata interna de gRPC core con el algoritmo de compresión de los mensajes que envía
+# una llamada (ver BDServicer._compress)
+COMPRESSION_METADATA_KEY = 'grpc-internal-encoding-request'
+
+
+def size_class(length):
+    """Devuelve el tamaño de bloque en el que cabe un valor de length bytes, o None si supera 4MB."""
+    for size in dbreader.SIZE_CLASSES:
+        if length <= size:
+            return size
+    return None
+
+
+def stored_key(key):
+    """
+    Devuelve la clave tal como queda en el índice, como la forma interna del servidor Go:
+    los primeros 16 bytes UTF-8 de una cadena, o keycodec.BINARY_KEY_TAG seguido de los 16
+    bytes de una keycodec.Key, así que una clave binaria nunca coincide con una de texto.
+    Una clave que ya viene del índice (bytes) se devuelve tal cual.
+    """
+    if isinstance(key, keycodec.Key):
+        return keycodec.BINARY_KEY_TAG + key.raw
+    if isinstance(key, bytes):
+        return key
+    return key.encode('utf-8')[:KEY_BYTES]
+
+
+def is_binary_key(clave):
+    """Indica si una clave del índice es binaria (ver stored_key)."""
+    return len(clave) == KEY_BYTES + 1 and clave.startswith(keycodec.BINARY_KEY_TAG)
+
+
+def request_key(clave, clave_binaria):
+    """
+    Devuelve la clave de una petición: una keycodec.Key si trae clave_binaria o la cadena.
+
+    Raises:
+        ValueError: Si la clave binaria no es válida.
+    """
+    return keycodec.Key(clave_binaria) if clave_binaria else clave
+
+
+def response_key_fields(clave, binary):
+    """
+    Devuelve el campo de clave de un Objeto de respuesta para una clave del índice, como
+    objetoDeClave en el servidor Go: clave_binaria (los 16 bytes) si la clave es binaria,
+    si la petición era binaria o si la clave no es UTF-8, y clave si no.
+    """
+    if is_binary_key(clave):
+        return {'clave_binaria': clave[1:]}
+    if not binary:
+        try:
+            return {'clave': clave.decode('utf-8')}
+        except UnicodeDecodeError:
+            pass
+    return {'clave_binaria': clave.ljust(KEY_BYTES, b'\x00')}
+
+
+def value_fields(valor, as_bytes):
+    """
+    Devuelve el campo de valor de un Objeto de respuesta, como asignarValor en el servidor
+    Go: valor_binario si la petición lo pidió (en_bytes) o el valor no es UTF-8, y valor si no.
+    """
+    if not as_bytes:
+        try:
+            return {'valor': valor.decode('utf-8')}
+        except UnicodeDecodeError:
+            pass
+    return {'valor_binario': valor}
+
+
+class OffsetStore:
+    """
+    Almacenamiento sobre keys.db / values.db que solo guarda en memoria la ubicación de
+    cada valor, no el valor.
+
+    El índice es un diccionario clave -> número de registro en keys.db más tres arreglos
+    compactos (array.array) con la dirección, el tamaño de bloque y el largo del valor de
+    cada registro, unos 16 bytes por clave además de la propia clave. Los valores se leen con os.pread (o de un
+    mmap de values.db) sobre descriptores que quedan abiertos, así que la memoria residente
+    no crece con el tamaño de los valores.
+
+    A diferencia del servidor Go, cada escritura va a un bloque nuevo al final de values.db
+    y el índice pasa a apuntarlo en commit(): un get concurrente sigue leyendo el bloque
+    anterior completo y dos escrituras de la misma clave no se mezclan. Los bloques
+    anteriores se recuperan con compactor.py.
+    """
+    def __init__(self, db_dir='./db', use_mmap=False, values_in_memory=False):
+        self.db_dir = db_dir
+        self.use_mmap = use_mmap
+        # Modo de comparación: además guarda los valores en memoria, como tablaHash del servidor Go
+        self.values_in_memory = values_in_memory
+        self.values_cache = {}
+        os.makedirs(db_dir, exist_ok=True)
+        self._seek_lock = threading.Lock() # Solo se usa si el sistema no tiene os.pread (Windows)
+        self._map_lock = threading.Lock()
+        self._map = None
+        self._open()
+        self.load()
+
+    def _open(self):
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        self.keys_fd = os.open(os.path.join(self.db_dir, 'keys.db'), flags, 0o644)
+        self.values_fd = os.open(os.path.join(self.db_dir, 'values.db'), flags, 0o644)
+
+    def load(self):
+        """
+        Construye el índice a partir de keys.db. Como en el servidor Go, si una clave
+        aparece varias veces gana el último registro; los valores no se leen salvo en el
+        modo values_in_memory.
+        """
+        with dbreader.StoreReader(self.db_dir) as reader:
+            live = reader.live_indices()
+            self.dirs = array.array('q', reader.records['dir'].tobytes())
+            self.tams = array.array('i', reader.block_sizes.tobytes())
+            self.lens = array.array('i', reader.lengths.tobytes())
+            claves = [keycodec.BINARY_KEY_TAG + clave.ljust(KEY_BYTES, b'\x00') if binaria else clave
+                      for clave, binaria in zip(reader.records['clave'][live].tolist(), reader.binary_keys[live].tolist())]
+            self.slots = dict(zip(claves, live.tolist()))
+            self.next_slot = len(reader.records)
+            self.values_end = reader.values_size
+        if self.values_in_memory:
+            self.values_cache = {clave: self.read(slot) for clave, slot in self.slots.items()}
+
+    def close(self):
+        os.close(self.keys_fd)
+        os.close(self.values_fd)
+        self._map = None
+
+    def _pread(self, fd, length, offset):
+        if hasattr(os, 'pread'):
+            return os.pread(fd, length, offset)
+        with self._seek_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.read(fd, length)
+
+    def _pwrite(self, fd, data, offset):
+        if hasattr(os, 'pwrite'):
+            return os.pwrite(fd, data, offset)
+        with self._seek_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.write(fd, data)
+
+    def _read_mapped(self, start, length):
+        mapped = self._map
+        if mapped is None or start + length > len(mapped):
+            # values.db creció desde el último mapeo: se vuelve a mapear. El mapeo anterior se
+            # libera cuando ningún hilo lo esté usando.
+            with self._map_lock:
+                if self._map is None or start + length > len(self._map):
+                    self._map = mmap.mmap(self.values_fd, 0, access=mmap.ACCESS_READ)
+                mapped = self._map
+        return mapped[start:start + length]
+
+    def lookup(self, key):
+        """Devuelve el registro de key, o None si no existe o aún no terminó de escribirse."""
+        slot = self.slots.get(stored_key(key))
+        if slot is None or self.dirs[slot] < 0:
+            return None
+        return slot
+
+    def read_raw(self, start, length):
+        """Lee length bytes de values.db a partir de start, relleno incluido."""
+        if self.use_mmap:
+            return self._read_mapped(start, length)
+        return self._pread(self.values_fd, length, start)
+
+    def read(self, slot):
+        """
+        Lee los bytes del valor del registro slot: su largo exacto o, en los registros que
+        solo tienen el tamaño de bloque, el bloque sin el relleno de NULs, como el servidor Go.
+        """
+        length = self.lens[slot]
+        if length != dbreader.UNKNOWN_LENGTH:
+            return self.read_raw(self.dirs[slot], length)
+        return self.read_raw(self.dirs[slot], self.tams[slot]).rstrip(b'\x00')
+
+    def allocate(self, key, length):
+        """
+        Reserva el registro y el bloque de un valor de length bytes para key.
+
+        Debe llamarse desde un único hilo (el del event loop): así la reserva es atómica
+        sin bloqueos y dos escrituras nunca reciben el mismo bloque. Si key es una
+        keycodec.Key el bloque es el de su clase de tamaño. El bloque es siempre nuevo,
+        aunque el actual tenga el mismo tamaño, para que el valor anterior siga legible
+        hasta commit().
+
+        Returns:
+            tuple: (registro, dirección, tamaño de bloque), o None si el valor supera 4MB
+                   o la clase de la clave.
+        """
+        tam = key.size_class if isinstance(key, keycodec.Key) else size_class(length)
+        if tam is None or length > tam:
+            return None
+        clave = stored_key(key)
+        slot = self.slots.get(clave)
+        if slot is None:
+            slot = self.next_slot
+            self.next_slot += 1
+            self.slots[clave] = slot
+            self.dirs.append(-1) # Reservado: lookup() lo ignora hasta commit()
+            self.tams.append(0)
+            self.lens.append(dbreader.UNKNOWN_LENGTH)
+        direccion = self.values_end
+        self.values_end += tam
+        return slot, direccion, tam
+
+    def write(self, value_bytes, direccion, tam):
+        """Escribe el valor relleno hasta tam en su bloque. Se puede llamar desde cualquier hilo."""
+        self._pwrite(self.values_fd, value_bytes.ljust(tam, b'\x00'), direccion)
+
+    def write_chunk(self, data, offset):
+        """Escribe un fragmento de un valor en values.db. Se puede llamar desde cualquier hilo."""
+        self._pwrite(self.values_fd, data, offset)
+
+    def finish_chunked(self, direccion, tam, length):
+        """
+        Completa un valor escrito con write_chunk rellenando con NULs desde length hasta
+        tam. Se puede llamar desde cualquier hilo.
+        """
+        zeros = bytes(min(tam - length, lbclient.DEFAULT_CHUNK_SIZE))
+        for offset in range(length, tam, len(zeros) or 1):
+            self._pwrite(self.values_fd, zeros[:tam - offset], direccion + offset)
+
+    def write_record(self, key, slot, direccion, tam, length):
+        """Escribe el registro InfClave de key con el tamaño de bloque y el largo del valor."""
+        clave = stored_key(key)
+        binaria = is_binary_key(clave)
+        if binaria:
+            clave = clave[1:]
+        record = (clave.ljust(KEY_BYTES, b'\x00') + dbreader.pack_size(tam, length, binaria).to_bytes(4, 'little', signed=True)
+                  + direccion.to_bytes(8, 'little', signed=True))
+        self._pwrite(self.keys_fd, record, slot * RECORD_SIZE)
+
+    def commit(self, key, value, slot, direccion, tam, length=None):
+        """
+        Escribe el registro InfClave del valor ya escrito por write() o finish_chunked() y
+        lo publica en el índice, de modo que keys.db nunca apunta a un valor a medio escribir.
+        Solo desde el event loop: así los registros de dos escrituras de la misma clave
+        quedan en keys.db en el mismo orden que en el índice.
+
+        Args:
+            value (bytes): El valor escrito, o None si se escribió en fragmentos (entonces
+                           length es su largo).
+        """
+        length = len(value) if value is not None else length
+        self.write_record(key, slot, direccion, tam, length)
+        self.dirs[slot] = direccion
+        self.tams[slot] = tam
+        self.lens[slot] = length
+        if self.values_in_memory:
+            if value is None: # Escrito en fragmentos: se leerá del disco
+                self.values_cache.pop(stored_key(key), None)
+            else:
+                self.values_cache[stored_key(key)] = value
+
+    def keys_with_prefix(self, prefix, cursor=''):
+        """
+        Devuelve, ordenadas, las claves guardadas que empiezan por prefix y son mayores que
+        cursor. Un prefix o cursor bytes (binario) solo abarca las claves binarias; uno de
+        texto, las de texto, salvo el prefijo vacío, que incluye las binarias después de
+        todas las de texto (como el servidor Go).
+        """
+        prefijo = keycodec.BINARY_KEY_TAG + prefix if isinstance(prefix, bytes) else stored_key(prefix)
+        minimo = keycodec.BINARY_KEY_TAG + cursor if isinstance(cursor, bytes) else stored_key(cursor)
+        return sorted(clave for clave, slot in self.slots.items()
+                      if clave.ljust(KEY_BYTES, b'\x00').startswith(prefijo) and clave > minimo and self.dirs[slot] >= 0)
+
+    def reset(self):
+        """Vacía los archivos y el índice."""
+        os.ftruncate(self.keys_fd, 0)
+        os.ftruncate(self.values_fd, 0)
+        with self._map_lock:
+            self._map = None
+        self.slots = {}
+        self.dirs = array.array('q')
+        self.tams = array.array('i')
+        self.lens = array.array('i')
+        self.values_cache = {}
+        self.next_slot = 0
+        self.values_end = 0
+
+
+class BDServicer(pb_grpc.BDServicer):
+    """
+    Implementación de referencia en Python (grpc.aio) del servicio BD de conexion.proto,
+    compatible con el formato de keys.db / values.db del servidor Go.
+
+    El índice solo se modifica desde el event loop; las lecturas y escrituras de valores
+    se hacen en hilos (asyncio.to_thread) para no bloquearlo con valores de 4MB. resetDb
+    espera a que terminen las escrituras en curso (ver _writing), que si no se aplicarían
+    sobre los archivos recién vaciados.
+
+    Con compression ('gzip' o 'deflate'), las respuestas de al menos compression_threshold bytes se comprimen
+    (como -compresion en el servidor Go); las peticiones comprimidas se aceptan siempre.
+    """
+    def __init__(self, store, compression=None, compression_threshold=lbclient.DEFAULT_COMPRESSION_THRESHOLD):
+        self.store = store
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        # Escrituras en curso y reinicio pendiente (ver _writing y resetDb). generation
+        # cambia con cada reinicio: un setStream que lo atraviesa se aborta, como en Go.
+        self._writes = 0
+        self._resetting = False
+        self._writes_idle = asyncio.Condition()
+        self.generation = 0
+
+    @contextlib.asynccontextmanager
+    async def _writing(self):
+        """
+        Marca una escritura en curso mientras dura el bloque. Si hay un resetDb pendiente
+        espera a que termine, así que el reinicio nunca se cruza con una escritura.
+        """
+        async with self._writes_idle:
+            await self._writes_idle.wait_for(lambda: not self._resetting)
+            self._writes += 1
+        try:
+            yield
+        finally:
+            async with self._writes_idle:
+                self._writes -= 1
+                self._writes_idle.notify_all()
+
+    async def _compress(self, context, size):
+        """Comprime la respuesta de context si lleva al menos compression_threshold bytes."""
+        if self.compression is not None and size >= self.compression_threshold:
+            # context.set_compression no se aplica a las respuestas de grpc.aio; la metadata
+            # interna con que gRPC core elige el algoritmo de envío sí
+            await context.send_initial_metadata(((COMPRESSION_METADATA_KEY, self.compression),))
+
+    async def _set(self, clave, value, clave_binaria=b'', valor_binario=b''):
+        try:
+            key = request_key(clave, clave_binaria)
+        except ValueError as e:
+            return pb.RespuestaSet(estado=False, mensaje=str(e))
+        value_bytes = valor_binario or value.encode('utf-8')
+        async with self._writing():
+            ubicacion = self.store.allocate(key, len(value_bytes))
+            if ubicacion is None:
+                if isinstance(key, keycodec.Key) and len(value_bytes) <= max(keycodec.SIZE_CLASS_BITS):
+                    return pb.RespuestaSet(estado=False, mensaje="el valor es mayor que la clase de tamaño de la clave")
+                return pb.RespuestaSet(estado=False, mensaje="el tamaño de la cadena es mayor a 4 MB")
+            await asyncio.to_thread(self.store.write, value_bytes, *ubicacion[1:])
+            self.store.commit(key, value_bytes, *ubicacion)
+        return pb.RespuestaSet(estado=True, mensaje="OK")
+
+    async def _get(self, key, key_fields, as_bytes=False):
+        slot = self.store.lookup(key)
+        if slot is None:
+            return pb.RespuestaGet(estado=False, mensaje="Clave no encontrada")
+        valor = self.store.values_cache.get(stored_key(key))
+        if valor is None:
+            valor = await asyncio.to_thread(self.store.read, slot)
+        return pb.RespuestaGet(estado=True, mensaje="OK", objeto=pb.Objeto(**key_fields, **value_fields(valor, as_bytes)))
+
+    async def _get_request(self, request):
+        try:
+            key = request_key(request.clave, request.clave_binaria)
+        except ValueError as e:
+            return pb.RespuestaGet(estado=False, mensaje=str(e))
+        return await self._get(key, lbclient.key_fields(key), request.en_bytes)
+
+    async def set(self, request, context):
+        respuesta = await self._set(request.clave, request.valor, request.clave_binaria, request.valor_binario)
+        if not respuesta.estado:
+            # Igual que el servidor Go: un valor demasiado grande no se debe reintentar
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, respuesta.mensaje)
+        return respuesta
+
+    async def get(self, request, context):
+        if request.clave_binaria:
+            try:
+                keycodec.Key(request.clave_binaria)
+            except ValueError as e:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        respuesta = await self._get_request(request)
+        await self._compress(context, respuesta.ByteSize())
+        return respuesta
+
+    async def getPrefix(self, request, context):
+        binary = bool(request.clave_binaria)
+        if len(request.clave_binaria) > KEY_BYTES:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "el prefijo binario tiene más de 16 bytes")
+        objetos = []
+        for clave in self.store.keys_with_prefix(request.clave_binaria if binary else request.clave):
+            respuesta = await self._get(clave, response_key_fields(clave, binary), request.en_bytes)
+            if respuesta.estado:
+                objetos.append(respuesta.objeto)
+        respuesta = pb.RespuestaGetPrefix(estado=True, mensaje="OK", objetos=objetos)
+        await self._compress(context, respuesta.ByteSize())
+        return respuesta
+
+    async def getPrefixStream(self, request, context):
+        binary = bool(request.prefijo_binario or request.cursor_binario)
+        if len(request.prefijo_binario) > KEY_BYTES or len(request.cursor_binario) > KEY_BYTES:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "el prefijo o el cursor binario tienen más de 16 bytes")
+        if binary:
+            claves = self.store.keys_with_prefix(request.prefijo_binario, request.cursor_binario)
+        else:
+            claves = self.store.keys_with_prefix(request.prefijo, request.cursor)
+        enviados = 0
+        for clave in claves:
+            if request.limite > 0 and enviados >= request.limite:
+                break
+            if request.solo_claves:
+                yield pb.Objeto(**response_key_fields(clave, binary))
+            else:
+                respuesta = await self._get(clave, response_key_fields(clave, binary), request.en_bytes)
+                if not respuesta.estado:
+                    continue
+                yield respuesta.objeto
+            enviados += 1
+
+    async def setStream(self, request_iterator, context):
+        # El primer fragmento trae la clave y el tamaño total; cada fragmento se escribe en
+        # su lugar del bloque apenas llega, sin reunir el valor en memoria. Cada escritura
+        # cuenta como en curso para resetDb; si hubo un reinicio entre dos fragmentos, el
+        # bloque ya no existe y la llamada se aborta.
+        primero = None
+        async for fragmento in request_iterator:
+            if primero is None:
+                primero = fragmento
+                if not fragmento.clave and not fragmento.clave_binaria:
+                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "el primer fragmento debe llevar la clave")
+                try:
+                    key = request_key(fragmento.clave, fragmento.clave_binaria)
+                except ValueError as e:
+                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+                # Con una clave binaria el bloque sale de la clase de la clave
+                async with self._writing():
+                    generation = self.generation
+                    ubicacion = self.store.allocate(key, fragmento.tamano_total)
+                if ubicacion is None or fragmento.tamano_total < 0:
+                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "el tamaño de la cadena es mayor a 4 MB")
+                recibidos = 0
+            if recibidos + len(fragmento.datos) > primero.tamano_total:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"se recibieron más de los {primero.tamano_total} bytes anunciados")
+            async with self._writing():
+                if self.generation != generation:
+                    await context.abort(grpc.StatusCode.ABORTED, "la base de datos se reinició durante setStream")
+                await asyncio.to_thread(self.store.write_chunk, fragmento.datos, ubicacion[1] + recibidos)
+            recibidos += len(fragmento.datos)
+        if primero is None:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "setStream sin fragmentos")
+        if recibidos != primero.tamano_total:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"se recibieron {recibidos} de los {primero.tamano_total} bytes anunciados")
+        async with self._writing():
+            if self.generation != generation:
+                await context.abort(grpc.StatusCode.ABORTED, "la base de datos se reinició durante setStream")
+            await asyncio.to_thread(self.store.finish_chunked, *ubicacion[1:], recibidos)
+            self.store.commit(key, None, *ubicacion, recibidos)
+        return pb.RespuestaSet(estado=True, mensaje="OK")
+
+    async def getStream(self, request, context):
+        try:
+            slot = self.store.lookup(request_key(request.clave, request.clave_binaria))
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        if slot is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "Clave no encontrada")
+        start, length = self.store.dirs[slot], self.store.tams[slot]
+        chunk_size = lbclient.DEFAULT_CHUNK_SIZE
+        exact = self.store.lens[slot] != dbreader.UNKNOWN_LENGTH
+        await self._compress(context, self.store.lens[slot] if exact else length)
+        if exact:
+            # Con el largo del valor en su registro se envían exactamente esos bytes
+            length = self.store.lens[slot]
+            for offset in range(0, length, chunk_size):
+                yield pb.Fragmento(datos=await asyncio.to_thread(self.store.read_raw, start + offset, min(chunk_size, length - offset)))
+            return
+        # En los registros anteriores, como en get, el relleno de NULs no se envía: los ceros
+        # se retienen hasta saber si les sigue otro byte del valor
+        ceros = 0
+        for offset in range(0, length, chunk_size):
+            n = min(chunk_size, length - offset)
+            datos = (await asyncio.to_thread(self.store.read_raw, start + offset, n)).rstrip(b'\x00')
+            if not datos:
+                ceros += n
+                continue
+            while ceros > 0:
+                yield pb.Fragmento(datos=bytes(min(ceros, chunk_size)))
+                ceros -= min(ceros, chunk_size)
+            yield pb.Fragmento(datos=datos)
+            ceros = n - len(datos)
+
+    async def multiSet(self, request, context):
+        respuestas = [await self._set(e.clave, e.valor, e.clave_binaria, e.valor_binario) for e in request.elementos]
+        fallidos = sum(1 for r in respuestas if not r.estado)
+        mensaje = "OK" if not fallidos else f"{fallidos} de {len(respuestas)} escrituras fallaron"
+        return pb.RespuestaLoteSet(estado=fallidos == 0, mensaje=mensaje, respuestas=respuestas)
+
+    async def multiGet(self, request, context):
+        respuestas = [await self._get_request(e) for e in request.elementos]
+        respuesta = pb.RespuestaLoteGet(estado=True, mensaje="OK", respuestas=respuestas)
+        await self._compress(context, respuesta.ByteSize())
+        return respuesta
+
+    async def resetDb(self, request, context):
+        print("Solicitud ResetDb recibida.")
+        async with self._writes_idle:
+            # Las escrituras nuevas esperan; las que están en curso terminan antes del reinicio
+            await self._writes_idle.wait_for(lambda: not self._resetting)
+            self._resetting = True
+            await self._writes_idle.wait_for(lambda: self._writes == 0)
+            self.store.reset()
+            self.generation += 1
+            self._resetting = False
+            self._writes_idle.notify_all()
+        return pb.RespuestaReset(estado=True, mensaje="OK")
+
+
+async def serve(port, store, compression=None, compression_threshold=lbclient.DEFAULT_COMPRESSION_THRESHOLD):
+    server = grpc.aio.server(options=SERVER_OPTIONS)
+    pb_grpc.add_BDServicer_to_server(BDServicer(store, compression, compression_threshold), server)
+    server.add_insecure_port(f'[::]:{port}')
+    await server.start()
+    print(f"Servidor Python escuchando en el puerto {port}")
+    print("Cantidad de claves indexadas:", len(store.slots))
+    try:
+        await server.wait_for_termination()
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de referencia en Python del servicio BD")
+    parser.add_argument('--port', type=int, default=5050, help='Puerto del servidor (por defecto: 5050)')
+    parser.add_argument('--db', default='./db', help='Directorio con keys.db y values.db (por defecto: ./db)')
+    parser.add_argument('--mmap', action='store_true', help='Leer los valores de un mmap de values.db en vez de con pread')
+    parser.add_argument('--values_in_memory', action='store_true', help='Guardar también los valores en memoria, como el servidor Go (para comparar)')
+    parser.add_argument('--compression', choices=['none', *lbclient.COMPRESSION_ALGORITHMS], default='none', help='Compresión de las respuestas grandes (por defecto: none); las peticiones comprimidas se aceptan siempre')
+    parser.add_argument('--compression_threshold', type=int, default=lbclient.DEFAULT_COMPRESSION_THRESHOLD, help='Bytes a partir de los cuales se comprime una respuesta (por defecto: 64KB)')
+    args = parser.parse_args(argv)
+
+    store = OffsetStore(args.db, use_mmap=args.mmap, values_in_memory=args.values_in_memory)
+    try:
+        compression = None if args.compression == 'none' else args.compression
+        asyncio.run(serve(args.port, store, compression, args.compression_threshold))
+    except KeyboardInterrupt:
+        print("Servidor detenido.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+import collections
+
+import conexion_pb2 as pb
+import keycodec
+
+# Números de campo de conexion.proto que se codifican a mano
+INSERTAR_CLAVE = 1
+INSERTAR_CLAVE_BINARIA = 3
+INSERTAR_VALOR_BINARIO = 4
+RESPUESTA_ESTADO = 1
+RESPUESTA_MENSAJE = 2
+RESPUESTA_OBJETO = 3
+OBJETO_VALOR = 2
+OBJETO_VALOR_BINARIO = 4
+
+# Tipos de campo del formato de protobuf
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_BYTES = 2
+WIRE_FIXED32 = 5
+
+# Respuesta de get decodificada por decode_respuesta_get; valor es un memoryview
+RawGet = collections.namedtuple('RawGet', ['estado', 'mensaje', 'valor'])
+
+
+def _varint(value):
+    """Codifica un entero no negativo como varint de protobuf."""
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _bytes_field(number, data):
+    """Devuelve las partes (etiqueta, largo, datos) de un campo bytes/string."""
+    return [_varint(number << 3 | WIRE_BYTES), _varint(len(data)), data]
+
+
+def encode_insertar(key, value):
+    """
+    Serializa un mensaje Insertar con el valor en valor_binario.
+
+    El mensaje se arma con un único b''.join de la clave, las cabeceras y value, así que
+    value (bytes, bytearray o memoryview) se copia una sola vez, directamente al buffer del
+    mensaje, y nunca pasa por una cadena. Armar el mensaje con protobuf copia el valor al
+    construirlo y otra vez al serializarlo, y con un valor de 4MB la serialización es
+    mucho más lenta que la copia.
+
+    Args:
+        key (str | keycodec.Key | bytes): La clave; una Key o bytes van en clave_binaria.
+        value: El valor, cualquier objeto con el protocolo de buffer.
+
+    Returns:
+        bytes: El mensaje serializado, listo para un método sin serializador.
+    """
+    if isinstance(key, (keycodec.Key, bytes, bytearray)):
+        parts = _bytes_field(INSERTAR_CLAVE_BINARIA, bytes(key))
+    else:
+        parts = _bytes_field(INSERTAR_CLAVE, key.encode('utf-8'))
+    view = memoryview(value)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return b''.join(parts + _bytes_field(INSERTAR_VALOR_BINARIO, view))
+
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(data, start, end):
+    """
+    Recorre los campos de un mensaje serializado en data[start:end].
+
+    Yields:
+        tuple: (número, tipo, valor); el valor es el entero de un varint, (inicio, fin) de
+               un campo bytes/string y None en los campos de tamaño fijo.
+    """
+    pos = start
+    while pos < end:
+        tag, pos = _read_varint(data, pos)
+        number, wire_type = tag >> 3, tag & 7
+        if wire_type == WIRE_VARINT:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == WIRE_BYTES:
+            length, pos = _read_varint(data, pos)
+            value = (pos, pos + length)
+            pos += length
+        elif wire_type in (WIRE_FIXED64, WIRE_FIXED32):
+            value = None
+            pos += 8 if wire_type == WIRE_FIXED64 else 4
+        else:
+            raise ValueError(f"tipo de campo de protobuf no soportado: {wire_type}")
+        yield number, wire_type, value
+
+
+def decode_respuesta_get(data):
+    """
+    Decodifica un RespuestaGet sin copiar el valor.
+
+    Solo se leen estado, mensaje y el valor del objeto (valor_binario, o valor si el
+    servidor lo envió como texto); el valor es un memoryview de solo lectura sobre data,
+    los bytes de la respuesta tal como los entrega gRPC.
+
+    Returns:
+        RawGet: (estado, mensaje, valor)
+    """
+    view = memoryview(data)
+    estado, mensaje, valor = False, '', view[:0]
+    for number, wire_type, value in _fields(data, 0, len(data)):
+        if number == RESPUESTA_ESTADO and wire_type == WIRE_VARINT:
+            estado = bool(value)
+        elif number == RESPUESTA_MENSAJE and wire_type == WIRE_BYTES:
+            mensaje = data[value[0]:value[1]].decode('utf-8')
+        elif number == RESPUESTA_OBJETO and wire_type == WIRE_BYTES:
+            for field, field_type, field_value in _fields(data, *value):
+                if field in (OBJETO_VALOR, OBJETO_VALOR_BINARIO) and field_type == WIRE_BYTES:
+                    valor = view[field_value[0]:field_value[1]]
+    return RawGet(estado, mensaje, valor)
+
+
+class RawStub:
+    """
+    Métodos set y get del servicio BD con los valores binarios codificados a mano (ver
+    encode_insertar y decode_respuesta_get). Funciona sobre un canal síncrono o de grpc.aio.
+    """
+    def __init__(self, channel):
+        # Sin serializador, gRPC envía los bytes de encode_insertar tal cual
+        self.set = channel.unary_unary('/conexion.BD/set', request_serializer=None,
+                                       response_deserializer=pb.RespuestaSet.FromString)
+        self.get = channel.unary_unary('/conexion.BD/get', request_serializer=pb.Consultar.SerializeToString,
+                                       response_deserializer=decode_respuesta_get)
@@ -1,8 +1,18 @@
+import grpc
 import lbclient
+import keycodec
 import utils
+import histogram
+import loadgen
+import workload
+import bulkio
 import time
 import argparse
-import random # Necesario para la carga de trabajo mixta
+import random
+import asyncio
+import multiprocessing
+import queue
+import sys
 
 # Contadores globales (pueden ser re-inicializados o pasados como retorno)
 # Los hacemos globales para simplicidad al acumular en benchmark,
@@ -10,12 +20,70 @@ import random # Necesario para la carga de trabajo mixta
 success_count = 0
 failure_count = 0
 failure_messages = []
-lock_counts = {}
+
+# Dirección del servidor por defecto
+DEFAULT_SERVER = 'localhost:5050'
 
 # Definición de los tamaños de valor para Benchmark 1
 VALUE_SIZES = [512, 4 * 1024, 512 * 1024, 1 * 1024 * 1024, 4 * 1024 * 1024] # En bytes
 
-def perform_bulk_write(client_instance, num_writes, value_size):
+# Espera máxima de un trabajador del Benchmark 2 en la barrera, es decir, a que los demás
+# terminen la fase anterior; y cada cuánto revisa el proceso padre si algún trabajador murió
+BARRIER_TIMEOUT_S = 600
+RESULT_POLL_S = 1.0
+
+# Clase de los fallos sin código de estado gRPC: el servidor respondió estado=False (p. ej.
+# "Clave no encontrada") o el cliente falló antes de la llamada
+FAILED_RESPONSE = 'RESPUESTA_FALLIDA'
+
+def build_latency_metrics(latency_histogram):
+    """
+    Construye el diccionario de métricas de latencia de una fase a partir de su histograma.
+
+    Args:
+        latency_histogram (histogram.LatencyHistogram): Latencias registradas en la fase.
+
+    Returns:
+        dict: min/max/avg y percentiles en ms, más el propio histograma en 'histogram'
+              para poder combinarlo con el de otros clientes o exportarlo.
+    """
+    latency_metrics = latency_histogram.summary()
+    latency_metrics["histogram"] = latency_histogram
+    return latency_metrics
+
+def failure_code(message):
+    """
+    Devuelve la clase de un fallo: el nombre del código de estado gRPC que lleva el
+    mensaje (lbclient.RpcFailure) o FAILED_RESPONSE si no lo lleva.
+    """
+    code = getattr(message, 'code', None)
+    return code.name if code is not None else FAILED_RESPONSE
+
+def count_failure(error_counts, message):
+    """Suma un fallo a error_counts ({código: cantidad}) según su código de estado."""
+    code = failure_code(message)
+    error_counts[code] = error_counts.get(code, 0) + 1
+
+def print_error_counts(error_counts, indent="     "):
+    """Imprime los fallos de una fase agrupados por código de estado."""
+    if not error_counts:
+        return
+    print(f"{indent}Fallos por código de estado:")
+    for code, count in sorted(error_counts.items()):
+        print(f"{indent}  - {code}: {count}")
+
+def print_latency_metrics(title, latency_metrics):
+    """
+    Imprime las métricas de latencia de una fase.
+    """
+    print(f"\n--- Métricas de Latencia ({title}) ---")
+    print(f"  Latencia Mínima: {latency_metrics['min_latency_ms']:.2f} ms")
+    print(f"  Latencia Máxima: {latency_metrics['max_latency_ms']:.2f} ms")
+    print(f"  Latencia Promedio: {latency_metrics['avg_latency_ms']:.2f} ms")
+    percentiles = ", ".join(f"p{p:g}={latency_metrics[f'p{p:g}_latency_ms']:.2f}ms" for p in histogram.PERCENTILES)
+    print(f"  Percentiles: {percentiles}")
+
+def perform_bulk_write(client_instance, num_writes, value_size, generator=None, batch_size=1):
     """
     Realiza una serie de escrituras secuenciales en el servidor gRPC.
     Genera claves y valores aleatorios, e intenta establecerlos.
@@ -25,53 +93,58 @@ def perform_bulk_write(client_instance, num_writes, value_size):
         client_instance (lbclient.KeyValueClient): La instancia del cliente gRPC.
         num_writes (int): El número total de escrituras a realizar.
         value_size (int): El tamaño en bytes de los valores a generar.
+        generator (utils.ValueGenerator, opcional): Generador de claves y valores (uno nuevo si no se indica).
+        batch_size (int): Escrituras por petición; con un valor mayor a 1 se usa set_many (multiSet)
+                          y cada elemento registra la latencia de su lote.
 
     Returns:
-        tuple: (success_count, failure_count, failure_messages, lock_counts, generated_keys, latency_metrics)
-                Un resumen de la operación de escritura, incluyendo las claves generadas
-                y un diccionario con la latencia (min, max, avg).
+        tuple: (success_count, failure_count, failure_messages, error_counts, generated_keys, latency_metrics)
+                Un resumen de la operación de escritura, incluyendo los fallos por código de
+                estado gRPC, las claves generadas y un diccionario con la latencia (min, max,
+                avg, percentiles e histograma).
     """
-    print(f"Iniciando {num_writes} escrituras de forma secuencial (tamaño: {value_size} B)...")
+    print(f"Iniciando {num_writes} escrituras de forma secuencial (tamaño: {value_size} B, lote: {batch_size})...")
 
     local_success_count = 0
     local_failure_count = 0
     local_failure_messages = []
-    local_lock_counts = {}
+    local_error_counts = {}
     generated_keys_list = [] # Para almacenar todas las claves generadas
     
-    # Lista para almacenar el tiempo de cada petición
-    request_latencies = []
+    # Histograma con el tiempo de cada petición
+    latency_histogram = histogram.LatencyHistogram()
 
-    for i in range(num_writes):
-        key = utils.generate_random_key()
-        value = utils.generate_random_value(value_size)
-        generated_keys_list.append(key) # Añadir la clave generada a la lista
+    if generator is None:
+        generator = utils.ValueGenerator()
+
+    completed = 0
+    while completed < num_writes:
+        batch = [(generator.key_for(value_size), generator.value(value_size)) for _ in range(min(batch_size, num_writes - completed))]
+        generated_keys_list.extend(key for key, _ in batch) # Añadir las claves generadas a la lista
 
         # Medir el tiempo de la petición
-        start_time = time.time()
-        status, message = client_instance.set(key, value)
-        end_time = time.time()
-        
-        # Calcular la latencia de la petición y almacenarla
-        latency = (end_time - start_time) * 1000 # Convertir a milisegundos
-        request_latencies.append(latency)
-        
-        if status:
-            local_success_count += 1
+        start_time = time.perf_counter_ns()
+        if batch_size > 1:
+            batch_results = client_instance.set_many(batch)
         else:
-            local_failure_count += 1
-            local_failure_messages.append(f"Key: {key}, Error: {message}")
-            if "bloqueo en la posición" in message:
-                try:
-                    # Extraer la posición del mensaje de error para contar bloqueos específicos
-                    pos_str = message.split('posición ')[1].split(' ')[0]
-                    pos = int(pos_str)
-                    local_lock_counts[pos] = local_lock_counts.get(pos, 0) + 1
-                except:
-                    pass # Fallback si el formato del mensaje cambia
-
-        if (i + 1) % 100 == 0 or (i + 1) == num_writes:
-            print(f"   Progreso: {i + 1}/{num_writes} escrituras completadas.")
+            batch_results = [client_instance.set(*batch[0])]
+        end_time = time.perf_counter_ns()
+        
+        for (key, _), (status, message) in zip(batch, batch_results):
+            # Registrar la latencia de la petición en nanosegundos
+            latency_histogram.record(end_time - start_time)
+
+            if status:
+                local_success_count += 1
+            else:
+                local_failure_count += 1
+                local_failure_messages.append(f"Key: {key}, Error: {message}")
+                count_failure(local_error_counts, message)
+
+        previous = completed
+        completed += len(batch)
+        if completed // 100 > previous // 100 or completed == num_writes:
+            print(f"   Progreso: {completed}/{num_writes} escrituras completadas.")
             
     print(f"   BulkWrite completado para {value_size} B.")
     print(f"     Total exitosos: {local_success_count}")
@@ -80,29 +153,166 @@ def perform_bulk_write(client_instance, num_writes, value_size):
         print("     Detalles de los fallos:")
         for msg in local_failure_messages:
             print(f"       - {msg}")
-    
-    if local_lock_counts:
-        print("\n     Conteo de errores de 'bloqueo' por posición:")
-        for pos, count in sorted(local_lock_counts.items()):
-            print(f"       - Posición {pos}: {count} veces")
+    print_error_counts(local_error_counts)
+
+    latency_metrics = build_latency_metrics(latency_histogram)
+    latency_metrics["error_counts"] = local_error_counts
+    print_latency_metrics("Escritura", latency_metrics)
+
+    return local_success_count, local_failure_count, local_failure_messages, local_error_counts, generated_keys_list, latency_metrics
+
+async def perform_bulk_write_async(client_instance, num_writes, value_size, generator=None):
+    """
+    Realiza una serie de escrituras concurrentes usando el cliente asíncrono.
+    Mantiene hasta client_instance.max_in_flight peticiones en vuelo a la vez, y solo
+    los valores de esas peticiones en memoria. Mide la latencia de cada petición y
+    calcula estadísticas.
+
+    Args:
+        client_instance (lbclient.AsyncKeyValueClient): La instancia del cliente gRPC asíncrono.
+        num_writes (int): El número total de escrituras a realizar.
+        value_size (int): El tamaño en bytes de los valores a generar.
+        generator (utils.ValueGenerator, opcional): Generador de claves y valores (uno nuevo si no se indica).
+
+    Returns:
+        tuple: (success_count, failure_count, failure_messages, error_counts, generated_keys, latency_metrics)
+                El mismo resumen que devuelve perform_bulk_write.
+    """
+    print(f"Iniciando {num_writes} escrituras concurrentes (en vuelo: {client_instance.max_in_flight}, tamaño: {value_size} B)...")
+
+    local_success_count = 0
+    local_failure_count = 0
+    local_failure_messages = []
+    local_error_counts = {}
+    generated_keys_list = []
+    latency_histogram = histogram.LatencyHistogram()
+
+    if generator is None:
+        generator = utils.ValueGenerator()
+
+    # max_in_flight escritores toman las escrituras de un mismo iterador. Cada uno genera
+    # su clave y su valor justo antes de enviarlo, así que en memoria solo están los
+    # valores en vuelo y no los num_writes. La latencia se mide desde el envío.
+    pendientes = iter(range(num_writes))
+    completadas = 0
+
+    async def escritor():
+        nonlocal local_success_count, local_failure_count, completadas
+        for _ in pendientes:
+            key = generator.key_for(value_size)
+            value = generator.value(value_size)
+            generated_keys_list.append(key)
+            start_time = time.perf_counter_ns()
+            status, message = await client_instance.set(key, value)
+            latency_histogram.record(time.perf_counter_ns() - start_time)
+            completadas += 1
+
+            if status:
+                local_success_count += 1
+            else:
+                local_failure_count += 1
+                local_failure_messages.append(f"Key: {key}, Error: {message}")
+                count_failure(local_error_counts, message)
+
+            if completadas % 100 == 0 or completadas == num_writes:
+                print(f"   Progreso: {completadas}/{num_writes} escrituras completadas.")
+
+    await asyncio.gather(*(escritor() for _ in range(client_instance.max_in_flight)))
+
+    print(f"   BulkWrite concurrente completado para {value_size} B.")
+    print(f"     Total exitosos: {local_success_count}")
+    print(f"     Total fallidos: {local_failure_count}")
+    if local_failure_count > 0:
+        print("     Detalles de los fallos:")
+        for msg in local_failure_messages:
+            print(f"       - {msg}")
+    print_error_counts(local_error_counts)
+
+    latency_metrics = build_latency_metrics(latency_histogram)
+    latency_metrics["error_counts"] = local_error_counts
+    print_latency_metrics("Escritura concurrente", latency_metrics)
+
+    return local_success_count, local_failure_count, local_failure_messages, local_error_counts, generated_keys_list, latency_metrics
+
+
+async def run_benchmark_async(args):
+    """
+    Ejecuta la fase de escritura del benchmark con el cliente asíncrono.
+
+    Args:
+        args (argparse.Namespace): Argumentos de línea de comandos (usa servers, num_operations, value_size, concurrency, seed y latency_report; solo el primer servidor).
+    """
+    client = lbclient.AsyncKeyValueClient(args.servers.split(',')[0].strip(), max_in_flight=args.concurrency)
+    generator = utils.ValueGenerator(args.seed, binary_keys=args.binary_keys)
+    try:
+        write_start_time = time.time()
+        success_w, failed_w, _, _, _, write_latency_metrics = await perform_bulk_write_async(client, args.num_operations, args.value_size, generator)
+        write_end_time = time.time()
+        elapsed = write_end_time - write_start_time
+        throughput = args.num_operations / elapsed if elapsed > 0 else 0
+        print(f"  Escrituras concurrentes: Éxitos: {success_w}, Fallos: {failed_w}. Tiempo: {elapsed:.2f}s ({throughput:.2f} ops/s)")
+
+        if args.latency_report:
+            histogram.export(args.latency_report, {f"write_{args.value_size}B": write_latency_metrics["histogram"]})
+            print(f"Reporte de latencias guardado en: {args.latency_report}")
+    finally:
+        await client.close()
 
-    # Calcular métricas de latencia
-    min_latency = min(request_latencies) if request_latencies else 0
-    max_latency = max(request_latencies) if request_latencies else 0
-    avg_latency = sum(request_latencies) / len(request_latencies) if request_latencies else 0
 
-    latency_metrics = {
-        "min_latency_ms": min_latency,
-        "max_latency_ms": max_latency,
-        "avg_latency_ms": avg_latency
-    }
+def ramp_rates(rate, rate_max=0, rate_step=0):
+    """
+    Devuelve las tasas de la rampa: de rate hasta rate_max (incluida) en pasos de
+    rate_step (por defecto, rate). Sin rate_max, solo rate.
+    """
+    if rate_max <= rate:
+        return [rate]
+    rate_step = rate_step or rate
+    rates = []
+    current = rate
+    while current <= rate_max + 1e-9:
+        rates.append(current)
+        current += rate_step
+    return rates
 
-    print("\n--- Métricas de Latencia (Escritura) ---")
-    print(f"  Latencia Mínima: {min_latency:.2f} ms")
-    print(f"  Latencia Máxima: {max_latency:.2f} ms")
-    print(f"  Latencia Promedio: {avg_latency:.2f} ms")
 
-    return local_success_count, local_failure_count, local_failure_messages, local_lock_counts, generated_keys_list, latency_metrics
+async def run_open_loop_benchmark(args):
+    """
+    Ejecuta la fase de escritura del benchmark en lazo abierto: las escrituras se envían
+    a la tasa --rate (con llegadas constantes o de Poisson) sin esperar a las anteriores,
+    y la latencia se mide desde el instante previsto de envío. Con --rate_max se sube la
+    tasa escalón a escalón hasta saturar el servidor.
+
+    Args:
+        args (argparse.Namespace): Argumentos de línea de comandos (usa servers, rate, rate_max, rate_step, duration, arrivals, value_size, concurrency, seed y latency_report; solo el primer servidor).
+    """
+    max_in_flight = args.concurrency if args.concurrency > 1 else loadgen.DEFAULT_MAX_IN_FLIGHT
+    client = lbclient.AsyncKeyValueClient(args.servers.split(',')[0].strip(), max_in_flight=max_in_flight)
+    generator = utils.ValueGenerator(args.seed, binary_keys=args.binary_keys)
+    arrivals_rng = random.Random(args.seed)
+
+    def armar(i):
+        # La clave y el valor se generan con el hueco ya tomado: un valor de 4MB es una
+        # copia del pool y no debe esperar en la cola de llegadas atrasadas
+        return generator.key_for(args.value_size), generator.value(args.value_size)
+
+    async def escribir(datos):
+        return await client.set(*datos)
+
+    try:
+        steps = await loadgen.run_rate_ramp(escribir, ramp_rates(args.rate, args.rate_max, args.rate_step),
+                                            args.duration, args.arrivals, arrivals_rng, max_in_flight, armar)
+        loadgen.print_ramp_report(steps)
+
+        if args.latency_report:
+            latency_histograms = {}
+            for step in steps:
+                latency_histograms[f"open_loop_write_{step['rate']:g}ops_{args.value_size}B"] = step["histogram"]
+                latency_histograms[f"open_loop_service_{step['rate']:g}ops_{args.value_size}B"] = step["service_histogram"]
+            histogram.export(args.latency_report, latency_histograms)
+            print(f"Reporte de latencias guardado en: {args.latency_report}")
+    finally:
+        await client.close()
+
 
 def perform_bulk_read(client_instance, keys_to_read):
     """
@@ -115,22 +325,23 @@ def perform_bulk_read(client_instance, keys_to_read):
 
     Returns:
         tuple: (success_count, failure_count, failure_messages, latency_metrics)
-                Un resumen de la operación de lectura y un diccionario con la latencia (min, max, avg).
+                Un resumen de la operación de lectura y un diccionario con la latencia (min, max, avg, percentiles e histograma)
+                y los fallos por código de estado en 'error_counts'.
     """
     print(f"Iniciando {len(keys_to_read)} lecturas de forma secuencial...")
 
     local_success_count = 0
     local_failure_count = 0
     local_failure_messages = []
-    request_latencies = [] # Lista para almacenar el tiempo de cada petición
+    local_error_counts = {}
+    latency_histogram = histogram.LatencyHistogram() # Histograma con el tiempo de cada petición
 
     for i, key in enumerate(keys_to_read):
-        start_time = time.time() # Inicia la medición de tiempo
+        start_time = time.perf_counter_ns() # Inicia la medición de tiempo
         status, value = client_instance.get(key)
-        end_time = time.time()   # Termina la medición de tiempo
+        end_time = time.perf_counter_ns()   # Termina la medición de tiempo
         
-        latency = (end_time - start_time) * 1000 # Convertir a milisegundos
-        request_latencies.append(latency)
+        latency_histogram.record(end_time - start_time)
         
         if status:
             local_success_count += 1
@@ -138,6 +349,7 @@ def perform_bulk_read(client_instance, keys_to_read):
         else:
             local_failure_count += 1
             local_failure_messages.append(f"Key: {key}, Error: {value}") # value contendrá el mensaje de error
+            count_failure(local_error_counts, value)
             # Opcional: print(f"  Fallo al leer '{key}': {value}")
 
         if (i + 1) % 100 == 0 or (i + 1) == len(keys_to_read):
@@ -150,27 +362,64 @@ def perform_bulk_read(client_instance, keys_to_read):
         print("    Detalles de los fallos:")
         for msg in local_failure_messages:
             print(f"      - {msg}")
-    
-    # Calcular métricas de latencia
-    min_latency = min(request_latencies) if request_latencies else 0
-    max_latency = max(request_latencies) if request_latencies else 0
-    avg_latency = sum(request_latencies) / len(request_latencies) if request_latencies else 0
-
-    latency_metrics = {
-        "min_latency_ms": min_latency,
-        "max_latency_ms": max_latency,
-        "avg_latency_ms": avg_latency
-    }
-
-    print("\n--- Métricas de Latencia (Lectura) ---")
-    print(f"  Latencia Mínima: {min_latency:.2f} ms")
-    print(f"  Latencia Máxima: {max_latency:.2f} ms")
-    print(f"  Latencia Promedio: {avg_latency:.2f} ms")
+    print_error_counts(local_error_counts, indent="    ")
+
+    latency_metrics = build_latency_metrics(latency_histogram)
+    latency_metrics["error_counts"] = local_error_counts
+    print_latency_metrics("Lectura", latency_metrics)
 
     return local_success_count, local_failure_count, local_failure_messages, latency_metrics
 
 
-def perform_mixed_workload(client_instance, num_operations, value_size, existing_keys):
+def perform_cached_read_comparison(client_instance, keys, num_reads, cache_max_bytes, cache_ttl_seconds=None, generator=None, servers=None):
+    """
+    Compara lecturas sin caché y con la caché de lecturas del cliente.
+    Ambas fases leen la misma secuencia de claves, elegida al azar entre keys.
+
+    Args:
+        client_instance (lbclient.KeyValueClient): Cliente sin caché.
+        keys (list): Claves existentes entre las que se eligen las lecturas.
+        num_reads (int): Número de lecturas por fase.
+        cache_max_bytes (int): Tamaño máximo de la caché en bytes.
+        cache_ttl_seconds (float, opcional): Tiempo de vida de las entradas de la caché.
+        generator (utils.ValueGenerator, opcional): Generador usado para elegir las claves.
+        servers (list, opcional): Servidores a los que se conecta el cliente con caché.
+
+    Returns:
+        dict: {"uncached": latency_metrics, "cached": latency_metrics, "cache_stats": dict}
+    """
+    if not keys:
+        print("Advertencia: No hay claves para comparar lecturas con y sin caché.")
+        return {}
+    if generator is None:
+        generator = utils.ValueGenerator()
+    read_sequence = [generator.rng.choice(keys) for _ in range(num_reads)]
+
+    print(f"\n  >> Lecturas sin caché ({num_reads} lecturas)...")
+    start_time = time.time()
+    _, _, _, uncached_metrics = perform_bulk_read(client_instance, read_sequence)
+    uncached_elapsed = time.time() - start_time
+
+    cached_client = create_client(servers or [DEFAULT_SERVER], cache_max_bytes=cache_max_bytes, cache_ttl_seconds=cache_ttl_seconds)
+    try:
+        print(f"\n  >> Lecturas con caché ({cache_max_bytes / (1024 * 1024):.1f} MB, {num_reads} lecturas)...")
+        start_time = time.time()
+        _, _, _, cached_metrics = perform_bulk_read(cached_client, read_sequence)
+        cached_elapsed = time.time() - start_time
+        cache_stats = cached_client.cache_stats()
+    finally:
+        cached_client.close()
+
+    print("\n--- Comparación de lecturas con y sin caché ---")
+    print(f"  Sin caché: {num_reads / uncached_elapsed if uncached_elapsed > 0 else 0:.2f} ops/s, p99={uncached_metrics['p99_latency_ms']:.2f} ms")
+    print(f"  Con caché: {num_reads / cached_elapsed if cached_elapsed > 0 else 0:.2f} ops/s, p99={cached_metrics['p99_latency_ms']:.2f} ms")
+    print(f"  Aciertos: {cache_stats['hits']}, Fallos: {cache_stats['misses']} (ratio {cache_stats['hit_ratio']:.2%})")
+    print(f"  Expulsiones: {cache_stats['evictions']}, Bytes ahorrados: {cache_stats['bytes_saved']}")
+
+    return {"uncached": uncached_metrics, "cached": cached_metrics, "cache_stats": cache_stats}
+
+
+def perform_mixed_workload(client_instance, num_operations, value_size, existing_keys, generator=None):
     """
     Realiza una carga de trabajo mixta (50% lectura, 50% escritura).
     Mide la latencia de cada petición y calcula estadísticas.
@@ -180,39 +429,53 @@ def perform_mixed_workload(client_instance, num_operations, value_size, existing
         num_operations (int): El número total de operaciones (lecturas + escrituras) a realizar.
         value_size (int): El tamaño en bytes de los valores para las nuevas escrituras.
         existing_keys (list): Una lista de claves preexistentes para las operaciones de lectura.
+        generator (utils.ValueGenerator, opcional): Generador de claves, valores y del reparto de operaciones.
 
     Returns:
         tuple: (success_count, failure_count, failure_messages, latency_metrics)
-                Un resumen de la operación de carga mixta y un diccionario con la latencia (min, max, avg).
+                Un resumen de la operación de carga mixta y un diccionario con la latencia (min, max, avg, percentiles e histograma)
+                y los fallos por código de estado en 'error_counts'.
     """
     print(f"Iniciando {num_operations} operaciones mixtas (50% lectura, 50% escritura, tamaño: {value_size} B)...")
 
     local_success_count = 0
     local_failure_count = 0
     local_failure_messages = []
-    request_latencies = [] # Lista para almacenar el tiempo de cada petición
+    local_error_counts = {}
+    latency_histogram = histogram.LatencyHistogram() # Histograma con el tiempo de cada petición
+    # Histogramas separados por tipo de operación
+    operation_histograms = {"get": histogram.LatencyHistogram(), "set": histogram.LatencyHistogram()}
+
+    if generator is None:
+        generator = utils.ValueGenerator()
+    rng = generator.rng
 
     # Asegurarse de tener claves existentes para leer
     if not existing_keys:
         print("Advertencia: No hay claves existentes para operaciones de lectura en la carga de trabajo mixta.")
 
     for i in range(num_operations):
-        start_time = time.time() # Inicia la medición de tiempo
+        # 50% de lectura, 50% de escritura. La clave y el valor se preparan antes de medir
+        is_read = rng.random() < 0.5 and existing_keys # Asegurarse de que haya claves para leer
+        if is_read:
+            key_to_read = rng.choice(existing_keys)
+        else:
+            new_key = generator.key_for(value_size)
+            new_value = generator.value(value_size)
+
+        start_time = time.perf_counter_ns() # Inicia la medición de tiempo
         
-        # 50% de lectura, 50% de escritura
-        if random.random() < 0.5 and existing_keys: # Asegurarse de que haya claves para leer
+        if is_read:
             # Operación de lectura
-            key_to_read = random.choice(existing_keys)
             status, message = client_instance.get(key_to_read)
             if status:
                 local_success_count += 1
             else:
                 local_failure_count += 1
                 local_failure_messages.append(f"Lectura Fallida Key: {key_to_read}, Error: {message}")
+                count_failure(local_error_counts, message)
         else:
             # Operación de escritura (si no hay claves existentes, por defecto será escritura)
-            new_key = utils.generate_random_key()
-            new_value = utils.generate_random_value(value_size)
             status, message = client_instance.set(new_key, new_value) # client.set ya tiene reintentos
             if status:
                 local_success_count += 1
@@ -221,10 +484,11 @@ def perform_mixed_workload(client_instance, num_operations, value_size, existing
             else:
                 local_failure_count += 1
                 local_failure_messages.append(f"Escritura Fallida Key: {new_key}, Error: {message}")
+                count_failure(local_error_counts, message)
         
-        end_time = time.time()   # Termina la medición de tiempo
-        latency = (end_time - start_time) * 1000 # Convertir a milisegundos
-        request_latencies.append(latency)
+        end_time = time.perf_counter_ns()   # Termina la medición de tiempo
+        latency_histogram.record(end_time - start_time)
+        operation_histograms["get" if is_read else "set"].record(end_time - start_time)
 
         if (i + 1) % 100 == 0 or (i + 1) == num_operations:
             print(f"  Progreso: {i + 1}/{num_operations} operaciones completadas.")
@@ -236,50 +500,471 @@ def perform_mixed_workload(client_instance, num_operations, value_size, existing
         print("    Detalles de los fallos:")
         for msg in local_failure_messages:
             print(f"      - {msg}")
+    print_error_counts(local_error_counts, indent="    ")
+
+    latency_metrics = build_latency_metrics(latency_histogram)
+    latency_metrics["histograms_by_operation"] = operation_histograms
+    latency_metrics["error_counts"] = local_error_counts
+    print_latency_metrics("Carga Mixta", latency_metrics)
+
+    return local_success_count, local_failure_count, local_failure_messages, latency_metrics
+
+
+def load_workload(client_instance, workload_instance, batch_size=64):
+    """
+    Fase de carga de una carga de trabajo: escribe sus record_count registros iniciales
+    con set_many, en lotes de batch_size.
+
+    Returns:
+        tuple: (success_count, failure_count)
+    """
+    record_count = workload_instance.spec["record_count"]
+    print(f"Cargando {record_count} registros iniciales...")
+    local_success_count = 0
+    local_failure_count = 0
+    items = workload_instance.load_items()
+    while True:
+        batch = [item for _, item in zip(range(batch_size), items)]
+        if not batch:
+            break
+        for status, _ in client_instance.set_many(batch):
+            if status:
+                local_success_count += 1
+            else:
+                local_failure_count += 1
+    print(f"  Carga completada. Éxitos: {local_success_count}, Fallos: {local_failure_count}")
+    return local_success_count, local_failure_count
+
+
+def perform_workload(client_instance, workload_instance, num_operations):
+    """
+    Ejecuta num_operations operaciones de una carga de trabajo (workload.Workload) en lazo
+    cerrado. Cada operación, valor incluido, se prepara antes de empezar a medir.
+
+    Args:
+        client_instance (lbclient.KeyValueClient): La instancia del cliente gRPC.
+        workload_instance (workload.Workload): Generador de operaciones de la carga.
+        num_operations (int): Número de operaciones a realizar.
 
-    # Calcular métricas de latencia
-    min_latency = min(request_latencies) if request_latencies else 0
-    max_latency = max(request_latencies) if request_latencies else 0
-    avg_latency = sum(request_latencies) / len(request_latencies) if request_latencies else 0
+    Returns:
+        tuple: (success_count, failure_count, failure_messages, latency_metrics)
+                latency_metrics incluye además 'histograms_by_operation', un histograma por
+                tipo de operación, y 'error_counts', los fallos por código de estado.
+    """
+    print(f"Iniciando {num_operations} operaciones ({workload.describe_spec(workload_instance.spec)})...")
+
+    local_success_count = 0
+    local_failure_count = 0
+    local_failure_messages = []
+    local_error_counts = {}
+    latency_histogram = histogram.LatencyHistogram()
+    operation_histograms = {}
 
-    latency_metrics = {
-        "min_latency_ms": min_latency,
-        "max_latency_ms": max_latency,
-        "avg_latency_ms": avg_latency
-    }
+    for i in range(num_operations):
+        operation = workload_instance.next_operation()
 
-    print("\n--- Métricas de Latencia (Carga Mixta) ---")
-    print(f"  Latencia Mínima: {min_latency:.2f} ms")
-    print(f"  Latencia Máxima: {max_latency:.2f} ms")
-    print(f"  Latencia Promedio: {avg_latency:.2f} ms")
+        start_time = time.perf_counter_ns()
+        status, message = workload.execute(client_instance, operation)
+        end_time = time.perf_counter_ns()
+
+        latency_histogram.record(end_time - start_time)
+        operation_histograms.setdefault(operation[0], histogram.LatencyHistogram()).record(end_time - start_time)
+        if status:
+            local_success_count += 1
+        else:
+            local_failure_count += 1
+            local_failure_messages.append(f"{operation[0]} Key: {operation[1]}, Error: {message}")
+            count_failure(local_error_counts, message)
+
+        if (i + 1) % 100 == 0 or (i + 1) == num_operations:
+            print(f"  Progreso: {i + 1}/{num_operations} operaciones completadas.")
+
+    print("  Carga de trabajo completada.")
+    print(f"    Total exitosos: {local_success_count}")
+    print(f"    Total fallidos: {local_failure_count}")
+    if local_failure_count > 0:
+        print("    Detalles de los fallos:")
+        for msg in local_failure_messages:
+            print(f"      - {msg}")
+    print_error_counts(local_error_counts, indent="    ")
+
+    latency_metrics = build_latency_metrics(latency_histogram)
+    latency_metrics["histograms_by_operation"] = operation_histograms
+    latency_metrics["error_counts"] = local_error_counts
+    print_latency_metrics("Carga de trabajo", latency_metrics)
+    for name, operation_histogram in operation_histograms.items():
+        print_latency_metrics(f"Carga de trabajo: {name}", build_latency_metrics(operation_histogram))
 
     return local_success_count, local_failure_count, local_failure_messages, latency_metrics
 
 
+async def perform_workload_open_loop(args, workload_instance):
+    """
+    Ejecuta la fase de medición de una carga de trabajo en lazo abierto (--rate), con el
+    cliente asíncrono y la rampa de loadgen. Devuelve los escalones ejecutados.
+    """
+    max_in_flight = args.concurrency if args.concurrency > 1 else loadgen.DEFAULT_MAX_IN_FLIGHT
+    client = lbclient.AsyncKeyValueClient(args.servers.split(',')[0].strip(), max_in_flight=max_in_flight)
+    try:
+        # Cada operación (con su valor) se arma con el hueco de petición en vuelo ya tomado
+        async def operar(operation):
+            return await workload.execute_async(client, operation)
+        steps = await loadgen.run_rate_ramp(operar, ramp_rates(args.rate, args.rate_max, args.rate_step),
+                                            args.duration, args.arrivals, random.Random(args.seed),
+                                            max_in_flight, lambda i: workload_instance.next_operation())
+        loadgen.print_ramp_report(steps)
+        return steps
+    finally:
+        await client.close()
+
+
+def run_workload_benchmark(args, servers):
+    """
+    Ejecuta una carga de trabajo (--workload): la fase de carga y luego la de medición,
+    en lazo cerrado o, con --rate, en lazo abierto.
+
+    Args:
+        args (argparse.Namespace): Argumentos de línea de comandos (usa workload, record_count, num_operations, seed, rate y latency_report).
+        servers (list): Direcciones de los servidores.
+    """
+    spec = workload.load_spec(args.workload)
+    if args.record_count is not None:
+        spec["record_count"] = args.record_count
+    workload_instance = workload.Workload(spec, args.seed)
+    name = f"workload_{args.workload.upper() if args.workload.upper() in workload.PRESETS else 'custom'}"
+
+    client = create_client(servers)
+    try:
+        load_workload(client, workload_instance)
+        latency_histograms = {}
+        if args.rate > 0:
+            client.close()
+            client = None
+            for step in asyncio.run(perform_workload_open_loop(args, workload_instance)):
+                latency_histograms[f"{name}_{step['rate']:g}ops"] = step["histogram"]
+                latency_histograms[f"{name}_service_{step['rate']:g}ops"] = step["service_histogram"]
+        else:
+            start_time = time.time()
+            success, failed, _, latency_metrics = perform_workload(client, workload_instance, args.num_operations)
+            elapsed = time.time() - start_time
+            print(f"  Operaciones: Éxitos: {success}, Fallos: {failed}. Tiempo: {elapsed:.2f}s "
+                  f"({args.num_operations / elapsed if elapsed > 0 else 0:.2f} ops/s)")
+            print_shard_stats(client)
+            latency_histograms[name] = latency_metrics["histogram"]
+            for operation, operation_histogram in latency_metrics["histograms_by_operation"].items():
+                latency_histograms[f"{name}_{operation}"] = operation_histogram
+
+        if args.latency_report:
+            histogram.export(args.latency_report, latency_histograms)
+            print(f"Reporte de latencias guardado en: {args.latency_report}")
+    finally:
+        if client is not None:
+            client.close()
+
+
+def create_client(servers, **client_options):
+    """
+    Crea el cliente del benchmark: un KeyValueClient si hay un único servidor,
+    o un ShardedKeyValueClient si se indicaron varios.
+
+    Args:
+        servers (list): Direcciones de los servidores.
+        **client_options: Opciones adicionales del cliente (p. ej. cache_max_bytes).
+    """
+    if len(servers) > 1:
+        return lbclient.ShardedKeyValueClient(servers, **client_options)
+    return lbclient.KeyValueClient(servers[0], **client_options)
+
+
+def print_shard_stats(client_instance):
+    """
+    Imprime el reparto de operaciones por nodo si el cliente es un ShardedKeyValueClient.
+    """
+    if not isinstance(client_instance, lbclient.ShardedKeyValueClient):
+        return
+    print("\n--- Reparto de carga por nodo ---")
+    for address, stats in client_instance.shard_stats().items():
+        print(f"  - {address}: {stats['ops']} operaciones ({stats['share']:.2%})")
+
+
+def benchmark_worker(client_id, num_operations, value_size, barrier, result_queue, seed=None, servers=None, binary_keys=False):
+    """
+    Proceso trabajador del Benchmark 2 (Multi Client).
+    Abre su propio canal con un KeyValueClient y ejecuta las fases de escritura,
+    lectura y carga mixta. Antes de cada fase espera en la barrera compartida
+    para que todos los clientes arranquen a la vez. Si el trabajador falla rompe la
+    barrera (abort), así que los demás salen de su espera en lugar de bloquearse.
+
+    Args:
+        client_id (int): Identificador del cliente (solo para el reporte).
+        num_operations (int): Número de operaciones por fase.
+        value_size (int): Tamaño en bytes de los valores a escribir.
+        barrier (multiprocessing.Barrier): Barrera de inicio compartida entre los trabajadores.
+        result_queue (multiprocessing.Queue): Cola donde se publica el resultado del trabajador.
+        seed (int, opcional): Semilla base; cada cliente usa seed + client_id.
+        servers (list, opcional): Direcciones de los servidores (varias activan el cliente con sharding).
+        binary_keys (bool): Escribir con claves binarias (keycodec.Key) en lugar de hexadecimales.
+    """
+    client = None
+    generator = utils.ValueGenerator(None if seed is None else seed + client_id, binary_keys=binary_keys)
+    phases = {}
+    error = None
+
+    try:
+        client = create_client(servers or [DEFAULT_SERVER])
+        barrier.wait(timeout=BARRIER_TIMEOUT_S)
+        start_time = time.time()
+        success_w, failed_w, _, error_counts, generated_keys, write_latency_metrics = perform_bulk_write(client, num_operations, value_size, generator)
+        phases["write"] = {"success": success_w, "failure": failed_w, "start": start_time, "end": time.time(),
+                           "histogram": write_latency_metrics["histogram"], "error_counts": error_counts}
+
+        barrier.wait(timeout=BARRIER_TIMEOUT_S)
+        start_time = time.time()
+        success_r, failed_r, _, read_latency_metrics = perform_bulk_read(client, generated_keys)
+        phases["read"] = {"success": success_r, "failure": failed_r, "start": start_time, "end": time.time(),
+                          "histogram": read_latency_metrics["histogram"], "error_counts": read_latency_metrics["error_counts"]}
+
+        barrier.wait(timeout=BARRIER_TIMEOUT_S)
+        start_time = time.time()
+        success_m, failed_m, _, mixed_latency_metrics = perform_mixed_workload(client, num_operations, value_size, generated_keys, generator)
+        phases["mixed"] = {"success": success_m, "failure": failed_m, "start": start_time, "end": time.time(),
+                           "histogram": mixed_latency_metrics["histogram"], "error_counts": mixed_latency_metrics["error_counts"],
+                           "histograms_by_operation": mixed_latency_metrics["histograms_by_operation"]}
+    except Exception as e:
+        barrier.abort()
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        shard_stats = client.shard_stats() if isinstance(client, lbclient.ShardedKeyValueClient) else {}
+        if client is not None:
+            client.close()
+        result_queue.put({"client_id": client_id, "phases": phases, "shard_stats": shard_stats, "error": error})
+
+
+def run_multi_client_benchmark(num_clients, num_operations, value_size, seed=None, servers=None, binary_keys=False):
+    """
+    Ejecuta el Benchmark 2: lanza num_clients procesos, cada uno con su propio
+    KeyValueClient, y agrega sus contadores e histogramas de latencia en un único reporte.
+
+    Args:
+        num_clients (int): Número de procesos cliente.
+        num_operations (int): Número de operaciones por fase y por cliente.
+        value_size (int): Tamaño en bytes de los valores a escribir.
+        seed (int, opcional): Semilla base para generar claves y valores reproducibles.
+        servers (list, opcional): Direcciones de los servidores (varias activan el cliente con sharding).
+        binary_keys (bool): Escribir con claves binarias (keycodec.Key) en lugar de hexadecimales.
+
+    Returns:
+        tuple: (summary, histograms) con el resumen agregado por fase ('write', 'read', 'mixed')
+               y los histogramas combinados por operación y tamaño, listos para histogram.export.
+    """
+    barrier = multiprocessing.Barrier(num_clients)
+    result_queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=benchmark_worker, args=(client_id, num_operations, value_size, barrier, result_queue, seed, servers, binary_keys))
+        for client_id in range(num_clients)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Leer los resultados antes de hacer join para no bloquear la cola. Un trabajador que
+    # muere sin publicar su resultado (p. ej. por una señal) no debe dejar al padre esperando.
+    results = []
+    while len(results) < len(workers):
+        try:
+            results.append(result_queue.get(timeout=RESULT_POLL_S))
+        except queue.Empty:
+            # Si un trabajador murió, los demás dejan de esperarlo en la barrera
+            if any(worker.exitcode for worker in workers):
+                barrier.abort()
+            if all(worker.exitcode is not None for worker in workers):
+                break
+    for worker in workers:
+        worker.join()
+    results.sort(key=lambda r: r["client_id"])
+
+    reported = {r["client_id"] for r in results}
+    for client_id, worker in enumerate(workers):
+        if client_id not in reported:
+            print(f"Error: el cliente {client_id} terminó sin resultado (código de salida {worker.exitcode})")
+    for r in results:
+        if r["error"]:
+            print(f"Error: el cliente {r['client_id']} se interrumpió: {r['error']}")
+
+    summary = {}
+    histograms = {}
+    for phase_name in ("write", "read", "mixed"):
+        phase_results = [(r["client_id"], r["phases"][phase_name]) for r in results if phase_name in r["phases"]]
+        if not phase_results:
+            continue
+
+        total_success = sum(p["success"] for _, p in phase_results)
+        total_failure = sum(p["failure"] for _, p in phase_results)
+        wall_time = max(p["end"] for _, p in phase_results) - min(p["start"] for _, p in phase_results)
+        phase_histogram = histogram.LatencyHistogram()
+        for _, p in phase_results:
+            phase_histogram.merge(p["histogram"])
+            for operation, operation_histogram in p.get("histograms_by_operation", {}).items():
+                name = f"{phase_name}_{operation}_{value_size}B"
+                histograms.setdefault(name, histogram.LatencyHistogram()).merge(operation_histogram)
+        histograms[f"{phase_name}_{value_size}B"] = phase_histogram
+        error_counts = {}
+        for _, p in phase_results:
+            for code, count in p["error_counts"].items():
+                error_counts[code] = error_counts.get(code, 0) + count
+
+        per_client = {}
+        for client_id, p in phase_results:
+            elapsed = p["end"] - p["start"]
+            per_client[client_id] = (p["success"] + p["failure"]) / elapsed if elapsed > 0 else 0
+
+        summary[phase_name] = {
+            "success": total_success,
+            "failure": total_failure,
+            "ops_per_sec": (total_success + total_failure) / wall_time if wall_time > 0 else 0,
+            "per_client_ops_per_sec": per_client,
+            "error_counts": error_counts,
+            **phase_histogram.summary(),
+        }
+
+    print(f"\n--- Reporte agregado Benchmark 2 ({num_clients} clientes, {value_size} B) ---")
+    for phase_name, phase in summary.items():
+        print(f"\n  Fase: {phase_name}")
+        print(f"    Éxitos: {phase['success']}, Fallos: {phase['failure']}")
+        print(f"    Throughput total: {phase['ops_per_sec']:.2f} ops/s")
+        for client_id, ops in phase["per_client_ops_per_sec"].items():
+            print(f"      - Cliente {client_id}: {ops:.2f} ops/s")
+        print(f"    Latencia: Min={phase['min_latency_ms']:.2f}ms, Max={phase['max_latency_ms']:.2f}ms, Avg={phase['avg_latency_ms']:.2f}ms")
+        percentiles = ", ".join(f"p{p:g}={phase[f'p{p:g}_latency_ms']:.2f}ms" for p in histogram.PERCENTILES)
+        print(f"    Percentiles: {percentiles}")
+        print_error_counts(phase["error_counts"], indent="    ")
+
+    shard_ops = {}
+    for r in results:
+        for address, stats in r.get("shard_stats", {}).items():
+            shard_ops[address] = shard_ops.get(address, 0) + stats["ops"]
+    if shard_ops:
+        total_ops = sum(shard_ops.values())
+        print("\n  Reparto de carga por nodo:")
+        for address, ops in shard_ops.items():
+            print(f"    - {address}: {ops} operaciones ({ops / total_ops if total_ops else 0:.2%})")
+
+    return summary, histograms
+
+
+def print_bulk_result(action, result):
+    """Imprime el resumen de un import o export de bulkio: registros, bytes y throughput sostenido."""
+    mb = result["bytes"] / (1024 * 1024)
+    print(f"Operación {action}: {result['records']} registros, {mb:.2f} MB en {result['elapsed_seconds']:.2f}s")
+    print(f"  Throughput: {result['mb_per_sec']:.2f} MB/s, {result['records_per_sec']:.1f} registros/s")
+    if result["skipped"]:
+        print(f"  Registros saltados: {result['skipped']}")
+
+
 def main():
     """
     Función principal para ejecutar el cliente gRPC.
     """
     parser = argparse.ArgumentParser(description='gRPC Key-Value Store Client')
-    parser.add_argument('action', choices=['set', 'get', 'getPrefix', 'resetDb', 'benchmark'], help='Acción a realizar')
+    parser.add_argument('action', choices=['set', 'get', 'getPrefix', 'resetDb', 'benchmark', 'import', 'export'], help='Acción a realizar')
     parser.add_argument('--key', help='Clave para las operaciones set/get')
     parser.add_argument('--value_size', type=int, default=512, help='Tamaño del valor en bytes para la operación set (por defecto: 512)')
-    parser.add_argument('--prefix', help='Prefijo para la operación getPrefix')
+    parser.add_argument('--prefix', help='Prefijo para la operación getPrefix; en export, prefijo de las claves a exportar (por defecto: todas)')
+    parser.add_argument('--keys_only', action='store_true', help='En getPrefix, recibir solo las claves y no los valores')
+    parser.add_argument('--limit', type=int, default=0, help='En getPrefix, máximo de claves a recibir (por defecto: 0, sin límite)')
+    parser.add_argument('--cursor', default='', help='En getPrefix, reanudar después de esta clave (la última recibida)')
     parser.add_argument('--num_operations', type=int, default=1000, help='Número total de operaciones para cargas de trabajo (benchmark) (por defecto: 1000)')
+    parser.add_argument('--servers', default=DEFAULT_SERVER, help='Direcciones de los servidores separadas por comas; con varias, las claves se reparten con hashing consistente (por defecto: localhost:5050)')
+    parser.add_argument('--batch_size', type=int, default=1, help='Escrituras por petición en la fase de escritura del benchmark; con un valor mayor a 1 se usa multiSet (por defecto: 1)')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla para generar claves y valores reproducibles en el benchmark (por defecto: aleatoria)')
+    parser.add_argument('--clients', type=int, default=1, help='Número de procesos cliente para el Benchmark 2 (Multi Client); con un valor mayor a 1 se ejecuta en modo multiproceso (por defecto: 1)')
+    parser.add_argument('--cache_mb', type=float, default=0, help='Si es mayor que 0, el benchmark compara lecturas con y sin una caché de cliente de este tamaño en MB (por defecto: 0)')
+    parser.add_argument('--cache_ttl', type=float, default=None, help='Tiempo de vida en segundos de las entradas de la caché de cliente (por defecto: sin caducidad)')
+    parser.add_argument('--latency_report', help='Archivo donde exportar los histogramas de latencia del benchmark (.json o .csv)')
+    parser.add_argument('--concurrency', type=int, default=1, help='Peticiones en vuelo simultáneas en el benchmark; con un valor mayor a 1 se usa el cliente asíncrono (por defecto: 1)')
+    parser.add_argument('--rate', type=float, default=0, help='Si es mayor que 0, el benchmark escribe en lazo abierto a esta tasa (ops/s), midiendo la latencia desde el instante previsto de envío (por defecto: 0, lazo cerrado)')
+    parser.add_argument('--arrivals', choices=loadgen.ARRIVALS, default='constant', help='Llegadas en lazo abierto: intervalo constante o de Poisson (por defecto: constant)')
+    parser.add_argument('--duration', type=float, default=10, help='Segundos de cada escalón en lazo abierto (por defecto: 10)')
+    parser.add_argument('--rate_max', type=float, default=0, help='En lazo abierto, subir la tasa desde --rate hasta esta, escalón a escalón, hasta saturar (por defecto: 0, un solo escalón)')
+    parser.add_argument('--rate_step', type=float, default=0, help='Incremento de tasa entre escalones de la rampa (por defecto: el valor de --rate)')
+    parser.add_argument('--pool_size', type=int, default=1, help='Canales (conexiones HTTP/2) por servidor para las peticiones pequeñas (por defecto: 1)')
+    parser.add_argument('--large_channels', type=int, default=0, help='Canales por servidor dedicados a los valores de 512KB o más, para que no frenen a las peticiones pequeñas (por defecto: 0)')
+    parser.add_argument('--compression', choices=['none', *lbclient.COMPRESSION_ALGORITHMS], default='none', help='Comprimir las peticiones grandes con este algoritmo; el servidor comprime las respuestas según su propia configuración (por defecto: none)')
+    parser.add_argument('--compression_threshold', type=int, default=lbclient.DEFAULT_COMPRESSION_THRESHOLD, help='Bytes a partir de los cuales se comprime una petición (por defecto: 64KB)')
+    parser.add_argument('--workload', help='Carga de trabajo del benchmark: un preset estilo YCSB (A-F) o un archivo JSON con su especificación (mezcla de operaciones, distribución de claves y de tamaños)')
+    parser.add_argument('--binary_keys', action='store_true', help='Usar claves binarias de 128 bits con la clase de tamaño del valor en el primer byte; en set/get/getPrefix, --key, --prefix y --cursor se escriben en hexadecimal')
+    parser.add_argument('--path', help='En import, archivo (CSV o JSON Lines) o directorio de valores a cargar; en export, archivo o directorio de destino')
+    parser.add_argument('--format', choices=bulkio.FORMATS, default=None, help='Formato de --path en import/export (por defecto: según la extensión; un directorio es dir)')
+    parser.add_argument('--writers', type=int, default=bulkio.DEFAULT_WRITERS, help='En import, escrituras simultáneas (por defecto: 8)')
+    parser.add_argument('--window_mb', type=float, default=bulkio.DEFAULT_WINDOW_BYTES / (1024 * 1024), help='En import, MB de valores leídos y aún sin confirmar como máximo (por defecto: 64)')
+    parser.add_argument('--checkpoint', help='Archivo de checkpoint de import/export; si existe se reanuda desde él (por defecto: --path con la extensión .import.ckpt o .export.ckpt)')
+    parser.add_argument('--record_count', type=int, default=None, help='Con --workload, registros que se cargan antes de medir (por defecto: el de la carga)')
 
     args = parser.parse_args()
+    servers = [address.strip() for address in args.servers.split(',') if address.strip()]
 
     print("Iniciando el cliente...")
 
-    client = lbclient.KeyValueClient() # Crea una única instancia del cliente
+    if args.action == 'benchmark' and args.clients > 1:
+        print(f"\n--- Iniciando Benchmark 2 (Multi Client, {args.clients} clientes) ---")
+        _, histograms = run_multi_client_benchmark(args.clients, args.num_operations, args.value_size, args.seed, servers, args.binary_keys)
+        if args.latency_report:
+            histogram.export(args.latency_report, histograms)
+            print(f"Reporte de latencias guardado en: {args.latency_report}")
+        print("\n--- Benchmark 2 Finalizado ---")
+        print("Cliente finalizado.")
+        return
+
+    if args.action == 'benchmark' and args.workload:
+        print(f"\n--- Iniciando Benchmark de carga de trabajo ({args.workload}) ---")
+        run_workload_benchmark(args, servers)
+        print("Cliente finalizado.")
+        return
+
+    if args.action == 'benchmark' and args.rate > 0:
+        print(f"\n--- Iniciando Benchmark 1 (Single Client, lazo abierto a {args.rate:g} ops/s) ---")
+        asyncio.run(run_open_loop_benchmark(args))
+        print("Cliente finalizado.")
+        return
+
+    if args.action == 'benchmark' and args.concurrency > 1:
+        print(f"\n--- Iniciando Benchmark 1 (Single Client, concurrencia {args.concurrency}) ---")
+        asyncio.run(run_benchmark_async(args))
+        print("Cliente finalizado.")
+        return
+
+    if args.action in ('import', 'export') and not args.path:
+        print(f"Error: --path es requerido para la operación {args.action}")
+        return
+
+    client = create_client(servers, pool_size=args.pool_size, large_channels=args.large_channels, # Crea una única instancia del cliente
+                           compression=args.compression, compression_threshold=args.compression_threshold)
 
     if args.action == 'benchmark':
         print("\n--- Iniciando Benchmark 1 (Single Client) ---")
         # 2. Pre-poblar la DB con datos para la lectura
         # Usamos args.num_operations para la cantidad de escrituras iniciales
         write_start_time = time.time()
-        success_w, failed_w, _, _, generated_keys, write_latency_metrics = perform_bulk_write(client, args.num_operations, args.value_size)
+        success_w, failed_w, _, _, generated_keys, write_latency_metrics = perform_bulk_write(client, args.num_operations, args.value_size, utils.ValueGenerator(args.seed, binary_keys=args.binary_keys), args.batch_size)
         write_end_time = time.time()
+        write_elapsed = write_end_time - write_start_time
+        print(f"  Escrituras: Éxitos: {success_w}, Fallos: {failed_w}. Tiempo: {write_elapsed:.2f}s "
+              f"({args.num_operations / write_elapsed if write_elapsed > 0 else 0:.2f} ops/s, lote: {args.batch_size})")
+
+        latency_histograms = {f"write_{args.value_size}B": write_latency_metrics["histogram"]}
+
+        if args.cache_mb > 0:
+            comparison = perform_cached_read_comparison(client, generated_keys, args.num_operations, int(args.cache_mb * 1024 * 1024),
+                                                        args.cache_ttl, utils.ValueGenerator(args.seed), servers)
+            if comparison:
+                latency_histograms[f"read_uncached_{args.value_size}B"] = comparison["uncached"]["histogram"]
+                latency_histograms[f"read_cached_{args.value_size}B"] = comparison["cached"]["histogram"]
+
+        print_shard_stats(client)
+
+        if args.latency_report:
+            histogram.export(args.latency_report, latency_histograms)
+            print(f"Reporte de latencias guardado en: {args.latency_report}")
 
         # --- Fase 2: Carga de trabajo 50% lectura y 50% escritura (Mixed Workload) ---
         # print("\n  >> Ejecutando carga de trabajo 50% lectura / 50% escritura...")
@@ -296,8 +981,51 @@ def main():
         # input("Presiona Enter para continuar...")
         # print("El script ha continuado.")
         
+    elif args.action == 'import':
+        print(f"\n--- Importando {args.path} ({args.writers} escritores, ventana de {args.window_mb:g}MB) ---")
+        try:
+            result = bulkio.import_records(client, args.path, args.format, args.writers, int(args.window_mb * 1024 * 1024), args.checkpoint)
+        except (OSError, ValueError) as e:
+            print(f"Error: no se pudo leer {args.path}: {e}")
+            client.close()
+            sys.exit(1)
+        print_bulk_result("import", result)
+        if result["failures"]:
+            for failure in result["failures"]:
+                print(f"  Fallo: {failure}")
+            print(f"Import interrumpido en el registro {result['position']}; vuelva a ejecutar el mismo comando para reanudar (checkpoint: {result['checkpoint']})")
+            client.close()
+            sys.exit(1)
+
+    elif args.action == 'export':
+        print(f"\n--- Exportando a {args.path} ---")
+        try:
+            result = bulkio.export_records(client, args.path, args.format, args.prefix or '', args.checkpoint)
+        except (OSError, ValueError) as e:
+            print(f"Error: no se pudo escribir {args.path}: {e}")
+            client.close()
+            sys.exit(1)
+        print_bulk_result("export", result)
+        if result["error"]:
+            print(f"Export interrumpido: {result['error']}; vuelva a ejecutar el mismo comando para reanudar (checkpoint: {result['checkpoint']})")
+            client.close()
+            sys.exit(1)
+
     else:
         # Lógica para las operaciones individuales (set, get, getPrefix, resetDb)
+        if args.binary_keys:
+            # Claves, prefijos y cursores binarios se escriben en hexadecimal
+            try:
+                if args.key:
+                    args.key = keycodec.Key.from_hex(args.key)
+                if args.prefix:
+                    args.prefix = bytes.fromhex(args.prefix)
+                args.cursor = bytes.fromhex(args.cursor)
+            except ValueError as e:
+                print(f"Error: clave binaria inválida: {e}")
+                client.close()
+                return
+
         if args.action == 'set':
             if not args.key:
                 print("Error: La clave es requerida para la operación set")
@@ -323,13 +1051,23 @@ def main():
                 print("Error: El prefijo es requerido para la operación getPrefix")
                 client.close()
                 return
-            status, objects_list = client.get_prefix(args.prefix)
-            if status:
-                print(f"Operación getPrefix: Claves encontradas = {len(objects_list)}")
-                for obj in objects_list:
-                    print(f"  - Clave: {obj.clave}, Valor: {obj.valor[:50]}...")
-            else:
-                print(f"Operación getPrefix: Fallo = {objects_list}")
+            # Los objetos se imprimen a medida que llegan por el stream, sin esperar la lista completa
+            found = 0
+            last_key = args.cursor
+            try:
+                for obj in client.iter_prefix(args.prefix, keys_only=args.keys_only, limit=args.limit, cursor=args.cursor):
+                    found += 1
+                    clave = obj.clave_binaria.hex() if obj.clave_binaria else obj.clave
+                    last_key = clave
+                    if args.keys_only:
+                        print(f"  - Clave: {clave}")
+                    else:
+                        print(f"  - Clave: {clave}, Valor: {obj.valor[:50]}...")
+                print(f"Operación getPrefix: Claves encontradas = {found}")
+            except grpc.RpcError as e:
+                print(f"Operación getPrefix: Fallo tras {found} claves = {e}")
+                if last_key:
+                    print(f"Para reanudar use --cursor {last_key}")
 
         elif args.action == 'resetDb':
             status, message = client.reset_db()
@@ -340,4 +1078,5 @@ def main():
     print("Cliente finalizado.")
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support() # Necesario para el ejecutable de PyInstaller en Windows
     main()
@@ -2,32 +2,146 @@ import os
 import random
 import string
 
-def generate_random_key(length=16):
+import keycodec
+
+# Alfabeto de los valores generados (caracteres imprimibles)
+CHARACTERS = string.ascii_letters + string.digits + string.punctuation + ' '
+
+# Tabla de traducción byte aleatorio -> carácter del alfabeto. Solo se aceptan los bytes
+# menores que el mayor múltiplo de len(CHARACTERS) que cabe en 256; el resto se descarta
+# para que todos los caracteres sean equiprobables.
+_ACCEPTED_BYTES = 256 - 256 % len(CHARACTERS)
+_TRANSLATION_TABLE = bytes(ord(CHARACTERS[b % len(CHARACTERS)]) for b in range(256))
+_REJECTED_BYTES = bytes(range(_ACCEPTED_BYTES, 256))
+
+# Palabras de los valores de texto (generate_names_value): nombres de clientes como los
+# que guardan los valores en producción, mucho más compresibles que los caracteres
+# aleatorios. Solo ASCII, para que cada carácter ocupe un byte.
+FIRST_NAMES = ('Ana', 'Carlos', 'Maria', 'Jose', 'Luis', 'Carmen', 'Pedro', 'Laura', 'Jorge', 'Sofia',
+               'Miguel', 'Elena', 'Andres', 'Lucia', 'Rafael', 'Valentina', 'Diego', 'Gabriela')
+LAST_NAMES = ('Garcia', 'Rodriguez', 'Gonzalez', 'Fernandez', 'Lopez', 'Martinez', 'Sanchez', 'Perez',
+              'Gomez', 'Diaz', 'Hernandez', 'Alvarez', 'Romero', 'Torres', 'Ramirez', 'Flores', 'Rivas')
+
+# Tipos de valor de ValueGenerator: caracteres aleatorios o nombres de clientes
+VALUE_KINDS = ('random', 'names')
+
+# Tamaño por defecto del pool de ValueGenerator: el doble del mayor tamaño de valor (4MB)
+DEFAULT_POOL_SIZE = 2 * 4 * 1024 * 1024
+
+
+def _random_bytes(length, rng=None):
+    """
+    Devuelve length bytes aleatorios, de os.urandom o de rng si se indica (determinista).
+    """
+    if rng is not None:
+        return rng.randbytes(length)
+    return os.urandom(length)
+
+
+def generate_random_key(length=16, rng=None):
     """
     Genera una clave aleatoria de la longitud especificada.
 
     Args:
         length (int): La longitud de la clave en bytes.
+        rng (random.Random, opcional): Generador con semilla para obtener claves deterministas.
 
     Returns:
         str: Una cadena hexadecimal que representa la clave.
     """
-    key = os.urandom(length).hex()  # Genera bytes aleatorios y los convierte a hexadecimal
-    print(f"Clave generada: {key}")  # Imprime la clave generada
-    return key
+    return _random_bytes(length, rng).hex()  # Genera bytes aleatorios y los convierte a hexadecimal
 
-def generate_random_value(size_bytes):
+def generate_random_value(size_bytes, rng=None):
     """
     Genera un valor aleatorio del tamaño especificado.
+    Los bytes aleatorios se traducen en bloque al alfabeto con bytes.translate,
+    sin llamadas Python por carácter.
 
     Args:
         size_bytes (int): El tamaño del valor en bytes.
+        rng (random.Random, opcional): Generador con semilla para obtener valores deterministas.
 
     Returns:
-        bytes: Una cadena de bytes aleatorios.
+        str: Una cadena de caracteres imprimibles de size_bytes caracteres.
     """
-    
-    characters = string.ascii_letters + string.digits + string.punctuation + ' '
-    random_string = ''.join(random.choice(characters) for _ in range(size_bytes))
-    print(f"Valor generado de tamaño: {size_bytes} bytes")  # Imprime el tamaño del valor generado
-    return random_string
+    value = bytearray()
+    while len(value) < size_bytes:
+        missing = size_bytes - len(value)
+        # Se pide algo más de lo que falta para compensar los bytes rechazados (~26%)
+        chunk = _random_bytes(missing + missing // 2 + 16, rng)
+        value += chunk.translate(_TRANSLATION_TABLE, _REJECTED_BYTES)
+    del value[size_bytes:]
+    return value.decode('ascii')
+
+
+def generate_names_value(size_bytes, rng=None):
+    """
+    Genera un valor de texto de size_bytes caracteres con nombres de clientes separados
+    por ';' (nombre y dos apellidos de FIRST_NAMES y LAST_NAMES).
+
+    Args:
+        size_bytes (int): El tamaño del valor en bytes.
+        rng (random.Random, opcional): Generador con semilla para obtener valores deterministas.
+
+    Returns:
+        str: Una cadena ASCII de size_bytes caracteres.
+    """
+    rng = rng or random
+    parts = []
+    length = 0
+    while length < size_bytes:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)};"
+        parts.append(name)
+        length += len(name)
+    return ''.join(parts)[:size_bytes]
+
+
+class ValueGenerator:
+    """
+    Generador de claves y valores de alto rendimiento para los benchmarks.
+
+    Al crearse genera un pool de caracteres aleatorios (o de nombres de clientes, con
+    kind='names'); cada valor es una porción del pool tomada en un desplazamiento
+    aleatorio, así que obtener un valor de 4MB cuesta una copia de memoria y no millones
+    de llamadas. Con una semilla, la secuencia de claves y valores es reproducible.
+    """
+    def __init__(self, seed=None, pool_size=DEFAULT_POOL_SIZE, binary_keys=False, kind='random'):
+        if kind not in VALUE_KINDS:
+            raise ValueError(f"tipo de valor desconocido: {kind} (opciones: {', '.join(VALUE_KINDS)})")
+        self.rng = random.Random(seed)
+        self._generate = generate_names_value if kind == 'names' else generate_random_value
+        self.pool = self._generate(pool_size, rng=self.rng)
+        self.binary_keys = binary_keys
+        self._pool_bytes = None # Pool codificado, para value_bytes
+
+    def key(self, length=16):
+        """Devuelve una clave hexadecimal aleatoria de length bytes."""
+        return generate_random_key(length, rng=self.rng)
+
+    def key_for(self, value_size):
+        """
+        Devuelve una clave para un valor de value_size bytes: con binary_keys, una
+        keycodec.Key de la clase de tamaño del valor; si no, una clave hexadecimal.
+        """
+        if self.binary_keys:
+            return keycodec.Key.random(keycodec.class_for_length(value_size), rng=self.rng)
+        return self.key()
+
+    def value(self, size_bytes):
+        """Devuelve un valor de size_bytes caracteres tomado del pool."""
+        if size_bytes > len(self.pool):
+            return self._generate(size_bytes, rng=self.rng)
+        offset = self.rng.randrange(len(self.pool) - size_bytes + 1)
+        return self.pool[offset:offset + size_bytes]
+
+    def value_bytes(self, size_bytes):
+        """
+        Devuelve un valor binario de size_bytes bytes como memoryview sobre el pool ya
+        codificado, sin copiarlo (ver KeyValueClient.set con valores binarios).
+        """
+        if size_bytes > len(self.pool):
+            return memoryview(self._generate(size_bytes, rng=self.rng).encode('ascii'))
+        if self._pool_bytes is None:
+            self._pool_bytes = memoryview(self.pool.encode('ascii'))
+        offset = self.rng.randrange(len(self.pool) - size_bytes + 1)
+        return self._pool_bytes[offset:offset + size_bytes]
@@ -0,0 +1,241 @@
+import json
+import random
+
+import grpc
+import utils
+
+# Operaciones que puede mezclar una carga de trabajo
+OPERATIONS = ('read', 'update', 'insert', 'scan', 'read_modify_write')
+# Distribuciones de popularidad de las claves
+DISTRIBUTIONS = ('uniform', 'zipfian', 'latest')
+
+# Constante de Zipf de YCSB: unas pocas claves concentran la mayoría de los accesos
+ZIPFIAN_CONSTANT = 0.99
+
+# Mezcla de tamaños por defecto sobre las 5 clases de tamaño del servidor: [tamaño, peso]
+DEFAULT_VALUE_SIZES = [[512, 60], [4 * 1024, 30], [512 * 1024, 8], [1024 * 1024, 1.5], [4 * 1024 * 1024, 0.5]]
+
+# Especificación por defecto; una carga solo indica lo que cambia
+DEFAULT_SPEC = {
+    "read": 0.0,
+    "update": 0.0,
+    "insert": 0.0,
+    "scan": 0.0,
+    "read_modify_write": 0.0,
+    "distribution": "zipfian",
+    "zipfian_constant": ZIPFIAN_CONSTANT,
+    "value_sizes": DEFAULT_VALUE_SIZES,
+    "record_count": 1000,  # Claves que se cargan antes de la fase de medición
+    "scan_length": 100,    # Máximo de claves por scan (la longitud se elige uniforme entre 1 y este valor)
+    "seed": 1,
+}
+
+# Cargas estándar al estilo de YCSB A-F
+PRESETS = {
+    "A": {"read": 0.5, "update": 0.5},                  # Actualizaciones intensivas
+    "B": {"read": 0.95, "update": 0.05},                # Mayoría de lecturas
+    "C": {"read": 1.0},                                 # Solo lecturas
+    "D": {"read": 0.95, "insert": 0.05, "distribution": "latest"},  # Leer lo más reciente
+    "E": {"scan": 0.95, "insert": 0.05},                # Recorridos cortos por rango
+    "F": {"read": 0.5, "read_modify_write": 0.5},       # Leer, modificar y escribir
+}
+
+
+def load_spec(name_or_path):
+    """
+    Devuelve la especificación completa de una carga: un preset (A-F) o un archivo JSON
+    con los campos de DEFAULT_SPEC que cambian.
+
+    Raises:
+        ValueError: Si la especificación no es válida.
+    """
+    if name_or_path.upper() in PRESETS:
+        overrides = PRESETS[name_or_path.upper()]
+    else:
+        with open(name_or_path, encoding='utf-8') as f:
+            overrides = json.load(f)
+    unknown = set(overrides) - set(DEFAULT_SPEC)
+    if unknown:
+        raise ValueError(f"campos desconocidos en la carga de trabajo: {', '.join(sorted(unknown))}")
+    spec = {**DEFAULT_SPEC, **overrides}
+    if spec["distribution"] not in DISTRIBUTIONS:
+        raise ValueError(f"distribución de claves desconocida: {spec['distribution']}")
+    if sum(spec[operation] for operation in OPERATIONS) <= 0:
+        raise ValueError("la carga de trabajo no tiene operaciones")
+    if any(size <= 0 or size > 4 * 1024 * 1024 for size, _ in spec["value_sizes"]):
+        raise ValueError("los tamaños de valor deben estar entre 1 byte y 4MB")
+    return spec
+
+
+def describe_spec(spec):
+    """Devuelve una línea con la mezcla de operaciones y la distribución de una carga."""
+    mix = ", ".join(f"{operation} {spec[operation]:.0%}" for operation in OPERATIONS if spec[operation] > 0)
+    return f"{mix}; claves {spec['distribution']}; {spec['record_count']} registros iniciales"
+
+
+def fnv1a_64(number):
+    """Hash FNV-1a de 64 bits de los 8 bytes little-endian de number."""
+    h = 0xcbf29ce484222325
+    for byte in number.to_bytes(8, 'little'):
+        h = ((h ^ byte) * 0x100000001b3) & 0xFFFFFFFFFFFFFFFF
+    return h
+
+
+class KeyStore:
+    """
+    Espacio de claves de una carga de trabajo.
+
+    La clave del registro i se deriva de i (16 caracteres hexadecimales de su hash FNV-1a,
+    justo los 16 bytes de clave que guarda el servidor), así que solo se guarda el número
+    de registros: la memoria no crece con las inserciones, por larga que sea la ejecución.
+    El hash reparte los registros populares (índices bajos) por todo el espacio de claves.
+    """
+    def __init__(self, count=0):
+        self.count = count
+
+    @staticmethod
+    def key(index):
+        return f"{fnv1a_64(index):016x}"
+
+    def add(self):
+        """Añade un registro al final y devuelve su clave."""
+        self.count += 1
+        return self.key(self.count - 1)
+
+
+class ZipfianGenerator:
+    """
+    Genera rangos 0..n-1 con popularidad de Zipf (el rango 0 es el más popular), con el
+    método de Gray et al. que usa YCSB. n puede crecer: zeta(n) se extiende con los
+    términos nuevos en vez de recalcularse.
+    """
+    def __init__(self, items, theta=ZIPFIAN_CONSTANT, rng=None):
+        self.theta = theta
+        self.rng = rng or random.Random()
+        self.alpha = 1.0 / (1.0 - theta)
+        self.zeta2 = 1.0 + 0.5 ** theta
+        self.items = 0
+        self.zetan = 0.0
+        self._grow(max(1, items))
+
+    def _grow(self, items):
+        for i in range(self.items, items):
+            self.zetan += 1.0 / (i + 1) ** self.theta
+        self.items = items
+        self.eta = (1 - (2.0 / items) ** (1 - self.theta)) / (1 - self.zeta2 / self.zetan)
+
+    def next(self, items):
+        """Devuelve un rango entre 0 e items - 1."""
+        if items > self.items:
+            self._grow(items)
+        u = self.rng.random()
+        uz = u * self.zetan
+        if uz < 1.0:
+            return 0
+        if uz < self.zeta2:
+            return 1
+        return min(items - 1, int(items * (self.eta * u - self.eta + 1) ** self.alpha))
+
+
+class Workload:
+    """
+    Genera la secuencia de operaciones de una especificación de carga: el tipo de
+    operación según sus proporciones, la clave según la distribución y el tamaño del
+    valor según la mezcla de tamaños. Con la misma semilla la secuencia es la misma.
+
+    next_operation() prepara la operación completa (incluido el valor), para que el
+    benchmark la genere fuera de la región medida.
+    """
+    def __init__(self, spec, seed=None):
+        self.spec = spec
+        seed = spec["seed"] if seed is None else seed
+        self.rng = random.Random(seed)
+        self.generator = utils.ValueGenerator(seed)
+        self.keys = KeyStore()
+        self.zipfian = ZipfianGenerator(spec["record_count"], spec["zipfian_constant"], self.rng)
+        self.operations = [operation for operation in OPERATIONS if spec[operation] > 0]
+        self.operation_weights = [spec[operation] for operation in self.operations]
+        self.sizes = [size for size, _ in spec["value_sizes"]]
+        self.size_weights = [weight for _, weight in spec["value_sizes"]]
+
+    def value(self):
+        size = self.rng.choices(self.sizes, self.size_weights)[0]
+        return self.generator.value(size)
+
+    def load_items(self):
+        """Genera los (clave, valor) de la fase de carga y los añade al espacio de claves."""
+        for _ in range(self.spec["record_count"] - self.keys.count):
+            yield self.keys.add(), self.value()
+
+    def choose_key(self):
+        """Elige una clave existente según la distribución de la carga."""
+        count = max(1, self.keys.count)
+        distribution = self.spec["distribution"]
+        if distribution == 'uniform':
+            index = self.rng.randrange(count)
+        elif distribution == 'zipfian':
+            index = self.zipfian.next(count)
+        else:  # latest: los registros más recientes son los más populares
+            index = count - 1 - self.zipfian.next(count)
+        return self.keys.key(index)
+
+    def next_operation(self):
+        """
+        Devuelve la siguiente operación como (nombre, clave, argumento): el valor a escribir
+        en update/insert/read_modify_write, el máximo de claves en scan y None en read.
+        """
+        operation = self.rng.choices(self.operations, self.operation_weights)[0]
+        if operation == 'insert':
+            return operation, self.keys.add(), self.value()
+        key = self.choose_key()
+        if operation == 'read':
+            return operation, key, None
+        if operation == 'scan':
+            return operation, key, self.rng.randint(1, self.spec["scan_length"])
+        return operation, key, self.value()
+
+
+def execute(client, operation):
+    """
+    Ejecuta una operación de Workload.next_operation con un cliente síncrono.
+
+    Un scan lee hasta el número indicado de claves siguientes a la clave elegida
+    (getPrefixStream con prefijo vacío y la clave como cursor).
+
+    Returns:
+        tuple: (estado_exitoso, mensaje)
+    """
+    name, key, argument = operation
+    if name == 'read':
+        return client.get(key)
+    if name == 'scan':
+        try:
+            found = sum(1 for _ in client.iter_prefix('', limit=argument, cursor=key))
+            return True, f"{found} claves"
+        except grpc.RpcError as e:
+            return False, f"{e.code().name}: {e.details()}"
+    if name == 'read_modify_write':
+        status, message = client.get(key)
+        if not status:
+            return status, message
+    return client.set(key, argument)
+
+
+async def execute_async(client, operation):
+    """Versión de execute para lbclient.AsyncKeyValueClient."""
+    name, key, argument = operation
+    if name == 'read':
+        return await client.get(key)
+    if name == 'scan':
+        try:
+            found = 0
+            async for _ in client.iter_prefix('', limit=argument, cursor=key):
+                found += 1
+            return True, f"{found} claves"
+        except grpc.RpcError as e:
+            return False, f"{e.code().name}: {e.details()}"
+    if name == 'read_modify_write':
+        status, message = await client.get(key)
+        if not status:
+            return status, message
+    return await client.set(key, argument)
@@ -233,6 +233,8 @@ type Objeto struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Clave         string                 `protobuf:"bytes,1,opt,name=clave,proto3" json:"clave,omitempty"`
 	Valor         string                 `protobuf:"bytes,2,opt,name=valor,proto3" json:"valor,omitempty"`
+	ClaveBinaria  []byte                 `protobuf:"bytes,3,opt,name=clave_binaria,proto3,json=claveBinaria" json:"clave_binaria,omitempty"`
+	ValorBinario  []byte                 `protobuf:"bytes,4,opt,name=valor_binario,proto3,json=valorBinario" json:"valor_binario,omitempty"`
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
@@ -281,9 +283,25 @@ func (x *Objeto) GetValor() string {
 	return ""
 }
 
+func (x *Objeto) GetClaveBinaria() []byte {
+	if x != nil {
+		return x.ClaveBinaria
+	}
+	return nil
+}
+
+func (x *Objeto) GetValorBinario() []byte {
+	if x != nil {
+		return x.ValorBinario
+	}
+	return nil
+}
+
 type Consultar struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Clave         string                 `protobuf:"bytes,1,opt,name=clave,proto3" json:"clave,omitempty"`
+	ClaveBinaria  []byte                 `protobuf:"bytes,2,opt,name=clave_binaria,proto3,json=claveBinaria" json:"clave_binaria,omitempty"`
+	EnBytes       bool                   `protobuf:"varint,3,opt,name=en_bytes,proto3,json=enBytes" json:"en_bytes,omitempty"`
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
@@ -325,10 +343,26 @@ func (x *Consultar) GetClave() string {
 	return ""
 }
 
+func (x *Consultar) GetClaveBinaria() []byte {
+	if x != nil {
+		return x.ClaveBinaria
+	}
+	return nil
+}
+
+func (x *Consultar) GetEnBytes() bool {
+	if x != nil {
+		return x.EnBytes
+	}
+	return false
+}
+
 type Insertar struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Clave         string                 `protobuf:"bytes,1,opt,name=clave,proto3" json:"clave,omitempty"`
 	Valor         string                 `protobuf:"bytes,2,opt,name=valor,proto3" json:"valor,omitempty"`
+	ClaveBinaria  []byte                 `protobuf:"bytes,3,opt,name=clave_binaria,proto3,json=claveBinaria" json:"clave_binaria,omitempty"`
+	ValorBinario  []byte                 `protobuf:"bytes,4,opt,name=valor_binario,proto3,json=valorBinario" json:"valor_binario,omitempty"`
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
@@ -377,6 +411,20 @@ func (x *Insertar) GetValor() string {
 	return ""
 }
 
+func (x *Insertar) GetClaveBinaria() []byte {
+	if x != nil {
+		return x.ClaveBinaria
+	}
+	return nil
+}
+
+func (x *Insertar) GetValorBinario() []byte {
+	if x != nil {
+		return x.ValorBinario
+	}
+	return nil
+}
+
 type RespuestaSet struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Estado        bool                   `protobuf:"varint,1,opt,name=estado,proto3" json:"estado,omitempty"`
@@ -429,6 +477,374 @@ func (x *RespuestaSet) GetMensaje() string {
 	return ""
 }
 
+type InsertarLote struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Elementos     []*Insertar            `protobuf:"bytes,1,rep,name=elementos,proto3" json:"elementos,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *InsertarLote) Reset() {
+	*x = InsertarLote{}
+	mi := &file_proto_conexion_proto_msgTypes[8]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *InsertarLote) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*InsertarLote) ProtoMessage() {}
+
+func (x *InsertarLote) ProtoReflect() protoreflect.Message {
+	mi := &file_proto_conexion_proto_msgTypes[8]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use InsertarLote.ProtoReflect.Descriptor instead.
+func (*InsertarLote) Descriptor() ([]byte, []int) {
+	return file_proto_conexion_proto_rawDescGZIP(), []int{8}
+}
+
+func (x *InsertarLote) GetElementos() []*Insertar {
+	if x != nil {
+		return x.Elementos
+	}
+	return nil
+}
+
+type RespuestaLoteSet struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Estado        bool                   `protobuf:"varint,1,opt,name=estado,proto3" json:"estado,omitempty"`
+	Mensaje       string                 `protobuf:"bytes,2,opt,name=mensaje,proto3" json:"mensaje,omitempty"`
+	Respuestas    []*RespuestaSet        `protobuf:"bytes,3,rep,name=respuestas,proto3" json:"respuestas,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *RespuestaLoteSet) Reset() {
+	*x = RespuestaLoteSet{}
+	mi := &file_proto_conexion_proto_msgTypes[9]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *RespuestaLoteSet) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*RespuestaLoteSet) ProtoMessage() {}
+
+func (x *RespuestaLoteSet) ProtoReflect() protoreflect.Message {
+	mi := &file_proto_conexion_proto_msgTypes[9]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use RespuestaLoteSet.ProtoReflect.Descriptor instead.
+func (*RespuestaLoteSet) Descriptor() ([]byte, []int) {
+	return file_proto_conexion_proto_rawDescGZIP(), []int{9}
+}
+
+func (x *RespuestaLoteSet) GetEstado() bool {
+	if x != nil {
+		return x.Estado
+	}
+	return false
+}
+
+func (x *RespuestaLoteSet) GetMensaje() string {
+	if x != nil {
+		return x.Mensaje
+	}
+	return ""
+}
+
+func (x *RespuestaLoteSet) GetRespuestas() []*RespuestaSet {
+	if x != nil {
+		return x.Respuestas
+	}
+	return nil
+}
+
+type ConsultarLote struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Elementos     []*Consultar           `protobuf:"bytes,1,rep,name=elementos,proto3" json:"elementos,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *ConsultarLote) Reset() {
+	*x = ConsultarLote{}
+	mi := &file_proto_conexion_proto_msgTypes[10]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *ConsultarLote) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*ConsultarLote) ProtoMessage() {}
+
+func (x *ConsultarLote) ProtoReflect() protoreflect.Message {
+	mi := &file_proto_conexion_proto_msgTypes[10]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use ConsultarLote.ProtoReflect.Descriptor instead.
+func (*ConsultarLote) Descriptor() ([]byte, []int) {
+	return file_proto_conexion_proto_rawDescGZIP(), []int{10}
+}
+
+func (x *ConsultarLote) GetElementos() []*Consultar {
+	if x != nil {
+		return x.Elementos
+	}
+	return nil
+}
+
+type RespuestaLoteGet struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Estado        bool                   `protobuf:"varint,1,opt,name=estado,proto3" json:"estado,omitempty"`
+	Mensaje       string                 `protobuf:"bytes,2,opt,name=mensaje,proto3" json:"mensaje,omitempty"`
+	Respuestas    []*RespuestaGet        `protobuf:"bytes,3,rep,name=respuestas,proto3" json:"respuestas,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *RespuestaLoteGet) Reset() {
+	*x = RespuestaLoteGet{}
+	mi := &file_proto_conexion_proto_msgTypes[11]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *RespuestaLoteGet) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*RespuestaLoteGet) ProtoMessage() {}
+
+func (x *RespuestaLoteGet) ProtoReflect() protoreflect.Message {
+	mi := &file_proto_conexion_proto_msgTypes[11]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use RespuestaLoteGet.ProtoReflect.Descriptor instead.
+func (*RespuestaLoteGet) Descriptor() ([]byte, []int) {
+	return file_proto_conexion_proto_rawDescGZIP(), []int{11}
+}
+
+func (x *RespuestaLoteGet) GetEstado() bool {
+	if x != nil {
+		return x.Estado
+	}
+	return false
+}
+
+func (x *RespuestaLoteGet) GetMensaje() string {
+	if x != nil {
+		return x.Mensaje
+	}
+	return ""
+}
+
+func (x *RespuestaLoteGet) GetRespuestas() []*RespuestaGet {
+	if x != nil {
+		return x.Respuestas
+	}
+	return nil
+}
+
+type ConsultarPrefijo struct {
+	state          protoimpl.MessageState `protogen:"open.v1"`
+	Prefijo        string                 `protobuf:"bytes,1,opt,name=prefijo,proto3" json:"prefijo,omitempty"`
+	SoloClaves     bool                   `protobuf:"varint,2,opt,name=solo_claves,proto3,json=soloClaves" json:"solo_claves,omitempty"`
+	Limite         int32                  `protobuf:"varint,3,opt,name=limite,proto3" json:"limite,omitempty"`
+	Cursor         string                 `protobuf:"bytes,4,opt,name=cursor,proto3" json:"cursor,omitempty"`
+	PrefijoBinario []byte                 `protobuf:"bytes,5,opt,name=prefijo_binario,proto3,json=prefijoBinario" json:"prefijo_binario,omitempty"`
+	CursorBinario  []byte                 `protobuf:"bytes,6,opt,name=cursor_binario,proto3,json=cursorBinario" json:"cursor_binario,omitempty"`
+	EnBytes        bool                   `protobuf:"varint,7,opt,name=en_bytes,proto3,json=enBytes" json:"en_bytes,omitempty"`
+	unknownFields  protoimpl.UnknownFields
+	sizeCache      protoimpl.SizeCache
+}
+
+func (x *ConsultarPrefijo) Reset() {
+	*x = ConsultarPrefijo{}
+	mi := &file_proto_conexion_proto_msgTypes[12]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *ConsultarPrefijo) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*ConsultarPrefijo) ProtoMessage() {}
+
+func (x *ConsultarPrefijo) ProtoReflect() protoreflect.Message {
+	mi := &file_proto_conexion_proto_msgTypes[12]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use ConsultarPrefijo.ProtoReflect.Descriptor instead.
+func (*ConsultarPrefijo) Descriptor() ([]byte, []int) {
+	return file_proto_conexion_proto_rawDescGZIP(), []int{12}
+}
+
+func (x *ConsultarPrefijo) GetPrefijo() string {
+	if x != nil {
+		return x.Prefijo
+	}
+	return ""
+}
+
+func (x *ConsultarPrefijo) GetSoloClaves() bool {
+	if x != nil {
+		return x.SoloClaves
+	}
+	return false
+}
+
+func (x *ConsultarPrefijo) GetLimite() int32 {
+	if x != nil {
+		return x.Limite
+	}
+	return 0
+}
+
+func (x *ConsultarPrefijo) GetCursor() string {
+	if x != nil {
+		return x.Cursor
+	}
+	return ""
+}
+
+func (x *ConsultarPrefijo) GetPrefijoBinario() []byte {
+	if x != nil {
+		return x.PrefijoBinario
+	}
+	return nil
+}
+
+func (x *ConsultarPrefijo) GetCursorBinario() []byte {
+	if x != nil {
+		return x.CursorBinario
+	}
+	return nil
+}
+
+func (x *ConsultarPrefijo) GetEnBytes() bool {
+	if x != nil {
+		return x.EnBytes
+	}
+	return false
+}
+
+type Fragmento struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Clave         string                 `protobuf:"bytes,1,opt,name=clave,proto3" json:"clave,omitempty"`
+	TamanoTotal   int64                  `protobuf:"varint,2,opt,name=tamano_total,proto3,json=tamanoTotal" json:"tamano_total,omitempty"`
+	Datos         []byte                 `protobuf:"bytes,3,opt,name=datos,proto3" json:"datos,omitempty"`
+	ClaveBinaria  []byte                 `protobuf:"bytes,4,opt,name=clave_binaria,proto3,json=claveBinaria" json:"clave_binaria,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *Fragmento) Reset() {
+	*x = Fragmento{}
+	mi := &file_proto_conexion_proto_msgTypes[13]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *Fragmento) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*Fragmento) ProtoMessage() {}
+
+func (x *Fragmento) ProtoReflect() protoreflect.Message {
+	mi := &file_proto_conexion_proto_msgTypes[13]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use Fragmento.ProtoReflect.Descriptor instead.
+func (*Fragmento) Descriptor() ([]byte, []int) {
+	return file_proto_conexion_proto_rawDescGZIP(), []int{13}
+}
+
+func (x *Fragmento) GetClave() string {
+	if x != nil {
+		return x.Clave
+	}
+	return ""
+}
+
+func (x *Fragmento) GetTamanoTotal() int64 {
+	if x != nil {
+		return x.TamanoTotal
+	}
+	return 0
+}
+
+func (x *Fragmento) GetDatos() []byte {
+	if x != nil {
+		return x.Datos
+	}
+	return nil
+}
+
+func (x *Fragmento) GetClaveBinaria() []byte {
+	if x != nil {
+		return x.ClaveBinaria
+	}
+	return nil
+}
+
 var File_proto_conexion_proto protoreflect.FileDescriptor
 
 const file_proto_conexion_proto_rawDesc = "" +
@@ -445,23 +861,64 @@ const file_proto_conexion_proto_rawDesc = "" +
 	"\fRespuestaGet\x12\x16\n" +
 	"\x06estado\x18\x01 \x01(\bR\x06estado\x12\x18\n" +
 	"\amensaje\x18\x02 \x01(\tR\amensaje\x12(\n" +
-	"\x06objeto\x18\x03 \x01(\v2\x10.conexion.ObjetoR\x06objeto\"4\n" +
+	"\x06objeto\x18\x03 \x01(\v2\x10.conexion.ObjetoR\x06objeto\"~\n" +
 	"\x06Objeto\x12\x14\n" +
 	"\x05clave\x18\x01 \x01(\tR\x05clave\x12\x14\n" +
-	"\x05valor\x18\x02 \x01(\tR\x05valor\"!\n" +
+	"\x05valor\x18\x02 \x01(\tR\x05valor\x12#\n" +
+	"\rclave_binaria\x18\x03 \x01(\fR\fclaveBinaria\x12#\n" +
+	"\rvalor_binario\x18\x04 \x01(\fR\fvalorBinario\"a\n" +
 	"\tConsultar\x12\x14\n" +
-	"\x05clave\x18\x01 \x01(\tR\x05clave\"6\n" +
+	"\x05clave\x18\x01 \x01(\tR\x05clave\x12#\n" +
+	"\rclave_binaria\x18\x02 \x01(\fR\fclaveBinaria\x12\x19\n" +
+	"\ben_bytes\x18\x03 \x01(\bR\aenBytes\"\x80\x01\n" +
 	"\bInsertar\x12\x14\n" +
 	"\x05clave\x18\x01 \x01(\tR\x05clave\x12\x14\n" +
-	"\x05valor\x18\x02 \x01(\tR\x05valor\"@\n" +
+	"\x05valor\x18\x02 \x01(\tR\x05valor\x12#\n" +
+	"\rclave_binaria\x18\x03 \x01(\fR\fclaveBinaria\x12#\n" +
+	"\rvalor_binario\x18\x04 \x01(\fR\fvalorBinario\"@\n" +
 	"\fRespuestaSet\x12\x16\n" +
 	"\x06estado\x18\x01 \x01(\bR\x06estado\x12\x18\n" +
-	"\amensaje\x18\x02 \x01(\tR\amensaje2\xea\x01\n" +
+	"\amensaje\x18\x02 \x01(\tR\amensaje\"@\n" +
+	"\fInsertarLote\x120\n" +
+	"\telementos\x18\x01 \x03(\v2\x12.conexion.InsertarR\telementos\"|\n" +
+	"\x10RespuestaLoteSet\x12\x16\n" +
+	"\x06estado\x18\x01 \x01(\bR\x06estado\x12\x18\n" +
+	"\amensaje\x18\x02 \x01(\tR\amensaje\x126\n" +
+	"\n" +
+	"respuestas\x18\x03 \x03(\v2\x16.conexion.RespuestaSetR\n" +
+	"respuestas\"B\n" +
+	"\rConsultarLote\x121\n" +
+	"\telementos\x18\x01 \x03(\v2\x13.conexion.ConsultarR\telementos\"|\n" +
+	"\x10RespuestaLoteGet\x12\x16\n" +
+	"\x06estado\x18\x01 \x01(\bR\x06estado\x12\x18\n" +
+	"\amensaje\x18\x02 \x01(\tR\amensaje\x126\n" +
+	"\n" +
+	"respuestas\x18\x03 \x03(\v2\x16.conexion.RespuestaGetR\n" +
+	"respuestas\"\xe8\x01\n" +
+	"\x10ConsultarPrefijo\x12\x18\n" +
+	"\aprefijo\x18\x01 \x01(\tR\aprefijo\x12\x1f\n" +
+	"\vsolo_claves\x18\x02 \x01(\bR\n" +
+	"soloClaves\x12\x16\n" +
+	"\x06limite\x18\x03 \x01(\x05R\x06limite\x12\x16\n" +
+	"\x06cursor\x18\x04 \x01(\tR\x06cursor\x12'\n" +
+	"\x0fprefijo_binario\x18\x05 \x01(\fR\x0eprefijoBinario\x12%\n" +
+	"\x0ecursor_binario\x18\x06 \x01(\fR\rcursorBinario\x12\x19\n" +
+	"\ben_bytes\x18\a \x01(\bR\aenBytes\"\x7f\n" +
+	"\tFragmento\x12\x14\n" +
+	"\x05clave\x18\x01 \x01(\tR\x05clave\x12!\n" +
+	"\ftamano_total\x18\x02 \x01(\x03R\vtamanoTotal\x12\x14\n" +
+	"\x05datos\x18\x03 \x01(\fR\x05datos\x12#\n" +
+	"\rclave_binaria\x18\x04 \x01(\fR\fclaveBinaria2\xa3\x04\n" +
 	"\x02BD\x121\n" +
 	"\x03set\x12\x12.conexion.Insertar\x1a\x16.conexion.RespuestaSet\x122\n" +
 	"\x03get\x12\x13.conexion.Consultar\x1a\x16.conexion.RespuestaGet\x12>\n" +
 	"\tgetPrefix\x12\x13.conexion.Consultar\x1a\x1c.conexion.RespuestaGetPrefix\x12=\n" +
-	"\aresetDb\x12\x18.conexion.RequestResetDb\x1a\x18.conexion.RespuestaResetB;Z9github.com/yormanbalanD/bd-clave-valor-distribuidos/protob\x06proto3"
+	"\aresetDb\x12\x18.conexion.RequestResetDb\x1a\x18.conexion.RespuestaReset\x12>\n" +
+	"\bmultiSet\x12\x16.conexion.InsertarLote\x1a\x1a.conexion.RespuestaLoteSet\x12?\n" +
+	"\bmultiGet\x12\x17.conexion.ConsultarLote\x1a\x1a.conexion.RespuestaLoteGet\x12A\n" +
+	"\x0fgetPrefixStream\x12\x1a.conexion.ConsultarPrefijo\x1a\x10.conexion.Objeto0\x01\x12:\n" +
+	"\tsetStream\x12\x13.conexion.Fragmento\x1a\x16.conexion.RespuestaSet(\x01\x127\n" +
+	"\tgetStream\x12\x13.conexion.Consultar\x1a\x13.conexion.Fragmento0\x01B;Z9github.com/yormanbalanD/bd-clave-valor-distribuidos/protob\x06proto3"
 
 var (
 	file_proto_conexion_proto_rawDescOnce sync.Once
@@ -475,7 +932,7 @@ func file_proto_conexion_proto_rawDescGZIP() []byte {
 	return file_proto_conexion_proto_rawDescData
 }
 
-var file_proto_conexion_proto_msgTypes = make([]protoimpl.MessageInfo, 8)
+var file_proto_conexion_proto_msgTypes = make([]protoimpl.MessageInfo, 14)
 var file_proto_conexion_proto_goTypes = []any{
 	(*RequestResetDb)(nil),     // 0: conexion.RequestResetDb
 	(*RespuestaReset)(nil),     // 1: conexion.RespuestaReset
@@ -485,23 +942,43 @@ var file_proto_conexion_proto_goTypes = []any{
 	(*Consultar)(nil),          // 5: conexion.Consultar
 	(*Insertar)(nil),           // 6: conexion.Insertar
 	(*RespuestaSet)(nil),       // 7: conexion.RespuestaSet
+	(*InsertarLote)(nil),       // 8: conexion.InsertarLote
+	(*RespuestaLoteSet)(nil),   // 9: conexion.RespuestaLoteSet
+	(*ConsultarLote)(nil),      // 10: conexion.ConsultarLote
+	(*RespuestaLoteGet)(nil),   // 11: conexion.RespuestaLoteGet
+	(*ConsultarPrefijo)(nil),   // 12: conexion.ConsultarPrefijo
+	(*Fragmento)(nil),          // 13: conexion.Fragmento
 }
 var file_proto_conexion_proto_depIdxs = []int32{
-	4, // 0: conexion.RespuestaGetPrefix.objetos:type_name -> conexion.Objeto
-	4, // 1: conexion.RespuestaGet.objeto:type_name -> conexion.Objeto
-	6, // 2: conexion.BD.set:input_type -> conexion.Insertar
-	5, // 3: conexion.BD.get:input_type -> conexion.Consultar
-	5, // 4: conexion.BD.getPrefix:input_type -> conexion.Consultar
-	0, // 5: conexion.BD.resetDb:input_type -> conexion.RequestResetDb
-	7, // 6: conexion.BD.set:output_type -> conexion.RespuestaSet
-	3, // 7: conexion.BD.get:output_type -> conexion.RespuestaGet
-	2, // 8: conexion.BD.getPrefix:output_type -> conexion.RespuestaGetPrefix
-	1, // 9: conexion.BD.resetDb:output_type -> conexion.RespuestaReset
-	6, // [6:10] is the sub-list for method output_type
-	2, // [2:6] is the sub-list for method input_type
-	2, // [2:2] is the sub-list for extension type_name
-	2, // [2:2] is the sub-list for extension extendee
-	0, // [0:2] is the sub-list for field type_name
+	4,  // 0: conexion.RespuestaGetPrefix.objetos:type_name -> conexion.Objeto
+	4,  // 1: conexion.RespuestaGet.objeto:type_name -> conexion.Objeto
+	6,  // 2: conexion.InsertarLote.elementos:type_name -> conexion.Insertar
+	7,  // 3: conexion.RespuestaLoteSet.respuestas:type_name -> conexion.RespuestaSet
+	5,  // 4: conexion.ConsultarLote.elementos:type_name -> conexion.Consultar
+	3,  // 5: conexion.RespuestaLoteGet.respuestas:type_name -> conexion.RespuestaGet
+	6,  // 6: conexion.BD.set:input_type -> conexion.Insertar
+	5,  // 7: conexion.BD.get:input_type -> conexion.Consultar
+	5,  // 8: conexion.BD.getPrefix:input_type -> conexion.Consultar
+	0,  // 9: conexion.BD.resetDb:input_type -> conexion.RequestResetDb
+	8,  // 10: conexion.BD.multiSet:input_type -> conexion.InsertarLote
+	10, // 11: conexion.BD.multiGet:input_type -> conexion.ConsultarLote
+	12, // 12: conexion.BD.getPrefixStream:input_type -> conexion.ConsultarPrefijo
+	13, // 13: conexion.BD.setStream:input_type -> conexion.Fragmento
+	5,  // 14: conexion.BD.getStream:input_type -> conexion.Consultar
+	7,  // 15: conexion.BD.set:output_type -> conexion.RespuestaSet
+	3,  // 16: conexion.BD.get:output_type -> conexion.RespuestaGet
+	2,  // 17: conexion.BD.getPrefix:output_type -> conexion.RespuestaGetPrefix
+	1,  // 18: conexion.BD.resetDb:output_type -> conexion.RespuestaReset
+	9,  // 19: conexion.BD.multiSet:output_type -> conexion.RespuestaLoteSet
+	11, // 20: conexion.BD.multiGet:output_type -> conexion.RespuestaLoteGet
+	4,  // 21: conexion.BD.getPrefixStream:output_type -> conexion.Objeto
+	7,  // 22: conexion.BD.setStream:output_type -> conexion.RespuestaSet
+	13, // 23: conexion.BD.getStream:output_type -> conexion.Fragmento
+	15, // [15:24] is the sub-list for method output_type
+	6,  // [6:15] is the sub-list for method input_type
+	6,  // [6:6] is the sub-list for extension type_name
+	6,  // [6:6] is the sub-list for extension extendee
+	0,  // [0:6] is the sub-list for field type_name
 }
 
 func init() { file_proto_conexion_proto_init() }
@@ -515,7 +992,7 @@ func file_proto_conexion_proto_init() {
 			GoPackagePath: reflect.TypeOf(x{}).PkgPath(),
 			RawDescriptor: unsafe.Slice(unsafe.StringData(file_proto_conexion_proto_rawDesc), len(file_proto_conexion_proto_rawDesc)),
 			NumEnums:      0,
-			NumMessages:   8,
+			NumMessages:   14,
 			NumExtensions: 0,
 			NumServices:   1,
 		},
@@ -19,10 +19,15 @@ import (
 const _ = grpc.SupportPackageIsVersion9
 
 const (
-	BD_Set_FullMethodName       = "/conexion.BD/set"
-	BD_Get_FullMethodName       = "/conexion.BD/get"
-	BD_GetPrefix_FullMethodName = "/conexion.BD/getPrefix"
-	BD_ResetDb_FullMethodName   = "/conexion.BD/resetDb"
+	BD_Set_FullMethodName             = "/conexion.BD/set"
+	BD_Get_FullMethodName             = "/conexion.BD/get"
+	BD_GetPrefix_FullMethodName       = "/conexion.BD/getPrefix"
+	BD_ResetDb_FullMethodName         = "/conexion.BD/resetDb"
+	BD_MultiSet_FullMethodName        = "/conexion.BD/multiSet"
+	BD_MultiGet_FullMethodName        = "/conexion.BD/multiGet"
+	BD_GetPrefixStream_FullMethodName = "/conexion.BD/getPrefixStream"
+	BD_SetStream_FullMethodName       = "/conexion.BD/setStream"
+	BD_GetStream_FullMethodName       = "/conexion.BD/getStream"
 )
 
 // BDClient is the client API for BD service.
@@ -33,6 +38,11 @@ type BDClient interface {
 	Get(ctx context.Context, in *Consultar, opts ...grpc.CallOption) (*RespuestaGet, error)
 	GetPrefix(ctx context.Context, in *Consultar, opts ...grpc.CallOption) (*RespuestaGetPrefix, error)
 	ResetDb(ctx context.Context, in *RequestResetDb, opts ...grpc.CallOption) (*RespuestaReset, error)
+	MultiSet(ctx context.Context, in *InsertarLote, opts ...grpc.CallOption) (*RespuestaLoteSet, error)
+	MultiGet(ctx context.Context, in *ConsultarLote, opts ...grpc.CallOption) (*RespuestaLoteGet, error)
+	GetPrefixStream(ctx context.Context, in *ConsultarPrefijo, opts ...grpc.CallOption) (grpc.ServerStreamingClient[Objeto], error)
+	SetStream(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[Fragmento, RespuestaSet], error)
+	GetStream(ctx context.Context, in *Consultar, opts ...grpc.CallOption) (grpc.ServerStreamingClient[Fragmento], error)
 }
 
 type bDClient struct {
@@ -83,6 +93,77 @@ func (c *bDClient) ResetDb(ctx context.Context, in *RequestResetDb, opts ...grpc
 	return out, nil
 }
 
+func (c *bDClient) MultiSet(ctx context.Context, in *InsertarLote, opts ...grpc.CallOption) (*RespuestaLoteSet, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(RespuestaLoteSet)
+	err := c.cc.Invoke(ctx, BD_MultiSet_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
+func (c *bDClient) MultiGet(ctx context.Context, in *ConsultarLote, opts ...grpc.CallOption) (*RespuestaLoteGet, error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	out := new(RespuestaLoteGet)
+	err := c.cc.Invoke(ctx, BD_MultiGet_FullMethodName, in, out, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	return out, nil
+}
+
+func (c *bDClient) GetPrefixStream(ctx context.Context, in *ConsultarPrefijo, opts ...grpc.CallOption) (grpc.ServerStreamingClient[Objeto], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &BD_ServiceDesc.Streams[0], BD_GetPrefixStream_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[ConsultarPrefijo, Objeto]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type BD_GetPrefixStreamClient = grpc.ServerStreamingClient[Objeto]
+
+func (c *bDClient) SetStream(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[Fragmento, RespuestaSet], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &BD_ServiceDesc.Streams[1], BD_SetStream_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[Fragmento, RespuestaSet]{ClientStream: stream}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type BD_SetStreamClient = grpc.ClientStreamingClient[Fragmento, RespuestaSet]
+
+func (c *bDClient) GetStream(ctx context.Context, in *Consultar, opts ...grpc.CallOption) (grpc.ServerStreamingClient[Fragmento], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &BD_ServiceDesc.Streams[2], BD_GetStream_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[Consultar, Fragmento]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type BD_GetStreamClient = grpc.ServerStreamingClient[Fragmento]
+
 // BDServer is the server API for BD service.
 // All implementations must embed UnimplementedBDServer
 // for forward compatibility.
@@ -91,6 +172,11 @@ type BDServer interface {
 	Get(context.Context, *Consultar) (*RespuestaGet, error)
 	GetPrefix(context.Context, *Consultar) (*RespuestaGetPrefix, error)
 	ResetDb(context.Context, *RequestResetDb) (*RespuestaReset, error)
+	MultiSet(context.Context, *InsertarLote) (*RespuestaLoteSet, error)
+	MultiGet(context.Context, *ConsultarLote) (*RespuestaLoteGet, error)
+	GetPrefixStream(*ConsultarPrefijo, grpc.ServerStreamingServer[Objeto]) error
+	SetStream(grpc.ClientStreamingServer[Fragmento, RespuestaSet]) error
+	GetStream(*Consultar, grpc.ServerStreamingServer[Fragmento]) error
 	mustEmbedUnimplementedBDServer()
 }
 
@@ -113,6 +199,21 @@ func (UnimplementedBDServer) GetPrefix(context.Context, *Consultar) (*RespuestaG
 func (UnimplementedBDServer) ResetDb(context.Context, *RequestResetDb) (*RespuestaReset, error) {
 	return nil, status.Errorf(codes.Unimplemented, "method ResetDb not implemented")
 }
+func (UnimplementedBDServer) MultiSet(context.Context, *InsertarLote) (*RespuestaLoteSet, error) {
+	return nil, status.Errorf(codes.Unimplemented, "method MultiSet not implemented")
+}
+func (UnimplementedBDServer) MultiGet(context.Context, *ConsultarLote) (*RespuestaLoteGet, error) {
+	return nil, status.Errorf(codes.Unimplemented, "method MultiGet not implemented")
+}
+func (UnimplementedBDServer) GetPrefixStream(*ConsultarPrefijo, grpc.ServerStreamingServer[Objeto]) error {
+	return status.Errorf(codes.Unimplemented, "method GetPrefixStream not implemented")
+}
+func (UnimplementedBDServer) SetStream(grpc.ClientStreamingServer[Fragmento, RespuestaSet]) error {
+	return status.Errorf(codes.Unimplemented, "method SetStream not implemented")
+}
+func (UnimplementedBDServer) GetStream(*Consultar, grpc.ServerStreamingServer[Fragmento]) error {
+	return status.Errorf(codes.Unimplemented, "method GetStream not implemented")
+}
 func (UnimplementedBDServer) mustEmbedUnimplementedBDServer() {}
 func (UnimplementedBDServer) testEmbeddedByValue()            {}
 
@@ -206,6 +307,71 @@ func _BD_ResetDb_Handler(srv interface{}, ctx context.Context, dec func(interfac
 	return interceptor(ctx, in, info, handler)
 }
 
+func _BD_MultiSet_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(InsertarLote)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(BDServer).MultiSet(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: BD_MultiSet_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(BDServer).MultiSet(ctx, req.(*InsertarLote))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
+func _BD_MultiGet_Handler(srv interface{}, ctx context.Context, dec func(interface{}) error, interceptor grpc.UnaryServerInterceptor) (interface{}, error) {
+	in := new(ConsultarLote)
+	if err := dec(in); err != nil {
+		return nil, err
+	}
+	if interceptor == nil {
+		return srv.(BDServer).MultiGet(ctx, in)
+	}
+	info := &grpc.UnaryServerInfo{
+		Server:     srv,
+		FullMethod: BD_MultiGet_FullMethodName,
+	}
+	handler := func(ctx context.Context, req interface{}) (interface{}, error) {
+		return srv.(BDServer).MultiGet(ctx, req.(*ConsultarLote))
+	}
+	return interceptor(ctx, in, info, handler)
+}
+
+func _BD_GetPrefixStream_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(ConsultarPrefijo)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(BDServer).GetPrefixStream(m, &grpc.GenericServerStream[ConsultarPrefijo, Objeto]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type BD_GetPrefixStreamServer = grpc.ServerStreamingServer[Objeto]
+
+func _BD_SetStream_Handler(srv interface{}, stream grpc.ServerStream) error {
+	return srv.(BDServer).SetStream(&grpc.GenericServerStream[Fragmento, RespuestaSet]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type BD_SetStreamServer = grpc.ClientStreamingServer[Fragmento, RespuestaSet]
+
+func _BD_GetStream_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(Consultar)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(BDServer).GetStream(m, &grpc.GenericServerStream[Consultar, Fragmento]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type BD_GetStreamServer = grpc.ServerStreamingServer[Fragmento]
+
 // BD_ServiceDesc is the grpc.ServiceDesc for BD service.
 // It's only intended for direct use with grpc.RegisterService,
 // and not to be introspected or modified (even as a copy)
@@ -229,7 +395,31 @@ var BD_ServiceDesc = grpc.ServiceDesc{
 			MethodName: "resetDb",
 			Handler:    _BD_ResetDb_Handler,
 		},
+		{
+			MethodName: "multiSet",
+			Handler:    _BD_MultiSet_Handler,
+		},
+		{
+			MethodName: "multiGet",
+			Handler:    _BD_MultiGet_Handler,
+		},
+	},
+	Streams: []grpc.StreamDesc{
+		{
+			StreamName:    "getPrefixStream",
+			Handler:       _BD_GetPrefixStream_Handler,
+			ServerStreams: true,
+		},
+		{
+			StreamName:    "setStream",
+			Handler:       _BD_SetStream_Handler,
+			ClientStreams: true,
+		},
+		{
+			StreamName:    "getStream",
+			Handler:       _BD_GetStream_Handler,
+			ServerStreams: true,
+		},
 	},
-	Streams:  []grpc.StreamDesc{},
 	Metadata: "proto/conexion.proto",
 }
@@ -0,0 +1,211 @@
+package main
+
+import (
+	"encoding/binary"
+	"fmt"
+	"os"
+	"runtime"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+)
+
+// decodificarRegistros decodifica los registros InfClave completos de datos (el contenido
+// de keys.db) entre los índices de registro desde y hasta, sin leer los valores.
+func decodificarRegistros(datos []byte, desde int, hasta int) []DatosDiccionario {
+	entradas := make([]DatosDiccionario, 0, hasta-desde)
+	for i := desde; i < hasta; i++ {
+		registro := datos[i*InfClaveSize : (i+1)*InfClaveSize]
+		campoTamaño := int32(binary.LittleEndian.Uint32(registro[16:20]))
+		clave := claveDeRegistro(registro[:16], campoTamaño)
+		tamaño, largo := decodificarTamaño(campoTamaño)
+		entradas = append(entradas, DatosDiccionario{
+			Clave:         clave,
+			Tamaño:        tamaño,
+			Largo:         largo,
+			PosicionValue: int64(binary.LittleEndian.Uint64(registro[20:28])),
+			PosicionKey:   int64(i * InfClaveSize),
+		})
+	}
+	return entradas
+}
+
+// getAllValuesToDict carga el índice de claves de keys.db en tablaHash sin leer los
+// valores, que se cargan al primer acceso (valorDe) o en segundo plano (precargarValores).
+//
+// keys.db se lee completo de una vez y sus registros se decodifican en paralelo, un
+// tramo por CPU; luego se insertan en orden en tablaHash para que, si una clave aparece
+// varias veces, gane el último registro.
+func getAllValuesToDict() error {
+	datos, err := os.ReadFile("./db/keys.db")
+	if err != nil && !os.IsNotExist(err) {
+		fmt.Println("Error al leer el archivo Keys de la DB:", err)
+		return fmt.Errorf("error al leer el archivo Keys de la DB: %v", err)
+	}
+
+	total := len(datos) / InfClaveSize
+	if sobrante := len(datos) % InfClaveSize; sobrante != 0 {
+		fmt.Printf("Advertencia: keys.db termina con un registro incompleto de %d bytes. Se ignora.\n", sobrante)
+	}
+
+	trabajadores := runtime.NumCPU()
+	tramo := (total + trabajadores - 1) / trabajadores
+	tramos := make([][]DatosDiccionario, trabajadores)
+	var grupo sync.WaitGroup
+	for t := 0; t < trabajadores; t++ {
+		desde, hasta := t*tramo, (t+1)*tramo
+		if hasta > total {
+			hasta = total
+		}
+		if desde >= hasta {
+			break
+		}
+		grupo.Add(1)
+		go func(t int, desde int, hasta int) {
+			defer grupo.Done()
+			tramos[t] = decodificarRegistros(datos, desde, hasta)
+		}(t, desde, hasta)
+	}
+	grupo.Wait()
+
+	tablaHashMutex.Lock()
+	defer tablaHashMutex.Unlock()
+
+	for _, entradas := range tramos {
+		for _, entrada := range entradas {
+			tablaHash[entrada.Clave] = entrada
+		}
+	}
+	claves := make([]string, 0, len(tablaHash))
+	for clave := range tablaHash {
+		claves = append(claves, clave)
+	}
+	indiceClaves.Reconstruir(claves)
+
+	return nil
+}
+
+// leerValor lee de fileValues el valor de largo bytes en pos. Si el largo no se conoce
+// (LARGO_DESCONOCIDO) lee el bloque de tamaño bytes y descarta el relleno de NULs.
+func leerValor(fileValues *os.File, pos int64, tamaño int32, largo int32) (string, error) {
+	if largo != LARGO_DESCONOCIDO {
+		tamaño = largo
+	}
+	buf := make([]byte, tamaño)
+	n, err := fileValues.ReadAt(buf, pos)
+	if n < int(tamaño) {
+		return "", fmt.Errorf("error al leer el archivo Values: registro incompleto en pos %d: %v", pos, err)
+	}
+	if largo != LARGO_DESCONOCIDO {
+		return string(buf), nil
+	}
+	return strings.TrimRight(string(buf), "\x00"), nil
+}
+
+// cargarValor lee de values.db el valor de clave si aún no está en memoria y lo guarda en
+// tablaHash. Toma el bloqueo de la clave, así que no se cruza con una escritura de la
+// misma clave. Si fileValues es nil abre el archivo. Devuelve false si la clave no existe.
+func cargarValor(clave string, fileValues *os.File) (string, bool, error) {
+	bloqueo := bloqueoDeClave(clave)
+	bloqueo.Lock()
+	defer bloqueo.Unlock()
+
+	tablaHashMutex.RLock()
+	entrada, exist := tablaHash[clave]
+	tablaHashMutex.RUnlock()
+	if !exist || entrada.Cargado {
+		return entrada.Valor, exist, nil
+	}
+
+	if fileValues == nil {
+		archivo, err := os.Open("./db/values.db")
+		if err != nil {
+			return "", true, err
+		}
+		defer archivo.Close()
+		fileValues = archivo
+	}
+	valor, err := leerValor(fileValues, entrada.PosicionValue, entrada.Tamaño, entrada.Largo)
+	if err != nil {
+		return "", true, err
+	}
+
+	entrada.Valor = valor
+	entrada.Cargado = true
+	tablaHashMutex.Lock()
+	tablaHash[clave] = entrada
+	tablaHashMutex.Unlock()
+	return valor, true, nil
+}
+
+// valorDe devuelve el valor de clave, leyéndolo de values.db en el primer acceso.
+// Devuelve false si la clave no existe.
+func valorDe(clave string) (string, bool, error) {
+	tablaHashMutex.RLock()
+	entrada, exist := tablaHash[clave]
+	tablaHashMutex.RUnlock()
+	if !exist || entrada.Cargado {
+		return entrada.Valor, exist, nil
+	}
+	return cargarValor(clave, nil)
+}
+
+// generacionBD cambia con cada resetDb (bajo reinicioMutex en modo escritura); la precarga
+// la usa para detenerse si la base se reinició mientras corría.
+var generacionBD int64
+
+// precargarValores lee en segundo plano los valores que aún no están en memoria, en el
+// orden en que están en values.db para que la lectura sea secuencial, y reporta el
+// tiempo de precarga por separado del de construcción del índice.
+func precargarValores() {
+	inicio := time.Now()
+
+	type pendiente struct {
+		clave string
+		pos   int64
+	}
+	tablaHashMutex.RLock()
+	pendientes := make([]pendiente, 0, len(tablaHash))
+	for clave, entrada := range tablaHash {
+		if !entrada.Cargado {
+			pendientes = append(pendientes, pendiente{clave, entrada.PosicionValue})
+		}
+	}
+	tablaHashMutex.RUnlock()
+	if len(pendientes) == 0 {
+		return
+	}
+	sort.Slice(pendientes, func(a, b int) bool { return pendientes[a].pos < pendientes[b].pos })
+
+	reinicioMutex.RLock()
+	generacion := generacionBD
+	reinicioMutex.RUnlock()
+
+	fileValues, err := os.Open("./db/values.db")
+	if err != nil {
+		fmt.Println("Error al abrir el archivo Values para la precarga:", err)
+		return
+	}
+	defer fileValues.Close()
+
+	var bytesLeidos int64
+	for _, p := range pendientes {
+		reinicioMutex.RLock()
+		if generacionBD != generacion {
+			reinicioMutex.RUnlock()
+			fmt.Println("Precarga de valores interrumpida por resetDb")
+			return
+		}
+		valor, _, err := cargarValor(p.clave, fileValues)
+		reinicioMutex.RUnlock()
+		if err != nil {
+			fmt.Printf("Error al precargar el valor de la clave '%s': %v\n", p.clave, err)
+			continue
+		}
+		bytesLeidos += int64(len(valor))
+	}
+
+	duracion := time.Since(inicio)
+	fmt.Printf("Precarga de valores terminada: %d valores, %.2f MB en %v\n", len(pendientes), float64(bytesLeidos)/(1024*1024), duracion)
+}
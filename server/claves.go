@@ -0,0 +1,131 @@
+package main
+
+import (
+	"errors"
+	"strings"
+	"unicode/utf8"
+
+	pb "github.com/yormanbalanD/bd-clave-valor-distribuidos/proto"
+)
+
+// Largo en bytes de una clave de 128 bits (y del campo Clave de InfClave)
+const LARGO_CLAVE = 16
+
+// Primer byte de la forma interna de una clave binaria. Nunca aparece en texto UTF-8, así
+// que una clave binaria no coincide con ninguna de texto y en el índice ordenado todas
+// las binarias quedan después de las de texto.
+const MARCA_CLAVE_BINARIA = 0xFF
+
+// Clase de tamaño según el primer byte de una clave binaria (PLANTEAMIENTO.txt): un único
+// bit en 1 entre los cinco más altos; los tres bits bajos deben ser cero.
+var clasesDeClave = map[byte]int32{
+	0x80: B512,
+	0x40: KB4,
+	0x20: KB512,
+	0x10: MB1,
+	0x08: MB4,
+}
+
+var errClaveInvalida = errors.New("clave binaria inválida: deben ser 16 bytes con la clase de tamaño en el primer byte")
+var errValorFueraDeClase = errors.New("el valor es mayor que la clase de tamaño de la clave")
+
+// claveBinaria valida una clave binaria y devuelve su forma interna y la clase de tamaño
+// de su primer byte.
+//
+// La forma interna es MARCA_CLAVE_BINARIA seguida de los 16 bytes, sin quitar los NUL
+// finales: las claves binarias y las de texto son espacios de nombres distintos aunque
+// sus bytes coincidan (una clave de texto "@abc" y la binaria '@' 'a' 'b' 'c' con 12 NUL
+// son dos claves). Entre las binarias el orden del índice es el de sus 16 bytes.
+func claveBinaria(clave []byte) (string, int32, error) {
+	if len(clave) != LARGO_CLAVE {
+		return "", 0, errClaveInvalida
+	}
+	clase, ok := clasesDeClave[clave[0]]
+	if !ok {
+		return "", 0, errClaveInvalida
+	}
+	return formaBinaria(clave), clase, nil
+}
+
+// formaBinaria devuelve la forma interna de una clave, un prefijo o un cursor binarios: la
+// marca seguida de sus bytes, sin quitar los NUL finales.
+func formaBinaria(clave []byte) string {
+	return string([]byte{MARCA_CLAVE_BINARIA}) + string(clave)
+}
+
+// esClaveBinaria indica si una clave en su forma interna es binaria.
+func esClaveBinaria(clave string) bool {
+	return len(clave) == LARGO_CLAVE+1 && clave[0] == MARCA_CLAVE_BINARIA
+}
+
+// claseDeClave devuelve la clase de tamaño de una clave en su forma interna: la de su
+// primer byte si es binaria, o 0 si es de texto (el bloque se elige por el largo del valor).
+func claseDeClave(clave string) int32 {
+	if !esClaveBinaria(clave) {
+		return 0
+	}
+	return clasesDeClave[clave[1]]
+}
+
+// claveDeRegistro devuelve la forma interna de la clave de un registro de keys.db a
+// partir de sus 16 bytes y su campo Tamaño: la forma binaria si el registro está marcado
+// (ver marcarClaveBinaria) o, si no, la clave de texto sin los NUL finales.
+func claveDeRegistro(clave []byte, tamaño int32) string {
+	if esRegistroBinario(tamaño) {
+		return formaBinaria(clave)
+	}
+	return strings.TrimRight(string(clave), "\x00")
+}
+
+// resolverClave devuelve la clave de una petición: la binaria si viene, con su clase de
+// tamaño, o la de texto con clase 0 (el bloque se elige por el largo del valor).
+func resolverClave(texto string, binaria []byte) (string, int32, error) {
+	if len(binaria) > 0 {
+		return claveBinaria(binaria)
+	}
+	return texto, 0, nil
+}
+
+// rellenarClave devuelve los 16 bytes de keys.db de una clave en su forma interna: los de
+// una clave binaria sin la marca, o los de una de texto completados con NUL.
+func rellenarClave(clave string) []byte {
+	if esClaveBinaria(clave) {
+		return []byte(clave[1:])
+	}
+	buf := make([]byte, LARGO_CLAVE)
+	copy(buf, clave)
+	return buf
+}
+
+// objetoDeClave arma el Objeto de una respuesta. La clave va en ClaveBinaria si es
+// binaria, si la petición usó claves binarias o si no es texto UTF-8 (un campo string de
+// protobuf no puede llevarla); si no, en Clave.
+func objetoDeClave(clave string, binaria bool) *pb.Objeto {
+	if binaria || esClaveBinaria(clave) || !utf8.ValidString(clave) {
+		return &pb.Objeto{ClaveBinaria: rellenarClave(clave)}
+	}
+	return &pb.Objeto{Clave: clave}
+}
+
+// tamañoDeBloque devuelve el tamaño de bloque de un valor de lenValue bytes: la clase de
+// la clave si es binaria (clase > 0) o, si no, la menor clase en la que cabe el valor.
+func tamañoDeBloque(lenValue int, clase int32) (int32, error) {
+	if clase == 0 {
+		return claseDeTamaño(lenValue)
+	}
+	if lenValue > int(clase) {
+		return 0, errValorFueraDeClase
+	}
+	return clase, nil
+}
+
+// tienePrefijo indica si la clave, completada con NUL hasta 16 bytes como en keys.db,
+// empieza por prefijo. Así un prefijo con bytes en cero coincide con las claves de texto
+// más cortas que el prefijo. Un prefijo binario lleva la marca (ver formaBinaria), así
+// que solo coincide con claves binarias.
+func tienePrefijo(clave string, prefijo string) bool {
+	if len(clave) >= len(prefijo) {
+		return strings.HasPrefix(clave, prefijo)
+	}
+	return strings.HasPrefix(prefijo, clave) && strings.TrimLeft(prefijo[len(clave):], "\x00") == ""
+}
@@ -0,0 +1,87 @@
+package main
+
+import (
+	"compress/zlib"
+	"context"
+	"fmt"
+	"io"
+	"slices"
+	"sync"
+
+	"google.golang.org/grpc"
+	"google.golang.org/grpc/encoding"
+	_ "google.golang.org/grpc/encoding/gzip" // Registra el compresor gzip
+)
+
+// Algoritmos de compresión de mensajes. gzip lo registra grpc-go; deflate, que el cliente
+// Python (gRPC core) también ofrece, se registra aquí.
+const (
+	COMPRESION_NINGUNA = ""
+	COMPRESION_GZIP    = "gzip"
+	COMPRESION_DEFLATE = "deflate"
+)
+
+// Tamaño mínimo por defecto de una respuesta comprimida (DEFAULT_COMPRESSION_THRESHOLD en
+// lbclient.py): las respuestas de valores pequeños no pagan la CPU de comprimir.
+const UMBRAL_COMPRESION = 64 * 1024
+
+// compresorDeflate implementa encoding.Compressor con el formato zlib, que es el que gRPC
+// core llama deflate. Los escritores se reutilizan, como en el compresor gzip de grpc-go.
+type compresorDeflate struct {
+	escritores sync.Pool
+}
+
+type escritorDeflate struct {
+	*zlib.Writer
+	pool *sync.Pool
+}
+
+func (e *escritorDeflate) Close() error {
+	defer e.pool.Put(e)
+	return e.Writer.Close()
+}
+
+func (c *compresorDeflate) Compress(w io.Writer) (io.WriteCloser, error) {
+	if e, ok := c.escritores.Get().(*escritorDeflate); ok {
+		e.Reset(w)
+		return e, nil
+	}
+	return &escritorDeflate{Writer: zlib.NewWriter(w), pool: &c.escritores}, nil
+}
+
+func (c *compresorDeflate) Decompress(r io.Reader) (io.Reader, error) {
+	return zlib.NewReader(r)
+}
+
+func (c *compresorDeflate) Name() string {
+	return COMPRESION_DEFLATE
+}
+
+func init() {
+	encoding.RegisterCompressor(&compresorDeflate{})
+}
+
+// validarCompresion comprueba que el algoritmo de -compresion esté registrado.
+func validarCompresion(algoritmo string) error {
+	if algoritmo != COMPRESION_NINGUNA && encoding.GetCompressor(algoritmo) == nil {
+		return fmt.Errorf("algoritmo de compresión desconocido: %s (opciones: %s, %s)", algoritmo, COMPRESION_GZIP, COMPRESION_DEFLATE)
+	}
+	return nil
+}
+
+// comprimirRespuesta pide que la respuesta de la llamada de ctx se comprima con el
+// algoritmo de -compresion si lleva al menos -compresionUmbral bytes de valores y el
+// cliente lo acepta. Las peticiones comprimidas se aceptan siempre, con o sin -compresion;
+// grpc-go responde a ellas con el mismo algoritmo.
+func comprimirRespuesta(ctx context.Context, tamaño int) {
+	if *compresion == COMPRESION_NINGUNA || tamaño < *compresionUmbral {
+		return
+	}
+	aceptados, err := grpc.ClientSupportedCompressors(ctx)
+	if err != nil || !slices.Contains(aceptados, *compresion) {
+		return
+	}
+	if err := grpc.SetSendCompressor(ctx, *compresion); err != nil {
+		fmt.Println("Error al activar la compresión de la respuesta:", err)
+	}
+}
@@ -0,0 +1,311 @@
+package main
+
+import (
+	"bytes"
+	"fmt"
+	"io"
+	"os"
+
+	pb "github.com/yormanbalanD/bd-clave-valor-distribuidos/proto"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/status"
+)
+
+// Tamaño de los fragmentos que envía getStream (y que se recomienda usar en setStream)
+const TAMAÑO_FRAGMENTO = 64 * 1024
+
+// Bloque de ceros de solo lectura para rellenar y para reenviar ceros intermedios
+var ceros = make([]byte, TAMAÑO_FRAGMENTO)
+
+// escribirCeros escribe n bytes en cero en file a partir de pos, de a TAMAÑO_FRAGMENTO.
+func escribirCeros(file *os.File, pos int64, n int64) error {
+	for n > 0 {
+		parte := int64(len(ceros))
+		if n < parte {
+			parte = n
+		}
+		if _, err := file.WriteAt(ceros[:parte], pos); err != nil {
+			return err
+		}
+		pos += parte
+		n -= parte
+	}
+	return nil
+}
+
+// aplicarReferencia apunta la clave al bloque de values.db ya escrito en pos: escribe su
+// registro en keys.db y actualiza tablaHash sin el valor, que se leerá del disco en el
+// primer acceso. tamaño es el tamaño de bloque codificado con el largo del valor (ver
+// codificarTamaño), como en el registro de referencia del WAL. El bloque anterior de la
+// clave se libera. Si el llamador no es la reproducción del WAL debe tener el bloqueo de
+// la clave.
+func aplicarReferencia(fileKeys *os.File, key string, pos int64, tamaño int32) error {
+	tamaño, largo := decodificarTamaño(tamaño)
+	posKey, err := writeKeys(fileKeys, key, pos, tamaño, largo)
+	if err != nil {
+		return err
+	}
+
+	tablaHashMutex.Lock()
+	anterior, exist := tablaHash[key]
+	if !exist {
+		indiceClaves.Insertar(key)
+	}
+	tablaHash[key] = DatosDiccionario{Clave: key, PosicionValue: pos, Tamaño: tamaño, Largo: largo, PosicionKey: posKey}
+	tablaHashMutex.Unlock()
+
+	if exist && anterior.PosicionValue != pos {
+		slabsValues.Liberar(anterior.PosicionValue, anterior.Tamaño)
+	}
+	return nil
+}
+
+// SetStream recibe un valor en fragmentos y los escribe directamente en su bloque de
+// values.db, sin reunir el valor completo en memoria.
+//
+// El primer fragmento lleva la clave y el tamaño total, con el que se reserva siempre un
+// bloque nuevo: el valor anterior sigue intacto y legible hasta que, con todos los
+// fragmentos escritos, el registro de la clave pasa a apuntar al bloque nuevo. El WAL
+// guarda solo una referencia a ese bloque; en modo batch o always los datos del bloque
+// se sincronizan antes de registrarla.
+func (s *server) SetStream(stream pb.BD_SetStreamServer) error {
+	primero, err := stream.Recv()
+	if err == io.EOF {
+		return status.Error(codes.InvalidArgument, "setStream sin fragmentos")
+	}
+	if err != nil {
+		return err
+	}
+	key, clase, err := resolverClave(primero.Clave, primero.ClaveBinaria)
+	if err != nil {
+		return estadoDeEscritura(err)
+	}
+	if key == "" {
+		return status.Error(codes.InvalidArgument, "el primer fragmento debe llevar la clave")
+	}
+	total := primero.TamanoTotal
+	if total < 0 || total > MB4 {
+		return estadoDeEscritura(errValorDemasiadoGrande)
+	}
+	// Con una clave binaria el bloque sale de la clase de la clave, sin mirar el valor
+	tamaño, err := tamañoDeBloque(int(total), clase)
+	if err != nil {
+		return estadoDeEscritura(err)
+	}
+
+	reinicioMutex.RLock()
+	generacion := generacionBD
+	fileValues, err := os.OpenFile("./db/values.db", os.O_RDWR|os.O_CREATE, 0644)
+	if err != nil {
+		reinicioMutex.RUnlock()
+		return estadoDeEscritura(fmt.Errorf("error al abrir/crear el archivo Values de la DB: %v", err))
+	}
+	defer fileValues.Close()
+	pos, err := slabsValues.Reservar(fileValues, tamaño)
+	reinicioMutex.RUnlock()
+	if err != nil {
+		return estadoDeEscritura(fmt.Errorf("error al reservar posición en el archivo Values: %v", err))
+	}
+	// Si setStream falla antes de registrar el bloque en el WAL, el bloque se libera (salvo
+	// que resetDb lo haya descartado ya junto con el resto del archivo)
+	confirmado := false
+	defer func() {
+		if confirmado {
+			return
+		}
+		reinicioMutex.RLock()
+		if generacionBD == generacion {
+			slabsValues.Liberar(pos, tamaño)
+		}
+		reinicioMutex.RUnlock()
+	}()
+
+	// Los fragmentos se escriben a medida que llegan; solo se retiene uno a la vez
+	var recibidos int64
+	for fragmento := primero; ; {
+		if recibidos+int64(len(fragmento.Datos)) > total {
+			return status.Errorf(codes.InvalidArgument, "se recibieron más de los %d bytes anunciados", total)
+		}
+		if _, err := fileValues.WriteAt(fragmento.Datos, pos+recibidos); err != nil {
+			return estadoDeEscritura(fmt.Errorf("error al escribir en el archivo values.db: %v", err))
+		}
+		recibidos += int64(len(fragmento.Datos))
+
+		fragmento, err = stream.Recv()
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			return err
+		}
+	}
+	if recibidos != total {
+		return status.Errorf(codes.InvalidArgument, "se recibieron %d de los %d bytes anunciados", recibidos, total)
+	}
+	if err := escribirCeros(fileValues, pos+total, int64(tamaño)-total); err != nil {
+		return estadoDeEscritura(fmt.Errorf("error al escribir en el archivo values.db: %v", err))
+	}
+
+	reinicioMutex.RLock()
+	defer reinicioMutex.RUnlock()
+	if generacionBD != generacion {
+		return status.Error(codes.Aborted, "la base de datos se reinició durante setStream")
+	}
+
+	bloqueo := bloqueoDeClave(key)
+	bloqueo.Lock()
+	defer bloqueo.Unlock()
+
+	if wal != nil && wal.modo != DURABILIDAD_NONE {
+		if err := fileValues.Sync(); err != nil {
+			return estadoDeEscritura(fmt.Errorf("error al sincronizar el archivo values.db: %v", err))
+		}
+	}
+	referencia := codificarTamaño(tamaño, int32(total))
+	if err := wal.Registrar([]registroWAL{{Clave: key, Referencia: true, Posicion: pos, Tamaño: referencia}}); err != nil {
+		fmt.Println("Error al escribir en el WAL:", err)
+		return estadoDeEscritura(fmt.Errorf("error al escribir en el WAL"))
+	}
+	confirmado = true // El log ya apunta al bloque: no se libera aunque falle lo que sigue
+
+	fileKeys, err := os.OpenFile("./db/keys.db", os.O_RDWR|os.O_CREATE, 0644)
+	if err != nil {
+		return estadoDeEscritura(fmt.Errorf("error al abrir/crear el archivo Keys de la DB: %v", err))
+	}
+	defer fileKeys.Close()
+	if err := aplicarReferencia(fileKeys, key, pos, referencia); err != nil {
+		return estadoDeEscritura(err)
+	}
+	fmt.Fprintf(salidaEscrituras, "Se escribieron %d bytes en el archivo Values (setStream).\n", total)
+
+	return stream.SendAndClose(&pb.RespuestaSet{Estado: true, Mensaje: "OK"})
+}
+
+// GetStream envía el valor de una clave en fragmentos de TAMAÑO_FRAGMENTO. Si el valor
+// no está en memoria se lee de values.db de a un fragmento sobre un único búfer y no se
+// guarda en tablaHash, así que la memoria por petición queda acotada por el tamaño del
+// fragmento.
+//
+// Se envía el largo guardado en el registro de la clave. En los registros anteriores, que
+// solo tienen el tamaño de bloque, el relleno de ceros no se envía: los ceros se retienen
+// hasta saber si les sigue otro byte del valor.
+//
+// Los bloqueos de la clave y de reinicio se sueltan antes de enviar, porque Send espera a
+// que el cliente lea y un lector lento no debe frenar las escrituras de la clave ni un
+// reinicio de la base. El bloque del valor queda fijado (ver asignadorSlabs.Fijar) hasta
+// terminar: una escritura concurrente de la clave va a otro bloque y no lo corta.
+func (s *server) GetStream(in *pb.Consultar, stream pb.BD_GetStreamServer) error {
+	clave, _, err := resolverClave(in.Clave, in.ClaveBinaria)
+	if err != nil {
+		return status.Error(codes.InvalidArgument, err.Error())
+	}
+
+	lectura, err := fijarValor(clave)
+	if err != nil {
+		return err
+	}
+	defer lectura.soltar()
+
+	if lectura.fileValues == nil {
+		valor := lectura.entrada.Valor
+		comprimirRespuesta(stream.Context(), len(valor))
+		for inicio := 0; inicio < len(valor); inicio += TAMAÑO_FRAGMENTO {
+			fin := min(inicio+TAMAÑO_FRAGMENTO, len(valor))
+			if err := stream.Send(&pb.Fragmento{Datos: bytesDeValor(valor[inicio:fin])}); err != nil {
+				return err
+			}
+		}
+		return nil
+	}
+
+	// Con el largo del valor en su registro se envían exactamente esos bytes, sin recortar
+	entrada := lectura.entrada
+	exacto := entrada.Largo != LARGO_DESCONOCIDO
+	limite := int64(entrada.Tamaño)
+	if exacto {
+		limite = int64(entrada.Largo)
+	}
+	comprimirRespuesta(stream.Context(), int(limite))
+	buf := make([]byte, TAMAÑO_FRAGMENTO)
+	var cerosPendientes int64
+	for leidos := int64(0); leidos < limite; {
+		n := min(int64(TAMAÑO_FRAGMENTO), limite-leidos)
+		if _, err := lectura.fileValues.ReadAt(buf[:n], entrada.PosicionValue+leidos); err != nil {
+			return status.Errorf(codes.Unavailable, "error al leer el archivo Values en pos %d: %v", entrada.PosicionValue+leidos, err)
+		}
+		leidos += n
+
+		if exacto {
+			if err := stream.Send(&pb.Fragmento{Datos: buf[:n]}); err != nil {
+				return err
+			}
+			continue
+		}
+		datos := bytes.TrimRight(buf[:n], "\x00")
+		if len(datos) == 0 {
+			cerosPendientes += n
+			continue
+		}
+		// Los ceros retenidos eran parte del valor: se envían antes que estos datos
+		for cerosPendientes > 0 {
+			parte := min(cerosPendientes, int64(len(ceros)))
+			if err := stream.Send(&pb.Fragmento{Datos: ceros[:parte]}); err != nil {
+				return err
+			}
+			cerosPendientes -= parte
+		}
+		if err := stream.Send(&pb.Fragmento{Datos: datos}); err != nil {
+			return err
+		}
+		cerosPendientes = n - int64(len(datos))
+	}
+	return nil
+}
+
+// lecturaFijada es el valor que envía GetStream, tomado con el bloqueo de la clave: la
+// entrada de tablaHash y, si el valor no está en memoria, values.db abierto con el bloque
+// de la entrada fijado.
+type lecturaFijada struct {
+	entrada    DatosDiccionario
+	fileValues *os.File
+	generacion int
+}
+
+// fijarValor toma la entrada de clave con el bloqueo de la clave, para que no se lea un
+// bloque a medio sobrescribir. Un valor ya cargado se envía de memoria (las cadenas son
+// inmutables); si no, abre values.db y fija el bloque del valor.
+func fijarValor(clave string) (*lecturaFijada, error) {
+	reinicioMutex.RLock()
+	defer reinicioMutex.RUnlock()
+	bloqueo := bloqueoDeClave(clave)
+	bloqueo.Lock()
+	defer bloqueo.Unlock()
+
+	tablaHashMutex.RLock()
+	entrada, exist := tablaHash[clave]
+	tablaHashMutex.RUnlock()
+	if !exist {
+		return nil, status.Error(codes.NotFound, "Clave no encontrada")
+	}
+	lectura := &lecturaFijada{entrada: entrada}
+	if entrada.Cargado {
+		return lectura, nil
+	}
+
+	fileValues, err := os.Open("./db/values.db")
+	if err != nil {
+		return nil, status.Errorf(codes.Unavailable, "error al abrir el archivo Values: %v", err)
+	}
+	lectura.fileValues = fileValues
+	lectura.generacion = slabsValues.Fijar(entrada.PosicionValue)
+	return lectura, nil
+}
+
+// soltar cierra values.db y suelta el bloque fijado.
+func (l *lecturaFijada) soltar() {
+	if l.fileValues == nil {
+		return
+	}
+	l.fileValues.Close()
+	slabsValues.Soltar(l.entrada.PosicionValue, l.generacion)
+}
@@ -0,0 +1,290 @@
+package main
+
+import (
+	"context"
+	"fmt"
+	"io"
+	"math"
+	"math/rand"
+	"net"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+
+	pb "github.com/yormanbalanD/bd-clave-valor-distribuidos/proto"
+	"google.golang.org/grpc"
+	"google.golang.org/grpc/credentials/insecure"
+)
+
+// Tamaño mínimo del buffer delta antes de fusionarlo con el arreglo base
+const DELTA_MINIMO = 1024
+
+// indiceOrdenado mantiene las claves ordenadas para resolver getPrefix con búsqueda
+// binaria en O(log n + k) en vez de recorrer toda tablaHash.
+//
+// Las claves están en un arreglo base ordenado más un buffer delta pequeño, también
+// ordenado, donde caen las claves nuevas. Cuando el delta supera max(DELTA_MINIMO, √n)
+// se fusiona con la base, así que una inserción cuesta O(√n) amortizado. Tiene su propio
+// mutex: un recorrido por prefijo no bloquea tablaHashMutex mientras se ejecuta.
+type indiceOrdenado struct {
+	mu    sync.RWMutex
+	base  []string
+	delta []string
+}
+
+var indiceClaves = &indiceOrdenado{}
+
+// contiene indica si clave está en el arreglo ordenado claves.
+func contiene(claves []string, clave string) bool {
+	i := sort.SearchStrings(claves, clave)
+	return i < len(claves) && claves[i] == clave
+}
+
+// Insertar añade clave al índice si aún no está.
+func (ix *indiceOrdenado) Insertar(clave string) {
+	ix.mu.Lock()
+	defer ix.mu.Unlock()
+
+	if contiene(ix.base, clave) {
+		return
+	}
+	i := sort.SearchStrings(ix.delta, clave)
+	if i < len(ix.delta) && ix.delta[i] == clave {
+		return
+	}
+	ix.delta = append(ix.delta, "")
+	copy(ix.delta[i+1:], ix.delta[i:])
+	ix.delta[i] = clave
+
+	limite := int(math.Sqrt(float64(len(ix.base))))
+	if limite < DELTA_MINIMO {
+		limite = DELTA_MINIMO
+	}
+	if len(ix.delta) > limite {
+		ix.base = fusionar(ix.base, ix.delta)
+		ix.delta = nil
+	}
+}
+
+// fusionar mezcla dos arreglos ordenados sin claves en común.
+func fusionar(a []string, b []string) []string {
+	resultado := make([]string, 0, len(a)+len(b))
+	i, j := 0, 0
+	for i < len(a) && j < len(b) {
+		if a[i] < b[j] {
+			resultado = append(resultado, a[i])
+			i++
+		} else {
+			resultado = append(resultado, b[j])
+			j++
+		}
+	}
+	resultado = append(resultado, a[i:]...)
+	return append(resultado, b[j:]...)
+}
+
+// Reconstruir reemplaza el contenido del índice por claves (en cualquier orden).
+func (ix *indiceOrdenado) Reconstruir(claves []string) {
+	sort.Strings(claves)
+
+	ix.mu.Lock()
+	defer ix.mu.Unlock()
+	ix.base = claves
+	ix.delta = nil
+}
+
+// Limpiar vacía el índice (resetDb).
+func (ix *indiceOrdenado) Limpiar() {
+	ix.Reconstruir(nil)
+}
+
+// rangoPrefijo devuelve las claves de un arreglo ordenado que empiezan por prefijo y
+// son mayores que cursor, como mucho limite (0 = sin límite). El prefijo se compara con
+// los bytes de la clave tal como están en keys.db (ver tienePrefijo).
+func rangoPrefijo(claves []string, prefijo string, cursor string, limite int) []string {
+	// Las claves no terminan en NUL: la primera con el prefijo es la mayor o igual a él sin sus NUL finales
+	desde := strings.TrimRight(prefijo, "\x00")
+	if cursor > desde {
+		desde = cursor + "\x00" // Primera clave estrictamente mayor que el cursor
+	}
+	inicio := sort.SearchStrings(claves, desde)
+	fin := inicio
+	for fin < len(claves) && tienePrefijo(claves[fin], prefijo) {
+		fin++
+		if limite > 0 && fin-inicio >= limite {
+			break
+		}
+	}
+	return claves[inicio:fin]
+}
+
+// RangoPrefijo devuelve, en orden, una copia de las claves que empiezan por prefijo y
+// son mayores que cursor, como mucho limite (0 = sin límite).
+func (ix *indiceOrdenado) RangoPrefijo(prefijo string, cursor string, limite int) []string {
+	ix.mu.RLock()
+	defer ix.mu.RUnlock()
+
+	deBase := rangoPrefijo(ix.base, prefijo, cursor, limite)
+	deDelta := rangoPrefijo(ix.delta, prefijo, cursor, limite)
+	claves := fusionar(deBase, deDelta)
+	if limite > 0 && len(claves) > limite {
+		claves = claves[:limite]
+	}
+	return claves
+}
+
+// Largo de los valores de benchmarkPrefijos: la medición de punta a punta los envía
+const LARGO_VALOR_BENCH_PREFIJOS = 100
+
+// benchmarkPrefijos compara la latencia de getPrefix recorriendo el mapa completo y
+// usando el índice ordenado, para prefijos estrechos (pocas coincidencias) y amplios
+// (1/16 de las claves), con 10k claves hasta maxClaves. Además mide getPrefix y
+// getPrefixStream de punta a punta, con un servidor gRPC en localhost y valores ya en
+// memoria: la búsqueda en el índice, la lectura de los valores, la serialización y el
+// envío hasta que el cliente recibe el último objeto.
+func benchmarkPrefijos(maxClaves int) {
+	const repeticiones = 20
+	const repeticionesRPC = 5
+	aleatorio := rand.New(rand.NewSource(1))
+	valor := strings.Repeat("v", LARGO_VALOR_BENCH_PREFIJOS)
+
+	cliente, cerrar, err := servidorDeBenchmark()
+	if err != nil {
+		fmt.Println("Error al iniciar el servidor del benchmark:", err)
+		return
+	}
+	defer cerrar()
+
+	fmt.Printf("%-10s %-8s %12s %14s %14s %14s %14s\n", "Claves", "Prefijo", "Resultados", "Mapa completo", "Índice", "getPrefix", "Stream")
+
+	for n := 10_000; n <= maxClaves; n *= 10 {
+		mapa := make(map[string]DatosDiccionario, n)
+		claves := make([]string, 0, n)
+		for len(mapa) < n {
+			clave := fmt.Sprintf("%016x", aleatorio.Uint64())
+			mapa[clave] = DatosDiccionario{Clave: clave, Valor: valor, Largo: LARGO_VALOR_BENCH_PREFIJOS, Cargado: true}
+			claves = append(claves, clave)
+		}
+		indice := &indiceOrdenado{}
+		inicioCarga := time.Now()
+		indice.Reconstruir(append([]string(nil), claves...))
+		tiempoCarga := time.Since(inicioCarga)
+
+		// El servidor de punta a punta atiende con este mapa y este índice
+		tablaHashMutex.Lock()
+		tablaHash = mapa
+		tablaHashMutex.Unlock()
+		indiceClaves = indice
+
+		for _, caso := range []struct {
+			nombre  string
+			prefijo string
+		}{
+			{"estrecho", claves[0][:6]},
+			{"amplio", claves[0][:1]},
+		} {
+			var resultados int
+
+			inicio := time.Now()
+			for r := 0; r < repeticiones; r++ {
+				resultados = 0
+				for clave := range mapa {
+					if strings.HasPrefix(clave, caso.prefijo) {
+						resultados++
+					}
+				}
+			}
+			tiempoMapa := time.Since(inicio) / repeticiones
+
+			inicio = time.Now()
+			for r := 0; r < repeticiones; r++ {
+				resultados = len(indice.RangoPrefijo(caso.prefijo, "", 0))
+			}
+			tiempoIndice := time.Since(inicio) / repeticiones
+
+			tiempoGetPrefix, tiempoStream, err := medirPrefijoRPC(cliente, caso.prefijo, resultados, repeticionesRPC)
+			if err != nil {
+				fmt.Println("Error en la medición de punta a punta:", err)
+				return
+			}
+
+			fmt.Printf("%-10d %-8s %12d %14v %14v %14v %14v\n", n, caso.nombre, resultados, tiempoMapa, tiempoIndice, tiempoGetPrefix, tiempoStream)
+		}
+		fmt.Printf("%-10d construcción del índice: %v\n", n, tiempoCarga)
+	}
+}
+
+// servidorDeBenchmark inicia el servicio BD en un puerto libre de localhost, con las
+// mismas opciones de mensajes y ventanas que main, y devuelve un cliente conectado y la
+// función que cierra ambos.
+func servidorDeBenchmark() (pb.BDClient, func(), error) {
+	lis, err := net.Listen("tcp", "127.0.0.1:0")
+	if err != nil {
+		return nil, nil, err
+	}
+	s := grpc.NewServer(
+		grpc.MaxRecvMsgSize(1024*1024*1024),
+		grpc.MaxSendMsgSize(1024*1024*1024),
+		grpc.InitialWindowSize(VENTANA_STREAM),
+		grpc.InitialConnWindowSize(VENTANA_CONEXION),
+	)
+	pb.RegisterBDServer(s, &server{})
+	go s.Serve(lis)
+
+	conexion, err := grpc.NewClient(lis.Addr().String(),
+		grpc.WithTransportCredentials(insecure.NewCredentials()),
+		grpc.WithDefaultCallOptions(grpc.MaxCallRecvMsgSize(1024*1024*1024)),
+		grpc.WithInitialWindowSize(VENTANA_STREAM),
+		grpc.WithInitialConnWindowSize(VENTANA_CONEXION),
+	)
+	if err != nil {
+		s.Stop()
+		return nil, nil, err
+	}
+	return pb.NewBDClient(conexion), func() {
+		conexion.Close()
+		s.Stop()
+	}, nil
+}
+
+// medirPrefijoRPC devuelve la latencia media de getPrefix y de getPrefixStream (hasta
+// recibir el último objeto) con prefijo. Falla si alguna respuesta no trae esperados objetos.
+func medirPrefijoRPC(cliente pb.BDClient, prefijo string, esperados int, repeticiones int) (time.Duration, time.Duration, error) {
+	ctx := context.Background()
+
+	inicio := time.Now()
+	for r := 0; r < repeticiones; r++ {
+		respuesta, err := cliente.GetPrefix(ctx, &pb.Consultar{Clave: prefijo})
+		if err != nil {
+			return 0, 0, err
+		}
+		if len(respuesta.Objetos) != esperados {
+			return 0, 0, fmt.Errorf("getPrefix devolvió %d objetos, se esperaban %d", len(respuesta.Objetos), esperados)
+		}
+	}
+	tiempoGetPrefix := time.Since(inicio) / time.Duration(repeticiones)
+
+	inicio = time.Now()
+	for r := 0; r < repeticiones; r++ {
+		stream, err := cliente.GetPrefixStream(ctx, &pb.ConsultarPrefijo{Prefijo: prefijo})
+		if err != nil {
+			return 0, 0, err
+		}
+		recibidos := 0
+		for {
+			if _, err := stream.Recv(); err == io.EOF {
+				break
+			} else if err != nil {
+				return 0, 0, err
+			}
+			recibidos++
+		}
+		if recibidos != esperados {
+			return 0, 0, fmt.Errorf("getPrefixStream devolvió %d objetos, se esperaban %d", recibidos, esperados)
+		}
+	}
+	tiempoStream := time.Since(inicio) / time.Duration(repeticiones)
+
+	return tiempoGetPrefix, tiempoStream, nil
+}
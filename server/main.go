@@ -7,6 +7,7 @@ import (
 	"errors"
 	"flag"
 	"fmt"
+	"hash/fnv"
 	"io"
 	"log"
 	"net"
@@ -17,10 +18,19 @@ import (
 
 	pb "github.com/yormanbalanD/bd-clave-valor-distribuidos/proto"
 	"google.golang.org/grpc"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/keepalive"
+	"google.golang.org/grpc/status"
 )
 
 var (
-	port = flag.Int("port", 5050, "The server port")
+	port             = flag.Int("port", 5050, "The server port")
+	precarga         = flag.Bool("precarga", true, "Leer todos los valores en segundo plano después de arrancar; con false cada valor se lee en su primer acceso")
+	durabilidad      = flag.String("durabilidad", DURABILIDAD_NONE, "Durabilidad de las escrituras: none (WAL sin fsync), batch (group commit) o always (fsync por escritura)")
+	benchWAL         = flag.Int("benchWAL", 0, "Si es mayor que 0, mide set con cada modo de durabilidad usando este número de escrituras y termina")
+	benchPrefijos    = flag.Int("benchPrefijos", 0, "Si es mayor que 0, mide la latencia de getPrefix con hasta este número de claves y termina")
+	compresion       = flag.String("compresion", COMPRESION_NINGUNA, "Compresión de las respuestas grandes: gzip o deflate (vacío = sin compresión); las peticiones comprimidas se aceptan siempre")
+	compresionUmbral = flag.Int("compresionUmbral", UMBRAL_COMPRESION, "Bytes de valores a partir de los cuales se comprime una respuesta")
 )
 
 const (
@@ -31,6 +41,18 @@ const (
 	MB4   = 1024 * 1024 * 4
 )
 
+// Ventanas de control de flujo HTTP/2: un valor de 4MB cabe entero en la ventana de un
+// stream (igual que STREAM_WINDOW_BYTES en lbclient.py) y la de la conexión admite varios
+// en vuelo, así que un set grande no frena a las peticiones pequeñas de la misma conexión.
+const (
+	VENTANA_STREAM   = 8 * 1024 * 1024
+	VENTANA_CONEXION = 32 * 1024 * 1024
+)
+
+// Intervalo mínimo entre pings de keepalive que se acepta de un cliente. lbclient.py los
+// envía cada 20s; con la política por defecto (5 minutos) se cerraría la conexión.
+const PING_MINIMO = 10 * time.Second
+
 type InfClave struct {
 	Clave     [16]byte
 	Tamaño    int32
@@ -44,7 +66,9 @@ type DatosDiccionario struct {
 	Valor         string
 	PosicionValue int64
 	PosicionKey   int64
-	Tamaño        int32
+	Tamaño        int32 // Tamaño de bloque
+	Largo         int32 // Largo exacto del valor (LARGO_DESCONOCIDO: se descartan los NUL finales del bloque)
+	Cargado       bool  // Valor ya leído de values.db (los valores se cargan de forma perezosa)
 }
 
 const (
@@ -55,13 +79,67 @@ const (
 var tablaHash = make(map[string]DatosDiccionario)
 var tablaHashMutex sync.RWMutex
 
-var bloqueoValues = make(map[int64]string)
-var bloqueoValuesMutex sync.Mutex
+// asignadorAppend reparte posiciones al final de un archivo: cada reserva avanza el fin
+// bajo un mutex, así que dos escrituras concurrentes nunca reciben la misma posición.
+type asignadorAppend struct {
+	mu       sync.Mutex
+	fin      int64
+	iniciado bool
+}
+
+// Reservar devuelve la posición de un bloque nuevo de n bytes al final de file.
+func (a *asignadorAppend) Reservar(file *os.File, n int64) (int64, error) {
+	a.mu.Lock()
+	defer a.mu.Unlock()
+
+	if !a.iniciado {
+		info, err := file.Stat()
+		if err != nil {
+			return -1, err
+		}
+		a.fin = info.Size()
+		a.iniciado = true
+	}
+	pos := a.fin
+	a.fin += n
+	return pos, nil
+}
+
+// Reiniciar hace que la próxima reserva vuelva a tomar el fin del archivo (resetDb).
+func (a *asignadorAppend) Reiniciar() {
+	a.mu.Lock()
+	defer a.mu.Unlock()
+	a.iniciado = false
+}
+
+var finKeys asignadorAppend
+
+// Bloqueos por clave repartidos en franjas: las escrituras de una misma clave se
+// serializan y las de claves distintas avanzan en paralelo.
+const FRANJAS_BLOQUEO = 256
+
+var bloqueosClave [FRANJAS_BLOQUEO]sync.Mutex
+
+func franjaDeClave(key string) uint32 {
+	h := fnv.New32a()
+	h.Write([]byte(key))
+	return h.Sum32() % FRANJAS_BLOQUEO
+}
+
+func bloqueoDeClave(key string) *sync.Mutex {
+	return &bloqueosClave[franjaDeClave(key)]
+}
 
-var bloqueoKeys = make(map[int64]string)
-var bloqueoKeysMutex sync.Mutex
+// Las escrituras toman reinicioMutex en modo lectura y resetDb en modo escritura, para
+// que resetDb nunca borre los archivos con una escritura a medias.
+var reinicioMutex sync.RWMutex
 
+var errValorDemasiadoGrande = errors.New("el tamaño de la cadena es mayor a 4 MB")
+
+// getValue lee el valor de un registro de keys.db; tamaño es el campo Tamaño tal como
+// está en el registro (ver codificarTamaño).
 func getValue(pos int64, tamaño int32) (string, error) {
+	tamaño, largo := decodificarTamaño(tamaño)
 	var fileValues, err = os.OpenFile("./db/values.db", os.O_RDWR|os.O_CREATE, 0644)
 
 	if err != nil {
@@ -95,6 +173,9 @@ func getValue(pos int64, tamaño int32) (string, error) {
 		fmt.Printf("Advertencia: Se leyeron menos bytes de lo esperado (%d de %d) del archivo Values en pos %d\n", n, tamaño, pos)
 	}
 
+	if largo != LARGO_DESCONOCIDO {
+		return string(buf[:largo]), nil
+	}
 	return string(bytes.TrimRight(buf, "\x00")), nil
 }
 
@@ -146,7 +227,7 @@ func searchKey(key string, where int8) (string, error) {
 				return "", errors.New("error al deserializar InfClave")
 			}
 
-			claveString := strings.TrimRight(string(temp.Clave[:16]), "\x00")
+			claveString := claveDeRegistro(temp.Clave[:], temp.Tamaño)
 			if claveString == key {
 				claveEncontrada = true
 				clave = temp
@@ -169,22 +250,25 @@ func searchKey(key string, where int8) (string, error) {
 	}
 
 	if where == WHERE_HAST_TABLE {
-		tablaHashMutex.RLock()
-		// Ensure the lock is released when the function exits (or when read is done)
-		defer tablaHashMutex.RUnlock()
-
-		value, exist := tablaHash[key]
+		value, exist, err := valorDe(key)
 		if !exist {
 			return "", errors.New("clave no encontrada")
 		}
+		if err != nil {
+			fmt.Println("Error al obtener valor desde values.db:", err)
+			return "", errors.New("error al obtener valor desde values.db")
+		}
 
-		return value.Valor, nil
+		return value, nil
 	}
 
 	return "", errors.New("error al leer el archivo")
 }
 
-func searchKeyPrefix(key string, where int8) ([]*pb.Objeto, error) {
+// searchKeyPrefix devuelve los objetos cuya clave empieza por key. Con binaria las claves
+// de la respuesta van en ClaveBinaria (ver objetoDeClave) y con enBytes los valores en
+// ValorBinario (ver asignarValor).
+func searchKeyPrefix(key string, where int8, binaria bool, enBytes bool) ([]*pb.Objeto, error) {
 	if where == WHERE_FILESYSTEM {
 		var fileKeys, err = os.OpenFile("./db/keys.db", os.O_RDWR|os.O_CREATE, 0644)
 
@@ -231,7 +315,7 @@ func searchKeyPrefix(key string, where int8) ([]*pb.Objeto, error) {
 				continue // Skip this record if it's malformed
 			}
 
-			claveString := strings.TrimRight(string(temp.Clave[:16]), "\x00")
+			claveString := claveDeRegistro(temp.Clave[:], temp.Tamaño)
 
 			if strings.HasPrefix(claveString, key) {
 				claves = append(claves, temp)
@@ -248,7 +332,8 @@ func searchKeyPrefix(key string, where int8) ([]*pb.Objeto, error) {
 				return []*pb.Objeto{}, errors.New("error al leer el archivo")
 			}
 
-			objeto := &pb.Objeto{Clave: string(clave.Clave[:16]), Valor: valor}
+			objeto := &pb.Objeto{Clave: string(clave.Clave[:16])}
+			asignarValor(objeto, valor, enBytes)
 
 			objetos = append(objetos, objeto)
 		}
@@ -256,19 +341,21 @@ func searchKeyPrefix(key string, where int8) ([]*pb.Objeto, error) {
 		return objetos, nil
 	}
 	if where == WHERE_HAST_TABLE {
-		var objetos []*pb.Objeto
-
-		tablaHashMutex.RLock()
-		// Ensure the lock is released when the function exits (or when read is done)
-		defer tablaHashMutex.RUnlock()
-
-		for _, clave := range tablaHash {
-			if strings.HasPrefix(clave.Clave, key) {
-				objeto := &pb.Objeto{Clave: clave.Clave, Valor: clave.Valor}
+		// El índice ordenado da las claves del prefijo sin recorrer tablaHash, y cada valor
+		// se toma con un bloqueo de lectura corto para no frenar a los escritores.
+		claves := indiceClaves.RangoPrefijo(key, "", 0)
+		objetos := make([]*pb.Objeto, 0, len(claves))
 
+		for _, clave := range claves {
+			valor, exist, err := valorDe(clave)
+			if err != nil {
+				return nil, err
+			}
+			if exist {
+				objeto := objetoDeClave(clave, binaria)
+				asignarValor(objeto, valor, enBytes)
 				objetos = append(objetos, objeto)
 			}
-
 		}
 
 		return objetos, nil
@@ -277,18 +364,14 @@ func searchKeyPrefix(key string, where int8) ([]*pb.Objeto, error) {
 	return nil, errors.New("error al leer el archivo")
 }
 
-func writeKeys(key string, posicion int64, tamaño int32) (int64, error) {
-	var fileKeys, err = os.OpenFile("./db/keys.db", os.O_RDWR|os.O_CREATE, 0644)
-	if err != nil {
-		fmt.Println("Error al abrir/crear el archivo Keys de la DB:", err)
-		return -1, err
-	}
-	defer fileKeys.Close() // Asegura que el archivo se cierre
-
+// writeKeys escribe el registro InfClave de key en el archivo Keys ya abierto: en su
+// posición anterior si la clave existe, o en un registro nuevo al final. El registro
+// guarda el tamaño de bloque y el largo del valor (ver codificarTamaño). El llamador debe
+// tener el bloqueo de la clave.
+func writeKeys(fileKeys *os.File, key string, posicion int64, tamaño int32, largo int32) (int64, error) {
 	var pos int64
+	var err error
 
-	bloqueoKeysMutex.Lock() // Protect access to `bloqueoKeys` map
-	// Critical section: determine position and mark it
 	tablaHashMutex.RLock() // Read lock to check if key exists in hash table
 	tableValue, exist := tablaHash[key]
 	tablaHashMutex.RUnlock()
@@ -296,40 +379,22 @@ func writeKeys(key string, posicion int64, tamaño int32) (int64, error) {
 	if exist {
 		pos = tableValue.PosicionKey // Key exists, overwrite at its original position
 	} else {
-		pos, err = fileKeys.Seek(0, io.SeekEnd) // New key, append to end
+		pos, err = finKeys.Reservar(fileKeys, int64(InfClaveSize)) // New key, append to end
 		if err != nil {
-			bloqueoKeysMutex.Unlock() // IMPORTANT: Unlock before returning
-			fmt.Println("Error al posicionar el archivo Keys al final:", err)
-			return -1, errors.New("error al posicionar el archivo Keys al final")
+			fmt.Println("Error al reservar posición en el archivo Keys:", err)
+			return -1, errors.New("error al reservar posición en el archivo Keys")
 		}
 	}
 
-	if _, isBlocked := bloqueoKeys[pos]; isBlocked {
-		bloqueoKeysMutex.Unlock() // IMPORTANT: Unlock `bloqueoKeysMutex` before returning this error
-		return -1, fmt.Errorf("bloqueo en la posición %d para clave '%s'", pos, key)
-	}
-	bloqueoKeys[pos] = key // Mark this position as being handled
-	bloqueoKeysMutex.Unlock()
-
-	defer func(p int64) {
-		bloqueoKeysMutex.Lock() // Re-acquire lock to modify the map
-		delete(bloqueoKeys, p)
-		bloqueoKeysMutex.Unlock()
-		// println("bloqueoKeysMutex - Position", p, "unblocked.")
-	}(pos)
-
-	_, err = fileKeys.Seek(pos, io.SeekStart)
-	if err != nil {
-		fmt.Println("Error al posicionar el archivo Keys para escritura:", err)
-		return -1, errors.New("error al posicionar el archivo Keys para escritura")
-	}
-
 	var buf bytes.Buffer
 	var temp InfClave
 
-	copy(temp.Clave[:], []byte(key))
+	copy(temp.Clave[:], rellenarClave(key))
 	temp.Direccion = posicion
-	temp.Tamaño = tamaño
+	temp.Tamaño = codificarTamaño(tamaño, largo)
+	if esClaveBinaria(key) {
+		temp.Tamaño = marcarClaveBinaria(temp.Tamaño)
+	}
 
 	err = binary.Write(&buf, binary.LittleEndian, temp)
 	if err != nil {
@@ -337,17 +402,21 @@ func writeKeys(key string, posicion int64, tamaño int32) (int64, error) {
 		return -1, err
 	}
 
-	_, err = fileKeys.Write(buf.Bytes())
+	_, err = fileKeys.WriteAt(buf.Bytes(), pos)
 	if err != nil {
 		fmt.Println("Error al escribir en el archivo keys.db:", err)
 		return -1, errors.New("error al escribir en el archivo keys.db")
 	}
 
-	// fmt.Printf("Se escribieron %d bytes en keys.db en la posición %d.\n", n, pos)
 	return pos, nil
 }
 
-func writeValues(key string, value string) error {
+// writeValues escribe value en un bloque del tamaño de la clase de la clave si es binaria
+// (clase > 0) o de la menor clase en la que cabe el valor.
+func writeValues(key string, value string, clase int32) error {
+	reinicioMutex.RLock()
+	defer reinicioMutex.RUnlock()
+
 	var fileValues, err = os.OpenFile("./db/values.db", os.O_RDWR|os.O_CREATE, 0644)
 	if err != nil {
 		fmt.Println("Error al abrir/crear el archivo Values de la DB:", err)
@@ -355,221 +424,335 @@ func writeValues(key string, value string) error {
 	}
 	defer fileValues.Close() // Asegura que el archivo se cierre
 
-	var tamaño int32
-	var lenValue = len(value)
+	fileKeys, err := os.OpenFile("./db/keys.db", os.O_RDWR|os.O_CREATE, 0644)
+	if err != nil {
+		fmt.Println("Error al abrir/crear el archivo Keys de la DB:", err)
+		return errors.New("error al abrir/crear el archivo Keys de la DB")
+	}
+	defer fileKeys.Close()
+
+	return writeValuesTo(fileValues, fileKeys, key, value, clase)
+}
 
+// claseDeTamaño devuelve el tamaño de bloque en el que cabe un valor de lenValue bytes.
+func claseDeTamaño(lenValue int) (int32, error) {
 	if lenValue <= B512 {
-		tamaño = B512
+		return B512, nil
 	} else if lenValue <= KB4 {
-		tamaño = KB4
+		return KB4, nil
 	} else if lenValue <= KB512 {
-		tamaño = KB512
+		return KB512, nil
 	} else if lenValue <= MB1 {
-		tamaño = MB1
+		return MB1, nil
 	} else if lenValue <= MB4 {
-		tamaño = MB4
-	} else {
-		fmt.Println("El tamaño de la cadena es mayor a 4 MB")
-		return errors.New("el tamaño de la cadena es mayor a 4 MB")
+		return MB4, nil
 	}
+	fmt.Println("El tamaño de la cadena es mayor a 4 MB")
+	return 0, errValorDemasiadoGrande
+}
 
-	var pos int64
+// writeValuesTo registra la escritura en el WAL y escribe value y su registro de clave en
+// archivos Values y Keys ya abiertos.
+//
+// Nunca rechaza una escritura por concurrencia: las posiciones nuevas salen de
+// asignadorAppend y las escrituras de una misma clave se serializan con su bloqueo, que
+// se mantiene desde el registro en el WAL hasta la escritura en los archivos de datos
+// para que el orden del log coincida con el orden en que se aplicaron.
+func writeValuesTo(fileValues *os.File, fileKeys *os.File, key string, value string, clase int32) error {
+	tamaño, err := tamañoDeBloque(len(value), clase)
+	if err != nil {
+		return err
+	}
+
+	bloqueo := bloqueoDeClave(key)
+	bloqueo.Lock()
+	defer bloqueo.Unlock()
+
+	if err := wal.Registrar([]registroWAL{{Clave: key, Valor: value}}); err != nil {
+		fmt.Println("Error al escribir en el WAL:", err)
+		return errors.New("error al escribir en el WAL")
+	}
+	return escribirValor(fileValues, fileKeys, key, value, tamaño)
+}
+
+// Destino del mensaje de cada escritura; benchmarkWAL lo descarta para no medir la consola.
+var salidaEscrituras io.Writer = os.Stdout
+
+// escribirValor escribe value y su registro de clave. El llamador debe tener el bloqueo de
+// la clave. El valor se escribe antes que su registro de clave, así keys.db no apunta a un
+// valor a medio escribir.
+func escribirValor(fileValues *os.File, fileKeys *os.File, key string, value string, tamaño int32) error {
+	var err error
 
-	bloqueoValuesMutex.Lock() // Protect access to `bloqueoValues` map
-	// Critical section: determine position and mark it
 	tablaHashMutex.RLock() // Read lock to check if key exists in hash table
 	existingEntry, exist := tablaHash[key]
 	tablaHashMutex.RUnlock()
 
-	if exist {
-		pos = existingEntry.PosicionValue // Key exists, overwrite at its original position
+	var pos int64
+	enSuLugar := exist && existingEntry.Tamaño == tamaño && !slabsValues.Fijado(existingEntry.PosicionValue)
+	if enSuLugar {
+		pos = existingEntry.PosicionValue // Mismo tamaño de bloque: se sobrescribe en su lugar
 	} else {
-		pos, err = fileValues.Seek(0, io.SeekEnd) // New value, append to end
+		// Clave nueva, cambio de tamaño de bloque o bloque que un getStream está leyendo:
+		// bloque nuevo de la clase, para no pisar el siguiente ni el que se está enviando
+		pos, err = slabsValues.Reservar(fileValues, tamaño)
 		if err != nil {
-			bloqueoValuesMutex.Unlock() // IMPORTANT: Unlock before returning
-			fmt.Println("Error al posicionar el archivo Values al final:", err)
-			return errors.New("error al posicionar el archivo Values al final")
+			fmt.Println("Error al reservar posición en el archivo Values:", err)
+			return errors.New("error al reservar posición en el archivo Values")
 		}
 	}
 
-	if _, isBlocked := bloqueoValues[pos]; isBlocked {
-		bloqueoValuesMutex.Unlock() // IMPORTANT: Unlock `bloqueoValuesMutex` before returning this error
-		return fmt.Errorf("bloqueo en la posición %d para clave '%s'", pos, key)
-	}
-	bloqueoValues[pos] = key // Mark this position as being handled
-	bloqueoValuesMutex.Unlock()
-
-	defer func(p int64) {
-		bloqueoValuesMutex.Lock() // Re-acquire lock to modify the map
-		delete(bloqueoValues, p)
-		bloqueoValuesMutex.Unlock()
-		// println("bloqueoValuesMutex - Position", p, "unblocked.")
-	}(pos)
+	valueBytes := make([]byte, tamaño) // Relleno con ceros hasta el tamaño de bloque
+	copy(valueBytes, value)
 
-	_, err = fileValues.Seek(pos, io.SeekStart)
+	n, err := fileValues.WriteAt(valueBytes, pos)
 	if err != nil {
-		fmt.Println("Error al posicionar el archivo Values para escritura:", err)
-		return errors.New("error al posicionar el archivo Values para escritura")
-	}
-
-	var buf bytes.Buffer
-
-	valueBytes := make([]byte, tamaño)
-	copy(valueBytes, []byte(value))
-	err = binary.Write(&buf, binary.LittleEndian, valueBytes) // Write the padded bytes
-	if err != nil {
-		fmt.Println("Error al serializar el valor en buffer:", err)
-		return err
+		if !enSuLugar {
+			slabsValues.Liberar(pos, tamaño)
+		}
+		fmt.Println("Error al escribir en el archivo values.db:", err)
+		return errors.New("error al escribir en el archivo values.db")
 	}
 
-	posKey, err := writeKeys(key, pos, tamaño)
+	posKey, err := writeKeys(fileKeys, key, pos, tamaño, int32(len(value)))
 	if err != nil {
 		fmt.Println("Error al escribir en el archivo Keys:", err)
 		return errors.New("error al escribir en el archivo Keys")
 	}
 
-	n, err := fileValues.Write(buf.Bytes())
-	if err != nil {
-		fmt.Println("Error al escribir en el archivo values.db:", err)
-		return errors.New("error al escribir en el archivo values.db")
-	}
-
 	tablaHashMutex.Lock() // Acquire write lock for the hash table
 	defer tablaHashMutex.Unlock()
 
-	// println("Clave: %s Valor: %s PosicionValue: %d PosicionKey: %d Tamaño: %d", key, value, pos, posKey, tamaño)
-	tablaHash[key] = DatosDiccionario{Clave: key, Valor: value, PosicionValue: pos, Tamaño: tamaño, PosicionKey: posKey}
-	fmt.Printf("Se escribieron %d bytes en el final del archivo Values.\n", n)
+	if _, exist := tablaHash[key]; !exist {
+		indiceClaves.Insertar(key)
+	}
+	tablaHash[key] = DatosDiccionario{Clave: key, Valor: value, PosicionValue: pos, Tamaño: tamaño, Largo: int32(len(value)), PosicionKey: posKey, Cargado: true}
+	if exist && !enSuLugar {
+		// keys.db ya apunta al bloque nuevo: el anterior vuelve a la lista de su clase
+		slabsValues.Liberar(existingEntry.PosicionValue, existingEntry.Tamaño)
+	}
+	fmt.Fprintf(salidaEscrituras, "Se escribieron %d bytes en el archivo Values.\n", n)
 
 	return nil
 }
 
-func getAllValuesToDict() error {
-	var fileKeys, err = os.OpenFile("./db/keys.db", os.O_RDWR|os.O_CREATE, 0644)
+type server struct {
+	pb.UnimplementedBDServer
+}
 
-	if err != nil {
-		fmt.Println("Error al abrir/crear el archivo Keys de la DB:", err)
-		return errors.New("error al abrir/crear el archivo Keys de la DB")
+func (s *server) GetPrefix(ctx context.Context, in *pb.Consultar) (*pb.RespuestaGetPrefix, error) {
+	prefijo, binaria := in.Clave, len(in.ClaveBinaria) > 0
+	if binaria {
+		if len(in.ClaveBinaria) > LARGO_CLAVE {
+			return nil, status.Error(codes.InvalidArgument, "el prefijo binario tiene más de 16 bytes")
+		}
+		prefijo = formaBinaria(in.ClaveBinaria)
 	}
-	defer fileKeys.Close() // Asegura que el archivo se cierre
-
-	fmt.Println("Archivo Keys abierto/creado exitosamente para la lectura.")
-
-	var buf = make([]byte, InfClaveSize)
-	_, err = fileKeys.Seek(0, io.SeekStart)
+	res, err := searchKeyPrefix(prefijo, WHERE_HAST_TABLE, binaria, in.EnBytes)
 	if err != nil {
-		fmt.Println("Error al posicionar el archivo Keys para carga:", err)
-		return errors.New("error al posicionar el archivo Keys para carga")
+		return nil, err
 	}
+	tamaño := 0
+	for _, objeto := range res {
+		tamaño += len(objeto.Valor) + len(objeto.ValorBinario)
+	}
+	comprimirRespuesta(ctx, tamaño)
 
-	// Create a temporary map to store data before acquiring the lock
-	tempMap := make(map[string]DatosDiccionario)
+	return &pb.RespuestaGetPrefix{Estado: true, Mensaje: "OK", Objetos: res}, nil
+}
 
-	for {
-		posKey, _ := fileKeys.Seek(0, io.SeekCurrent) // Get current position before read
-		n, err := fileKeys.Read(buf)
+// GetPrefixStream envía uno a uno los objetos cuya clave empieza por el prefijo, en orden
+// de clave. El valor de cada objeto se lee justo antes de enviarlo, así que el servidor no
+// arma la respuesta completa en memoria y el control de flujo de HTTP/2 frena el envío
+// si el cliente consume más despacio. Con Cursor (la última clave recibida) se reanuda un
+// recorrido interrumpido. PrefijoBinario y CursorBinario sustituyen a Prefijo y Cursor
+// para recorrer claves binarias.
+func (s *server) GetPrefixStream(in *pb.ConsultarPrefijo, stream pb.BD_GetPrefixStreamServer) error {
+	prefijo, cursor := in.Prefijo, in.Cursor
+	binaria := len(in.PrefijoBinario) > 0 || len(in.CursorBinario) > 0
+	if binaria {
+		if len(in.PrefijoBinario) > LARGO_CLAVE || len(in.CursorBinario) > LARGO_CLAVE {
+			return status.Error(codes.InvalidArgument, "el prefijo o el cursor binario tienen más de 16 bytes")
+		}
+		prefijo = formaBinaria(in.PrefijoBinario)
+		cursor = formaBinaria(in.CursorBinario)
+	}
+	claves := indiceClaves.RangoPrefijo(prefijo, cursor, int(in.Limite))
 
-		if err != nil {
-			if err == io.EOF {
-				// fmt.Println("Se ha leido el último elemento del archivo Keys durante la carga.")
-				break
-			}
-			// Handle partial reads as potential corruption
-			if n > 0 && n < InfClaveSize {
-				fmt.Printf("Error al leer el archivo Keys durante la carga: registro incompleto, se leyeron %d de %d bytes. Saltando.\n", n, InfClaveSize)
-				// Seek past the incomplete record to try to read the next one
-				_, seekErr := fileKeys.Seek(int64(InfClaveSize-n), io.SeekCurrent)
-				if seekErr != nil {
-					fmt.Println("Fatal: No se pudo saltar el registro incompleto, abortando carga.")
-					return fmt.Errorf("error irrecuperable al leer keys.db: %v", err)
-				}
-				continue // Skip this corrupted record
-			}
-			fmt.Println("Error al leer el archivo Keys durante la carga:", err)
-			return errors.New("error al leer el archivo Keys durante la carga")
+	enviados := int32(0)
+	for _, clave := range claves {
+		if in.Limite > 0 && enviados >= in.Limite {
+			break
 		}
-		if n < InfClaveSize { // This indicates an unexpected short read without EOF
-			fmt.Printf("Advertencia: Se leyeron menos bytes de lo esperado (%d de %d) del archivo Keys durante la carga. Saltando.\n", n, InfClaveSize)
-			continue
+		if err := stream.Context().Err(); err != nil {
+			return err
 		}
 
-		var temp InfClave
-		reader := bytes.NewReader(buf)
-		err = binary.Read(reader, binary.LittleEndian, &temp)
-		if err != nil {
-			fmt.Println("Error al deserializar InfClave durante la carga:", err)
-			continue // Skip this record if it's malformed
+		objeto := objetoDeClave(clave, binaria)
+		if !in.SoloClaves {
+			valor, exist, err := valorDe(clave)
+			if err != nil {
+				return err
+			}
+			if !exist {
+				continue // Borrada (resetDb) después de tomar la lista de claves
+			}
+			asignarValor(objeto, valor, in.EnBytes)
 		}
 
-		claveString := strings.TrimRight(string(temp.Clave[:]), "\x00")
-		valor, err := getValue(temp.Direccion, temp.Tamaño)
-		if err != nil {
-			fmt.Printf("Error al leer el valor asociado a la clave '%s' durante la carga: %v. Saltando.\n", claveString, err)
-			continue // Skip this key if its value can't be read
+		if err := stream.Send(objeto); err != nil {
+			return err
 		}
+		enviados++
+	}
 
-		if err != nil {
-			fmt.Println("Error al leer el archivo:", err)
-			return errors.New("error al leer el archivo")
-		}
+	return nil
+}
 
-		// Add to a temporary map first
-		tempMap[claveString] = DatosDiccionario{Clave: claveString, Valor: valor, PosicionValue: temp.Direccion, Tamaño: temp.Tamaño, PosicionKey: posKey}
+func (s *server) Get(ctx context.Context, in *pb.Consultar) (*pb.RespuestaGet, error) {
+	clave, _, err := resolverClave(in.Clave, in.ClaveBinaria)
+	if err != nil {
+		return nil, status.Error(codes.InvalidArgument, err.Error())
 	}
+	value, err := searchKey(clave, WHERE_HAST_TABLE)
 
-	// After reading all data from the file, acquire the lock once to update tablaHash
-	tablaHashMutex.Lock()
-	defer tablaHashMutex.Unlock() // Ensure it's unlocked even if something goes wrong here
-
-	// Copy all data from tempMap to tablaHash
-	for k, v := range tempMap {
-		tablaHash[k] = v
+	if err != nil {
+		if strings.Contains(err.Error(), "clave no encontrada") {
+			return &pb.RespuestaGet{Estado: false, Mensaje: "Clave no encontrada"}, nil
+		}
+		return nil, err
 	}
 
-	return nil
+	objeto := &pb.Objeto{Clave: in.Clave, ClaveBinaria: in.ClaveBinaria}
+	asignarValor(objeto, value, in.EnBytes)
+	comprimirRespuesta(ctx, len(value))
+	return &pb.RespuestaGet{Estado: true, Mensaje: "OK", Objeto: objeto}, nil
 }
 
-type server struct {
-	pb.UnimplementedBDServer
+// estadoDeEscritura convierte un error de escritura en un error gRPC con código: un valor
+// demasiado grande o una clave binaria inválida es InvalidArgument (no se debe reintentar)
+// y cualquier otro fallo es Unavailable, que el cliente puede reintentar porque set es
+// idempotente.
+func estadoDeEscritura(err error) error {
+	if errors.Is(err, errValorDemasiadoGrande) || errors.Is(err, errValorFueraDeClase) || errors.Is(err, errClaveInvalida) {
+		return status.Error(codes.InvalidArgument, err.Error())
+	}
+	return status.Error(codes.Unavailable, err.Error())
 }
 
-func (s *server) GetPrefix(ctx context.Context, in *pb.Consultar) (*pb.RespuestaGetPrefix, error) {
-	res, err := searchKeyPrefix(in.Clave, WHERE_HAST_TABLE)
+func (s *server) Set(ctx context.Context, in *pb.Insertar) (*pb.RespuestaSet, error) {
+	clave, clase, err := resolverClave(in.Clave, in.ClaveBinaria)
+	if err == nil {
+		err = writeValues(clave, valorDePeticion(in.Valor, in.ValorBinario), clase)
+	}
+
 	if err != nil {
-		return nil, err
+		return nil, estadoDeEscritura(err)
 	}
 
-	return &pb.RespuestaGetPrefix{Estado: true, Mensaje: "OK", Objetos: res}, nil
+	return &pb.RespuestaSet{Estado: true, Mensaje: "OK"}, nil
 }
 
-func (s *server) Get(ctx context.Context, in *pb.Consultar) (*pb.RespuestaGet, error) {
-	value, err := searchKey(in.Clave, WHERE_HAST_TABLE)
+func (s *server) MultiSet(ctx context.Context, in *pb.InsertarLote) (*pb.RespuestaLoteSet, error) {
+	reinicioMutex.RLock()
+	defer reinicioMutex.RUnlock()
+
+	// Cada elemento tiene su propio estado: un fallo no aborta el resto del lote
+	respuestas := make([]*pb.RespuestaSet, len(in.Elementos))
+	clavesLote := make([]string, len(in.Elementos))
+	valores := make([]string, len(in.Elementos))
+	tamaños := make([]int32, len(in.Elementos))
+	var validos []registroWAL
+	fallidos := 0
+	for i, elemento := range in.Elementos {
+		clave, clase, err := resolverClave(elemento.Clave, elemento.ClaveBinaria)
+		valor := valorDePeticion(elemento.Valor, elemento.ValorBinario)
+		var tamaño int32
+		if err == nil {
+			tamaño, err = tamañoDeBloque(len(valor), clase)
+		}
+		if err != nil {
+			fallidos++
+			respuestas[i] = &pb.RespuestaSet{Estado: false, Mensaje: err.Error()}
+			continue
+		}
+		clavesLote[i] = clave
+		valores[i] = valor
+		tamaños[i] = tamaño
+		validos = append(validos, registroWAL{Clave: clave, Valor: valor})
+	}
 
+	fileValues, err := os.OpenFile("./db/values.db", os.O_RDWR|os.O_CREATE, 0644)
 	if err != nil {
-		if strings.Contains(err.Error(), "clave no encontrada") {
-			return &pb.RespuestaGet{Estado: false, Mensaje: "Clave no encontrada"}, nil
+		fmt.Println("Error al abrir/crear el archivo Values de la DB:", err)
+		return nil, status.Error(codes.Unavailable, "error al abrir/crear el archivo Values de la DB")
+	}
+	defer fileValues.Close()
+
+	fileKeys, err := os.OpenFile("./db/keys.db", os.O_RDWR|os.O_CREATE, 0644)
+	if err != nil {
+		fmt.Println("Error al abrir/crear el archivo Keys de la DB:", err)
+		return nil, status.Error(codes.Unavailable, "error al abrir/crear el archivo Keys de la DB")
+	}
+	defer fileKeys.Close()
+
+	// Todo el lote se registra en el WAL con un solo commit, con los bloqueos de sus claves
+	// tomados para que el orden del log coincida con el de los archivos de datos
+	claves := make([]string, len(validos))
+	for i, registro := range validos {
+		claves[i] = registro.Clave
+	}
+	desbloquear := bloquearClaves(claves)
+	defer desbloquear()
+	if err := wal.Registrar(validos); err != nil {
+		fmt.Println("Error al escribir en el WAL:", err)
+		return nil, status.Error(codes.Unavailable, "error al escribir en el WAL")
+	}
+
+	for i := range in.Elementos {
+		if respuestas[i] != nil {
+			continue
 		}
-		return nil, err
+		err := escribirValor(fileValues, fileKeys, clavesLote[i], valores[i], tamaños[i])
+		if err != nil {
+			fallidos++
+			respuestas[i] = &pb.RespuestaSet{Estado: false, Mensaje: err.Error()}
+			continue
+		}
+		respuestas[i] = &pb.RespuestaSet{Estado: true, Mensaje: "OK"}
 	}
 
-	return &pb.RespuestaGet{Estado: true, Mensaje: "OK", Objeto: &pb.Objeto{Clave: in.Clave, Valor: value}}, nil
+	mensaje := "OK"
+	if fallidos > 0 {
+		mensaje = fmt.Sprintf("%d de %d escrituras fallaron", fallidos, len(in.Elementos))
+	}
+	return &pb.RespuestaLoteSet{Estado: fallidos == 0, Mensaje: mensaje, Respuestas: respuestas}, nil
 }
 
-func (s *server) Set(ctx context.Context, in *pb.Insertar) (*pb.RespuestaSet, error) {
-	err := writeValues(in.Clave, in.Valor)
-
-	if err != nil {
-		if strings.Contains(err.Error(), "bloqueo") {
-			return &pb.RespuestaSet{Estado: false, Mensaje: fmt.Sprintf("Error concurrente: %v", err)}, nil
+func (s *server) MultiGet(ctx context.Context, in *pb.ConsultarLote) (*pb.RespuestaLoteGet, error) {
+	respuestas := make([]*pb.RespuestaGet, 0, len(in.Elementos))
+	tamaño := 0
+	for _, elemento := range in.Elementos {
+		respuesta, err := s.Get(ctx, elemento)
+		if err != nil {
+			respuestas = append(respuestas, &pb.RespuestaGet{Estado: false, Mensaje: err.Error()})
+			continue
 		}
-		return nil, err
+		if respuesta.Objeto != nil {
+			tamaño += len(respuesta.Objeto.Valor) + len(respuesta.Objeto.ValorBinario)
+		}
+		respuestas = append(respuestas, respuesta)
 	}
+	comprimirRespuesta(ctx, tamaño)
 
-	return &pb.RespuestaSet{Estado: true, Mensaje: "OK"}, nil
+	return &pb.RespuestaLoteGet{Estado: true, Mensaje: "OK", Respuestas: respuestas}, nil
 }
 
 func (s *server) ResetDb(ctx context.Context, in *pb.RequestResetDb) (*pb.RespuestaReset, error) {
 	fmt.Println("Solicitud ResetDb recibida.")
+	// Esperar a que terminen las escrituras en curso y bloquear las nuevas
+	reinicioMutex.Lock()
+	defer reinicioMutex.Unlock()
 	// Acquire write lock for tablaHashMutex before clearing the map
 	tablaHashMutex.Lock()
 	defer tablaHashMutex.Unlock()
@@ -590,6 +773,14 @@ func (s *server) ResetDb(ctx context.Context, in *pb.RequestResetDb) (*pb.Respue
 
 	// Reinitialize the map after deleting files
 	tablaHash = make(map[string]DatosDiccionario)
+	indiceClaves.Limpiar()
+	generacionBD++
+	finKeys.Reiniciar()
+	slabsValues.Reiniciar()
+	if err := wal.Reiniciar(); err != nil {
+		log.Printf("Error al reabrir el WAL después de ResetDb: %v", err)
+		return nil, status.Error(codes.Unavailable, "error al reabrir el WAL")
+	}
 	fmt.Println("Base de datos reiniciada exitosamente.")
 	return &pb.RespuestaReset{Estado: true, Mensaje: "OK"}, nil
 }
@@ -597,6 +788,18 @@ func (s *server) ResetDb(ctx context.Context, in *pb.RequestResetDb) (*pb.Respue
 func main() {
 
 	flag.Parse() // Parse command-line flags
+	if err := validarCompresion(*compresion); err != nil {
+		log.Fatalf("%v", err)
+	}
+	if *benchPrefijos > 0 {
+		benchmarkPrefijos(*benchPrefijos)
+		return
+	}
+	if *benchWAL > 0 {
+		benchmarkWAL(*benchWAL)
+		return
+	}
+
 	// Ensure the 'db' directory exists at startup
 	if _, err := os.Stat("./db"); os.IsNotExist(err) {
 		err := os.Mkdir("./db", 0755)
@@ -606,22 +809,53 @@ func main() {
 	}
 
 	start := time.Now()
-	println("Iniciando la carga de datos a la memoria")
-	getAllValuesToDict()
+	println("Iniciando la carga del índice de claves a la memoria")
+	if err := getAllValuesToDict(); err != nil {
+		log.Fatalf("fallo al cargar el índice de claves: %v", err)
+	}
 
-	fmt.Println("Datos cargados a la memoria")
-	fmt.Println("Cantidad de clave valor cargados a la memoria:", len(tablaHash))
+	fmt.Println("Índice de claves cargado a la memoria")
+	fmt.Println("Cantidad de claves cargadas a la memoria:", len(tablaHash))
 	end := time.Now()
 
-	fmt.Println("Tiempo de carga:", end.Sub(start))
+	// Los valores no forman parte de este tiempo: se leen al primer acceso o en la precarga
+	fmt.Println("Tiempo de construcción del índice:", end.Sub(start))
+
+	// Las escrituras confirmadas que no llegaron a los archivos de datos están en el WAL
+	aplicados, err := reproducirWAL()
+	if err != nil {
+		log.Fatalf("fallo al reproducir el WAL: %v", err)
+	}
+	fmt.Println("Registros del WAL reproducidos:", aplicados)
+
+	if err := reconstruirBloquesLibres(); err != nil {
+		log.Fatalf("fallo al reconstruir los bloques libres de values.db: %v", err)
+	}
+
+	wal, err = abrirWAL(*durabilidad)
+	if err != nil {
+		log.Fatalf("fallo al abrir el WAL: %v", err)
+	}
+	go wal.checkpointsPeriodicos(time.Second)
+	fmt.Println("Durabilidad de las escrituras:", *durabilidad)
+	if *compresion != COMPRESION_NINGUNA {
+		fmt.Printf("Compresión de respuestas: %s desde %d bytes\n", *compresion, *compresionUmbral)
+	}
+
+	if *precarga {
+		go precargarValores() // Reporta su propio tiempo al terminar, ya con el servidor atendiendo
+	}
 
-	lis, err := net.Listen("tcp", ":5050")
+	lis, err := net.Listen("tcp", fmt.Sprintf(":%d", *port))
 	if err != nil {
 		log.Fatalf("failed to listen: %v", err)
 	}
 	s := grpc.NewServer(
 		grpc.MaxRecvMsgSize(1024*1024*1024),
 		grpc.MaxSendMsgSize(1024*1024*1024),
+		grpc.InitialWindowSize(VENTANA_STREAM),
+		grpc.InitialConnWindowSize(VENTANA_CONEXION),
+		grpc.KeepaliveEnforcementPolicy(keepalive.EnforcementPolicy{MinTime: PING_MINIMO, PermitWithoutStream: true}),
 	)
 	pb.RegisterBDServer(s, &server{})
 	log.Printf("server listening at %v", lis.Addr())
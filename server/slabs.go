@@ -0,0 +1,264 @@
+package main
+
+import (
+	"fmt"
+	"os"
+	"sort"
+	"sync"
+)
+
+// Tamaño mínimo de un slab: cada clase de tamaño toma values.db de a slabs de al menos
+// este tamaño y los reparte en bloques de su clase.
+const TAMAÑO_SLAB = 1024 * 1024
+
+// Clases de bloque de mayor a menor (para repartir un hueco en los bloques más grandes)
+var clasesDeBloque = []int32{MB4, MB1, KB512, KB4, B512}
+
+// claseSlab lleva los bloques de una clase de tamaño: los liberados, que se reutilizan
+// primero, y lo que queda sin usar del slab actual.
+type claseSlab struct {
+	mu      sync.Mutex
+	tamaño  int32
+	libres  []int64 // Posiciones de bloques libres (se reutilizan en orden LIFO)
+	proximo int64   // Siguiente bloque sin usar del slab actual
+	fin     int64   // Fin del slab actual
+}
+
+// asignadorSlabs reparte los bloques de values.db por clase de tamaño.
+//
+// Cada clase tiene su propio bloqueo y su lista de bloques libres, así que las escrituras
+// de clases distintas no compiten entre sí, y reservar o liberar un bloque es O(1). El
+// final del archivo solo se toca al abrir un slab nuevo, no en cada escritura. Un slab
+// nuevo sale primero de un bloque libre de una clase mayor y, si no hay, del final de
+// values.db, de modo que el espacio liberado por una clase lo puede reutilizar otra.
+//
+// Las posiciones siguen siendo desplazamientos en bytes dentro de un único values.db, no
+// índices de hueco por clase: el campo dir de keys.db conserva su significado, y
+// dbreader.py (lectura de valores, huecos y fragmentación) y compactor.py (que reescribe
+// values.db a partir de dir) lo interpretan como desplazamiento en bytes. Dentro de un
+// slab, bloque i está en inicio + i*tamaño.
+//
+// Un bloque fijado (Fijar) lo está leyendo un getStream sin el bloqueo de su clave:
+// mientras siga fijado no se sobrescribe en su lugar (ver Fijado) y, si se libera, no
+// vuelve a su clase hasta que el último lector lo suelta.
+type asignadorSlabs struct {
+	clases []*claseSlab // En el orden de clasesDeBloque
+	final  asignadorAppend
+
+	fijadosMu  sync.Mutex
+	fijados    map[int64]int   // Lectores de cada bloque fijado
+	diferidos  map[int64]int32 // Bloques liberados mientras estaban fijados, con su tamaño
+	generacion int             // Cambia en Reiniciar: los bloques fijados antes ya no cuentan
+}
+
+func nuevoAsignadorSlabs() *asignadorSlabs {
+	a := &asignadorSlabs{}
+	for _, tamaño := range clasesDeBloque {
+		a.clases = append(a.clases, &claseSlab{tamaño: tamaño})
+	}
+	return a
+}
+
+var slabsValues = nuevoAsignadorSlabs()
+
+// indiceDeClase devuelve la posición de tamaño en clasesDeBloque, o -1 si no es una clase.
+func indiceDeClase(tamaño int32) int {
+	for i, t := range clasesDeBloque {
+		if t == tamaño {
+			return i
+		}
+	}
+	return -1
+}
+
+// Reservar devuelve la posición de un bloque libre de la clase tamaño en file.
+func (a *asignadorSlabs) Reservar(file *os.File, tamaño int32) (int64, error) {
+	i := indiceDeClase(tamaño)
+	if i < 0 {
+		return -1, fmt.Errorf("tamaño de bloque inválido: %d", tamaño)
+	}
+	c := a.clases[i]
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if n := len(c.libres); n > 0 {
+		pos := c.libres[n-1]
+		c.libres = c.libres[:n-1]
+		return pos, nil
+	}
+	if c.proximo >= c.fin {
+		inicio, largo, err := a.nuevoSlab(file, i)
+		if err != nil {
+			return -1, err
+		}
+		c.proximo, c.fin = inicio, inicio+largo
+	}
+	pos := c.proximo
+	c.proximo += int64(tamaño)
+	return pos, nil
+}
+
+// nuevoSlab devuelve un slab para la clase i: un bloque libre de una clase mayor de al
+// menos TAMAÑO_SLAB bytes o, si no hay, espacio nuevo al final del archivo. Se llama con
+// el bloqueo de la clase i tomado; los de las clases mayores se toman siempre después de
+// los de las menores, así que no hay interbloqueos.
+func (a *asignadorSlabs) nuevoSlab(file *os.File, i int) (int64, int64, error) {
+	minimo := max(int64(TAMAÑO_SLAB), int64(clasesDeBloque[i]))
+	for j := i - 1; j >= 0; j-- {
+		mayor := a.clases[j]
+		if int64(mayor.tamaño) < minimo {
+			continue
+		}
+		mayor.mu.Lock()
+		if n := len(mayor.libres); n > 0 {
+			pos := mayor.libres[n-1]
+			mayor.libres = mayor.libres[:n-1]
+			mayor.mu.Unlock()
+			return pos, int64(mayor.tamaño), nil
+		}
+		mayor.mu.Unlock()
+	}
+	inicio, err := a.final.Reservar(file, minimo)
+	return inicio, minimo, err
+}
+
+// Liberar devuelve a su clase el bloque de tamaño bytes en pos, que ya no debe estar
+// referenciado por ninguna clave.
+func (a *asignadorSlabs) Liberar(pos int64, tamaño int32) {
+	i := indiceDeClase(tamaño)
+	if i < 0 {
+		return
+	}
+	a.fijadosMu.Lock()
+	if a.fijados[pos] > 0 {
+		a.diferidos[pos] = tamaño
+		a.fijadosMu.Unlock()
+		return
+	}
+	a.fijadosMu.Unlock()
+	c := a.clases[i]
+	c.mu.Lock()
+	c.libres = append(c.libres, pos)
+	c.mu.Unlock()
+}
+
+// Fijar marca el bloque en pos como leído por un stream y devuelve la generación con la
+// que hay que soltarlo (Soltar). El llamador debe tener el bloqueo de la clave que apunta
+// al bloque, así ninguna escritura de la clave lo sobrescribe ni lo libera antes.
+func (a *asignadorSlabs) Fijar(pos int64) int {
+	a.fijadosMu.Lock()
+	defer a.fijadosMu.Unlock()
+	if a.fijados == nil {
+		a.fijados = map[int64]int{}
+		a.diferidos = map[int64]int32{}
+	}
+	a.fijados[pos]++
+	return a.generacion
+}
+
+// Soltar deja de fijar el bloque en pos. Si fue liberado mientras estaba fijado y este
+// era su último lector, vuelve a su clase. Un bloque fijado antes de un Reiniciar se ignora.
+func (a *asignadorSlabs) Soltar(pos int64, generacion int) {
+	a.fijadosMu.Lock()
+	if generacion != a.generacion {
+		a.fijadosMu.Unlock()
+		return
+	}
+	a.fijados[pos]--
+	tamaño, liberado := a.diferidos[pos]
+	if a.fijados[pos] > 0 || !liberado {
+		if a.fijados[pos] == 0 {
+			delete(a.fijados, pos)
+		}
+		a.fijadosMu.Unlock()
+		return
+	}
+	delete(a.fijados, pos)
+	delete(a.diferidos, pos)
+	a.fijadosMu.Unlock()
+	a.Liberar(pos, tamaño)
+}
+
+// Fijado indica si algún stream está leyendo el bloque en pos.
+func (a *asignadorSlabs) Fijado(pos int64) bool {
+	a.fijadosMu.Lock()
+	defer a.fijadosMu.Unlock()
+	return a.fijados[pos] > 0
+}
+
+// Reiniciar descarta los bloques libres y los slabs abiertos (resetDb).
+func (a *asignadorSlabs) Reiniciar() {
+	for _, c := range a.clases {
+		c.mu.Lock()
+		c.libres = nil
+		c.proximo, c.fin = 0, 0
+		c.mu.Unlock()
+	}
+	a.final.Reiniciar()
+	a.fijadosMu.Lock()
+	a.fijados, a.diferidos = nil, nil
+	a.generacion++
+	a.fijadosMu.Unlock()
+}
+
+// bloqueOcupado es un bloque de values.db al que apunta una clave.
+type bloqueOcupado struct {
+	pos    int64
+	tamaño int32
+}
+
+// Reconstruir arma las listas de bloques libres a partir de los bloques ocupados: cada
+// hueco entre ellos (y entre el último y finArchivo) se reparte en los bloques más grandes
+// que caben. El archivo sigue creciendo desde finArchivo.
+func (a *asignadorSlabs) Reconstruir(ocupados []bloqueOcupado, finArchivo int64) (int, int64) {
+	a.Reiniciar()
+	sort.Slice(ocupados, func(x, y int) bool { return ocupados[x].pos < ocupados[y].pos })
+
+	bloques, bytesLibres := 0, int64(0)
+	repartir := func(desde int64, hasta int64) {
+		for _, tamaño := range clasesDeBloque {
+			for hasta-desde >= int64(tamaño) {
+				a.Liberar(desde, tamaño)
+				desde += int64(tamaño)
+				bloques++
+				bytesLibres += int64(tamaño)
+			}
+		}
+	}
+	cursor := int64(0)
+	for _, b := range ocupados {
+		if b.pos > cursor {
+			repartir(cursor, b.pos)
+		}
+		cursor = max(cursor, b.pos+int64(b.tamaño))
+	}
+	if finArchivo > cursor {
+		repartir(cursor, finArchivo)
+	}
+	return bloques, bytesLibres
+}
+
+// reconstruirBloquesLibres arma las listas de bloques libres de slabsValues con los bloques
+// de values.db a los que no apunta ninguna clave. Se llama al arrancar, después de
+// reproducir el WAL, para que ningún bloque libre sea uno que el log todavía referencia.
+func reconstruirBloquesLibres() error {
+	info, err := os.Stat("./db/values.db")
+	if os.IsNotExist(err) {
+		slabsValues.Reiniciar()
+		return nil
+	}
+	if err != nil {
+		return err
+	}
+
+	tablaHashMutex.RLock()
+	ocupados := make([]bloqueOcupado, 0, len(tablaHash))
+	for _, entrada := range tablaHash {
+		ocupados = append(ocupados, bloqueOcupado{entrada.PosicionValue, entrada.Tamaño})
+	}
+	tablaHashMutex.RUnlock()
+
+	bloques, bytesLibres := slabsValues.Reconstruir(ocupados, info.Size())
+	fmt.Printf("Bloques libres en values.db: %d (%.2f MB de %.2f MB)\n", bloques, float64(bytesLibres)/(1024*1024), float64(info.Size())/(1024*1024))
+	return nil
+}
@@ -0,0 +1,79 @@
+package main
+
+import (
+	"math/bits"
+	"unicode/utf8"
+	"unsafe"
+
+	pb "github.com/yormanbalanD/bd-clave-valor-distribuidos/proto"
+)
+
+// Bits bajos del Tamaño codificado que llevan el largo del valor (hasta 4MB = 1<<22)
+const BITS_LARGO = 23
+
+// Bits del Tamaño codificado, sobre los del largo, que llevan el log2 del tamaño de bloque
+const BITS_BLOQUE = 5
+
+// Bit del Tamaño codificado que marca los registros de claves binarias (ver claveDeRegistro)
+const BIT_CLAVE_BINARIA = 1 << (BITS_LARGO + BITS_BLOQUE)
+
+// Largo de un valor cuyo registro solo guarda el tamaño de bloque (registros anteriores al
+// largo explícito): el valor termina en el último byte distinto de cero del bloque.
+const LARGO_DESCONOCIDO = -1
+
+// codificarTamaño arma el campo Tamaño de un registro InfClave con el tamaño de bloque y el
+// largo exacto del valor: ^(largo | log2(bloque)<<BITS_LARGO), siempre negativo. Así el
+// registro sigue midiendo 28 bytes y los registros anteriores, con el tamaño de bloque
+// positivo, se siguen leyendo.
+func codificarTamaño(bloque int32, largo int32) int32 {
+	if largo < 0 {
+		return bloque
+	}
+	return ^(largo | int32(bits.TrailingZeros32(uint32(bloque)))<<BITS_LARGO)
+}
+
+// decodificarTamaño devuelve el tamaño de bloque y el largo del valor de un campo Tamaño
+// de keys.db. El largo es LARGO_DESCONOCIDO en los registros anteriores.
+func decodificarTamaño(tamaño int32) (int32, int32) {
+	if tamaño >= 0 {
+		return tamaño, LARGO_DESCONOCIDO
+	}
+	codificado := ^tamaño
+	return 1 << (codificado >> BITS_LARGO & (1<<BITS_BLOQUE - 1)), codificado & (1<<BITS_LARGO - 1)
+}
+
+// marcarClaveBinaria marca un Tamaño codificado (con largo explícito) como registro de
+// una clave binaria.
+func marcarClaveBinaria(tamaño int32) int32 {
+	return tamaño &^ BIT_CLAVE_BINARIA
+}
+
+// esRegistroBinario indica si un campo Tamaño de keys.db es de una clave binaria.
+func esRegistroBinario(tamaño int32) bool {
+	return tamaño < 0 && ^tamaño&BIT_CLAVE_BINARIA != 0
+}
+
+// valorDePeticion devuelve el valor de un set: valor_binario si viene, o si no valor.
+func valorDePeticion(texto string, binario []byte) string {
+	if len(binario) > 0 {
+		return string(binario)
+	}
+	return texto
+}
+
+// bytesDeValor devuelve los bytes de valor sin copiarlos. El resultado es de solo lectura:
+// se usa para enviar valores de tablaHash en campos bytes, que protobuf solo lee.
+func bytesDeValor(valor string) []byte {
+	return unsafe.Slice(unsafe.StringData(valor), len(valor))
+}
+
+// asignarValor pone valor en el Objeto de una respuesta: en ValorBinario si la petición lo
+// pidió o si no es texto UTF-8 (un campo string de protobuf no puede llevarlo), y si no en
+// Valor.
+func asignarValor(objeto *pb.Objeto, valor string, enBytes bool) {
+	if enBytes || !utf8.ValidString(valor) {
+		objeto.ValorBinario = bytesDeValor(valor)
+		return
+	}
+	objeto.Valor = valor
+}
@@ -0,0 +1,477 @@
+package main
+
+import (
+	"bufio"
+	"encoding/binary"
+	"fmt"
+	"hash/crc32"
+	"io"
+	"os"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+)
+
+// Modos de durabilidad del WAL
+const (
+	DURABILIDAD_NONE   = "none"   // Se escribe en el log sin fsync: sobrevive a la caída del proceso, no a la del sistema
+	DURABILIDAD_BATCH  = "batch"  // Group commit: las escrituras concurrentes comparten una escritura y un fsync
+	DURABILIDAD_ALWAYS = "always" // Un fsync por cada escritura
+)
+
+const RUTA_WAL = "./db/wal.log"
+
+// Cabecera de cada registro del WAL: crc32, largo de la clave y largo del valor (uint32 little-endian)
+const CABECERA_WAL = 12
+
+// Con el log por encima de este tamaño se hace un checkpoint: fsync de los archivos de
+// datos y truncado del log.
+const UMBRAL_CHECKPOINT_WAL = 64 * 1024 * 1024
+
+// Marca en el largo de la clave de un registro de referencia
+const MARCA_REFERENCIA_WAL = 1 << 31
+
+// Largo del valor de un registro de referencia: posición (int64) y tamaño de bloque
+// (int32, codificado con el largo del valor como en keys.db, ver codificarTamaño)
+const LARGO_REFERENCIA_WAL = 12
+
+// registroWAL es una escritura registrada en el log. En un registro de referencia
+// (setStream) el valor ya está escrito en un bloque nuevo de values.db y el registro solo
+// guarda la ubicación de ese bloque, en vez del valor completo.
+type registroWAL struct {
+	Clave      string
+	Valor      string
+	Referencia bool
+	Posicion   int64
+	Tamaño     int32
+}
+
+type peticionWAL struct {
+	registros []registroWAL
+	hecho     chan error
+}
+
+// walGrupal es un write-ahead log con group commit. Cada set se registra en el log antes
+// de aplicarse a keys.db / values.db; al arrancar, los registros del log se vuelven a
+// aplicar, así que una escritura confirmada no se pierde aunque los archivos de datos
+// queden a medias.
+//
+// En modo batch una sola gorrutina escribe en el log: toma todas las peticiones que se
+// acumularon mientras hacía el fsync anterior y las escribe con un único Write y un único
+// Sync, de modo que el costo del fsync se reparte entre todas las escrituras concurrentes.
+type walGrupal struct {
+	modo       string
+	mu         sync.Mutex // Protege archivo y tamaño
+	archivo    *os.File
+	tamaño     int64
+	pendientes chan *peticionWAL
+	terminado  chan struct{} // Se cierra cuando termina confirmarGrupos
+}
+
+var wal *walGrupal
+
+// abrirWAL abre (o crea) el log en modo append e inicia la gorrutina de group commit.
+func abrirWAL(modo string) (*walGrupal, error) {
+	if modo != DURABILIDAD_NONE && modo != DURABILIDAD_BATCH && modo != DURABILIDAD_ALWAYS {
+		return nil, fmt.Errorf("modo de durabilidad desconocido: %s", modo)
+	}
+	w := &walGrupal{modo: modo}
+	if err := w.abrirArchivo(); err != nil {
+		return nil, err
+	}
+	if modo == DURABILIDAD_BATCH {
+		w.pendientes = make(chan *peticionWAL, 1024)
+		w.terminado = make(chan struct{})
+		go w.confirmarGrupos()
+	}
+	return w, nil
+}
+
+func (w *walGrupal) abrirArchivo() error {
+	archivo, err := os.OpenFile(RUTA_WAL, os.O_RDWR|os.O_CREATE|os.O_APPEND, 0644)
+	if err != nil {
+		return err
+	}
+	info, err := archivo.Stat()
+	if err != nil {
+		archivo.Close()
+		return err
+	}
+	w.archivo = archivo
+	w.tamaño = info.Size()
+	return nil
+}
+
+// codificarRegistros serializa registros con el formato [crc32][largo clave][largo valor][clave][valor].
+// En un registro de referencia el largo de la clave lleva MARCA_REFERENCIA_WAL y el valor
+// son la posición y el tamaño del bloque.
+func codificarRegistros(buf []byte, registros []registroWAL) []byte {
+	for _, r := range registros {
+		inicio := len(buf)
+		buf = append(buf, make([]byte, CABECERA_WAL)...)
+		if r.Referencia {
+			binary.LittleEndian.PutUint32(buf[inicio+4:], uint32(len(r.Clave))|MARCA_REFERENCIA_WAL)
+			binary.LittleEndian.PutUint32(buf[inicio+8:], LARGO_REFERENCIA_WAL)
+			buf = append(buf, r.Clave...)
+			buf = binary.LittleEndian.AppendUint64(buf, uint64(r.Posicion))
+			buf = binary.LittleEndian.AppendUint32(buf, uint32(r.Tamaño))
+		} else {
+			binary.LittleEndian.PutUint32(buf[inicio+4:], uint32(len(r.Clave)))
+			binary.LittleEndian.PutUint32(buf[inicio+8:], uint32(len(r.Valor)))
+			buf = append(buf, r.Clave...)
+			buf = append(buf, r.Valor...)
+		}
+		binary.LittleEndian.PutUint32(buf[inicio:], crc32.ChecksumIEEE(buf[inicio+4:]))
+	}
+	return buf
+}
+
+// leerRegistroWAL lee el siguiente registro del log. Devuelve false al llegar al final o
+// a un registro incompleto o con crc inválido (una escritura que no llegó a confirmarse).
+func leerRegistroWAL(lector *bufio.Reader, cabecera []byte) (registroWAL, bool) {
+	if _, err := io.ReadFull(lector, cabecera); err != nil {
+		return registroWAL{}, false // Fin del log o cabecera incompleta
+	}
+	largoClave := binary.LittleEndian.Uint32(cabecera[4:])
+	largoValor := binary.LittleEndian.Uint32(cabecera[8:])
+	referencia := largoClave&MARCA_REFERENCIA_WAL != 0
+	largoClave &^= MARCA_REFERENCIA_WAL
+	if largoClave > 1024 || largoValor > MB4 || (referencia && largoValor != LARGO_REFERENCIA_WAL) {
+		fmt.Println("Advertencia: registro del WAL inválido, se descarta el resto del log")
+		return registroWAL{}, false
+	}
+	datos := make([]byte, largoClave+largoValor)
+	if _, err := io.ReadFull(lector, datos); err != nil {
+		return registroWAL{}, false
+	}
+	crc := crc32.NewIEEE()
+	crc.Write(cabecera[4:])
+	crc.Write(datos)
+	if crc.Sum32() != binary.LittleEndian.Uint32(cabecera) {
+		fmt.Println("Advertencia: crc inválido en el WAL, se descarta el resto del log")
+		return registroWAL{}, false
+	}
+	registro := registroWAL{Clave: string(datos[:largoClave]), Referencia: referencia}
+	if referencia {
+		registro.Posicion = int64(binary.LittleEndian.Uint64(datos[largoClave:]))
+		registro.Tamaño = int32(binary.LittleEndian.Uint32(datos[largoClave+8:]))
+	} else {
+		registro.Valor = string(datos[largoClave:])
+	}
+	return registro, true
+}
+
+// escribir añade datos al log y, si sincronizar es true, hace fsync.
+func (w *walGrupal) escribir(datos []byte, sincronizar bool) error {
+	w.mu.Lock()
+	defer w.mu.Unlock()
+
+	if _, err := w.archivo.Write(datos); err != nil {
+		return err
+	}
+	w.tamaño += int64(len(datos))
+	if sincronizar {
+		return w.archivo.Sync()
+	}
+	return nil
+}
+
+// Registrar escribe registros en el log y vuelve cuando son durables según el modo. Con
+// w == nil (durante la reproducción del log al arrancar) no hace nada.
+func (w *walGrupal) Registrar(registros []registroWAL) error {
+	if w == nil || len(registros) == 0 {
+		return nil
+	}
+	switch w.modo {
+	case DURABILIDAD_BATCH:
+		peticion := &peticionWAL{registros: registros, hecho: make(chan error, 1)}
+		w.pendientes <- peticion
+		return <-peticion.hecho
+	case DURABILIDAD_ALWAYS:
+		return w.escribir(codificarRegistros(nil, registros), true)
+	default:
+		return w.escribir(codificarRegistros(nil, registros), false)
+	}
+}
+
+// confirmarGrupos es la gorrutina de group commit del modo batch.
+func (w *walGrupal) confirmarGrupos() {
+	defer close(w.terminado)
+	var buf []byte
+	for primera := range w.pendientes {
+		grupo := []*peticionWAL{primera}
+	acumular:
+		for {
+			select {
+			case siguiente := <-w.pendientes:
+				grupo = append(grupo, siguiente)
+			default:
+				break acumular
+			}
+		}
+
+		buf = buf[:0]
+		for _, peticion := range grupo {
+			buf = codificarRegistros(buf, peticion.registros)
+		}
+		err := w.escribir(buf, true)
+		for _, peticion := range grupo {
+			peticion.hecho <- err
+		}
+	}
+}
+
+// Cerrar detiene la gorrutina de group commit (modo batch), esperando a que confirme las
+// peticiones pendientes, y cierra el log. No debe haber escrituras en curso ni posteriores.
+func (w *walGrupal) Cerrar() error {
+	if w == nil {
+		return nil
+	}
+	if w.pendientes != nil {
+		close(w.pendientes)
+		<-w.terminado
+	}
+	w.mu.Lock()
+	defer w.mu.Unlock()
+	return w.archivo.Close()
+}
+
+// sincronizarDatos hace fsync de keys.db y values.db.
+func sincronizarDatos() error {
+	for _, ruta := range []string{"./db/values.db", "./db/keys.db"} {
+		archivo, err := os.OpenFile(ruta, os.O_RDWR|os.O_CREATE, 0644)
+		if err != nil {
+			return err
+		}
+		err = archivo.Sync()
+		archivo.Close()
+		if err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// Checkpoint trunca el log una vez que los archivos de datos están en disco. Toma
+// reinicioMutex en modo escritura, así que cuando se ejecuta todos los registros del log
+// ya se aplicaron a los archivos de datos.
+func (w *walGrupal) Checkpoint() error {
+	reinicioMutex.Lock()
+	defer reinicioMutex.Unlock()
+
+	if err := sincronizarDatos(); err != nil {
+		return err
+	}
+	w.mu.Lock()
+	defer w.mu.Unlock()
+	if err := w.archivo.Truncate(0); err != nil {
+		return err
+	}
+	w.tamaño = 0
+	return nil
+}
+
+// checkpointsPeriodicos hace un checkpoint cada vez que el log supera UMBRAL_CHECKPOINT_WAL.
+func (w *walGrupal) checkpointsPeriodicos(intervalo time.Duration) {
+	for range time.Tick(intervalo) {
+		w.mu.Lock()
+		tamaño := w.tamaño
+		w.mu.Unlock()
+		if tamaño < UMBRAL_CHECKPOINT_WAL {
+			continue
+		}
+		if err := w.Checkpoint(); err != nil {
+			fmt.Println("Error en el checkpoint del WAL:", err)
+		}
+	}
+}
+
+// Reiniciar reabre el log vacío después de que resetDb borró el directorio db. El
+// llamador debe tener reinicioMutex en modo escritura.
+func (w *walGrupal) Reiniciar() error {
+	if w == nil {
+		return nil
+	}
+	w.mu.Lock()
+	defer w.mu.Unlock()
+	w.archivo.Close()
+	return w.abrirArchivo()
+}
+
+// reproducirWAL vuelve a aplicar a los archivos de datos los registros de RUTA_WAL. Se
+// detiene en el primer registro incompleto o con crc inválido (una escritura que no
+// llegó a confirmarse). Al terminar sincroniza los datos y vacía el log.
+//
+// Solo se aplica el último registro de cada clave: uno anterior podría sobrescribir en su
+// lugar el bloque al que ya apunta un registro de referencia posterior. Por eso el log se
+// recorre dos veces, la primera solo para saber cuál es el último registro de cada clave.
+func reproducirWAL() (int, error) {
+	archivo, err := os.OpenFile(RUTA_WAL, os.O_RDWR|os.O_CREATE, 0644)
+	if err != nil {
+		return 0, err
+	}
+	defer archivo.Close()
+
+	fileValues, err := os.OpenFile("./db/values.db", os.O_RDWR|os.O_CREATE, 0644)
+	if err != nil {
+		return 0, err
+	}
+	defer fileValues.Close()
+	fileKeys, err := os.OpenFile("./db/keys.db", os.O_RDWR|os.O_CREATE, 0644)
+	if err != nil {
+		return 0, err
+	}
+	defer fileKeys.Close()
+
+	cabecera := make([]byte, CABECERA_WAL)
+	ultimo := make(map[string]int)
+	lector := bufio.NewReaderSize(archivo, 1024*1024)
+	total := 0
+	for {
+		registro, ok := leerRegistroWAL(lector, cabecera)
+		if !ok {
+			break
+		}
+		ultimo[registro.Clave] = total
+		total++
+	}
+
+	if _, err := archivo.Seek(0, io.SeekStart); err != nil {
+		return 0, err
+	}
+	lector.Reset(archivo)
+
+	// Los bloques liberados se reutilizan, así que el bloque al que keys.db apunta para una
+	// clave del log puede ser ya de otra clave si el corte perdió la actualización de
+	// keys.db: sin tamaño, escribirValor no sobrescribe ese bloque y toma uno nuevo
+	tablaHashMutex.Lock()
+	for clave := range ultimo {
+		if entrada, exist := tablaHash[clave]; exist {
+			entrada.Tamaño = 0
+			tablaHash[clave] = entrada
+		}
+	}
+	tablaHashMutex.Unlock()
+
+	aplicados := 0
+	for i := 0; i < total; i++ {
+		registro, _ := leerRegistroWAL(lector, cabecera)
+		if ultimo[registro.Clave] != i {
+			continue // La clave se vuelve a escribir más adelante en el log
+		}
+		if registro.Referencia {
+			err = aplicarReferencia(fileKeys, registro.Clave, registro.Posicion, registro.Tamaño)
+		} else {
+			// Una clave binaria vuelve al bloque de la clase de su primer byte, como en Set
+			err = writeValuesTo(fileValues, fileKeys, registro.Clave, registro.Valor, claseDeClave(registro.Clave))
+		}
+		if err != nil {
+			return aplicados, err
+		}
+		aplicados++
+	}
+
+	if err := fileValues.Sync(); err != nil {
+		return aplicados, err
+	}
+	if err := fileKeys.Sync(); err != nil {
+		return aplicados, err
+	}
+	return aplicados, archivo.Truncate(0)
+}
+
+// bloquearClaves toma, en orden, los bloqueos de franja de todas las claves (sin
+// repetir), para que un lote no se cruce con otro en un interbloqueo. Devuelve la
+// función que los libera.
+func bloquearClaves(claves []string) func() {
+	franjas := make(map[uint32]bool)
+	for _, clave := range claves {
+		franjas[franjaDeClave(clave)] = true
+	}
+	orden := make([]int, 0, len(franjas))
+	for franja := range franjas {
+		orden = append(orden, int(franja))
+	}
+	sort.Ints(orden)
+	for _, franja := range orden {
+		bloqueosClave[franja].Lock()
+	}
+	return func() {
+		for _, franja := range orden {
+			bloqueosClave[franja].Unlock()
+		}
+	}
+}
+
+// benchmarkWAL mide el throughput y la latencia p99 de set con cada modo de durabilidad,
+// para valores de 512B y 4MB, con 32 escritores concurrentes. Se ejecuta en un directorio
+// temporal.
+func benchmarkWAL(escrituras int) {
+	const escritores = 32
+
+	dir, err := os.MkdirTemp("", "bench-wal")
+	if err != nil {
+		fmt.Println("Error al crear el directorio temporal:", err)
+		return
+	}
+	defer os.RemoveAll(dir)
+	if err := os.Chdir(dir); err != nil {
+		fmt.Println("Error al cambiar al directorio temporal:", err)
+		return
+	}
+
+	// Los mensajes de cada escritura se descartan para no medir la consola
+	salida := salidaEscrituras
+	salidaEscrituras = io.Discard
+	defer func() { salidaEscrituras = salida }()
+
+	fmt.Printf("%-8s %-6s %10s %12s %12s %10s\n", "Modo", "Valor", "Escrituras", "Ops/s", "MB/s", "p99")
+	for _, modo := range []string{DURABILIDAD_NONE, DURABILIDAD_BATCH, DURABILIDAD_ALWAYS} {
+		for _, tamaño := range []int{B512, MB4} {
+			n := escrituras
+			if tamaño == MB4 && n > 256 {
+				n = 256 // Acotar el volumen escrito con valores de 4MB
+			}
+
+			os.RemoveAll("./db")
+			os.Mkdir("./db", 0755)
+			tablaHash = make(map[string]DatosDiccionario)
+			indiceClaves.Limpiar()
+			finKeys.Reiniciar()
+			slabsValues.Reiniciar()
+			wal, err = abrirWAL(modo)
+			if err != nil {
+				fmt.Println("Error al abrir el WAL:", err)
+				return
+			}
+
+			valor := strings.Repeat("x", tamaño)
+			latencias := make([]time.Duration, n)
+			var grupo sync.WaitGroup
+			inicio := time.Now()
+			for e := 0; e < escritores; e++ {
+				grupo.Add(1)
+				go func(e int) {
+					defer grupo.Done()
+					for i := e; i < n; i += escritores {
+						t := time.Now()
+						writeValues(fmt.Sprintf("k%015d", i), valor, 0)
+						latencias[i] = time.Since(t)
+					}
+				}(e)
+			}
+			grupo.Wait()
+			total := time.Since(inicio)
+
+			sort.Slice(latencias, func(a, b int) bool { return latencias[a] < latencias[b] })
+			p99 := latencias[(len(latencias)*99)/100]
+			fmt.Printf("%-8s %-6s %10d %12.0f %12.2f %10v\n", modo, map[int]string{B512: "512B", MB4: "4MB"}[tamaño], n,
+				float64(n)/total.Seconds(), float64(n*tamaño)/(1024*1024)/total.Seconds(), p99)
+			if err := wal.Cerrar(); err != nil {
+				fmt.Println("Error al cerrar el WAL:", err)
+			}
+			wal = nil
+		}
+	}
+}